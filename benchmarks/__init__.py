@@ -0,0 +1,8 @@
+"""
+Benchmarks for tableau-api-lib, run offline against the in-process synthetic Tableau REST server.
+
+Run the full suite and write machine-readable results:
+    python -m benchmarks.run --output benchmark_results.json
+
+Compare the JSON emitted by two releases to track regressions.
+"""
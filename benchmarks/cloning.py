@@ -0,0 +1,73 @@
+import os
+import tempfile
+
+from tableau_api_lib import TableauServerConnection
+from tableau_api_lib.utils.cloning import CloningEngine
+from tableau_api_lib.utils.cloning.workbooks import clone_workbooks
+from tableau_api_lib.utils.synthetic_server import SyntheticSite, SyntheticTableauServer
+
+from benchmarks.common import MB, measure
+
+SUITE = 'cloning'
+
+
+def run(options) -> list:
+    """Measures an end-to-end clone_workbooks run between two synthetic servers."""
+    source_site = SyntheticSite(num_workbooks=options.clone_workbooks, extract_size=options.clone_extract_mb * MB)
+    target_site = SyntheticSite(num_workbooks=0, seed=1)
+    with SyntheticTableauServer([source_site], latency=options.latency) as source_server, \
+            SyntheticTableauServer([target_site], latency=options.latency) as target_server, \
+            tempfile.TemporaryDirectory() as temp_dir:
+        conn_source = TableauServerConnection(source_server.get_config(), ssl_verify=False)
+        conn_target = TableauServerConnection(target_server.get_config(), ssl_verify=False)
+        conn_source.sign_in()
+        conn_target.sign_in()
+        working_dir = os.getcwd()
+        os.chdir(temp_dir)  # clone_workbooks writes its intermediate CSV files to the working directory
+        try:
+            result = measure(
+                SUITE,
+                'clone_workbooks',
+                lambda: clone_workbooks(conn_source, conn_target, temp_dir=os.path.join(temp_dir, 'clone'),
+                                        overwrite_policy='overwrite'),
+                params={'workbooks': options.clone_workbooks, 'extract_mb': options.clone_extract_mb,
+                        'latency': options.latency},
+                repeat=options.repeat,
+                items_processed=options.clone_workbooks,
+            )
+        finally:
+            os.chdir(working_dir)
+        conn_source.sign_out()
+        conn_target.sign_out()
+    return [result] + [run_site_migration(options, max_workers) for max_workers in options.migration_workers]
+
+
+def run_site_migration(options, max_workers) -> dict:
+    """Measures a CloningEngine migrating a whole site (users, groups, projects, and content) to an empty site."""
+    num_items = options.migration_workbooks
+    source_site = SyntheticSite(num_users=num_items, num_groups=4, num_projects=8, num_workbooks=num_items,
+                                num_datasources=num_items // 4, num_flows=0, extract_size=64 * 1024)
+    num_tasks = num_items + 4 + 8 + num_items + num_items // 4
+
+    def migrate():
+        target_site = SyntheticSite(num_users=0, num_groups=0, num_projects=1, num_workbooks=0, num_datasources=0,
+                                    num_flows=0, seed=1)
+        with SyntheticTableauServer([target_site], latency=options.latency) as target_server:
+            conn_target = TableauServerConnection(target_server.get_config(), ssl_verify=False)
+            conn_target.sign_in()
+            engine = CloningEngine(conn_source, conn_target, max_workers=max_workers)
+            engine.add_site_migration()
+            engine.run()
+
+    with SyntheticTableauServer([source_site], latency=options.latency) as source_server:
+        conn_source = TableauServerConnection(source_server.get_config(), ssl_verify=False)
+        conn_source.sign_in()
+        return measure(
+            SUITE,
+            'clone_site_with_engine',
+            migrate,
+            params={'workbooks': num_items, 'tasks': num_tasks, 'max_workers': max_workers,
+                    'latency': options.latency},
+            repeat=options.repeat,
+            items_processed=num_tasks,
+        )
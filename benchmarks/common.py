@@ -0,0 +1,121 @@
+import base64
+import contextlib
+import io
+import os
+import statistics
+import time
+import tracemalloc
+import zipfile
+from typing import Any, Callable, Dict, Optional
+
+MB = 1024 * 1024
+FILL_BLOCK_SIZE = 4 * MB
+
+
+def measure(
+    suite: str,
+    name: str,
+    func: Callable[[], Any],
+    params: Optional[Dict[str, Any]] = None,
+    repeat: int = 1,
+    trace_memory: bool = False,
+    bytes_processed: Optional[int] = None,
+    items_processed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Runs a benchmark case and returns its result as a JSON-serializable dict.
+    :param str suite: the name of the benchmark suite the case belongs to
+    :param str name: the name of the benchmark case
+    :param func: the callable being measured; it is called once per repetition
+    :param dict params: the parameters describing the case (sizes, page sizes, etc.)
+    :param int repeat: the number of times the case is run; timing statistics cover all repetitions
+    :param bool trace_memory: measures the peak Python memory allocated during the first repetition if True
+    :param int bytes_processed: the number of bytes processed per repetition, used to report throughput
+    :param int items_processed: the number of items processed per repetition, used to report throughput
+    :return: dict
+    """
+    timings = []
+    peak_memory = None
+    for i in range(repeat):
+        if trace_memory and i == 0:
+            tracemalloc.start()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        timings.append(time.perf_counter() - start)
+        if trace_memory and i == 0:
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    result = {
+        'suite': suite,
+        'name': name,
+        'params': params or {},
+        'repeat': repeat,
+        'min_seconds': min(timings),
+        'median_seconds': statistics.median(timings),
+        'max_seconds': max(timings),
+    }
+    if peak_memory is not None:
+        result['peak_memory_bytes'] = peak_memory
+    if bytes_processed:
+        result['bytes_per_second'] = bytes_processed / result['median_seconds']
+    if items_processed:
+        result['items_per_second'] = items_processed / result['median_seconds']
+    return result
+
+
+def write_filler_file(file_path: str, size: int) -> str:
+    """Writes a file of the given size, filled with incompressible bytes, and returns its path."""
+    block = os.urandom(min(size, FILL_BLOCK_SIZE))
+    with open(file_path, 'wb') as file:
+        remaining = size
+        while remaining > 0:
+            written = file.write(block[:remaining])
+            remaining -= written
+    return file_path
+
+
+def build_workbook_xml(server: str, site_url: str, num_datasources: int) -> str:
+    """Returns workbook XML with server, site, and path references in each of its datasources."""
+    netloc = server.split('://')[-1]
+    datasources = ''.join(
+        f"    <datasource caption='datasource_{i}' name='sqlproxy.{i}'>\n"
+        f"      <repository-location id='datasource_{i}' path='/t/{site_url}/datasources' site='{site_url}' "
+        f"xml:base='{server}' />\n"
+        f"      <connection class='sqlproxy' server='{netloc}' dbname='datasource_{i}' channel='https' />\n"
+        f"      <column caption='Sales' datatype='real' name='[Sales]' role='measure' type='quantitative' />\n"
+        f"    </datasource>\n"
+        for i in range(num_datasources)
+    )
+    return (
+        f"<?xml version='1.0' encoding='utf-8' ?>\n"
+        f"<workbook source-build='benchmark' version='18.1'>\n"
+        f"  <repository-location id='benchmark' path='/t/{site_url}/workbooks' site='{site_url}' />\n"
+        f"  <datasources>\n{datasources}  </datasources>\n"
+        f"</workbook>\n"
+    )
+
+
+def build_embedded_workbook_xml(server: str, site_url: str, num_datasources: int, embedded_size: int) -> str:
+    """Returns workbook XML whose references are outnumbered by embedded custom SQL and a base64 thumbnail, which
+    together make up roughly `embedded_size` characters."""
+    sql_line = "SELECT s.store_id, s.sales FROM sales s WHERE s.region = 'west' AND s.order_date > '2020-01-01'\n"
+    sql = sql_line * max(embedded_size // 2 // len(sql_line), 1)
+    thumbnail = base64.b64encode(os.urandom(embedded_size // 2 * 3 // 4)).decode('ascii')
+    embedded = (f"  <custom-sql><relation name='Custom SQL Query' type='text'>{sql}</relation></custom-sql>\n"
+                f"  <thumbnails><thumbnail name='Sheet 1'>{thumbnail}</thumbnail></thumbnails>\n")
+    return build_workbook_xml(server, site_url, num_datasources).replace('</workbook>', embedded + '</workbook>')
+
+
+def write_packaged_workbook(file_path: str, server: str, site_url: str, num_datasources: int, extract_size: int) -> str:
+    """Writes a .twbx file containing generated workbook XML and an extract of the given size."""
+    with zipfile.ZipFile(file_path, 'w', zipfile.ZIP_DEFLATED) as package:
+        package.writestr(os.path.splitext(os.path.basename(file_path))[0] + '.twb',
+                         build_workbook_xml(server, site_url, num_datasources))
+        extract = os.urandom(min(extract_size, FILL_BLOCK_SIZE))
+        extract_info = zipfile.ZipInfo('Data/Extracts/benchmark.hyper')
+        with package.open(extract_info, 'w', force_zip64=extract_size > 2 ** 31) as extract_file:
+            remaining = extract_size
+            while remaining > 0:
+                remaining -= extract_file.write(extract[:remaining])
+    return file_path
@@ -0,0 +1,115 @@
+import pandas as pd
+
+from tableau_api_lib import TableauServerConnection
+from tableau_api_lib.utils import flatten_dict_column, flatten_dict_list_column
+from tableau_api_lib.utils.querying import get_view_data_dataframe, get_view_data_for_filters_dataframe, \
+    iter_view_data_dataframes
+from tableau_api_lib.utils.synthetic_server import VIEW_DATA_CATEGORIES, VIEW_DATA_REGIONS, SyntheticSite, \
+    SyntheticTableauServer
+
+from benchmarks.common import measure
+
+SUITE = 'dataframes'
+
+
+def build_content_df(num_rows: int, tags_per_row: int = 3) -> pd.DataFrame:
+    """Returns a DataFrame shaped like a paginated REST API response, with dict and list-of-dict columns."""
+    return pd.DataFrame({
+        'id': [f'id-{i}' for i in range(num_rows)],
+        'name': [f'workbook_{i}' for i in range(num_rows)],
+        'project': [{'id': f'project-{i % 50}', 'name': f'project_{i % 50}'} for i in range(num_rows)],
+        'tags': [[{'label': f'tag_{i}_{j}'} for j in range(tags_per_row)] for i in range(num_rows)],
+    })
+
+
+def sum_view_data_in_chunks(conn: TableauServerConnection, view_id: str, chunk_rows: int) -> float:
+    return sum(chunk['Sales'].sum() for chunk in iter_view_data_dataframes(conn, view_id, chunk_rows=chunk_rows))
+
+
+def run_view_data(options) -> list:
+    """Measures reading a view's data into one DataFrame, against streaming it in chunks of rows. The synthetic server
+    runs in the same process and builds each response in memory, which is included in both peaks."""
+    results = []
+    for num_rows in options.view_data_rows:
+        site = SyntheticSite(num_workbooks=1, views_per_workbook=1, rows_per_view=num_rows)
+        with SyntheticTableauServer([site]) as server:
+            conn = TableauServerConnection(server.get_config(), ssl_verify=False)
+            conn.sign_in()
+            view_id = site.views[0]['id']
+            for name, func in [('get_view_data_dataframe', lambda: get_view_data_dataframe(conn, view_id)['Sales'].sum()),
+                               ('iter_view_data_dataframes', lambda: sum_view_data_in_chunks(conn, view_id, 10000))]:
+                results.append(measure(
+                    SUITE,
+                    name,
+                    func,
+                    params={'rows': num_rows, 'chunk_rows': 10000 if name.startswith('iter') else None},
+                    repeat=options.repeat,
+                    trace_memory=True,
+                    items_processed=num_rows,
+                ))
+            conn.sign_out()
+    return results
+
+
+def get_view_data_in_loop(conn: TableauServerConnection, view_id: str, filter_sets: list) -> pd.DataFrame:
+    """The loop get_view_data_for_filters_dataframe replaces: one get_view_data_dataframe call per filter set."""
+    view_dfs = []
+    for filters in filter_sets:
+        parameter_dict = {f'vf_{name}': f'vf_{name}={value}' for name, value in filters.items()}
+        view_df = get_view_data_dataframe(conn, view_id, parameter_dict=parameter_dict)
+        for name, value in filters.items():
+            view_df[f'filter_{name}'] = value
+        view_dfs.append(view_df)
+    return pd.concat(view_dfs, ignore_index=True)
+
+
+def run_view_data_fan_out(options) -> list:
+    """Measures reading a view's data once per region and category, in a loop and with a growing number of workers."""
+    site = SyntheticSite(num_workbooks=1, views_per_workbook=1, rows_per_view=10000)
+    filter_sets = [{'Region': region, 'Category': category}
+                   for region in VIEW_DATA_REGIONS for category in VIEW_DATA_CATEGORIES]
+    with SyntheticTableauServer([site], latency=options.view_export_latency) as server:
+        conn = TableauServerConnection(server.get_config(), ssl_verify=False)
+        conn.sign_in()
+        view_id = site.views[0]['id']
+        params = {'filter_sets': len(filter_sets), 'latency': options.view_export_latency}
+        results = [measure(SUITE, 'get_view_data_in_loop', lambda: get_view_data_in_loop(conn, view_id, filter_sets),
+                           params={**params, 'max_workers': 1}, repeat=options.repeat,
+                           items_processed=len(filter_sets))]
+        for max_workers in options.view_export_workers:
+            results.append(measure(
+                SUITE,
+                'get_view_data_for_filters_dataframe',
+                lambda: get_view_data_for_filters_dataframe(conn, view_id, filter_sets, max_workers=max_workers),
+                params={**params, 'max_workers': max_workers},
+                repeat=options.repeat,
+                items_processed=len(filter_sets),
+            ))
+        conn.sign_out()
+    return results
+
+
+def run(options) -> list:
+    """Measures flatten_dict_column and flatten_dict_list_column as the number of rows grows, and reading view data."""
+    results = []
+    for num_rows in options.rows:
+        df = build_content_df(num_rows)
+        results.append(measure(
+            SUITE,
+            'flatten_dict_column',
+            lambda: flatten_dict_column(df.copy(), keys=['id', 'name'], col_name='project'),
+            params={'rows': num_rows},
+            repeat=options.repeat,
+            items_processed=num_rows,
+        ))
+        results.append(measure(
+            SUITE,
+            'flatten_dict_list_column',
+            lambda: flatten_dict_list_column(df.copy(), col_name='tags'),
+            params={'rows': num_rows, 'list_length': 3},
+            repeat=options.repeat,
+            items_processed=num_rows,
+        ))
+    results.extend(run_view_data(options))
+    results.extend(run_view_data_fan_out(options))
+    return results
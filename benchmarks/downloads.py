@@ -0,0 +1,127 @@
+import os
+import tempfile
+
+from tableau_api_lib import TableauServerConnection
+from tableau_api_lib.utils.bulk_download import BulkDownloader
+from tableau_api_lib.utils.synthetic_server import SyntheticSite, SyntheticTableauServer
+from tableau_api_lib.utils.view_export import ViewExporter
+
+from benchmarks.common import MB, measure
+
+SUITE = 'downloads'
+BULK_DOWNLOAD_EXTRACT_SIZE = 10 * MB
+
+
+def download_to_file(conn: TableauServerConnection, workbook_id: str, file_path: str) -> None:
+    response = conn.download_workbook(workbook_id)
+    response.raise_for_status()
+    with open(file_path, 'wb') as file:
+        file.write(response.content)
+
+
+def stream_to_file(conn: TableauServerConnection, workbook_id: str, file_path: str) -> None:
+    result = conn.download_workbook_to_file(workbook_id, file_path)
+    result.response.raise_for_status()
+
+
+def run(options) -> list:
+    """Measures time and peak memory while saving packaged workbooks to disk, buffering each response in memory
+    (download_workbook) or streaming it (download_workbook_to_file)."""
+    results = []
+    for size_mb in options.download_sizes_mb:
+        site = SyntheticSite(num_workbooks=1, extract_size=size_mb * MB)
+        with SyntheticTableauServer([site], latency=options.latency) as server, \
+                tempfile.TemporaryDirectory() as temp_dir:
+            conn = TableauServerConnection(server.get_config(), ssl_verify=False)
+            conn.sign_in()
+            workbook_id = site.workbooks[0]['id']
+            file_path = os.path.join(temp_dir, 'download.twbx')
+            download_to_file(conn, workbook_id, file_path)  # builds the package before anything is measured
+            for name, func in [('download_workbook', download_to_file), ('download_workbook_to_file', stream_to_file)]:
+                results.append(measure(
+                    SUITE,
+                    name,
+                    lambda: func(conn, workbook_id, file_path),
+                    params={'size_mb': size_mb, 'latency': options.latency},
+                    repeat=options.repeat,
+                    trace_memory=True,
+                    bytes_processed=os.path.getsize(file_path),
+                ))
+            conn.sign_out()
+    results.extend(run_bulk_download(options))
+    results.extend(run_view_export(options))
+    return results
+
+
+def run_bulk_download(options) -> list:
+    """Measures downloading many workbooks through a BulkDownloader with an increasing number of workers."""
+    site = SyntheticSite(num_workbooks=options.bulk_download_files, extract_size=BULK_DOWNLOAD_EXTRACT_SIZE)
+    with SyntheticTableauServer([site], latency=options.latency) as server, tempfile.TemporaryDirectory() as temp_dir:
+        conn = TableauServerConnection(server.get_config(), ssl_verify=False)
+        conn.sign_in()
+        workbook_ids = [workbook['id'] for workbook in site.workbooks]
+
+        def download_all(max_workers):
+            downloader = BulkDownloader(conn, temp_dir, max_workers=max_workers)
+            downloader.add_ids('workbook', workbook_ids)
+            failed = [item for item in downloader.run() if item.status != item.SUCCEEDED]
+            if failed:
+                raise RuntimeError(f'{len(failed)} bulk downloads failed: {failed}')
+            return sum(item.result.size for item in downloader.items)
+
+        bytes_processed = download_all(1)  # builds the packages before anything is measured
+        results = [measure(
+            SUITE,
+            'bulk_download',
+            lambda: download_all(max_workers),
+            params={'files': len(workbook_ids), 'max_workers': max_workers, 'latency': options.latency},
+            repeat=options.repeat,
+            bytes_processed=bytes_processed,
+            items_processed=len(workbook_ids),
+        ) for max_workers in options.bulk_download_workers]
+        conn.sign_out()
+    return results
+
+
+def export_views_in_loop(conn: TableauServerConnection, view_ids: list, directory: str) -> None:
+    """The export loop ViewExporter replaces: one query_view_image call after another, each buffered in memory."""
+    for view_id in view_ids:
+        response = conn.query_view_image(view_id)
+        response.raise_for_status()
+        with open(os.path.join(directory, f'{view_id}.png'), 'wb') as file:
+            file.write(response.content)
+
+
+def run_view_export(options) -> list:
+    """Measures exporting view images in a loop, through a ViewExporter with an increasing number of workers, and
+    through a ViewExporter whose render cache already holds every render."""
+    site = SyntheticSite(num_workbooks=options.view_export_views // 2, views_per_workbook=2)
+    with SyntheticTableauServer([site], latency=options.view_export_latency) as server, \
+            tempfile.TemporaryDirectory() as temp_dir:
+        conn = TableauServerConnection(server.get_config(), ssl_verify=False)
+        conn.sign_in()
+        view_ids = [view['id'] for view in site.views]
+        params = {'views': len(view_ids), 'latency': options.view_export_latency}
+
+        def export_all(max_workers, render_cache=None):
+            exporter = ViewExporter(conn, temp_dir, max_workers=max_workers, render_cache=render_cache)
+            exporter.add_combinations(view_ids, ['image'])
+            failed = [item for item in exporter.run() if item.status != item.SUCCEEDED]
+            if failed:
+                raise RuntimeError(f'{len(failed)} view exports failed: {failed}')
+
+        results = [measure(SUITE, 'query_view_image_loop', lambda: export_views_in_loop(conn, view_ids, temp_dir),
+                           params={**params, 'max_workers': 1}, repeat=options.repeat,
+                           items_processed=len(view_ids))]
+        for max_workers in options.view_export_workers:
+            results.append(measure(SUITE, 'view_exporter', lambda: export_all(max_workers),
+                                   params={**params, 'max_workers': max_workers}, repeat=options.repeat,
+                                   items_processed=len(view_ids)))
+        render_cache = os.path.join(temp_dir, 'render_cache')
+        export_all(max(options.view_export_workers), render_cache)
+        results.append(measure(SUITE, 'view_exporter_cached',
+                               lambda: export_all(max(options.view_export_workers), render_cache),
+                               params={**params, 'max_workers': max(options.view_export_workers)},
+                               repeat=options.repeat, items_processed=len(view_ids)))
+        conn.sign_out()
+    return results
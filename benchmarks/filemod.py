@@ -0,0 +1,138 @@
+import os
+import shutil
+import tempfile
+import zipfile
+from xml.etree import ElementTree
+
+from tableau_api_lib import TableauServerConnection
+from tableau_api_lib.utils.common import get_server_netloc
+from tableau_api_lib.utils.connection_rewriter import ConnectionRule, rewrite_connections
+from tableau_api_lib.utils.filemod import generate_tableau_zipfile, get_tableau_filenames, modify_tableau_files, \
+    modify_tableau_zipfile, remap_xml_references, replace_zipped_xml_file
+
+from benchmarks.common import MB, build_embedded_workbook_xml, build_workbook_xml, measure, write_packaged_workbook
+
+SUITE = 'filemod'
+SOURCE_CONFIG = {'tableau_prod': {'server': 'https://source.example.com', 'api_version': '3.15', 'username': 'estam',
+                                  'password': 'secret', 'site_name': 'Source', 'site_url': 'source'}}
+TARGET_CONFIG = {'tableau_prod': {'server': 'https://target.example.com', 'api_version': '3.15', 'username': 'estam',
+                                  'password': 'secret', 'site_name': 'Target', 'site_url': 'target'}}
+
+
+def remap_with_replace_passes(file: str, conn_source: TableauServerConnection, conn_target: TableauServerConnection):
+    """The remapping remap_xml_references performed before it was a single scan: one str.replace pass per rule."""
+    for template, source, target in [
+        ("xml:base='{}'", conn_source.server, conn_target.server),
+        ("xml:base=&apos;{}", conn_source.server, conn_target.server),
+        ("path='/t/{}/", conn_source.site_url, conn_target.site_url),
+        ("path=&apos;/t/{}/", conn_source.site_url, conn_target.site_url),
+        ("site='{}'", conn_source.site_url, conn_target.site_url),
+        ("site=&apos;{}", conn_source.site_url, conn_target.site_url),
+        ("server='{}'", get_server_netloc(conn_source.server), get_server_netloc(conn_target.server)),
+        ("server=&apos;{}", get_server_netloc(conn_source.server), get_server_netloc(conn_target.server)),
+    ]:
+        file = file.replace(template.format(source), template.format(target))
+    return file
+
+
+def modify_by_extracting(zipfile_path, conn_source, conn_target, extraction_dir, destination_dir) -> None:
+    """The rewrite modify_tableau_zipfile performed before it copied members zip to zip: extract every member to disk,
+    then recompress every member into the new zipped file."""
+    shutil.rmtree(extraction_dir, ignore_errors=True)
+    with zipfile.ZipFile(zipfile_path) as zip_file:
+        zip_file.extractall(path=extraction_dir)
+        zip_file_base, xml_file_base = get_tableau_filenames(zipfile_path, extraction_dir)
+        replace_zipped_xml_file(conn_source, conn_target, zip_file, xml_file_base, extraction_dir)
+    generate_tableau_zipfile(extraction_dir, destination_dir, zip_file_base, xml_file_base)
+
+
+def rewrite_with_element_tree(source_path, destination_path, rules) -> None:
+    """Applies connection rules by building the whole document tree with ElementTree, then writing it back out."""
+    tree = ElementTree.parse(source_path)
+    for element in tree.iter():
+        for rule in rules:
+            new_value = rule.get_new_value(element.tag, element.attrib)
+            if new_value is not None:
+                element.set(rule.attribute, new_value)
+    tree.write(destination_path, encoding='utf-8', xml_declaration=True)
+
+
+def measure_rewrite_connections(xml: str, conn_source, conn_target, temp_dir: str, params: dict, repeat: int) -> list:
+    source_path = os.path.join(temp_dir, 'connections.twb')
+    destination_path = os.path.join(temp_dir, 'connections_rewritten.twb')
+    with open(source_path, 'w', encoding='utf-8') as file:
+        file.write(xml)
+    rules = [ConnectionRule('server', get_server_netloc(conn_target.server), where={'class': 'sqlproxy'})]
+    return [measure(
+        SUITE,
+        name,
+        lambda: func(source_path, destination_path, rules),
+        params={**params, 'xml_bytes': len(xml)},
+        repeat=repeat,
+        trace_memory=True,
+        bytes_processed=len(xml),
+    ) for name, func in [('rewrite_connections', rewrite_connections),
+                         ('rewrite_with_element_tree', rewrite_with_element_tree)]]
+
+
+def measure_remap(xml: str, conn_source, conn_target, params: dict, repeat: int) -> list:
+    return [measure(
+        SUITE,
+        name,
+        lambda: func(xml, conn_source, conn_target),
+        params={**params, 'xml_bytes': len(xml)},
+        repeat=repeat,
+        bytes_processed=len(xml),
+    ) for name, func in [('remap_xml_references', remap_xml_references),
+                         ('remap_with_replace_passes', remap_with_replace_passes)]]
+
+
+def run(options) -> list:
+    """Measures remap_xml_references, against the str.replace passes it replaced, rewrite_connections, against
+    ElementTree, modify_tableau_zipfile on large workbook files, and modify_tableau_files with a growing number of
+    processes."""
+    conn_source = TableauServerConnection(SOURCE_CONFIG)
+    conn_target = TableauServerConnection(TARGET_CONFIG)
+    results = []
+    for num_datasources in options.xml_datasources:
+        xml = build_workbook_xml(conn_source.server, conn_source.site_url, num_datasources)
+        results.extend(measure_remap(xml, conn_source, conn_target, {'datasources': num_datasources}, options.repeat))
+    for embedded_mb in options.xml_embedded_sizes_mb:
+        xml = build_embedded_workbook_xml(conn_source.server, conn_source.site_url, 100, embedded_mb * MB)
+        params = {'datasources': 100, 'embedded_mb': embedded_mb}
+        results.extend(measure_remap(xml, conn_source, conn_target, params, options.repeat))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for embedded_mb in options.xml_embedded_sizes_mb:
+            xml = build_embedded_workbook_xml(conn_source.server, conn_source.site_url, 100, embedded_mb * MB)
+            params = {'datasources': 100, 'embedded_mb': embedded_mb}
+            results.extend(measure_rewrite_connections(xml, conn_source, conn_target, temp_dir, params, options.repeat))
+        extraction_dir = os.path.join(temp_dir, 'extracted')
+        destination_dir = os.path.join(temp_dir, 'target')
+        os.makedirs(destination_dir)
+        for extract_mb in options.twbx_extract_sizes_mb:
+            file_path = write_packaged_workbook(os.path.join(temp_dir, 'benchmark.twbx'), conn_source.server,
+                                                conn_source.site_url, max(options.xml_datasources), extract_mb * MB)
+
+            for name, func in [('modify_tableau_zipfile', modify_tableau_zipfile),
+                               ('modify_by_extracting', modify_by_extracting)]:
+                results.append(measure(
+                    SUITE,
+                    name,
+                    lambda: func(file_path, conn_source, conn_target, extraction_dir, destination_dir),
+                    params={'extract_mb': extract_mb, 'datasources': max(options.xml_datasources)},
+                    repeat=options.repeat,
+                    trace_memory=True,
+                    bytes_processed=os.path.getsize(file_path),
+                ))
+        file_paths = [write_packaged_workbook(os.path.join(temp_dir, f'modify_{index}.twbx'), conn_source.server,
+                                              conn_source.site_url, 1000, MB) for index in range(options.modify_files)]
+        for max_workers in options.modify_workers:
+            results.append(measure(
+                SUITE,
+                'modify_tableau_files',
+                lambda: modify_tableau_files(file_paths, conn_source, conn_target, destination_dir, max_workers=max_workers),
+                params={'files': len(file_paths), 'max_workers': max_workers, 'cpus': os.cpu_count()},
+                repeat=options.repeat,
+                bytes_processed=sum(os.path.getsize(file_path) for file_path in file_paths),
+            ))
+    return results
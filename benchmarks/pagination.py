@@ -0,0 +1,28 @@
+from tableau_api_lib import TableauServerConnection
+from tableau_api_lib.utils import extract_pages
+from tableau_api_lib.utils.synthetic_server import SyntheticSite, SyntheticTableauServer
+
+from benchmarks.common import measure
+
+SUITE = 'pagination'
+
+
+def run(options) -> list:
+    """Measures extract_pages throughput for a large site at several page sizes."""
+    site = SyntheticSite(num_users=options.objects, num_workbooks=options.objects, views_per_workbook=1)
+    results = []
+    with SyntheticTableauServer([site], latency=options.latency) as server:
+        conn = TableauServerConnection(server.get_config(), ssl_verify=False)
+        conn.sign_in()
+        for query_func in [conn.query_workbooks_for_site, conn.get_users_on_site]:
+            for page_size in options.page_sizes:
+                results.append(measure(
+                    SUITE,
+                    f'extract_pages[{query_func.__code__.co_name}]',
+                    lambda: extract_pages(query_func, page_size=page_size),
+                    params={'objects': options.objects, 'page_size': page_size, 'latency': options.latency},
+                    repeat=options.repeat,
+                    items_processed=options.objects,
+                ))
+        conn.sign_out()
+    return results
@@ -0,0 +1,76 @@
+import os
+import tempfile
+
+from tableau_api_lib import TableauServerConnection
+from tableau_api_lib.utils.publish_queue import PublishQueue
+from tableau_api_lib.utils.synthetic_server import SyntheticTableauServer
+
+from benchmarks.common import MB, measure, write_filler_file
+
+SUITE = 'publishing'
+QUEUE_FILE_SIZE = 10 * MB
+PATH_FILE_SIZE_LIMITS = {
+    'single': float('inf'),  # always publish in a single request
+    'chunked': 0,  # always upload in chunks through a file upload session
+}
+
+
+def run(options) -> list:
+    """Measures publish_workbook time and peak memory on the single-request and chunked paths, and the throughput
+    of publishing many workbooks through a PublishQueue."""
+    results = []
+    with SyntheticTableauServer(latency=options.latency) as server, tempfile.TemporaryDirectory() as temp_dir:
+        conn = TableauServerConnection(server.get_config(), ssl_verify=False)
+        conn.sign_in()
+        project_id = server.sites[0].projects[0]['id']
+        for size_mb in options.publish_sizes_mb:
+            file_path = write_filler_file(os.path.join(temp_dir, f'publish_{size_mb}mb.twbx'), size_mb * MB)
+            cases = [('chunked', chunk_size_mb) for chunk_size_mb in options.chunk_sizes_mb]
+            if size_mb <= options.max_single_mb:
+                cases.insert(0, ('single', None))
+            for path, chunk_size_mb in cases:
+                results.append(measure(
+                    SUITE,
+                    f'publish_workbook[{path}]',
+                    lambda: conn.publish_workbook(
+                        file_path,
+                        f'publish_{size_mb}mb',
+                        project_id,
+                        chunk_size=chunk_size_mb and chunk_size_mb * MB,
+                        file_size_limit=PATH_FILE_SIZE_LIMITS[path],
+                    ).raise_for_status(),
+                    params={'size_mb': size_mb, 'chunk_size_mb': chunk_size_mb, 'latency': options.latency},
+                    repeat=options.repeat,
+                    trace_memory=True,
+                    bytes_processed=size_mb * MB,
+                ))
+            os.remove(file_path)
+        results.extend(run_publish_queue(options, conn, project_id, temp_dir))
+        conn.sign_out()
+    return results
+
+
+def run_publish_queue(options, conn, project_id, temp_dir) -> list:
+    file_paths = [write_filler_file(os.path.join(temp_dir, f'queued_{i}.twbx'), QUEUE_FILE_SIZE)
+                  for i in range(options.queue_files)]
+
+    def publish_all(max_workers):
+        publish_queue = PublishQueue(conn, max_workers=max_workers)
+        for i, file_path in enumerate(file_paths):
+            publish_queue.add('workbook', file_path, f'queued_{i}', project_id)
+        failed = [task for task in publish_queue.run() if task.status != task.SUCCEEDED]
+        if failed:
+            raise RuntimeError(f'{len(failed)} queued publishes failed: {failed}')
+
+    results = [measure(
+        SUITE,
+        'publish_queue',
+        lambda: publish_all(max_workers),
+        params={'files': len(file_paths), 'max_workers': max_workers, 'latency': options.latency},
+        repeat=options.repeat,
+        bytes_processed=len(file_paths) * QUEUE_FILE_SIZE,
+        items_processed=len(file_paths),
+    ) for max_workers in options.queue_workers]
+    for file_path in file_paths:
+        os.remove(file_path)
+    return results
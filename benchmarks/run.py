@@ -0,0 +1,139 @@
+"""
+Runs the benchmark suites and writes their results as JSON.
+
+Usage:
+    python -m benchmarks.run [--output results.json] [--suites pagination publishing ...] [--quick] [--include-2gb]
+"""
+
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from importlib import metadata
+
+from benchmarks import cloning, dataframes, downloads, filemod, pagination, publishing
+
+SUITES = {
+    'pagination': pagination,
+    'dataframes': dataframes,
+    'publishing': publishing,
+    'downloads': downloads,
+    'filemod': filemod,
+    'cloning': cloning,
+}
+QUICK_OPTIONS = {
+    'objects': 2000,
+    'page_sizes': [100, 1000],
+    'rows': [1000],
+    'view_data_rows': [20000],
+    'publish_sizes_mb': [10, 70],
+    'chunk_sizes_mb': [5],
+    'queue_files': 8,
+    'queue_workers': [1, 4],
+    'download_sizes_mb': [10],
+    'bulk_download_files': 8,
+    'bulk_download_workers': [1, 4],
+    'view_export_views': 20,
+    'view_export_workers': [1, 4],
+    'xml_datasources': [100, 1000],
+    'xml_embedded_sizes_mb': [10],
+    'twbx_extract_sizes_mb': [10],
+    'modify_files': 8,
+    'modify_workers': [1, 2],
+    'clone_workbooks': 5,
+    'migration_workbooks': 20,
+    'migration_workers': [1, 4],
+    'repeat': 1,
+}
+
+
+def int_list(value: str) -> list:
+    return [int(item) for item in value.split(',') if item]
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Runs tableau-api-lib benchmarks against a synthetic server.')
+    parser.add_argument('--output', help='the path of the JSON results file; results are printed if omitted')
+    parser.add_argument('--suites', nargs='+', choices=list(SUITES), default=list(SUITES))
+    parser.add_argument('--quick', action='store_true', help='use small sizes suitable for a smoke test')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds of latency added to every response')
+    parser.add_argument('--objects', type=int, default=20000, help='workbooks and users on the paginated site')
+    parser.add_argument('--page-sizes', type=int_list, default=[100, 500, 1000])
+    parser.add_argument('--rows', type=int_list, default=[1000, 10000], help='DataFrame rows to flatten')
+    parser.add_argument('--view-data-rows', type=int_list, default=[200000], help='rows of view data read as CSV')
+    parser.add_argument('--publish-sizes-mb', type=int_list, default=[10, 59, 100, 500])
+    parser.add_argument('--include-2gb', action='store_true', help='also publish a 2 GB workbook')
+    parser.add_argument('--chunk-sizes-mb', type=int_list, default=[5, 32],
+                        help='chunk sizes used when publishing through file upload sessions')
+    parser.add_argument('--max-single-mb', type=int, default=500,
+                        help='the largest file also published through a single request')
+    parser.add_argument('--queue-files', type=int, default=32, help='10 MB files published through a PublishQueue')
+    parser.add_argument('--queue-workers', type=int_list, default=[1, 4, 8],
+                        help='concurrent publishes used when publishing through a PublishQueue')
+    parser.add_argument('--download-sizes-mb', type=int_list, default=[10, 100, 500])
+    parser.add_argument('--bulk-download-files', type=int, default=32,
+                        help='workbooks with 10 MB extracts downloaded through a BulkDownloader')
+    parser.add_argument('--bulk-download-workers', type=int_list, default=[1, 4, 8],
+                        help='concurrent downloads used when downloading through a BulkDownloader')
+    parser.add_argument('--view-export-views', type=int, default=200, help='view images exported by a ViewExporter')
+    parser.add_argument('--view-export-workers', type=int_list, default=[1, 4, 8],
+                        help='concurrent exports used when exporting through a ViewExporter')
+    parser.add_argument('--view-export-latency', type=float, default=0.05,
+                        help='seconds the synthetic server takes to answer each request while exporting views')
+    parser.add_argument('--xml-datasources', type=int_list, default=[100, 1000, 10000])
+    parser.add_argument('--xml-embedded-sizes-mb', type=int_list, default=[50, 200],
+                        help='custom SQL and thumbnails embedded in the workbook XML being remapped')
+    parser.add_argument('--twbx-extract-sizes-mb', type=int_list, default=[10, 200])
+    parser.add_argument('--modify-files', type=int, default=32,
+                        help='workbooks with 1000 datasources modified through modify_tableau_files')
+    parser.add_argument('--modify-workers', type=int_list, default=[1, 4, 8],
+                        help='processes used when modifying files through modify_tableau_files')
+    parser.add_argument('--clone-workbooks', type=int, default=25)
+    parser.add_argument('--clone-extract-mb', type=int, default=1)
+    parser.add_argument('--migration-workbooks', type=int, default=100,
+                        help='workbooks (and users) on the site migrated through a CloningEngine')
+    parser.add_argument('--migration-workers', type=int_list, default=[1, 4, 8],
+                        help='concurrent tasks used when migrating a site through a CloningEngine')
+    return parser
+
+
+def parse_options(args=None) -> argparse.Namespace:
+    options = get_parser().parse_args(args)
+    if options.quick:
+        for key, value in QUICK_OPTIONS.items():
+            setattr(options, key, value)
+    if options.include_2gb:
+        options.publish_sizes_mb = options.publish_sizes_mb + [2048]
+    return options
+
+
+def run(options: argparse.Namespace) -> dict:
+    results = []
+    for suite_name in options.suites:
+        print(f"running benchmark suite '{suite_name}'...", file=sys.stderr)
+        results.extend(SUITES[suite_name].run(options))
+    return {
+        'library_version': metadata.version('tableau_api_lib'),
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'options': {key: value for key, value in vars(options).items() if key != 'output'},
+        'results': results,
+    }
+
+
+def main(args=None) -> None:
+    options = parse_options(args)
+    report = run(options)
+    if options.output:
+        with open(options.output, 'w') as file:
+            json.dump(report, file, indent=2)
+        print(f"wrote {len(report['results'])} benchmark results to '{options.output}'", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -13,7 +13,7 @@ with open("README.md", "r") as fh:
 
 setuptools.setup(
     name="tableau_api_lib",
-    version="0.1.50",
+    version="0.1.75",
     author="Elliott Stam",
     author_email="elliott.stam@gmail.com",
     description="This library enables developers to call any method seen in Tableau Server's REST API documentation.",
@@ -33,6 +33,9 @@ setuptools.setup(
         'typeguard',
         'packaging'
     ],
+    extras_require={
+        'arrow': ['pyarrow'],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
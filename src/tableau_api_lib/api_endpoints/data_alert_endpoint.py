@@ -11,6 +11,7 @@ class DataAlertEndpoint(BaseEndpoint):
                  add_user=False, 
                  remove_user=False,
                  delete_data_alert=False,
+                 update_data_alert=False,
                  parameter_dict=None):
         """
         Data Alert endpoint for Tableau Server API api_requests.
@@ -22,6 +23,7 @@ class DataAlertEndpoint(BaseEndpoint):
         :param bool add_user: True if adding a user to the alert, False otherwise
         :param bool remove_user: True if removing a user from the alert; False otherwise
         :param bool delete_data_alert: True if deleting a data-driven alert; False otherwise
+        :param bool update_data_alert: True if updating a data-driven alert; False otherwise
         :param dict parameter_dict: dictionary of URL parameters to append; the value in each key-value pair is the
         literal text that will be appended to the URL endpoint
         """
@@ -34,6 +36,7 @@ class DataAlertEndpoint(BaseEndpoint):
         self._add_user = add_user
         self._remove_user = remove_user
         self._delete_data_alert = delete_data_alert
+        self._update_data_alert = update_data_alert
         self._parameter_dict = parameter_dict
         self._validate_inputs()
 
@@ -45,6 +48,7 @@ class DataAlertEndpoint(BaseEndpoint):
             self._add_user,
             self._remove_user,
             self._delete_data_alert,
+            self._update_data_alert,
         ]
 
     def _validate_inputs(self):
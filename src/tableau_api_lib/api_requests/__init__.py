@@ -1,4 +1,5 @@
 from .base_request import BaseRequest
+from .base_publish_request import BasePublishRequest
 from .add_datasource_permissions_request import AddDatasourcePermissionsRequest
 from .add_datasource_to_favorites_request import AddDatasourceToFavoritesRequest
 from .add_datasource_to_schedule_request import AddDatasourceToScheduleRequest
@@ -0,0 +1,211 @@
+import json
+from urllib3.fields import RequestField
+from urllib3.filepost import encode_multipart_formdata
+
+from tableau_api_lib.api_requests import BaseRequest
+from tableau_api_lib.exceptions import InvalidFileTypeException
+from tableau_api_lib.utils.multipart import StreamingMultipartBody
+from tableau_api_lib.utils.publish_manifest import (PublishManifest, build_unchanged_response, content_hash,
+                                                    publish_hash)
+from tableau_api_lib.utils.upload import CHUNK_SIZE, FILE_SIZE_LIMIT, ChunkedUploader, UploadJournal, UploadSource
+
+
+class BasePublishRequest(BaseRequest):
+    """
+    The base request for publishing workbooks, datasources, and flows; it uploads the published file.
+    Files are given as an UploadSource or a file path. Sources of a known size no larger than 'file_size_limit' are
+    streamed within the publish request; other sources are first uploaded in chunks through a file upload session.
+    :param class ts_connection: the Tableau Server connection object
+    :param file_source: the content being published, as an UploadSource, a file path, or a named binary file object
+    :param int chunk_size: (Optional) the number of bytes sent per request when the file is uploaded in chunks
+    :param int file_size_limit: (Optional) the largest file size (in bytes) that is published in a single request
+    :param upload_progress_callback: (Optional) a callable receiving the ChunkStats of each uploaded chunk
+    :param upload_journal: (Optional) an UploadJournal, or the path to its file, used to resume chunked uploads
+    :param publish_manifest: (Optional) a PublishManifest, or the path to its file, used to skip unchanged content
+    :param bool force_publish: (Optional) True to publish even if the manifest shows the content is unchanged
+    :param bool as_job: (Optional) True to publish asynchronously, as a job tracked through the 'asJob' parameter
+    """
+    content_variety = None
+
+    def __init__(self,
+                 ts_connection,
+                 file_source,
+                 chunk_size=None,
+                 file_size_limit=None,
+                 upload_progress_callback=None,
+                 upload_journal=None,
+                 publish_manifest=None,
+                 force_publish=False,
+                 as_job=False):
+
+        super().__init__(ts_connection)
+        self.upload_source = UploadSource.from_value(file_source)
+        self._chunk_size = chunk_size or CHUNK_SIZE
+        self._file_size_limit = FILE_SIZE_LIMIT if file_size_limit is None else file_size_limit
+        self._upload_progress_callback = upload_progress_callback
+        self.upload_journal = UploadJournal.from_value(upload_journal)
+        self.publish_manifest = PublishManifest.from_value(publish_manifest)
+        self._force_publish = force_publish
+        self._as_job = as_job
+        self.content_hash = None
+        self.upload_stats = []
+        self.resumed_offset = 0
+        self._file_is_chunked = self._file_requires_chunking()
+
+    @property
+    def valid_file_extensions(self):
+        raise NotImplementedError
+
+    def modified_publish_request(self):
+        """Returns the JSON request payload describing the content being published."""
+        raise NotImplementedError
+
+    def _file_requires_chunking(self):
+        return self.upload_source.requires_chunking(self._file_size_limit)
+
+    def get_file_name(self):
+        file_extension = self.upload_source.file_extension
+        if file_extension not in self.valid_file_extensions:
+            raise InvalidFileTypeException(self.__class__.__name__,
+                                           file_variety=self.content_variety,
+                                           file_extension=file_extension)
+        return self.upload_source.file_name
+
+    def get_file(self):
+        file_name = self.get_file_name()
+        with self.upload_source.open() as reader:
+            file_bytes = reader.read()
+        return file_name, file_bytes
+
+    def get_file_part(self):
+        """Returns the file name and a part that streams the file's content into the publish request."""
+        return self.get_file_name(), self.upload_source
+
+    def publish_prep(self, publish_content_type, parameter_dict):
+        parameter_dict = parameter_dict if parameter_dict else {'overwrite': 'overwrite=true'}
+        if self._as_job:
+            parameter_dict.update({'asJob': 'asJob=true'})
+        if self._file_is_chunked:
+            uploader = ChunkedUploader(self._connection,
+                                       chunk_size=self._chunk_size,
+                                       progress_callback=self._upload_progress_callback,
+                                       journal=self.upload_journal,
+                                       journal_key=self._upload_journal_key())
+            upload_session_id = uploader.upload(self.upload_source)
+            self.upload_stats = uploader.chunk_stats
+            self.resumed_offset = uploader.resumed_offset
+            parameter_dict.update({'param': 'uploadSessionId={}'.format(upload_session_id)})
+
+        publishing_headers = self._connection.default_headers.copy()
+        publishing_headers.update({'content-type': publish_content_type})
+        file_type_param = '{}Type'.format(self.content_variety)
+        parameter_dict.update({file_type_param: '{}={}'.format(file_type_param, self.upload_source.file_extension)})
+        return publishing_headers, parameter_dict
+
+    def get_unchanged_response(self, parameter_dict=None):
+        """
+        Returns a locally built response if the publish manifest shows the same content was last published with the
+        same options to the same site, project, and name; returns None if the content needs to be published.
+        :param dict parameter_dict: (Optional) the query parameters the content is published with
+        :return: HTTP response, or None
+        """
+        if self.publish_manifest is None:
+            return None
+        self.content_hash = publish_hash(content_hash(self.upload_source),
+                                         self.modified_publish_request(),
+                                         parameter_dict)
+        key = self._publish_manifest_key()
+        if self._force_publish or not self.publish_manifest.is_unchanged(key, self.content_hash):
+            return None
+        return build_unchanged_response(self.content_variety, self.publish_manifest.get(key))
+
+    def complete_publish(self, response):
+        """
+        Updates the upload journal and publish manifest once Tableau Server has answered the publish request.
+        Server errors keep the upload journal entry, so that the upload session can be committed again without
+        re-uploading the file.
+        :param class response: the HTTP response to the publish request
+        :return: the HTTP response
+        """
+        if self.upload_journal is not None and self._file_is_chunked and response.status_code < 500:
+            self.upload_journal.discard(self._upload_journal_key())
+        if self.publish_manifest is not None and self.content_hash and response.status_code in [200, 201]:
+            self.publish_manifest.record(self._publish_manifest_key(),
+                                         self.content_hash,
+                                         response.json().get(self.content_variety, {}))
+        return response
+
+    def complete_publish_job(self, job_handle):
+        """
+        Records the publish in the publish manifest once the publish job started by an 'as_job' request succeeds.
+        :param class job_handle: the JobHandle tracking the publish job
+        :return: the JobHandle
+        """
+        if self.publish_manifest is not None and self.content_hash and job_handle.job_id is not None:
+            job_handle.add_done_callback(self._record_publish_job)
+        return job_handle
+
+    def _record_publish_job(self, job_handle):
+        if job_handle.succeeded:
+            self.publish_manifest.record(self._publish_manifest_key(),
+                                         self.content_hash,
+                                         job_handle.job.get(self.content_variety, {}))
+
+    def _get_target_key_parts(self):
+        content = self._request_body.get(self.content_variety, {})
+        return (self._connection.server,
+                self._connection.site_id,
+                self.content_variety,
+                content.get('project', {}).get('id'),
+                content.get('name'))
+
+    def _upload_journal_key(self):
+        return UploadJournal.make_key(*self._get_target_key_parts(),
+                                      self.upload_source.file_path or self.upload_source.file_name)
+
+    def _publish_manifest_key(self):
+        return PublishManifest.make_key(*self._get_target_key_parts())
+
+    def read_chunks(self, file_path=None):
+        source = UploadSource.from_value(file_path) if file_path else self.upload_source
+        with source.open() as reader:
+            while True:
+                chunked_content = reader.read(self._chunk_size)
+                if not chunked_content:
+                    break
+                yield chunked_content
+
+    def chunk_req(self, chunk):
+        parts = {'request_payload': (None, '', 'application/json'),
+                 'tableau_file': ('file', chunk, 'application/octet-stream')}
+        return self._add_multipart(parts)
+
+    @staticmethod
+    def _add_multipart(parts):
+        mime_multipart_parts = list()
+        for name, (filename, data, content_type) in parts.items():
+            multipart_part = RequestField(name=name, data=data, filename=filename)
+            multipart_part.make_multipart(content_type=content_type)
+            mime_multipart_parts.append(multipart_part)
+        request, content_type = encode_multipart_formdata(mime_multipart_parts)
+        content_type = ''.join(('multipart/mixed',) + content_type.partition(';')[1:])
+        return request, content_type
+
+    def _publish_chunked_file_request(self):
+        request = self.modified_publish_request()
+        parts = {'request_payload': (None, json.dumps(request), 'application/json')}
+        return self._add_multipart(parts)
+
+    def _publish_single_file_request(self):
+        request = self.modified_publish_request()
+        file_name, file_part = self.get_file_part()
+        parts = {'request_payload': (None, json.dumps(request), 'application/json'),
+                 'tableau_{}'.format(self.content_variety): (file_name, file_part, 'application/octet-stream')}
+        request_body = StreamingMultipartBody(parts)
+        return request_body, request_body.content_type
+
+    def get_request(self):
+        if self._file_is_chunked:
+            return self._publish_chunked_file_request()
+        else:
+            return self._publish_single_file_request()
@@ -1,16 +1,7 @@
-import os
-import json
-from urllib3.fields import RequestField
-from urllib3.filepost import encode_multipart_formdata
+from tableau_api_lib.api_requests import BasePublishRequest
 
-from tableau_api_lib.api_requests import BaseRequest
 
-
-CHUNK_SIZE = 1024 * 1024 * 5  # 5MB
-FILE_SIZE_LIMIT = 1024 * 1024 * 60  # 60MB
-
-
-class PublishFlowRequest(BaseRequest):
+class PublishFlowRequest(BasePublishRequest):
     """
     Builds the request body for Tableau Server REST API requests publishing flows.
     :param class ts_connection: the Tableau Server connection object
@@ -25,6 +16,8 @@ class PublishFlowRequest(BaseRequest):
     :param list embed_credentials_flag: (Optional) list of boolean values; True if embedding credentials, False if not
     :param list oauth_flag: (Optional) list of boolean values; True if using OAuth, False if not
     """
+    content_variety = 'flow'
+
     def __init__(self,
                  ts_connection,
                  flow_name,
@@ -36,9 +29,22 @@ class PublishFlowRequest(BaseRequest):
                  connection_username=None,
                  connection_password=None,
                  embed_credentials_flag=False,
-                 oauth_flag=False
+                 oauth_flag=False,
+                 chunk_size=None,
+                 file_size_limit=None,
+                 upload_progress_callback=None,
+                 upload_journal=None,
+                 publish_manifest=None,
+                 force_publish=False
                  ):
-        super().__init__(ts_connection)
+        super().__init__(ts_connection,
+                         file_source=flow_file_path,
+                         chunk_size=chunk_size,
+                         file_size_limit=file_size_limit,
+                         upload_progress_callback=upload_progress_callback,
+                         upload_journal=upload_journal,
+                         publish_manifest=publish_manifest,
+                         force_publish=force_publish)
         self._flow_name = flow_name
         self._flow_file_path = flow_file_path
         self._project_id = project_id
@@ -50,7 +56,6 @@ class PublishFlowRequest(BaseRequest):
         self._embed_credentials_flag = embed_credentials_flag
         self._oauth_flag = oauth_flag
         self._listify_inputs()
-        self._file_is_chunked = self._file_requires_chunking()
         self.base_publish_flow_request()
 
     def _listify_inputs(self):
@@ -152,82 +157,12 @@ class PublishFlowRequest(BaseRequest):
 
         return self._request_body
 
-    def _file_requires_chunking(self):
-        file_size = os.path.getsize(self._flow_file_path)
-        if file_size > FILE_SIZE_LIMIT:
-            return True
+    def modified_publish_request(self):
+        return self.modified_publish_flow_request()
 
     def get_flow(self):
-        flow_file = os.path.basename(self._flow_file_path)
-        with open(self._flow_file_path, 'rb') as f:
-            flow_bytes = f.read()
-        file_extension = flow_file.split('.')[-1]
-        if file_extension in self.valid_file_extensions:
-            pass
-        else:
-            raise Exception('Invalid flow type provided. flow must be a .tfl or .tflx file.')
-        return flow_file, flow_bytes
-
-    # testing for chunk upload
-    def publish_prep(self, publish_content_type, parameter_dict):
-        parameter_dict = parameter_dict if parameter_dict else {'overwrite': 'overwrite=true'}
-        filename = os.path.basename(self._flow_file_path)
-        file_extension = filename.split('.')[-1]
-
-        if self._file_is_chunked:
-            upload_session_id = self._connection.initiate_file_upload().json()['fileUpload']['uploadSessionId']
-            parameter_dict.update({'param': 'uploadSessionId={}'.format(upload_session_id)})
-            chunks = self.read_chunks(self._flow_file_path)
-            for chunk in chunks:
-                request, append_content_type = self.chunk_req(chunk)
-                file_upload = self._connection.append_to_file_upload(upload_session_id=upload_session_id,
-                                                                     payload=request,
-                                                                     content_type=append_content_type)
-
-        publishing_headers = self._connection.default_headers.copy()
-        publishing_headers.update({'content-type': publish_content_type})
-        parameter_dict.update({'flowType': 'flowType={}'.format(file_extension)})
-        return publishing_headers, parameter_dict
-
-    @staticmethod
-    def read_chunks(file_path):
-        with open(file_path, 'rb') as f:
-            while True:
-                chunked_content = f.read(CHUNK_SIZE)
-                if not chunked_content:
-                    break
-                yield chunked_content
-
-    def chunk_req(self, chunk):
-        parts = {'request_payload': (None, '', 'application/json'),
-                 'tableau_file': ('file', chunk, 'application/octet-stream')}
-        return self._add_multipart(parts)
-
-    @staticmethod
-    def _add_multipart(parts):
-        mime_multipart_parts = list()
-        for name, (filename, data, content_type) in parts.items():
-            multipart_part = RequestField(name=name, data=data, filename=filename)
-            multipart_part.make_multipart(content_type=content_type)
-            mime_multipart_parts.append(multipart_part)
-        request, content_type = encode_multipart_formdata(mime_multipart_parts)
-        content_type = ''.join(('multipart/mixed',) + content_type.partition(';')[1:])
-        return request, content_type
-
-    def _publish_chunked_file_request(self):
-        request = self.modified_publish_flow_request()
-        parts = {'request_payload': (None, json.dumps(request), 'application/json')}
-        return self._add_multipart(parts)
-
-    def _publish_single_file_request(self):
-        request = self.modified_publish_flow_request()
-        flow_file, flow_bytes = self.get_flow()
-        parts = {'request_payload': (None, json.dumps(request), 'application/json'),
-                 'tableau_flow': (flow_file, flow_bytes, 'application/octet-stream')}
-        return self._add_multipart(parts)
-
-    def get_request(self):
-        if self._file_is_chunked:
-            return self._publish_chunked_file_request()
-        else:
-            return self._publish_single_file_request()
+        return self.get_file()
+
+    def get_flow_part(self):
+        """Returns the flow file name and a part that streams its content into the publish request."""
+        return self.get_file_part()
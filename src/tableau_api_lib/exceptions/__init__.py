@@ -1,3 +1,4 @@
-from .custom_exceptions import InvalidParameterException, InvalidFileTypeException
+from .custom_exceptions import InvalidParameterException, InvalidFileTypeException, CassetteInteractionNotFound, \
+    JobWaitTimeout
 from .tableau_server_exceptions import InvalidRestApiVersion, InvalidTableauServerQuery, ContentOverwriteDisabled, \
-    ContentNotFound, PaginationError, UsersNotFound
+    ContentNotFound, PaginationError, UsersNotFound, FileUploadFailed
@@ -24,4 +24,31 @@ class InvalidFileTypeException(Exception):
             The provided file extension '{2}' is not a valid Tableau {1} file extension.
             Tableau {2} file extensions must be 'tds' or 'tdsx'.
             """.format(class_name, file_variety, file_extension)
+        elif file_variety.lower() == 'flow':
+            error_message = """
+            An error occurred while calling {0}
+            The provided file extension '{2}' is not a valid Tableau {1} file extension.
+            Tableau {1} file extensions must be 'tfl' or 'tflx'.
+            """.format(class_name, file_variety, file_extension)
+        super().__init__(error_message)
+
+
+class CassetteInteractionNotFound(Exception):
+    """Raised when a request being replayed from a cassette has no matching recorded interaction"""
+    def __init__(self, cassette_path, method, url):
+        error_message = """
+        No unused interaction for {0} {1} was found in the cassette '{2}'.
+        Re-record the cassette against a live Tableau Server if the requests sent by the code under test have changed.
+        """.format(method, url, cassette_path)
+        super().__init__(error_message)
+
+
+class JobWaitTimeout(Exception):
+    """Raised when Tableau Server jobs being waited on do not complete before the timeout"""
+    def __init__(self, job_ids, timeout):
+        self.job_ids = job_ids
+        self.timeout = timeout
+        error_message = """
+        {0} job(s) did not complete within {1} seconds: {2}
+        """.format(len(job_ids), timeout, job_ids)
         super().__init__(error_message)
@@ -84,3 +84,15 @@ class PaginationError(Exception):
         Not all Tableau Server REST API methods support pagination. 
         """.format(func.__name__)
         super().__init__(error_message)
+
+
+class FileUploadFailed(Exception):
+    """Raise an exception when Tableau Server rejects a request that creates or appends to a file upload session."""
+    def __init__(self, upload_session_id, offset, response):
+        self.upload_session_id = upload_session_id
+        self.offset = offset
+        self.response = response
+        error_message = """
+        The file upload session '{}' failed at byte offset {} with status code {}: {}
+        """.format(upload_session_id, offset, response.status_code, response.text)
+        super().__init__(error_message)
@@ -1,9 +1,16 @@
-from typing import Any, Dict, List, Optional, Union
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Union
 from urllib import parse
 
 import requests
 
 from tableau_api_lib import api_endpoints, api_requests, decorators
+from tableau_api_lib.utils import download, download_cache as cache, metrics
+from tableau_api_lib.utils.jobs import JobHandle
+from tableau_api_lib.utils.publish_manifest import PublishManifest
+from tableau_api_lib.utils.download import DOWNLOAD_CHUNK_SIZE, DownloadResult
+from tableau_api_lib.utils.download_cache import DownloadCache
+from tableau_api_lib.utils.upload import UploadJournal, UploadSource
 
 
 class TableauServerConnection:
@@ -13,6 +20,7 @@ class TableauServerConnection:
         env: str = "tableau_prod",
         ssl_verify: bool = True,
         use_apparent_encoding: bool = False,
+        session: Optional[requests.Session] = None,
     ):
         """Initializes a connection to Tableau Server using the environment configuration details provided.
 
@@ -21,6 +29,7 @@ class TableauServerConnection:
             env: (optional) The environment within the `config_json` object that will be used.
             ssl_verify: (optional) True if using and verifying SSL certificates for HTTP requests; set to False if using HTTP.
             use_apparent_encoding: (optional) When this value is True then responses from the Server are encoded using the apparent format.
+            session: (optional) The `requests.Session` used to send HTTP requests; a new session is created by default.
         """
         self._env = env
         self._config = config_json
@@ -34,9 +43,23 @@ class TableauServerConnection:
         self.active_endpoint = None
         self.active_request = None
         self.active_headers = None
+        self.session = self._build_session(session)
         self._validate_env()
         self.auth_method = self._get_auth_method()
 
+    @staticmethod
+    def _build_session(session: Optional[requests.Session] = None) -> requests.Session:
+        """Returns the HTTP session shared by all requests the connection sends.
+
+        Reusing a session keeps connections to Tableau Server alive between calls. Cookies are rejected because the
+        'X-Tableau-Auth' header is what authenticates each request, which keeps every call independent of the last.
+        """
+        session = session or requests.Session()
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        if metrics.record_response not in session.hooks["response"]:
+            session.hooks["response"].append(metrics.record_response)
+        return session
+
     def _validate_env(self) -> None:
         """Raises an exception if the specified environment, "env", is not described in the configuration provided."""
         try:
@@ -159,6 +182,83 @@ class TableauServerConnection:
             response.encoding = response.apparent_encoding
         return response
 
+    def _download_to_file(
+        self,
+        destination: Union[str, BinaryIO],
+        content_variety: str,
+        file_stem: Optional[str],
+        chunk_size: int,
+        progress_callback: Optional[Callable],
+        download_cache: Union[DownloadCache, str, None] = None,
+        content_id: Optional[str] = None,
+    ) -> DownloadResult:
+        """Streams the content at the active endpoint to a file; see `utils.download.save_response`.
+
+        With a download cache, current cached content is copied to the file instead, and content downloaded to a path
+        is added to the cache.
+        """
+        download_cache = DownloadCache.from_value(download_cache)
+        version = None
+        if download_cache is not None:
+            version = cache.get_content_version(self, content_variety, content_id)
+            entry, file = download_cache.open(self.active_endpoint, version)
+            if entry is not None:
+                with file:
+                    response = cache.build_cached_response(self.active_endpoint, entry, file)
+                    return download.save_response(
+                        response, destination, content_variety, file_stem, chunk_size, progress_callback
+                    )
+        self.active_headers = self.default_headers
+        with self.session.get(
+            url=self.active_endpoint,
+            headers=self.active_headers,
+            verify=self.ssl_verify,
+            stream=True,
+        ) as response:
+            result = download.save_response(
+                response,
+                destination,
+                content_variety,
+                file_stem=file_stem,
+                chunk_size=chunk_size,
+                progress_callback=progress_callback,
+            )
+        if download_cache is not None:
+            result.response.headers[cache.CACHE_HEADER] = "miss"
+            if result.ok and result.file_path and not hasattr(destination, "write"):
+                download_cache.store(self.active_endpoint, version, result.file_path, result.response.headers)
+        return result
+
+    def _download_with_cache(
+        self, content_variety: str, content_id: str, download_cache: Union[DownloadCache, str]
+    ) -> requests.Response:
+        """Downloads the content at the active endpoint, serving it from the download cache if it is current there."""
+        download_cache = DownloadCache.from_value(download_cache)
+        version = cache.get_content_version(self, content_variety, content_id)
+        response = download_cache.get_response(self.active_endpoint, version)
+        if response is None:
+            self.active_headers = self.default_headers
+            response = self.session.get(
+                url=self.active_endpoint,
+                headers=self.active_headers,
+                verify=self.ssl_verify,
+            )
+            download_cache.store_response(self.active_endpoint, version, response)
+            response.headers[cache.CACHE_HEADER] = "miss"
+        response = self._set_response_encoding(response=response)
+        return response
+
+    @staticmethod
+    def _set_include_extract_parameter(
+        parameter_dict: Optional[Dict[str, Any]], include_extract: bool
+    ) -> Optional[Dict[str, Any]]:
+        """Returns the URL parameters, adding 'includeExtract=False' if the extract is not to be downloaded."""
+        if include_extract:
+            return parameter_dict
+        parameter_dict = dict(parameter_dict or {})
+        parameter_dict.update({"includeExtract": "includeExtract=False"})
+        return parameter_dict
+
     @staticmethod
     def _set_local_vars(local_vars: Dict[str, Any]) -> Dict[str, Any]:
         """Returns a dict containing all local vars except for the `self` representing the class instance."""
@@ -173,7 +273,7 @@ class TableauServerConnection:
     def revoke_administrator_personal_access_tokens(self):
         """Revokes all personal access tokens belonging to administrators on the Tableau Server."""
         self.active_endpoint = api_endpoints.AuthEndpoint(ts_connection=self, revoke_admin_pat=True).get_endpoint()
-        response = requests.delete(url=self.active_endpoint, headers=self.default_headers, verify=self.ssl_verify)
+        response = self.session.delete(url=self.active_endpoint, headers=self.default_headers, verify=self.ssl_verify)
         response = self._set_response_encoding(response=response)
         return response
 
@@ -198,7 +298,7 @@ class TableauServerConnection:
             user_to_impersonate=user_to_impersonate,
         ).get_request()
         self.active_endpoint = api_endpoints.AuthEndpoint(ts_connection=self, sign_in=True).get_endpoint()
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.sign_in_headers,
@@ -216,7 +316,7 @@ class TableauServerConnection:
     def sign_out(self) -> requests.Response:
         """Signs out from Tableau Server and invalidates the connection's active auth token."""
         endpoint = api_endpoints.AuthEndpoint(ts_connection=self, sign_out=True).get_endpoint()
-        response = requests.post(url=endpoint, headers=self.x_auth_header, verify=self.ssl_verify)
+        response = self.session.post(url=endpoint, headers=self.x_auth_header, verify=self.ssl_verify)
         if response.status_code == 204:
             response = self._set_response_encoding(response=response)
             self.auth_token = None
@@ -236,7 +336,7 @@ class TableauServerConnection:
         self.active_request = api_requests.SwitchSiteRequest(ts_connection=self, site_name=content_url).get_request()
         self.active_endpoint = api_endpoints.AuthEndpoint(ts_connection=self, switch_site=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -257,7 +357,7 @@ class TableauServerConnection:
         """Returns information about the active Tableau Server connection."""
         self.active_endpoint = api_endpoints.AuthEndpoint(ts_connection=self, get_server_info=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(url=self.active_endpoint, headers=self.active_headers, verify=self.ssl_verify)
+        response = self.session.get(url=self.active_endpoint, headers=self.active_headers, verify=self.ssl_verify)
         response = self._set_response_encoding(response=response)
         return response
 
@@ -327,7 +427,7 @@ class TableauServerConnection:
         self.active_request = api_requests.CreateSiteRequest(ts_connection=self, **local_vars).get_request()
         self.active_endpoint = api_endpoints.SiteEndpoint(ts_connection=self, create_site=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -357,7 +457,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(url=self.active_endpoint, headers=self.active_headers, verify=self.ssl_verify)
+        response = self.session.get(url=self.active_endpoint, headers=self.active_headers, verify=self.ssl_verify)
         response = self._set_response_encoding(response=response)
         return response
 
@@ -375,7 +475,7 @@ class TableauServerConnection:
             ts_connection=self, query_sites=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(url=self.active_endpoint, headers=self.active_headers, verify=self.ssl_verify)
+        response = self.session.get(url=self.active_endpoint, headers=self.active_headers, verify=self.ssl_verify)
         response = self._set_response_encoding(response=response)
         return response
 
@@ -386,7 +486,7 @@ class TableauServerConnection:
             ts_connection=self, site_id=self.site_id, get_recently_viewed=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(url=self.active_endpoint, headers=self.active_headers, verify=self.ssl_verify)
+        response = self.session.get(url=self.active_endpoint, headers=self.active_headers, verify=self.ssl_verify)
         response = self._set_response_encoding(response=response)
         return response
 
@@ -408,7 +508,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(url=self.active_endpoint, headers=self.active_headers, verify=self.ssl_verify)
+        response = self.session.get(url=self.active_endpoint, headers=self.active_headers, verify=self.ssl_verify)
         response = self._set_response_encoding(response=response)
         return response
 
@@ -478,7 +578,7 @@ class TableauServerConnection:
             ts_connection=self, site_id=site_id, update_site=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -510,7 +610,7 @@ class TableauServerConnection:
             content_url=content_url,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -534,7 +634,7 @@ class TableauServerConnection:
             ts_connection=self, data_alert_id=data_alert_id, delete_data_alert=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -556,7 +656,7 @@ class TableauServerConnection:
             ts_connection=self, query_data_alert=True, data_alert_id=data_alert_id
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -575,7 +675,7 @@ class TableauServerConnection:
             ts_connection=self, query_data_alerts=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -602,7 +702,7 @@ class TableauServerConnection:
             data_alert_id=data_alert_id,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -629,7 +729,7 @@ class TableauServerConnection:
             data_alert_id=data_alert_id,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -662,10 +762,10 @@ class TableauServerConnection:
             is_public_flag=is_public_flag,
         ).get_request()
         self.active_endpoint = api_endpoints.DataAlertEndpoint(
-            ts_connection=self, data_alert_id=data_alert_id
+            ts_connection=self, data_alert_id=data_alert_id, update_data_alert=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -683,7 +783,7 @@ class TableauServerConnection:
             ts_connection=self, flow_id=flow_id, query_flow=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -698,7 +798,7 @@ class TableauServerConnection:
             ts_connection=self, flow_id=flow_id, delete_flow=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -713,7 +813,7 @@ class TableauServerConnection:
             ts_connection=self, flow_id=flow_id, download_flow=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -721,6 +821,29 @@ class TableauServerConnection:
         response = self._set_response_encoding(response=response)
         return response
 
+    @decorators.verify_api_method_exists("3.3")
+    def download_flow_to_file(
+        self,
+        flow_id: str,
+        destination: Union[str, BinaryIO],
+        file_stem: Optional[str] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress_callback: Optional[Callable[[int, Optional[int]], Any]] = None,
+    ) -> DownloadResult:
+        """Streams the specified flow to a file.
+
+        The content is written to `destination` (a file path, a directory, or a binary file object) in chunks of
+        `chunk_size` bytes, so memory use stays flat regardless of the file size. Paths are written through a
+        temporary file renamed into place once the download completes; files written to a directory are named
+        `file_stem` (or the file name reported by Tableau Server) with the extension matching the content.
+        `progress_callback` receives the bytes written so far and the total bytes (None if unknown) after each chunk.
+        The result reports the file path, size, SHA-256 checksum, and duration; check `result.ok` before using it.
+        """
+        self.active_endpoint = api_endpoints.FlowEndpoint(
+            ts_connection=self, flow_id=flow_id, download_flow=True
+        ).get_endpoint()
+        return self._download_to_file(destination, "flow", file_stem, chunk_size, progress_callback)
+
     @decorators.verify_api_method_exists("3.3")
     def query_flow_connections(self, flow_id: str) -> requests.Response:
         """Queries the connection details for the specified flow."""
@@ -728,7 +851,7 @@ class TableauServerConnection:
             ts_connection=self, flow_id=flow_id, query_flow_connections=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -743,7 +866,7 @@ class TableauServerConnection:
             ts_connection=self, query_flows_for_site=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -761,7 +884,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -781,7 +904,7 @@ class TableauServerConnection:
             ts_connection=self, flow_id=flow_id, update_flow=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -817,7 +940,7 @@ class TableauServerConnection:
             update_flow_connection=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -849,7 +972,7 @@ class TableauServerConnection:
             ts_connection=self, create_project=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -865,7 +988,7 @@ class TableauServerConnection:
             ts_connection=self, query_projects=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -894,7 +1017,7 @@ class TableauServerConnection:
             ts_connection=self, update_project=True, project_id=project_id
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -910,7 +1033,7 @@ class TableauServerConnection:
             ts_connection=self, project_id=project_id, delete_project=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -928,7 +1051,7 @@ class TableauServerConnection:
             ts_connection=self, view_id=view_id, add_tags=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -945,7 +1068,7 @@ class TableauServerConnection:
             ts_connection=self, workbook_id=workbook_id, add_tags=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -966,7 +1089,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -975,8 +1098,14 @@ class TableauServerConnection:
         return response
 
     @decorators.verify_api_method_exists("2.8")
-    def query_view_data(self, view_id: str, parameter_dict: Optional[Dict[str, Any]] = None) -> requests.Response:
-        """Queries the underlying data within the specified view."""
+    def query_view_data(
+        self, view_id: str, parameter_dict: Optional[Dict[str, Any]] = None, stream: bool = False
+    ) -> requests.Response:
+        """Queries the underlying data within the specified view.
+
+        With `stream` set to True, the response body is not read until it is consumed (for example through
+        `response.iter_content` or `response.raw`), and the response must be closed once it has been read.
+        """
         self.active_endpoint = api_endpoints.ViewEndpoint(
             ts_connection=self,
             view_id=view_id,
@@ -984,14 +1113,36 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
+            stream=stream,
         )
+        if stream:
+            return response
         response = self._set_response_encoding(response=response)
         return response
 
+    @decorators.verify_api_method_exists("2.8")
+    def query_view_data_to_file(
+        self,
+        view_id: str,
+        destination: Union[str, BinaryIO],
+        parameter_dict: Optional[Dict[str, Any]] = None,
+        file_stem: Optional[str] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress_callback: Optional[Callable[[int, Optional[int]], Any]] = None,
+    ) -> DownloadResult:
+        """Streams the underlying data (as CSV) of the specified view to a file; see `download_workbook_to_file` for the arguments."""
+        self.active_endpoint = api_endpoints.ViewEndpoint(
+            ts_connection=self,
+            view_id=view_id,
+            query_view_data=True,
+            parameter_dict=parameter_dict,
+        ).get_endpoint()
+        return self._download_to_file(destination, "view_data", file_stem, chunk_size, progress_callback)
+
     @decorators.verify_api_method_exists("2.5")
     def query_view_image(self, view_id: str, parameter_dict: Optional[Dict[str, Any]] = None) -> requests.Response:
         """Downloads a PNG of the specified view."""
@@ -1002,7 +1153,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1010,6 +1161,25 @@ class TableauServerConnection:
         response = self._set_response_encoding(response=response)
         return response
 
+    @decorators.verify_api_method_exists("2.5")
+    def query_view_image_to_file(
+        self,
+        view_id: str,
+        destination: Union[str, BinaryIO],
+        parameter_dict: Optional[Dict[str, Any]] = None,
+        file_stem: Optional[str] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress_callback: Optional[Callable[[int, Optional[int]], Any]] = None,
+    ) -> DownloadResult:
+        """Streams a PNG of the specified view to a file; see `download_workbook_to_file` for the arguments."""
+        self.active_endpoint = api_endpoints.ViewEndpoint(
+            ts_connection=self,
+            view_id=view_id,
+            query_view_image=True,
+            parameter_dict=parameter_dict,
+        ).get_endpoint()
+        return self._download_to_file(destination, "view_image", file_stem, chunk_size, progress_callback)
+
     @decorators.verify_api_method_exists("2.8")
     def query_view_pdf(self, view_id: str, parameter_dict: Optional[Dict[str, Any]] = None) -> requests.Response:
         """Downloads a PDF of the specified view."""
@@ -1020,7 +1190,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1028,6 +1198,25 @@ class TableauServerConnection:
         response = self._set_response_encoding(response=response)
         return response
 
+    @decorators.verify_api_method_exists("2.8")
+    def query_view_pdf_to_file(
+        self,
+        view_id: str,
+        destination: Union[str, BinaryIO],
+        parameter_dict: Optional[Dict[str, Any]] = None,
+        file_stem: Optional[str] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress_callback: Optional[Callable[[int, Optional[int]], Any]] = None,
+    ) -> DownloadResult:
+        """Streams a PDF of the specified view to a file; see `download_workbook_to_file` for the arguments."""
+        self.active_endpoint = api_endpoints.ViewEndpoint(
+            ts_connection=self,
+            view_id=view_id,
+            query_view_pdf=True,
+            parameter_dict=parameter_dict,
+        ).get_endpoint()
+        return self._download_to_file(destination, "view_pdf", file_stem, chunk_size, progress_callback)
+
     @decorators.verify_api_method_exists("2.3")
     def query_view_preview_image(
         self, workbook_id: str, view_id: str, parameter_dict: Optional[Dict[str, Any]] = None
@@ -1041,7 +1230,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1056,7 +1245,7 @@ class TableauServerConnection:
             ts_connection=self, view_id=view_id, query_view=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1073,7 +1262,7 @@ class TableauServerConnection:
             parameter_dict={"filter": f'filter=viewUrlName:eq:{view_name.replace(" ", "")}'},
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1090,7 +1279,7 @@ class TableauServerConnection:
             parameter_dict={"type": "type=view"},
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1104,7 +1293,7 @@ class TableauServerConnection:
             ts_connection=self, view_id=view_id, query_view=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1122,7 +1311,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1142,7 +1331,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1162,7 +1351,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1179,7 +1368,7 @@ class TableauServerConnection:
             downgrade_target_version=downgrade_target_version,
             get_workbook_downgrade_info=True,
         ).get_endpoint()
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1197,7 +1386,7 @@ class TableauServerConnection:
             remove_workbook_revision=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1217,7 +1406,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1232,7 +1421,7 @@ class TableauServerConnection:
             ts_connection=self, query_workbooks=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1252,7 +1441,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1261,16 +1450,30 @@ class TableauServerConnection:
         return response
 
     @decorators.verify_api_method_exists("2.3")
-    def download_workbook(self, workbook_id: str, parameter_dict: Optional[Dict[str, Any]] = None) -> requests.Response:
-        """Downloads the specified workbook."""
+    def download_workbook(
+        self,
+        workbook_id: str,
+        parameter_dict: Optional[Dict[str, Any]] = None,
+        download_cache: Union[DownloadCache, str, None] = None,
+    ) -> requests.Response:
+        """Downloads the specified workbook.
+
+        Args:
+            workbook_id: The ID (luid) for the workbook being downloaded.
+            parameter_dict: (optional) A Python dict whose values define additional URL parameters.
+            download_cache: (optional) A DownloadCache, or the path to its directory; the workbook is served from the
+                cache if its latest revision is cached there, and is otherwise added to the cache.
+        """
         self.active_endpoint = api_endpoints.WorkbookEndpoint(
             ts_connection=self,
             workbook_id=workbook_id,
             download_workbook=True,
             parameter_dict=parameter_dict,
         ).get_endpoint()
+        if download_cache is not None:
+            return self._download_with_cache("workbook", workbook_id, download_cache)
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1278,6 +1481,39 @@ class TableauServerConnection:
         response = self._set_response_encoding(response=response)
         return response
 
+    @decorators.verify_api_method_exists("2.3")
+    def download_workbook_to_file(
+        self,
+        workbook_id: str,
+        destination: Union[str, BinaryIO],
+        include_extract: bool = True,
+        file_stem: Optional[str] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress_callback: Optional[Callable[[int, Optional[int]], Any]] = None,
+        parameter_dict: Optional[Dict[str, Any]] = None,
+        download_cache: Union[DownloadCache, str, None] = None,
+    ) -> DownloadResult:
+        """Streams the specified workbook to a file; set `include_extract` to False to omit its extracts.
+
+        The content is written to `destination` (a file path, a directory, or a binary file object) in chunks of
+        `chunk_size` bytes, so memory use stays flat regardless of the file size. Paths are written through a
+        temporary file renamed into place once the download completes; files written to a directory are named
+        `file_stem` (or the file name reported by Tableau Server) with the extension matching the content.
+        `progress_callback` receives the bytes written so far and the total bytes (None if unknown) after each chunk.
+        The result reports the file path, size, SHA-256 checksum, and duration; check `result.ok` before using it.
+        With a `download_cache`, the workbook is copied from the cache if its latest revision is cached there, and
+        workbooks downloaded to a path are added to the cache.
+        """
+        self.active_endpoint = api_endpoints.WorkbookEndpoint(
+            ts_connection=self,
+            workbook_id=workbook_id,
+            download_workbook=True,
+            parameter_dict=self._set_include_extract_parameter(parameter_dict, include_extract),
+        ).get_endpoint()
+        return self._download_to_file(
+            destination, "workbook", file_stem, chunk_size, progress_callback, download_cache, workbook_id
+        )
+
     @decorators.verify_api_method_exists("3.4")
     def download_workbook_pdf(
         self, workbook_id: str, parameter_dict: Optional[Dict[str, Any]] = None
@@ -1290,7 +1526,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1315,7 +1551,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1336,7 +1572,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1344,6 +1580,28 @@ class TableauServerConnection:
         response = self._set_response_encoding(response=response)
         return response
 
+    @decorators.verify_api_method_exists("2.3")
+    def download_workbook_revision_to_file(
+        self,
+        workbook_id: str,
+        revision_number: str,
+        destination: Union[str, BinaryIO],
+        include_extract: bool = True,
+        file_stem: Optional[str] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress_callback: Optional[Callable[[int, Optional[int]], Any]] = None,
+        parameter_dict: Optional[Dict[str, Any]] = None,
+    ) -> DownloadResult:
+        """Streams an older version of the specified workbook to a file; see `download_workbook_to_file`."""
+        self.active_endpoint = api_endpoints.WorkbookEndpoint(
+            ts_connection=self,
+            workbook_id=workbook_id,
+            revision_number=revision_number,
+            download_workbook_revision=True,
+            parameter_dict=self._set_include_extract_parameter(parameter_dict, include_extract),
+        ).get_endpoint()
+        return self._download_to_file(destination, "workbook", file_stem, chunk_size, progress_callback)
+
     @decorators.verify_api_method_exists("2.3")
     def update_workbook(
         self,
@@ -1363,7 +1621,7 @@ class TableauServerConnection:
             ts_connection=self, workbook_id=workbook_id, update_workbook=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -1401,7 +1659,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -1418,7 +1676,7 @@ class TableauServerConnection:
             ts_connection=self, workbook_id=workbook_id, refresh_workbook=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -1434,7 +1692,7 @@ class TableauServerConnection:
             ts_connection=self, workbook_id=workbook_id, delete_workbook=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1449,7 +1707,7 @@ class TableauServerConnection:
             ts_connection=self, view_id=view_id, tag_name=tag_name, delete_tag=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1467,7 +1725,7 @@ class TableauServerConnection:
             delete_tag=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1485,7 +1743,7 @@ class TableauServerConnection:
             ts_connection=self, datasource_id=datasource_id, add_tags=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -1504,7 +1762,7 @@ class TableauServerConnection:
             delete_tag=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1519,7 +1777,7 @@ class TableauServerConnection:
             ts_connection=self, datasource_id=datasource_id, query_datasource=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1535,7 +1793,7 @@ class TableauServerConnection:
             ts_connection=self, query_datasources=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1552,7 +1810,7 @@ class TableauServerConnection:
             query_datasource_connections=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1572,7 +1830,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1582,17 +1840,29 @@ class TableauServerConnection:
 
     @decorators.verify_api_method_exists("2.3")
     def download_data_source(
-        self, datasource_id: str, parameter_dict: Optional[Dict[str, Any]] = None
+        self,
+        datasource_id: str,
+        parameter_dict: Optional[Dict[str, Any]] = None,
+        download_cache: Union[DownloadCache, str, None] = None,
     ) -> requests.Response:
-        """Downloads the specified datasource."""
+        """Downloads the specified datasource.
+
+        Args:
+            datasource_id: The ID (luid) for the datasource being downloaded.
+            parameter_dict: (optional) A Python dict whose values define additional URL parameters.
+            download_cache: (optional) A DownloadCache, or the path to its directory; the datasource is served from the
+                cache if its latest revision is cached there, and is otherwise added to the cache.
+        """
         self.active_endpoint = api_endpoints.DatasourceEndpoint(
             ts_connection=self,
             datasource_id=datasource_id,
             download_datasource=True,
             parameter_dict=parameter_dict,
         ).get_endpoint()
+        if download_cache is not None:
+            return self._download_with_cache("datasource", datasource_id, download_cache)
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1600,6 +1870,39 @@ class TableauServerConnection:
         response = self._set_response_encoding(response=response)
         return response
 
+    @decorators.verify_api_method_exists("2.3")
+    def download_data_source_to_file(
+        self,
+        datasource_id: str,
+        destination: Union[str, BinaryIO],
+        include_extract: bool = True,
+        file_stem: Optional[str] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress_callback: Optional[Callable[[int, Optional[int]], Any]] = None,
+        parameter_dict: Optional[Dict[str, Any]] = None,
+        download_cache: Union[DownloadCache, str, None] = None,
+    ) -> DownloadResult:
+        """Streams the specified datasource to a file; set `include_extract` to False to omit its extract.
+
+        The content is written to `destination` (a file path, a directory, or a binary file object) in chunks of
+        `chunk_size` bytes, so memory use stays flat regardless of the file size. Paths are written through a
+        temporary file renamed into place once the download completes; files written to a directory are named
+        `file_stem` (or the file name reported by Tableau Server) with the extension matching the content.
+        `progress_callback` receives the bytes written so far and the total bytes (None if unknown) after each chunk.
+        The result reports the file path, size, SHA-256 checksum, and duration; check `result.ok` before using it.
+        With a `download_cache`, the datasource is copied from the cache if its latest revision is cached there, and
+        datasources downloaded to a path are added to the cache.
+        """
+        self.active_endpoint = api_endpoints.DatasourceEndpoint(
+            ts_connection=self,
+            datasource_id=datasource_id,
+            download_datasource=True,
+            parameter_dict=self._set_include_extract_parameter(parameter_dict, include_extract),
+        ).get_endpoint()
+        return self._download_to_file(
+            destination, "datasource", file_stem, chunk_size, progress_callback, download_cache, datasource_id
+        )
+
     @decorators.verify_api_method_exists("2.3")
     def download_data_source_revision(
         self, datasource_id: str, revision_number: str, parameter_dict: Optional[Dict[str, Any]] = None
@@ -1613,7 +1916,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1646,7 +1949,7 @@ class TableauServerConnection:
             ts_connection=self, datasource_id=datasource_id, update_datasource=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -1685,7 +1988,7 @@ class TableauServerConnection:
             update_datasource_connection=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -1702,7 +2005,7 @@ class TableauServerConnection:
             ts_connection=self, datasource_id=datasource_id, refresh_datasource=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -1718,7 +2021,7 @@ class TableauServerConnection:
             ts_connection=self, datasource_id=datasource_id, delete_datasource=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1736,7 +2039,7 @@ class TableauServerConnection:
             remove_datasource_revision=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1767,7 +2070,7 @@ class TableauServerConnection:
             ts_connection=self, create_group=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -1784,7 +2087,7 @@ class TableauServerConnection:
             ts_connection=self, group_id=group_id, add_user=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -1804,7 +2107,7 @@ class TableauServerConnection:
         ).get_request()
         self.active_endpoint = api_endpoints.UserEndpoint(ts_connection=self, add_user=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -1823,7 +2126,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1841,7 +2144,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1856,7 +2159,7 @@ class TableauServerConnection:
             ts_connection=self, query_users=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1871,7 +2174,7 @@ class TableauServerConnection:
             ts_connection=self, query_groups=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1886,7 +2189,7 @@ class TableauServerConnection:
             ts_connection=self, user_id=user_id, query_user=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1912,7 +2215,7 @@ class TableauServerConnection:
             ts_connection=self, group_id=group_id, update_group=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -1944,7 +2247,7 @@ class TableauServerConnection:
             ts_connection=self, user_id=user_id, update_user=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.default_headers,
@@ -1960,7 +2263,7 @@ class TableauServerConnection:
             ts_connection=self, group_id=group_id, user_id=user_id, remove_user=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1976,7 +2279,7 @@ class TableauServerConnection:
             ts_connection=self, user_id=user_id, remove_user=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1991,7 +2294,7 @@ class TableauServerConnection:
             ts_connection=self, group_id=group_id, delete_group=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2026,7 +2329,7 @@ class TableauServerConnection:
             add_object_permissions=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -2058,7 +2361,7 @@ class TableauServerConnection:
             add_object_permissions=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -2100,7 +2403,7 @@ class TableauServerConnection:
             add_object_permissions=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -2145,7 +2448,7 @@ class TableauServerConnection:
             add_default_project_permissions=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -2188,7 +2491,7 @@ class TableauServerConnection:
             add_object_permissions=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -2231,7 +2534,7 @@ class TableauServerConnection:
             add_object_permissions=True,
         ).get_endpoint()
         self.active_headers = self.default_headers.copy()
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -2254,7 +2557,7 @@ class TableauServerConnection:
             query_object_permissions=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2276,7 +2579,7 @@ class TableauServerConnection:
             query_object_permissions=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2298,7 +2601,7 @@ class TableauServerConnection:
             query_object_permissions=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2321,7 +2624,7 @@ class TableauServerConnection:
             query_default_project_permissions=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2343,7 +2646,7 @@ class TableauServerConnection:
             query_object_permissions=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2365,7 +2668,7 @@ class TableauServerConnection:
             query_object_permissions=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2402,7 +2705,7 @@ class TableauServerConnection:
             capability_mode=capability_mode,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2438,7 +2741,7 @@ class TableauServerConnection:
             capability_mode=capability_mode,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2475,7 +2778,7 @@ class TableauServerConnection:
             capability_mode=capability_mode,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2514,7 +2817,7 @@ class TableauServerConnection:
             capability_mode=capability_mode,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2551,7 +2854,7 @@ class TableauServerConnection:
             capability_mode=capability_mode,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2588,7 +2891,7 @@ class TableauServerConnection:
             capability_mode=capability_mode,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2616,7 +2919,7 @@ class TableauServerConnection:
             ts_connection=self, schedule_id=schedule_id, add_datasource=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -2637,7 +2940,7 @@ class TableauServerConnection:
             ts_connection=self, schedule_id=schedule_id, add_flow=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -2664,7 +2967,7 @@ class TableauServerConnection:
             ts_connection=self, schedule_id=schedule_id, add_workbook=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -2684,7 +2987,7 @@ class TableauServerConnection:
             ts_connection=self, job_id=job_id, cancel_job=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2703,7 +3006,7 @@ class TableauServerConnection:
             ts_connection=self, job_id=job_id, query_job=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2722,7 +3025,7 @@ class TableauServerConnection:
             ts_connection=self, query_jobs=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2741,7 +3044,7 @@ class TableauServerConnection:
             ts_connection=self, task_id=task_id, get_refresh_task=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2754,7 +3057,7 @@ class TableauServerConnection:
         """Queries details for all extract refresh tasks on the active site."""
         self.active_endpoint = api_endpoints.TasksEndpoint(ts_connection=self, get_refresh_tasks=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2769,7 +3072,7 @@ class TableauServerConnection:
             ts_connection=self, query_schedule=True, schedule_id=schedule_id
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(url=self.active_endpoint, headers=self.active_headers, verify=self.ssl_verify)
+        response = self.session.get(url=self.active_endpoint, headers=self.active_headers, verify=self.ssl_verify)
         response = self._set_response_encoding(response=response)
         return response
 
@@ -2783,7 +3086,7 @@ class TableauServerConnection:
             ts_connection=self, schedule_id=schedule_id, query_extract_schedules=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2801,7 +3104,7 @@ class TableauServerConnection:
             ts_connection=self, task_id=task_id, get_flow_run_task=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2816,7 +3119,7 @@ class TableauServerConnection:
         """
         self.active_endpoint = api_endpoints.TasksEndpoint(ts_connection=self, get_flow_run_tasks=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2862,7 +3165,7 @@ class TableauServerConnection:
         ).get_request()
         self.active_endpoint = api_endpoints.SchedulesEndpoint(ts_connection=self, create_schedule=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -2886,7 +3189,7 @@ class TableauServerConnection:
             parameter_dict=parameter_dict,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2901,7 +3204,7 @@ class TableauServerConnection:
             ts_connection=self, delete_refresh_task=True, task_id=task_id
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(url=self.active_endpoint, headers=self.active_headers, verify=self.ssl_verify)
+        response = self.session.delete(url=self.active_endpoint, headers=self.active_headers, verify=self.ssl_verify)
         response = self._set_response_encoding(response=response)
         return response
 
@@ -2916,7 +3219,7 @@ class TableauServerConnection:
             ts_connection=self, query_schedules=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2937,7 +3240,7 @@ class TableauServerConnection:
             ts_connection=self, task_id=task_id, run_refresh_task=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -2954,7 +3257,7 @@ class TableauServerConnection:
             ts_connection=self, flow_id=flow_id, run_flow_now=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -2970,7 +3273,7 @@ class TableauServerConnection:
             ts_connection=self, get_flow_runs=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -2985,7 +3288,7 @@ class TableauServerConnection:
             ts_connection=self, flow_run_id=flow_run_id, get_flow_run=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3000,7 +3303,7 @@ class TableauServerConnection:
             ts_connection=self, flow_run_id=flow_run_id, cancel_flow_run=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3020,7 +3323,7 @@ class TableauServerConnection:
             ts_connection=self, task_id=task_id, run_flow_task=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -3074,7 +3377,7 @@ class TableauServerConnection:
             ts_connection=self, schedule_id=schedule_id, update_schedule=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -3094,7 +3397,7 @@ class TableauServerConnection:
             ts_connection=self, schedule_id=schedule_id, delete_schedule=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3152,7 +3455,7 @@ class TableauServerConnection:
             ts_connection=self, create_subscription=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -3172,7 +3475,7 @@ class TableauServerConnection:
             ts_connection=self, subscription_id=subscription_id, query_subscription=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3191,7 +3494,7 @@ class TableauServerConnection:
             ts_connection=self, query_subscriptions=True, parameter_dict=parameter_dict
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3219,7 +3522,7 @@ class TableauServerConnection:
             update_subscription=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -3241,7 +3544,7 @@ class TableauServerConnection:
             delete_subscription=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3269,7 +3572,7 @@ class TableauServerConnection:
             ts_connection=self, add_to_favorites=True, user_id=user_id
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -3294,7 +3597,7 @@ class TableauServerConnection:
             ts_connection=self, add_to_favorites=True, user_id=user_id
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -3319,7 +3622,7 @@ class TableauServerConnection:
             ts_connection=self, add_to_favorites=True, user_id=user_id
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -3344,7 +3647,7 @@ class TableauServerConnection:
             ts_connection=self, add_to_favorites=True, user_id=user_id
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -3369,7 +3672,7 @@ class TableauServerConnection:
             delete_from_favorites=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3393,7 +3696,7 @@ class TableauServerConnection:
             delete_from_favorites=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3417,7 +3720,7 @@ class TableauServerConnection:
             delete_from_favorites=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3441,7 +3744,7 @@ class TableauServerConnection:
             delete_from_favorites=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3460,7 +3763,7 @@ class TableauServerConnection:
             ts_connection=self, get_user_favorites=True, user_id=user_id
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3480,7 +3783,7 @@ class TableauServerConnection:
             ts_connection=self, initiate_file_upload=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3504,7 +3807,7 @@ class TableauServerConnection:
         ).get_endpoint()
         self.active_headers = self.default_headers.copy()
         self.active_headers.update({"content-type": content_type})
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             data=payload,
             headers=self.active_headers,
@@ -3525,10 +3828,18 @@ class TableauServerConnection:
         embed_credentials_flag=False,
         oauth_flag=False,
         parameter_dict: Optional[Dict[str, Any]] = None,
+        chunk_size: Optional[int] = None,
+        file_size_limit: Optional[int] = None,
+        upload_progress_callback: Optional[Callable] = None,
+        upload_journal: Optional[Union[str, UploadJournal]] = None,
+        publish_manifest: Optional[Union[str, PublishManifest]] = None,
+        force_publish: bool = False,
+        as_job: bool = False,
     ):
         """
         Publishes a datasource file to Tableau Server.
-        :param string datasource_file_path: the path to the datasource file
+        :param datasource_file_path: the path to the datasource file, or an UploadSource wrapping bytes, a file
+        object, or an iterable of bytes
         :param string datasource_name: the desired name for the datasource
         :param string project_id: the project ID where the file will be published
         :param string datasource_description: the description for the datasource
@@ -3537,37 +3848,61 @@ class TableauServerConnection:
         :param boolean embed_credentials_flag: enables or disables embedding the connection's password
         :param boolean oauth_flag: enables or disables OAuth authentication
         :param dict parameter_dict: dict defining url parameters for API endpoint
-        :return: HTTP response
-        """
-        publish_request = api_requests.PublishDatasourceRequest(
-            ts_connection=self,
-            datasource_name=datasource_name,
-            datasource_file_path=datasource_file_path,
-            project_id=project_id,
-            datasource_description=datasource_description,
-            connection_username=connection_username,
-            connection_password=connection_password,
-            embed_credentials_flag=embed_credentials_flag,
-            oauth_flag=oauth_flag,
-        )
-        self.active_request, content_type = publish_request.get_request()
-        self.active_headers, parameter_dict = publish_request.publish_prep(content_type, parameter_dict=parameter_dict)
-        self.active_endpoint = api_endpoints.DatasourceEndpoint(
-            ts_connection=self, publish_datasource=True, parameter_dict=parameter_dict
-        ).get_endpoint()
-        response = requests.post(
-            url=self.active_endpoint,
-            data=self.active_request,
-            headers=self.active_headers,
-            verify=self.ssl_verify,
-        )
+        :param int chunk_size: the number of bytes sent per request when the file is uploaded in chunks
+        :param int file_size_limit: files larger than this many bytes are uploaded in chunks before publishing
+        :param upload_progress_callback: a callable receiving upload statistics as each chunk is acknowledged
+        :param upload_journal: an UploadJournal, or the path to its file, recording chunked upload progress so that a
+        publish retried after a failure resumes its upload from the last acknowledged chunk
+        :param publish_manifest: a PublishManifest, or the path to its file; publishing content identical to what was
+        last published to the same project and name is skipped, returning the recorded item with HTTP status 200
+        :param bool force_publish: publishes the content even if the manifest shows it is unchanged
+        :param bool as_job: publishes asynchronously; a JobHandle tracking the publish job is returned instead of the
+        HTTP response, and can be waited on with utils.jobs.wait_for_jobs
+        :return: HTTP response, or a JobHandle if 'as_job' is True
+        """
+        with metrics.time_publish("datasource"):
+            publish_request = api_requests.PublishDatasourceRequest(
+                ts_connection=self,
+                datasource_name=datasource_name,
+                datasource_file_path=datasource_file_path,
+                project_id=project_id,
+                datasource_description=datasource_description,
+                connection_username=connection_username,
+                connection_password=connection_password,
+                embed_credentials_flag=embed_credentials_flag,
+                oauth_flag=oauth_flag,
+                chunk_size=chunk_size,
+                file_size_limit=file_size_limit,
+                upload_progress_callback=upload_progress_callback,
+                upload_journal=upload_journal,
+                publish_manifest=publish_manifest,
+                force_publish=force_publish,
+                as_job=as_job,
+            )
+            unchanged_response = publish_request.get_unchanged_response(parameter_dict)
+            if unchanged_response is not None:
+                return JobHandle.from_response(self, unchanged_response) if as_job else unchanged_response
+            self.active_request, content_type = publish_request.get_request()
+            self.active_headers, parameter_dict = publish_request.publish_prep(content_type, parameter_dict=parameter_dict)
+            self.active_endpoint = api_endpoints.DatasourceEndpoint(
+                ts_connection=self, publish_datasource=True, parameter_dict=parameter_dict
+            ).get_endpoint()
+            response = self.session.post(
+                url=self.active_endpoint,
+                data=self.active_request,
+                headers=self.active_headers,
+                verify=self.ssl_verify,
+            )
+            publish_request.complete_publish(response)
         response = self._set_response_encoding(response=response)
+        if as_job:
+            return publish_request.complete_publish_job(JobHandle.from_response(self, response))
         return response
 
     @decorators.verify_api_method_exists("2.3")
     def publish_workbook(
         self,
-        workbook_file_path: str,
+        workbook_file_path: Union[str, UploadSource],
         workbook_name: str,
         project_id: str,
         show_tabs_flag: Optional[bool] = False,
@@ -3581,22 +3916,48 @@ class TableauServerConnection:
         workbook_views_to_hide: Optional[List[str]] = None,
         hide_view_flag: Optional[bool] = None,
         parameter_dict: Optional[Dict[str, Any]] = None,
-    ) -> requests.Response:
-        """Publishes a workbook file to Tableau Server."""
+        chunk_size: Optional[int] = None,
+        file_size_limit: Optional[int] = None,
+        upload_progress_callback: Optional[Callable] = None,
+        upload_journal: Optional[Union[str, UploadJournal]] = None,
+        publish_manifest: Optional[Union[str, PublishManifest]] = None,
+        force_publish: bool = False,
+        as_job: bool = False,
+    ) -> Union[requests.Response, JobHandle]:
+        """Publishes a workbook file to Tableau Server.
+
+        The workbook is given as a file path, or as an UploadSource wrapping bytes, a file object, or an iterable of
+        bytes, so content built in memory can be published without writing a temp file. Files larger than
+        `file_size_limit` bytes (60MB by default), or whose size is unknown, are uploaded in chunks of `chunk_size`
+        bytes (5MB by default) before publishing; `upload_progress_callback` receives the ChunkStats of each chunk.
+        Given an `upload_journal`, chunked upload progress is recorded so that a publish retried after a failure
+        resumes its upload from the last acknowledged chunk.
+        Given a `publish_manifest`, publishing content identical to what was last published to the same project and
+        name is skipped and the recorded workbook is returned with HTTP status 200, unless `force_publish` is True.
+        With `as_job=True`, the workbook is published asynchronously and a JobHandle tracking the publish job is
+        returned instead of the HTTP response; handles can be waited on with `utils.jobs.wait_for_jobs`.
+        """
         local_vars = self._set_local_vars(local_vars=locals())
-        publish_request = api_requests.PublishWorkbookRequest(ts_connection=self, **local_vars)
-        self.active_request, content_type = publish_request.get_request()
-        self.active_headers, parameter_dict = publish_request.publish_prep(content_type, parameter_dict=parameter_dict)
-        self.active_endpoint = api_endpoints.WorkbookEndpoint(
-            ts_connection=self, publish_workbook=True, parameter_dict=parameter_dict
-        ).get_endpoint()
-        response = requests.post(
-            url=self.active_endpoint,
-            data=self.active_request,
-            headers=self.active_headers,
-            verify=self.ssl_verify,
-        )
+        with metrics.time_publish("workbook"):
+            publish_request = api_requests.PublishWorkbookRequest(ts_connection=self, **local_vars)
+            unchanged_response = publish_request.get_unchanged_response(parameter_dict)
+            if unchanged_response is not None:
+                return JobHandle.from_response(self, unchanged_response) if as_job else unchanged_response
+            self.active_request, content_type = publish_request.get_request()
+            self.active_headers, parameter_dict = publish_request.publish_prep(content_type, parameter_dict=parameter_dict)
+            self.active_endpoint = api_endpoints.WorkbookEndpoint(
+                ts_connection=self, publish_workbook=True, parameter_dict=parameter_dict
+            ).get_endpoint()
+            response = self.session.post(
+                url=self.active_endpoint,
+                data=self.active_request,
+                headers=self.active_headers,
+                verify=self.ssl_verify,
+            )
+            publish_request.complete_publish(response)
         response = self._set_response_encoding(response=response)
+        if as_job:
+            return publish_request.complete_publish_job(JobHandle.from_response(self, response))
         return response
 
     @decorators.verify_api_method_exists("3.3")
@@ -3613,10 +3974,17 @@ class TableauServerConnection:
         embed_credentials_flag=False,
         oauth_flag=False,
         parameter_dict: Optional[Dict[str, Any]] = None,
+        chunk_size: Optional[int] = None,
+        file_size_limit: Optional[int] = None,
+        upload_progress_callback: Optional[Callable] = None,
+        upload_journal: Optional[Union[str, UploadJournal]] = None,
+        publish_manifest: Optional[Union[str, PublishManifest]] = None,
+        force_publish: bool = False,
     ):
         """
         Publishes a flow file to Tableau Server.
-        :param str flow_file_path: the path to the flow file
+        :param flow_file_path: the path to the flow file, or an UploadSource wrapping bytes, a file object, or an
+        iterable of bytes
         :param str flow_name: the desired name for the published flow
         :param str project_id: the project ID where the flow will be published
         :param str flow_description: the description for the published flow
@@ -3627,32 +3995,51 @@ class TableauServerConnection:
         :param list or bool embed_credentials_flag: enables or disables embedding the connection's password
         :param list or bool oauth_flag: enables or disables OAuth authentication
         :param dict parameter_dict: dict defining url parameters for API endpoint
+        :param int chunk_size: the number of bytes sent per request when the file is uploaded in chunks
+        :param int file_size_limit: files larger than this many bytes are uploaded in chunks before publishing
+        :param upload_progress_callback: a callable receiving upload statistics as each chunk is acknowledged
+        :param upload_journal: an UploadJournal, or the path to its file, recording chunked upload progress so that a
+        publish retried after a failure resumes its upload from the last acknowledged chunk
+        :param publish_manifest: a PublishManifest, or the path to its file; publishing content identical to what was
+        last published to the same project and name is skipped, returning the recorded item with HTTP status 200
+        :param bool force_publish: publishes the content even if the manifest shows it is unchanged
         :return: HTTP response
         """
-        publish_request = api_requests.PublishFlowRequest(
-            ts_connection=self,
-            flow_file_path=flow_file_path,
-            flow_name=flow_name,
-            project_id=project_id,
-            flow_description=flow_description,
-            server_address=server_address,
-            port_number=port_number,
-            connection_username=connection_username,
-            connection_password=connection_password,
-            embed_credentials_flag=embed_credentials_flag,
-            oauth_flag=oauth_flag,
-        )
-        self.active_request, content_type = publish_request.get_request()
-        self.active_headers, parameter_dict = publish_request.publish_prep(content_type, parameter_dict=parameter_dict)
-        self.active_endpoint = api_endpoints.FlowEndpoint(
-            ts_connection=self, publish_flow=True, parameter_dict=parameter_dict
-        ).get_endpoint()
-        response = requests.post(
-            url=self.active_endpoint,
-            data=self.active_request,
-            headers=self.active_headers,
-            verify=self.ssl_verify,
-        )
+        with metrics.time_publish("flow"):
+            publish_request = api_requests.PublishFlowRequest(
+                ts_connection=self,
+                flow_file_path=flow_file_path,
+                flow_name=flow_name,
+                project_id=project_id,
+                flow_description=flow_description,
+                server_address=server_address,
+                port_number=port_number,
+                connection_username=connection_username,
+                connection_password=connection_password,
+                embed_credentials_flag=embed_credentials_flag,
+                oauth_flag=oauth_flag,
+                chunk_size=chunk_size,
+                file_size_limit=file_size_limit,
+                upload_progress_callback=upload_progress_callback,
+                upload_journal=upload_journal,
+                publish_manifest=publish_manifest,
+                force_publish=force_publish,
+            )
+            unchanged_response = publish_request.get_unchanged_response(parameter_dict)
+            if unchanged_response is not None:
+                return unchanged_response
+            self.active_request, content_type = publish_request.get_request()
+            self.active_headers, parameter_dict = publish_request.publish_prep(content_type, parameter_dict=parameter_dict)
+            self.active_endpoint = api_endpoints.FlowEndpoint(
+                ts_connection=self, publish_flow=True, parameter_dict=parameter_dict
+            ).get_endpoint()
+            response = self.session.post(
+                url=self.active_endpoint,
+                data=self.active_request,
+                headers=self.active_headers,
+                verify=self.ssl_verify,
+            )
+            publish_request.complete_publish(response)
         response = self._set_response_encoding(response=response)
         return response
 
@@ -3669,7 +4056,7 @@ class TableauServerConnection:
             self, query_database=True, database_id=database_id
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3685,7 +4072,7 @@ class TableauServerConnection:
         """
         self.active_endpoint = api_endpoints.DatabaseEndpoint(self, query_databases=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3722,7 +4109,7 @@ class TableauServerConnection:
             self, database_id=database_id, update_database=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -3742,7 +4129,7 @@ class TableauServerConnection:
             self, database_id=database_id, remove_database=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3759,7 +4146,7 @@ class TableauServerConnection:
         """
         self.active_endpoint = api_endpoints.TableEndpoint(self, table_id=table_id, query_table=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3775,7 +4162,7 @@ class TableauServerConnection:
         """
         self.active_endpoint = api_endpoints.TableEndpoint(self, query_tables=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3810,7 +4197,7 @@ class TableauServerConnection:
         ).get_request()
         self.active_endpoint = api_endpoints.TableEndpoint(self, table_id=table_id, update_table=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -3828,7 +4215,7 @@ class TableauServerConnection:
         """
         self.active_endpoint = api_endpoints.TableEndpoint(self, table_id=table_id, remove_table=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3848,7 +4235,7 @@ class TableauServerConnection:
             self, table_id=table_id, column_id=column_id, query_column=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3865,7 +4252,7 @@ class TableauServerConnection:
         """
         self.active_endpoint = api_endpoints.ColumnEndpoint(self, table_id=table_id, query_columns=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3889,7 +4276,7 @@ class TableauServerConnection:
             self, table_id=table_id, column_id=column_id, update_column=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -3910,7 +4297,7 @@ class TableauServerConnection:
             self, table_id=table_id, column_id=column_id, remove_column=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3938,7 +4325,7 @@ class TableauServerConnection:
             self, content_type=content_type, content_id=content_id, add_warning=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -3958,7 +4345,7 @@ class TableauServerConnection:
             self, warning_id=warning_id, query_by_id=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -3981,7 +4368,7 @@ class TableauServerConnection:
             query_by_content=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -4007,7 +4394,7 @@ class TableauServerConnection:
             self, warning_id=warning_id, update_warning=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.put(
+        response = self.session.put(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -4027,7 +4414,7 @@ class TableauServerConnection:
             self, warning_id=warning_id, delete_by_id=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -4051,7 +4438,7 @@ class TableauServerConnection:
             delete_by_content=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -4069,7 +4456,7 @@ class TableauServerConnection:
         self.active_request = api_requests.GraphqlRequest(self, query).get_request()
         self.active_endpoint = api_endpoints.GraphqlEndpoint(self).get_endpoint()
         self.active_headers = self.graphql_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -4088,7 +4475,7 @@ class TableauServerConnection:
         """
         self.active_endpoint = api_endpoints.EncryptionEndpoint(self, encrypt_extracts=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -4104,7 +4491,7 @@ class TableauServerConnection:
         """
         self.active_endpoint = api_endpoints.EncryptionEndpoint(self, decrypt_extracts=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -4120,7 +4507,7 @@ class TableauServerConnection:
         """
         self.active_endpoint = api_endpoints.EncryptionEndpoint(self, reencrypt_extracts=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -4145,7 +4532,7 @@ class TableauServerConnection:
             create_extract=True,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -4164,7 +4551,7 @@ class TableauServerConnection:
             ts_connection=self, datasource_id=datasource_id, delete_extract=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -4200,7 +4587,7 @@ class TableauServerConnection:
             encryption_flag=encryption_flag,
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -4221,7 +4608,7 @@ class TableauServerConnection:
             ts_connection=self, workbook_id=workbook_id, delete_extracts=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -4250,7 +4637,7 @@ class TableauServerConnection:
         ).get_request()
         self.active_endpoint = api_endpoints.WebhookEndpoint(self, create_webhook=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.post(
+        response = self.session.post(
             url=self.active_endpoint,
             json=self.active_request,
             headers=self.active_headers,
@@ -4270,7 +4657,7 @@ class TableauServerConnection:
             self, webhook_id=webhook_id, query_webhook=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -4286,7 +4673,7 @@ class TableauServerConnection:
         """
         self.active_endpoint = api_endpoints.WebhookEndpoint(self, query_webhook=True).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -4305,7 +4692,7 @@ class TableauServerConnection:
             self, webhook_id=webhook_id, test_webhook=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.get(
+        response = self.session.get(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -4324,7 +4711,7 @@ class TableauServerConnection:
             self, webhook_id=webhook_id, delete_webhook=True
         ).get_endpoint()
         self.active_headers = self.default_headers
-        response = requests.delete(
+        response = self.session.delete(
             url=self.active_endpoint,
             headers=self.active_headers,
             verify=self.ssl_verify,
@@ -1,2 +1,12 @@
+from .metrics import start_metrics_server, write_metrics
 from .pagination import extract_pages
 from .common import flatten_dict_column, flatten_dict_list_column, get_server_netloc
+from .upload import BandwidthLimiter, UploadJournal, UploadSource
+from .jobs import JobHandle, wait_for_jobs
+from .publish_manifest import PublishManifest
+from .publish_queue import PublishQueue
+from .bulk_download import BulkDownloader
+from .download_cache import DownloadCache
+from .artifact_store import ArtifactStore
+from .connection_rewriter import ConnectionRule, rewrite_connections
+from .view_export import ViewExporter
@@ -0,0 +1,279 @@
+"""Stores downloaded workbooks, datasources, and flows with each distinct packaged file kept only once.
+
+Packaged files (.twbx, .tdsx, .tflx) across a site, and across the revisions of one item, often embed the same
+extracts and images. An `ArtifactStore` splits each package into the data of its zip members and the zip structure
+between them (headers and the central directory). Member data is stored once per distinct content, in a file named
+after its SHA-256 hash, and a small JSON manifest per package records the sequence of segments. Concatenating the
+segments rebuilds the original file byte for byte; packages are identified by the SHA-256 hash of the whole file, which
+matches the `sha256` a `DownloadResult` reports.
+
+Member data is stored as it appears in the zip file (compressed or not), so no data is decompressed or recompressed
+when adding or restoring packages. Unpackaged files (.twb, .tds, .tfl) are stored as a single object.
+
+Example:
+    artifact_store = ArtifactStore('backups/artifacts')
+    package_id = artifact_store.add('downloads/sales.twbx', metadata={'workbook_id': workbook_id})
+    artifact_store.restore(package_id, 'restored/sales.twbx')
+"""
+
+import base64
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import time
+import zipfile
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+
+STORE_BLOCK_SIZE = 1024 * 1024  # 1MB
+LOCAL_HEADER_SIZE = 30
+LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+
+def _get_member_spans(file: BinaryIO) -> Optional[List[Tuple[str, int, int]]]:
+    """Returns the name, offset, and size of the data of each zip member in file order, or None if the file cannot be
+    split into non-overlapping members."""
+    try:
+        with zipfile.ZipFile(file) as zip_file:
+            members = sorted(zip_file.infolist(), key=lambda info: info.header_offset)
+    except zipfile.BadZipFile:
+        return None
+    spans = []
+    end_of_previous = 0
+    for member in members:
+        file.seek(member.header_offset)
+        header = file.read(LOCAL_HEADER_SIZE)
+        if len(header) < LOCAL_HEADER_SIZE or header[:4] != LOCAL_HEADER_SIGNATURE:
+            return None
+        name_length, extra_length = struct.unpack("<HH", header[26:30])
+        data_offset = member.header_offset + LOCAL_HEADER_SIZE + name_length + extra_length
+        if member.header_offset < end_of_previous:
+            return None
+        if member.compress_size:
+            spans.append((member.filename, data_offset, member.compress_size))
+        end_of_previous = data_offset + member.compress_size
+    return spans
+
+
+class ArtifactStore:
+    """A content-addressed store of packaged Tableau files, deduplicated by zip member.
+
+    Args:
+        directory: The directory holding the store, which is created when needed.
+        min_object_size: (optional) Zip members smaller than this many bytes are kept in the package manifest rather
+            than as separate objects.
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike], min_object_size: int = 4096):
+        self.directory = os.fspath(directory)
+        self.min_object_size = min_object_size
+
+    @classmethod
+    def from_value(cls, value: Union["ArtifactStore", str, os.PathLike, None]) -> Optional["ArtifactStore"]:
+        """Returns `value` as an ArtifactStore, treating strings and paths as the location of the store."""
+        if value is None or isinstance(value, cls):
+            return value
+        return cls(value)
+
+    @property
+    def objects_dir(self) -> str:
+        return os.path.join(self.directory, "objects")
+
+    @property
+    def packages_dir(self) -> str:
+        return os.path.join(self.directory, "packages")
+
+    def add(self, file_path: Union[str, os.PathLike], metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Stores a file, returning its package ID (the SHA-256 hash of the file).
+
+        Args:
+            file_path: The path of the file being stored.
+            metadata: (optional) Details recorded in the package manifest, such as the ID of the downloaded content.
+        """
+        file_path = os.fspath(file_path)
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.packages_dir, exist_ok=True)
+        package_hasher = hashlib.sha256()
+        segments = []
+        with open(file_path, "rb") as file:
+            spans = _get_member_spans(file) if zipfile.is_zipfile(file) else None
+            if spans is None:
+                spans = [(os.path.basename(file_path), 0, os.path.getsize(file_path))]
+            position = 0
+            file.seek(0)
+            for member_name, offset, size in spans + [(None, os.path.getsize(file_path), 0)]:
+                if offset > position:
+                    raw = file.read(offset - position)
+                    package_hasher.update(raw)
+                    segments.append({"data": base64.b64encode(raw).decode("ascii")})
+                if size and size < self.min_object_size:
+                    raw = file.read(size)
+                    package_hasher.update(raw)
+                    segments.append({"member": member_name, "data": base64.b64encode(raw).decode("ascii")})
+                elif size:
+                    object_id = self._write_object(file, size, package_hasher)
+                    segments.append({"member": member_name, "object": object_id, "size": size})
+                position = offset + size
+        package_id = package_hasher.hexdigest()
+        manifest = {
+            "package_id": package_id,
+            "file_name": os.path.basename(file_path),
+            "size": position,
+            "stored_at": time.time(),
+            "metadata": metadata or {},
+            "segments": segments,
+        }
+        file_descriptor, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.packages_dir)
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(temp_path, self._get_manifest_path(package_id))
+        return package_id
+
+    def has_package(self, package_id: str) -> bool:
+        """Returns True if the package is in the store."""
+        return os.path.exists(self._get_manifest_path(package_id))
+
+    def get_manifest(self, package_id: str) -> Dict[str, Any]:
+        """Returns the manifest describing how the package is rebuilt.
+
+        Raises:
+            KeyError: The package is not in the store.
+        """
+        try:
+            with open(self._get_manifest_path(package_id), encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            raise KeyError(f"The package '{package_id}' is not in the artifact store.")
+
+    def packages(self) -> List[Dict[str, Any]]:
+        """Returns the ID, file name, size, and metadata of each package in the store."""
+        packages = []
+        for manifest in sorted(self._manifests(), key=lambda package: package["stored_at"]):
+            manifest.pop("segments")
+            packages.append(manifest)
+        return packages
+
+    def restore(self, package_id: str, destination: Union[str, os.PathLike, BinaryIO]) -> str:
+        """Rebuilds the package, writing it to a file path, a directory, or a binary file object.
+
+        Files restored to a directory are given the package's original file name. Returns the path written, if any.
+
+        Raises:
+            KeyError: The package is not in the store.
+            IOError: An object the package is built from is missing or corrupt.
+        """
+        manifest = self.get_manifest(package_id)
+        if hasattr(destination, "write"):
+            self._write_package(manifest, destination)
+            return getattr(destination, "name", None)
+        file_path = os.fspath(destination)
+        if os.path.isdir(file_path):
+            file_path = os.path.join(file_path, manifest["file_name"])
+        directory, file_name = os.path.split(os.path.abspath(file_path))
+        file_descriptor, temp_path = tempfile.mkstemp(prefix=f".{file_name}.", suffix=".part", dir=directory)
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                self._write_package(manifest, file)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return file_path
+
+    def remove(self, package_id: str) -> None:
+        """Removes the package's manifest; objects no other package uses are removed by `collect_garbage`."""
+        try:
+            os.remove(self._get_manifest_path(package_id))
+        except FileNotFoundError:
+            pass
+
+    def collect_garbage(self) -> int:
+        """Removes the objects no package uses, returning the number of bytes freed."""
+        used = {segment["object"] for package in self._manifests() for segment in package["segments"]
+                if "object" in segment}
+        freed = 0
+        for object_id, object_path in self._objects():
+            if object_id not in used:
+                freed += os.path.getsize(object_path)
+                os.remove(object_path)
+        return freed
+
+    def get_stats(self) -> Dict[str, int]:
+        """Returns the number of packages, the total size of the packages, and the bytes the store actually uses."""
+        manifests = list(self._manifests())
+        stored_bytes = sum(os.path.getsize(object_path) for _, object_path in self._objects())
+        stored_bytes += sum(os.path.getsize(self._get_manifest_path(manifest["package_id"])) for manifest in manifests)
+        return {
+            "packages": len(manifests),
+            "package_bytes": sum(manifest["size"] for manifest in manifests),
+            "stored_bytes": stored_bytes,
+        }
+
+    def _get_manifest_path(self, package_id: str) -> str:
+        return os.path.join(self.packages_dir, f"{package_id}.json")
+
+    def _get_object_path(self, object_id: str) -> str:
+        return os.path.join(self.objects_dir, object_id[:2], object_id)
+
+    def _manifests(self):
+        if os.path.isdir(self.packages_dir):
+            for file_name in os.listdir(self.packages_dir):
+                if file_name.endswith(".json"):
+                    yield self.get_manifest(file_name[:-len(".json")])
+
+    def _objects(self):
+        if os.path.isdir(self.objects_dir):
+            for prefix in os.listdir(self.objects_dir):
+                if not os.path.isdir(os.path.join(self.objects_dir, prefix)):
+                    continue
+                for object_id in os.listdir(os.path.join(self.objects_dir, prefix)):
+                    if not object_id.endswith(".part"):
+                        yield object_id, os.path.join(self.objects_dir, prefix, object_id)
+
+    def _write_object(self, file: BinaryIO, size: int, package_hasher) -> str:
+        """Copies `size` bytes from the file into the store, returning the object's ID."""
+        file_descriptor, temp_path = tempfile.mkstemp(suffix=".part", dir=self.objects_dir)
+        try:
+            hasher = hashlib.sha256()
+            with os.fdopen(file_descriptor, "wb") as temp_file:
+                remaining = size
+                while remaining:
+                    block = file.read(min(STORE_BLOCK_SIZE, remaining))
+                    if not block:
+                        raise IOError(f"The file ended {remaining} bytes before the end of the zip member.")
+                    temp_file.write(block)
+                    hasher.update(block)
+                    package_hasher.update(block)
+                    remaining -= len(block)
+            object_id = hasher.hexdigest()
+            object_path = self._get_object_path(object_id)
+            if os.path.exists(object_path):
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                os.replace(temp_path, object_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return object_id
+
+    def _write_package(self, manifest: Dict[str, Any], file: BinaryIO) -> None:
+        hasher = hashlib.sha256()
+        for segment in manifest["segments"]:
+            if "data" in segment:
+                raw = base64.b64decode(segment["data"])
+                file.write(raw)
+                hasher.update(raw)
+                continue
+            try:
+                with open(self._get_object_path(segment["object"]), "rb") as object_file:
+                    for block in iter(lambda: object_file.read(STORE_BLOCK_SIZE), b""):
+                        file.write(block)
+                        hasher.update(block)
+            except FileNotFoundError:
+                raise IOError(f"The object '{segment['object']}' of package '{manifest['package_id']}' is missing.")
+        if hasher.hexdigest() != manifest["package_id"]:
+            raise IOError(f"The package '{manifest['package_id']}' could not be rebuilt; its objects are corrupt.")
@@ -0,0 +1,266 @@
+"""Downloads many workbooks, datasources, and flows concurrently, for backups and migrations.
+
+A `BulkDownloader` streams up to `max_workers` downloads at a time, each on its own copy of the connection, into one
+subdirectory per content type. An optional bandwidth limit caps the combined download rate. Downloads failing with a
+network error or a retryable status (429 or 5xx) are retried with a growing delay, and a JSON manifest records the
+path, size, SHA-256 checksum, duration, and outcome of every download. Workbooks and datasources can be served from a
+`DownloadCache`, and downloaded files can be moved into a deduplicating `ArtifactStore`.
+
+Example:
+    downloader = BulkDownloader(conn, 'backups/2024-01-01', max_workers=8, max_bytes_per_second=100 * 1024 * 1024)
+    downloader.add_dataframe('workbook', get_workbooks_dataframe(conn))
+    downloader.add_ids('datasource', datasource_ids)
+    downloader.run()
+    downloader.write_manifest()
+"""
+
+import copy
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+import requests
+
+from tableau_api_lib.utils.artifact_store import ArtifactStore
+from tableau_api_lib.utils.download import DOWNLOAD_CHUNK_SIZE
+from tableau_api_lib.utils.download_cache import DownloadCache
+from tableau_api_lib.utils.metrics import record_retry
+from tableau_api_lib.utils.upload import BandwidthLimiter
+
+DOWNLOAD_METHODS = {
+    "workbook": ("download_workbook_to_file", "workbook_id", "workbooks"),
+    "datasource": ("download_data_source_to_file", "datasource_id", "datasources"),
+    "flow": ("download_flow_to_file", "flow_id", "flows"),
+}
+RETRYABLE_STATUS_CODES = [429, 500, 502, 503, 504]
+MANIFEST_FILE_NAME = "manifest.json"
+
+
+class BulkDownloadItem:
+    """A workbook, datasource, or flow to be downloaded, and the outcome of downloading it.
+
+    Args:
+        content_type: One of 'workbook', 'datasource', or 'flow'.
+        content_id: The LUID of the content.
+        file_stem: The name, without extension, of the file the content is saved to.
+        name: (optional) The name of the content on Tableau Server.
+    """
+
+    PENDING = "pending"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    def __init__(self, content_type: str, content_id: str, file_stem: str, name: Optional[str] = None):
+        if content_type not in DOWNLOAD_METHODS:
+            raise ValueError(f"Unable to download '{content_type}' content; expected one of {list(DOWNLOAD_METHODS)}.")
+        self.content_type = content_type
+        self.content_id = content_id
+        self.file_stem = file_stem
+        self.name = name
+        self.status = self.PENDING
+        self.attempts = 0
+        self.result = None
+        self.error = None
+        self.seconds = None
+        self.package_id = None
+
+    def __repr__(self) -> str:
+        return f"BulkDownloadItem(content_type='{self.content_type}', content_id='{self.content_id}', status='{self.status}')"
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = self.result
+        return {
+            "content_type": self.content_type,
+            "content_id": self.content_id,
+            "name": self.name,
+            "status": self.status,
+            "status_code": result.status_code if result is not None else None,
+            "file_path": result.file_path if result is not None else None,
+            "size": result.size if result is not None else None,
+            "sha256": result.sha256 if result is not None else None,
+            "seconds": self.seconds,
+            "attempts": self.attempts,
+            "package_id": self.package_id,
+            "error": None if self.error is None else str(self.error),
+        }
+
+
+def _sanitize_file_stem(name: str) -> str:
+    return re.sub(r'[\\/:*?"<>|\x00-\x1f]', "_", str(name)).strip(" .") or "_"
+
+
+class BulkDownloader:
+    """Downloads queued workbooks, datasources, and flows concurrently into a directory.
+
+    Args:
+        conn: A signed-in TableauServerConnection; each download uses a copy of it.
+        destination_dir: The directory receiving the downloaded files and the manifest.
+        max_workers: (optional) The maximum number of downloads running at the same time.
+        max_bytes_per_second: (optional) The combined download rate allowed across all downloads.
+        retries: (optional) The number of times a failed download is retried.
+        retry_delay: (optional) The seconds waited before the first retry; the delay doubles with each retry.
+        include_extract: (optional) False to download workbooks and datasources without their extracts.
+        chunk_size: (optional) The number of bytes read and written at a time by each download.
+        progress_callback: (optional) A callable receiving the BulkDownloadItem, the bytes written so far, and the
+            total bytes (None if unknown) as each download progresses.
+        split_by_content_type: (optional) False to save every file directly in `destination_dir`, rather than in its
+            'workbooks', 'datasources', and 'flows' subdirectories.
+        download_cache: (optional) A DownloadCache, or the path to its directory, from which workbooks and datasources
+            whose latest revision is cached are copied instead of downloaded.
+        artifact_store: (optional) An ArtifactStore, or the path to its directory, into which downloaded files are
+            moved; each item's `package_id` then identifies the file in the store. An item whose file cannot be
+            stored fails with the error raised, and the other items are still downloaded.
+    """
+
+    def __init__(
+        self,
+        conn,
+        destination_dir: str,
+        max_workers: int = 4,
+        max_bytes_per_second: Optional[float] = None,
+        retries: int = 2,
+        retry_delay: float = 1.0,
+        include_extract: bool = True,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        progress_callback: Optional[Callable[[BulkDownloadItem, int, Optional[int]], Any]] = None,
+        split_by_content_type: bool = True,
+        download_cache: Union[DownloadCache, str, None] = None,
+        artifact_store: Union[ArtifactStore, str, None] = None,
+    ):
+        if max_workers < 1:
+            raise ValueError(f"At least one worker is required to download content, not {max_workers}.")
+        self._conn = conn
+        self.destination_dir = destination_dir
+        self.max_workers = max_workers
+        self.bandwidth_limiter = BandwidthLimiter(max_bytes_per_second) if max_bytes_per_second else None
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.include_extract = include_extract
+        self.chunk_size = chunk_size
+        self.progress_callback = progress_callback
+        self.split_by_content_type = split_by_content_type
+        self.download_cache = DownloadCache.from_value(download_cache)
+        self.artifact_store = ArtifactStore.from_value(artifact_store)
+        self.items: List[BulkDownloadItem] = []
+        self._file_stems = set()
+
+    def add(self, content_type: str, content_id: str, name: Optional[str] = None) -> BulkDownloadItem:
+        """Queues content to be downloaded, returning its BulkDownloadItem.
+
+        The file is named after the content's name if given, or its LUID otherwise; the LUID is appended to names
+        already used by another file in the same directory.
+        """
+        directory = self._get_directory(content_type)
+        file_stem = _sanitize_file_stem(name) if name else content_id
+        if (directory, file_stem.lower()) in self._file_stems:
+            file_stem = f"{file_stem}_{content_id}"
+        self._file_stems.add((directory, file_stem.lower()))
+        item = BulkDownloadItem(content_type, content_id, file_stem, name)
+        self.items.append(item)
+        return item
+
+    def add_ids(self, content_type: str, content_ids: Iterable[str]) -> List[BulkDownloadItem]:
+        """Queues content, given as a list of LUIDs, to be downloaded."""
+        return [self.add(content_type, content_id) for content_id in content_ids]
+
+    def add_dataframe(
+        self, content_type: str, content_df: pd.DataFrame, id_column: str = "id", name_column: Optional[str] = "name"
+    ) -> List[BulkDownloadItem]:
+        """Queues each row of a DataFrame, such as one built by `utils.querying.get_workbooks_dataframe`."""
+        if name_column in content_df.columns:
+            names = [None if pd.isna(name) else name for name in content_df[name_column]]
+        else:
+            names = [None] * len(content_df)
+        return [self.add(content_type, content_id, name) for content_id, name in zip(content_df[id_column], names)]
+
+    def run(self) -> List[BulkDownloadItem]:
+        """Downloads every pending item, returning all items once the downloads have finished."""
+        pending = [item for item in self.items if item.status == BulkDownloadItem.PENDING]
+        for directory in {self._get_directory(item.content_type) for item in pending}:
+            os.makedirs(directory, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tableau-api-lib-download") as pool:
+            list(pool.map(self._download, pending))
+        return self.items
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Returns a DataFrame describing the outcome of each download."""
+        return pd.DataFrame([item.to_dict() for item in self.items])
+
+    def write_manifest(self, file_path: Optional[str] = None) -> str:
+        """Writes the JSON manifest describing each download, returning its path.
+
+        Args:
+            file_path: (optional) The path of the manifest; defaults to 'manifest.json' in the destination directory.
+        """
+        file_path = file_path or os.path.join(self.destination_dir, MANIFEST_FILE_NAME)
+        manifest = {"created_at": time.time(), "items": [item.to_dict() for item in self.items]}
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2)
+        return file_path
+
+    def _get_directory(self, content_type: str) -> str:
+        if content_type not in DOWNLOAD_METHODS:
+            raise ValueError(f"Unable to download '{content_type}' content; expected one of {list(DOWNLOAD_METHODS)}.")
+        if not self.split_by_content_type:
+            return self.destination_dir
+        return os.path.join(self.destination_dir, DOWNLOAD_METHODS[content_type][2])
+
+    def _download(self, item: BulkDownloadItem) -> None:
+        conn = copy.copy(self._conn)
+        method_name, id_arg, _ = DOWNLOAD_METHODS[item.content_type]
+        download_kwargs = {
+            id_arg: item.content_id,
+            "destination": self._get_directory(item.content_type),
+            "file_stem": item.file_stem,
+            "chunk_size": self.chunk_size,
+        }
+        if item.content_type != "flow":
+            download_kwargs["include_extract"] = self.include_extract
+            download_kwargs["download_cache"] = self.download_cache
+        start = time.perf_counter()
+        delay = self.retry_delay
+        while True:
+            item.attempts += 1
+            item.error = None
+            download_kwargs["progress_callback"] = self._get_progress_callback(item)
+            try:
+                item.result = getattr(conn, method_name)(**download_kwargs)
+                retryable = item.result.status_code in RETRYABLE_STATUS_CODES
+            except (requests.RequestException, IOError) as error:
+                item.result, item.error, retryable = None, error, True
+            if item.result is not None and item.result.ok:
+                item.status = BulkDownloadItem.SUCCEEDED
+                if self.artifact_store is not None:
+                    try:
+                        self._store_artifact(item)
+                    except Exception as error:
+                        item.status, item.error = BulkDownloadItem.FAILED, error
+                break
+            if not retryable or item.attempts > self.retries:
+                item.status = BulkDownloadItem.FAILED
+                break
+            record_retry(f"download_{item.content_type}")
+            time.sleep(delay)
+            delay *= 2
+        item.seconds = time.perf_counter() - start
+
+    def _store_artifact(self, item: BulkDownloadItem) -> None:
+        metadata = {"content_type": item.content_type, "content_id": item.content_id, "name": item.name}
+        item.package_id = self.artifact_store.add(item.result.file_path, metadata=metadata)
+        os.remove(item.result.file_path)
+
+    def _get_progress_callback(self, item: BulkDownloadItem) -> Callable[[int, Optional[int]], None]:
+        previously_written = [0]
+
+        def progress_callback(written: int, total: Optional[int]) -> None:
+            if self.bandwidth_limiter:
+                self.bandwidth_limiter.consume(written - previously_written[0])
+            previously_written[0] = written
+            if self.progress_callback:
+                self.progress_callback(item, written, total)
+
+        return progress_callback
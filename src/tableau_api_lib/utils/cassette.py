@@ -0,0 +1,229 @@
+"""Defines a transport that records Tableau Server HTTP exchanges to cassette files and replays them offline.
+
+A cassette is a JSON file holding the responses received for a sequence of requests. In 'record' mode, requests are
+sent to the live server and each exchange is appended to the cassette. In 'replay' mode, no network traffic occurs:
+each request is answered with the next unused recorded response whose method, path, and query string match.
+
+Request bodies are never recorded, and the session token returned when signing in or switching sites is replaced by
+a placeholder, so cassettes can be committed without exposing credentials.
+
+Example:
+    with use_cassette(conn, 'cassettes/query_sites.json', mode='replay', latency=0.05):
+        conn.sign_in()
+        sites = extract_pages(conn.query_sites)
+"""
+
+import base64
+import io
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib import parse
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from tableau_api_lib.exceptions import CassetteInteractionNotFound
+
+CASSETTE_FORMAT_VERSION = 1
+VALID_CASSETTE_MODES = ["record", "replay"]
+TEXT_CONTENT_TYPES = ["application/json", "application/xml", "text/"]
+API_VERSION_PATTERN = re.compile(r"^/api/[^/]+/")
+CREDENTIALS_PATHS = ["/api/{version}/auth/signin", "/api/{version}/auth/switchSite"]
+CREDENTIALS_TOKEN_PATTERN = re.compile(rb'(<credentials\b[^>]*?\btoken=")[^"]*(")')
+REDACTED_TOKEN = "cassette-redacted-token"
+
+
+def _get_request_key(method: str, url: str) -> Tuple[str, str, str]:
+    """Returns the values identifying a request, ignoring the server address and REST API version."""
+    split_url = parse.urlsplit(url)
+    path = API_VERSION_PATTERN.sub("/api/{version}/", split_url.path)
+    query = "&".join(sorted(split_url.query.split("&"))) if split_url.query else ""
+    return method.upper(), path, query
+
+
+def _encode_body(body: bytes, content_type: str) -> Dict[str, str]:
+    if any(text_type in (content_type or "").lower() for text_type in TEXT_CONTENT_TYPES):
+        try:
+            return {"string": body.decode("utf-8")}
+        except UnicodeDecodeError:
+            pass
+    return {"base64": base64.b64encode(body).decode("ascii")}
+
+
+def _redact_credentials(path: str, body: bytes) -> bytes:
+    """Replaces the session token in a sign-in or site switch response with `REDACTED_TOKEN`."""
+    if path not in CREDENTIALS_PATHS:
+        return body
+    try:
+        content = json.loads(body)
+    except ValueError:
+        return CREDENTIALS_TOKEN_PATTERN.sub(rb"\g<1>" + REDACTED_TOKEN.encode("ascii") + rb"\g<2>", body)
+    if isinstance(content, dict) and "token" in content.get("credentials", {}):
+        content["credentials"]["token"] = REDACTED_TOKEN
+        return json.dumps(content).encode("utf-8")
+    return body
+
+
+def _decode_body(body: Dict[str, str]) -> bytes:
+    if "string" in body:
+        return body["string"].encode("utf-8")
+    return base64.b64decode(body.get("base64", ""))
+
+
+class Cassette:
+    """A file-backed sequence of recorded HTTP interactions.
+
+    Args:
+        file_path: The path to the cassette (JSON) file.
+        mode: Either 'record' (send requests to the server and save the exchanges) or 'replay' (serve saved exchanges).
+        latency: (optional) Seconds to wait before returning each replayed response, simulating network latency.
+        use_recorded_latency: (optional) True to wait for the elapsed time observed while recording each response.
+    """
+
+    def __init__(self, file_path: str, mode: str = "replay", latency: float = 0.0, use_recorded_latency: bool = False):
+        if mode not in VALID_CASSETTE_MODES:
+            raise ValueError(f"Invalid cassette mode '{mode}'. Valid modes include: {VALID_CASSETTE_MODES}.")
+        self.file_path = file_path
+        self.mode = mode
+        self.latency = latency
+        self.use_recorded_latency = use_recorded_latency
+        self.interactions = self._load() if mode == "replay" else []
+        self._used = [False] * len(self.interactions)
+        self._lock = threading.Lock()
+
+    def _load(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.file_path):
+            return []
+        with open(self.file_path, "r", encoding="utf-8") as file:
+            return json.load(file).get("interactions", [])
+
+    def save(self) -> None:
+        """Writes the recorded interactions to the cassette file."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.file_path)), exist_ok=True)
+        with open(self.file_path, "w", encoding="utf-8") as file:
+            json.dump({"version": CASSETTE_FORMAT_VERSION, "interactions": self.interactions}, file, indent=2)
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response) -> None:
+        """Appends the exchange to the cassette; request bodies and session tokens are never stored."""
+        method, path, query = _get_request_key(request.method, request.url)
+        headers = {key: value for key, value in response.headers.items() if key.lower() != "set-cookie"}
+        body = _redact_credentials(path, response.content)
+        interaction = {
+            "request": {"method": method, "path": path, "query": query},
+            "response": {
+                "status_code": response.status_code,
+                "reason": response.reason,
+                "headers": headers,
+                "body": _encode_body(body, response.headers.get("Content-Type")),
+                "elapsed": response.elapsed.total_seconds(),
+            },
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def play(self, request: requests.PreparedRequest) -> Dict[str, Any]:
+        """Returns the next unused recorded response matching the request."""
+        key = _get_request_key(request.method, request.url)
+        with self._lock:
+            for i, interaction in enumerate(self.interactions):
+                recorded = interaction["request"]
+                if not self._used[i] and (recorded["method"], recorded["path"], recorded["query"]) == key:
+                    self._used[i] = True
+                    return interaction["response"]
+        raise CassetteInteractionNotFound(self.file_path, request.method, request.url)
+
+    def rewind(self) -> None:
+        """Marks every interaction as unused so the cassette can be replayed again from the start."""
+        with self._lock:
+            self._used = [False] * len(self.interactions)
+
+
+class CassetteAdapter(BaseAdapter):
+    """A `requests` transport adapter that records to, or replays from, the active cassette.
+
+    Args:
+        cassette: The cassette used by the adapter. It can be swapped at any time by assigning `adapter.cassette`.
+        adapter: (optional) The adapter used to reach the live server while recording.
+    """
+
+    def __init__(self, cassette: Optional[Cassette], adapter: Optional[BaseAdapter] = None):
+        super().__init__()
+        self.cassette = cassette
+        self._adapter = adapter or HTTPAdapter()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if self.cassette is None:
+            raise ValueError("No cassette is loaded into the CassetteAdapter.")
+        if self.cassette.mode == "record":
+            response = self._adapter.send(
+                request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies
+            )
+            self.cassette.record(request, response)
+            return response
+        recorded = self.cassette.play(request)
+        delay = recorded.get("elapsed", 0.0) if self.cassette.use_recorded_latency else self.cassette.latency
+        if delay:
+            time.sleep(delay)
+        return self._build_response(request, recorded, stream, delay)
+
+    def _build_response(
+        self, request: requests.PreparedRequest, recorded: Dict[str, Any], stream: bool, delay: float
+    ) -> requests.Response:
+        # cassettes recorded before tokens were redacted still replay with the placeholder token
+        body = _redact_credentials(_get_request_key(request.method, request.url)[1], _decode_body(recorded["body"]))
+        response = requests.Response()
+        response.status_code = recorded["status_code"]
+        response.reason = recorded.get("reason")
+        response.headers = CaseInsensitiveDict(recorded.get("headers", {}))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = timedelta(seconds=delay)
+        if not stream:
+            response._content = body
+            response._content_consumed = True
+        return response
+
+    def close(self):
+        self._adapter.close()
+
+
+@contextmanager
+def use_cassette(
+    conn, file_path: str, mode: str = "replay", latency: float = 0.0, use_recorded_latency: bool = False
+) -> Iterator[Cassette]:
+    """Routes every request sent by the connection through a cassette for the duration of the context.
+
+    Args:
+        conn: The TableauServerConnection whose requests will be recorded or replayed.
+        file_path: The path to the cassette (JSON) file.
+        mode: Either 'record' or 'replay'.
+        latency: (optional) Seconds to wait before returning each replayed response.
+        use_recorded_latency: (optional) True to wait for the elapsed time observed while recording each response.
+
+    Returns:
+        The active cassette. Recorded cassettes are saved when the context exits.
+    """
+    cassette = Cassette(file_path, mode=mode, latency=latency, use_recorded_latency=use_recorded_latency)
+    adapter = CassetteAdapter(cassette)
+    previous_adapters = dict(conn.session.adapters)
+    conn.session.mount("http://", adapter)
+    conn.session.mount("https://", adapter)
+    try:
+        yield cassette
+    finally:
+        conn.session.adapters.clear()
+        for prefix, previous_adapter in previous_adapters.items():
+            conn.session.mount(prefix, previous_adapter)
+        if mode == "record":
+            cassette.save()
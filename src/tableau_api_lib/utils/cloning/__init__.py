@@ -4,3 +4,6 @@ from .schedules import clone_schedules, clone_schedule_state, override_schedule_
 from .users import clone_users
 from .groups import clone_groups
 from .datasources import clone_datasources
+from .engine import CloningEngine
+from .journal import CloningJournal
+from .planner import MigrationPlan, PlanItem, SiteSnapshot, plan_migration
@@ -5,8 +5,11 @@ import warnings
 
 from tableau_api_lib.utils.querying import get_workbooks_dataframe, get_projects_dataframe, get_datasources_dataframe, \
     get_workbook_connections_dataframe, get_datasource_connections_dataframe
-from tableau_api_lib.utils.filemod import modify_tableau_zipfile, set_temp_dirs, delete_temp_files
+from tableau_api_lib.utils.filemod import modify_tableau_files, raise_modification_errors, set_temp_dirs, \
+    delete_temp_files
 from tableau_api_lib.utils import flatten_dict_column, get_server_netloc
+from tableau_api_lib.utils.bulk_download import BulkDownloader
+from tableau_api_lib.utils.publish_queue import PublishQueue
 from tableau_api_lib.exceptions import ContentOverwriteDisabled
 
 
@@ -100,13 +103,22 @@ def get_credentials_df(file_path):
         return pd.DataFrame(columns=['serverAddress', 'userName', 'password', 'serverPort'])
 
 
-def download_datasources(conn_source, datasource_df, download_dir=None):
+def download_datasources(conn_source, datasource_df, download_dir=None, max_workers=4, max_bytes_per_second=None):
+    """
+    Downloads the datasources concurrently, naming each file after its datasource.
+    :param class conn_source: the source server connection
+    :param datasource_df: a DataFrame describing the datasources being downloaded
+    :param str download_dir: (optional) the directory the datasources are downloaded to
+    :param int max_workers: (optional) the number of datasources downloaded at the same time
+    :param float max_bytes_per_second: (optional) the combined download rate allowed across all downloads
+    :return: the BulkDownloadItem describing each download
+    """
     download_dir = download_dir or os.getcwd() + '/temp/datasources/source'
-    for index, datasource in datasource_df.iterrows():
-        with open(f"{download_dir}/{datasource['source_name']}.tdsx", 'wb') as file:
-            print("downloading datasource '{0}' to '{1}/{0}.tdsx'...".format(datasource['source_name'], download_dir))
-            response = conn_source.download_data_source(datasource_id=datasource['source_id'])
-            file.write(response.content)
+    print("downloading {} datasources to '{}'...".format(len(datasource_df), download_dir))
+    downloader = BulkDownloader(conn_source, download_dir, max_workers=max_workers,
+                                max_bytes_per_second=max_bytes_per_second, split_by_content_type=False)
+    downloader.add_dataframe('datasource', datasource_df, id_column='source_id', name_column='source_name')
+    return downloader.run()
 
 
 def get_credential_mappings(datasource_df, credentials_df):
@@ -152,26 +164,51 @@ def get_cloning_df(conn_source,
     return mapped_credentials_df
 
 
-def modify_datasources_by_project(conn_source, conn_target, source_project_dir, target_project_dir, extraction_dir):
-    for file in os.listdir(source_project_dir):
-        modify_tableau_zipfile(zipfile_path=source_project_dir + '/' + file,
-                               conn_source=conn_source, conn_target=conn_target,
-                               extraction_dir_path=extraction_dir,
-                               destination_dir_path=target_project_dir)
-        delete_temp_files(extraction_dir)
+def modify_datasources_by_project(conn_source, conn_target, source_project_dir, target_project_dir, extraction_dir=None,
+                                  connection_rules=None, max_workers=1):
+    """
+    Modifies the project's downloaded datasources, optionally in parallel, writing them to the target project directory.
+    :param class conn_source: the source server connection
+    :param class conn_target: the target server connection
+    :param str source_project_dir: the directory holding the downloaded datasources
+    :param str target_project_dir: the directory the modified datasources are written to
+    :param str extraction_dir: unused; datasources are modified without extracting them
+    :param list connection_rules: (optional) ConnectionRules applied to the connection elements of each file
+    :param int max_workers: (optional) the number of processes used; the default of 1 modifies the files one at a
+        time in this process, while more processes require the calling script to guard its entry point with
+        `if __name__ == '__main__':` (see modify_tableau_files)
+    :return: list of dicts describing each modified datasource
+    """
+    file_paths = [os.path.join(source_project_dir, file) for file in sorted(os.listdir(source_project_dir))]
+    results = modify_tableau_files(file_paths, conn_source, conn_target, target_project_dir,
+                                   connection_rules=connection_rules, max_workers=max_workers)
+    raise_modification_errors(results)
+    return results
 
 
-def publish_datasources_by_project(conn_target, project_datasources_df):
+def publish_datasources_by_project(conn_target, project_datasources_df, max_workers=4, max_bytes_per_second=None):
+    """
+    Publishes the project's datasources concurrently, recording the ID of each published datasource as 'target_id'.
+    :param class conn_target: the target server connection
+    :param project_datasources_df: a DataFrame describing the datasources being published
+    :param int max_workers: (optional) the number of datasources published at the same time
+    :param float max_bytes_per_second: (optional) the combined upload rate allowed across all publishes
+    :return: the DataFrame, including the 'target_id' column
+    """
+    publish_queue = PublishQueue(conn_target, max_workers=max_workers, max_bytes_per_second=max_bytes_per_second)
     for index, datasource in project_datasources_df.iterrows():
-        response = conn_target.publish_data_source(datasource_file_path=datasource['file_path'],
-                                                   datasource_name=datasource['source_name'],
-                                                   project_id=datasource['target_project_id'],
-                                                   connection_username=datasource['userName'],
-                                                   connection_password=datasource['password'],
-                                                   embed_credentials_flag=True if datasource['userName'] else False)
-        if response.status_code in [200, 201]:
-            project_datasources_df.at[index, 'target_id'] = response.json()['datasource']['id']
-        print(f"publish response for {datasource['source_name']}: ", response.json())
+        publish_queue.add('datasource',
+                          datasource['file_path'],
+                          datasource['source_name'],
+                          datasource['target_project_id'],
+                          task_id=index,
+                          connection_username=datasource['userName'],
+                          connection_password=datasource['password'],
+                          embed_credentials_flag=True if datasource['userName'] else False)
+    for task in publish_queue.run():
+        if task.status == task.SUCCEEDED:
+            project_datasources_df.at[task.task_id, 'target_id'] = task.content_id
+        print(f"publish response for {task.name}: ", task.response.json() if task.response is not None else task.error)
     return project_datasources_df
 
 
@@ -191,7 +228,8 @@ def clone_datasources_by_project(conn_source,
                                  mapped_credentials_df,
                                  temp_dir,
                                  project,
-                                 extraction_dir):
+                                 extraction_dir,
+                                 modify_workers=1):
     source_project_dir = f"{temp_dir}/datasources/source/{project}"
     target_project_dir = f"{temp_dir}/datasources/target/{project}"
     os.makedirs(source_project_dir, exist_ok=False)
@@ -201,7 +239,8 @@ def clone_datasources_by_project(conn_source,
         lambda file: f"{target_project_dir}/{file}.tdsx")
     project_datasources_df.fillna('', inplace=True)
     download_datasources(conn_source, project_datasources_df, download_dir=source_project_dir)
-    modify_datasources_by_project(conn_source, conn_target, source_project_dir, target_project_dir, extraction_dir)
+    modify_datasources_by_project(conn_source, conn_target, source_project_dir, target_project_dir, extraction_dir,
+                                  max_workers=modify_workers)
     published_datasources = publish_datasources_by_project(conn_target, project_datasources_df)
     update_datasources_by_project(conn_target, published_datasources)
 
@@ -211,7 +250,20 @@ def clone_datasources(conn_source,
                       datasource_ids=None,
                       credentials_file_path=None,
                       temp_dir=None,
-                      overwrite_policy=None):
+                      overwrite_policy=None,
+                      modify_workers=1):
+    """
+    Clones datasources from the source server to the target server.
+    :param class conn_source: the source server connection
+    :param class conn_target: the target server connection
+    :param list datasource_ids: (optional) the IDs of the datasources to clone; specifying no IDs clones all datasources
+    :param str credentials_file_path: (optional) the path to a CSV file with credentials for the connections
+    :param str temp_dir: (optional) designate the location where temp files will be stored
+    :param str overwrite_policy: (optional) set to 'overwrite' to overwrite content; defaults to not overwriting
+    :param int modify_workers: (optional) the number of processes modifying downloaded files; see
+        modify_datasources_by_project
+    :return: None
+    """
     temp_dir, extraction_dir = set_temp_dirs(temp_dir)
     try:
         mapped_credentials_df = get_cloning_df(conn_source,
@@ -224,6 +276,7 @@ def clone_datasources(conn_source,
                                          mapped_credentials_df,
                                          temp_dir,
                                          project,
-                                         extraction_dir)
+                                         extraction_dir,
+                                         modify_workers)
     finally:
         delete_temp_files(temp_dir)
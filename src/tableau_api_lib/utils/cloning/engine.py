@@ -0,0 +1,662 @@
+"""Migrates a site's users, groups, projects, datasources, flows, and workbooks as a graph of concurrent tasks.
+
+The `clone_*` functions each clone one kind of content serially, leaving it to the caller to run them in the right
+order. A `CloningEngine` instead models a migration as one task per object, each depending on the tasks whose content
+must exist first: a project waits for its parent project, a group for its members, and a workbook for its project and
+the published datasources it connects to. Up to `max_workers` tasks whose dependencies have succeeded run at the same
+time, so independent branches (the workbooks of two projects, or users and projects) progress together, and tasks
+depending on a failed task are skipped rather than attempted.
+
+Every task uses its own copies of the source and target connections. An optional request limit caps the combined rate
+of REST API requests sent by all tasks, an optional bandwidth limit caps the combined rate of downloads and uploads,
+and `stage_workers` caps the number of tasks of one stage running at once. `get_stage_stats` reports the timing and
+outcome of each stage. `add_site_migration` plans the migration with `plan_migration` and adds its tasks through
+`add_plan`, which also runs plans reviewed beforehand. With a `CloningJournal`, the outcome of each task is recorded as
+it finishes, and tasks whose object the journal records as cloned are not run again, so a failed or interrupted
+migration can be resumed.
+
+Example:
+    engine = CloningEngine(conn_source, conn_target, max_workers=8, max_requests_per_second=20)
+    engine.add_site_migration()
+    engine.add('schedules', clone_schedules)
+    engine.run()
+    print(engine.get_stage_stats())
+"""
+
+import collections
+import copy
+import functools
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Union
+
+import pandas as pd
+
+from tableau_api_lib.exceptions import ContentOverwriteDisabled
+from tableau_api_lib.utils.bulk_download import DOWNLOAD_METHODS
+from tableau_api_lib.utils.cloning.journal import CloningJournal
+from tableau_api_lib.utils.cloning.planner import CONTENT_STAGES, SITE_STAGES, MigrationPlan, PlanItem, \
+    plan_migration
+from tableau_api_lib.utils.filemod import get_connection_remap_rules, modify_tableau_file
+from tableau_api_lib.utils.publish_queue import PUBLISH_METHODS
+from tableau_api_lib.utils.upload import BandwidthLimiter, UploadSource
+
+DELETE_METHODS = {"datasource": "delete_data_source", "flow": "delete_flow", "workbook": "delete_workbook"}
+
+
+class CloningTask:
+    """One step of a migration, such as creating a project or publishing a workbook, and the outcome of running it.
+
+    Args:
+        task_id: The ID identifying the task within its engine.
+        stage: The kind of content the task clones, such as 'projects' or 'workbooks'; tasks are reported by stage.
+        func: The callable doing the work. It receives copies of the source and target connections, and for the tasks
+            added by the engine's `add_*` methods returns the LUID of the content on the target site.
+        depends_on: (optional) The tasks that must succeed before this one starts.
+        name: (optional) The name of the content being cloned.
+        source_id: (optional) The LUID of the content on the source site.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+    def __init__(
+        self,
+        task_id: Hashable,
+        stage: str,
+        func: Callable[[Any, Any], Any],
+        depends_on: Optional[Iterable["CloningTask"]] = None,
+        name: Optional[str] = None,
+        source_id: Optional[str] = None,
+    ):
+        self.task_id = task_id
+        self.stage = stage
+        self.func = func
+        self.depends_on = list(depends_on or [])
+        self.name = name
+        self.source_id = source_id
+        self.status = self.PENDING
+        self.result = None
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self.resumed = False
+
+    def __repr__(self) -> str:
+        return f"CloningTask(task_id='{self.task_id}', stage='{self.stage}', status='{self.status}')"
+
+    @property
+    def seconds(self) -> Optional[float]:
+        """Returns the time spent running the task, or None if it has not finished."""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    @property
+    def target_id(self) -> Optional[str]:
+        """Returns the LUID of the content on the target site, for succeeded tasks whose function returns one."""
+        if self.status != self.SUCCEEDED or not isinstance(self.result, str):
+            return None
+        return self.result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "task_id": self.task_id,
+            "stage": self.stage,
+            "name": self.name,
+            "source_id": self.source_id,
+            "target_id": self.target_id,
+            "status": self.status,
+            "resumed": self.resumed,
+            "error": None if self.error is None else str(self.error),
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "seconds": self.seconds,
+        }
+
+
+def _return_target_id(target_id: str, conn_source, conn_target) -> str:
+    return target_id
+
+
+def _raise_error(error: Exception, conn_source, conn_target) -> None:
+    raise error
+
+
+def _delete(delete_method: str, target_id: str, conn_source, conn_target) -> None:
+    getattr(conn_target, delete_method)(target_id).raise_for_status()
+
+
+def _get_response_id(response, singular: str) -> str:
+    """Returns the ID of the content a create or publish request responded with."""
+    response.raise_for_status()
+    return response.json()[singular]["id"]
+
+
+class CloningEngine:
+    """Runs cloning tasks concurrently, each once the tasks it depends on have succeeded.
+
+    Args:
+        conn_source: A signed-in TableauServerConnection to the source site; each task uses a copy of it.
+        conn_target: A signed-in TableauServerConnection to the target site; each task uses a copy of it.
+        max_workers: (optional) The maximum number of tasks running at the same time.
+        max_requests_per_second: (optional) The combined rate of REST API requests allowed across all tasks, on both
+            connections.
+        max_bytes_per_second: (optional) The combined rate of downloads and uploads allowed across all tasks.
+        stage_workers: (optional) The maximum number of tasks of particular stages running at the same time, such as
+            {'workbooks': 2}.
+        overwrite_policy: (optional) 'overwrite' to republish datasources, flows, and workbooks already on the target
+            site; otherwise their tasks fail with ContentOverwriteDisabled.
+        connection_rules: (optional) ConnectionRules applied to the connections of each datasource, flow, and workbook
+            before it is published; see `filemod.modify_tableau_file`.
+        temp_dir: (optional) The directory downloaded files are kept in while they are modified; defaults to the
+            system's temporary directory.
+        progress_callback: (optional) A callable receiving each CloningTask once it has finished.
+        journal: (optional) A CloningJournal, or the path to its file, recording the outcome of each task with a
+            `source_id`. Tasks the journal records as succeeded are marked as succeeded (and `resumed`) with their
+            recorded target LUID instead of being run.
+    """
+
+    def __init__(
+        self,
+        conn_source,
+        conn_target,
+        max_workers: int = 4,
+        max_requests_per_second: Optional[float] = None,
+        max_bytes_per_second: Optional[float] = None,
+        stage_workers: Optional[Dict[str, int]] = None,
+        overwrite_policy: Optional[str] = None,
+        connection_rules: Optional[list] = None,
+        temp_dir: Optional[str] = None,
+        progress_callback: Optional[Callable[[CloningTask], Any]] = None,
+        journal: Union[CloningJournal, str, None] = None,
+    ):
+        if max_workers < 1:
+            raise ValueError(f"At least one worker is required to clone content, not {max_workers}.")
+        if any(workers < 1 for workers in (stage_workers or {}).values()):
+            raise ValueError(f"At least one worker is required for each stage, not {stage_workers}.")
+        if overwrite_policy not in (None, "overwrite"):
+            raise ValueError(f"Invalid overwrite policy provided: '{overwrite_policy}'")
+        self.request_limiter = BandwidthLimiter(max_requests_per_second) if max_requests_per_second else None
+        self._conn_source = self._copy_connection(conn_source)
+        self._conn_target = self._copy_connection(conn_target)
+        self.max_workers = max_workers
+        self.bandwidth_limiter = BandwidthLimiter(max_bytes_per_second) if max_bytes_per_second else None
+        self.stage_workers = dict(stage_workers or {})
+        self.overwrite_policy = overwrite_policy
+        self.connection_rules = connection_rules
+        self.temp_dir = temp_dir
+        self.progress_callback = progress_callback
+        self.journal = CloningJournal.from_value(journal)
+        self.remap_rules = get_connection_remap_rules(conn_source, conn_target)
+        self.tasks: List[CloningTask] = []
+
+    def add(
+        self,
+        stage: str,
+        func: Callable[[Any, Any], Any],
+        depends_on: Optional[Iterable[CloningTask]] = None,
+        name: Optional[str] = None,
+        source_id: Optional[str] = None,
+        task_id: Optional[Hashable] = None,
+    ) -> CloningTask:
+        """Adds a task calling `func(conn_source, conn_target)`, returning its CloningTask.
+
+        Functions taking the source and target connections as their first two arguments, such as `clone_schedules`
+        and `clone_sites`, can be added as they are.
+
+        Args:
+            stage: The stage the task is reported under.
+            func: The callable doing the work; it receives copies of the source and target connections.
+            depends_on: (optional) Tasks from this engine that must succeed before this one starts.
+            name: (optional) The name of the content being cloned.
+            source_id: (optional) The LUID of the content on the source site.
+            task_id: (optional) The ID identifying the task; defaults to the task's position in the engine.
+        """
+        task_id = len(self.tasks) if task_id is None else task_id
+        task = CloningTask(task_id, stage, func, depends_on, name, source_id)
+        self.tasks.append(task)
+        return task
+
+    def add_existing(self, stage: str, target_id: str, name: Optional[str] = None,
+                     source_id: Optional[str] = None) -> CloningTask:
+        """Adds a task for content already on the target site, which succeeds with the content's target LUID."""
+        return self.add(stage, functools.partial(_return_target_id, target_id), name=name, source_id=source_id)
+
+    def add_user(self, user: Dict[str, Any]) -> CloningTask:
+        """Adds a task adding a user to the target site with the site role, name, and email it has on the source site.
+
+        Args:
+            user: The user's details, as returned by `get_users_on_site`.
+        """
+        return self.add("users", functools.partial(self._create_user, user), name=user["name"],
+                        source_id=user.get("id"))
+
+    def add_group(self, group: Dict[str, Any], member_tasks: Iterable[CloningTask] = ()) -> CloningTask:
+        """Adds a task creating a group on the target site and adding the users cloned by `member_tasks` to it.
+
+        Args:
+            group: The group's details, as returned by `query_groups`.
+            member_tasks: (optional) The tasks cloning the group's members.
+        """
+        member_tasks = list(member_tasks)
+        return self.add("groups", functools.partial(self._create_group, group, member_tasks), member_tasks,
+                        name=group["name"], source_id=group.get("id"))
+
+    def add_project(self, project: Dict[str, Any], parent_task: Optional[CloningTask] = None) -> CloningTask:
+        """Adds a task creating a project on the target site, within the project created by `parent_task`.
+
+        Args:
+            project: The project's details, as returned by `query_projects`.
+            parent_task: (optional) The task cloning the project's parent project.
+        """
+        depends_on = [parent_task] if parent_task else []
+        return self.add("projects", functools.partial(self._create_project, project, parent_task), depends_on,
+                        name=project["name"], source_id=project.get("id"))
+
+    def add_content(
+        self,
+        content_type: str,
+        item: Dict[str, Any],
+        project_task: CloningTask,
+        depends_on: Optional[Iterable[CloningTask]] = None,
+    ) -> CloningTask:
+        """Adds a task downloading a datasource, flow, or workbook, modifying it, and publishing it to the target site.
+
+        Connections referring to the source server and site are remapped to the target server and site, and the
+        engine's connection rules are applied. Embedded credentials are not cloned, as Tableau Server never returns
+        passwords.
+
+        Args:
+            content_type: One of 'datasource', 'flow', or 'workbook'.
+            item: The content's details, as returned by `query_data_sources`, `query_flows_for_site`, or
+                `query_workbooks_for_site`.
+            project_task: The task cloning the project the content is published to.
+            depends_on: (optional) Other tasks that must succeed first, such as those cloning the datasources a
+                workbook connects to.
+        """
+        if content_type not in CONTENT_STAGES:
+            raise ValueError(f"Unable to clone '{content_type}' content; expected one of {list(CONTENT_STAGES)}.")
+        func = functools.partial(self._publish_content, content_type, item, project_task)
+        return self.add(CONTENT_STAGES[content_type], func, [project_task] + list(depends_on or []),
+                        name=item["name"], source_id=item["id"])
+
+    def add_site_migration(self, stages: Iterable[str] = SITE_STAGES) -> List[CloningTask]:
+        """Adds the tasks migrating the source site's content to the target site, returning them.
+
+        The content of both sites is queried once, when this is called, and planned with `plan_migration`; see
+        `add_plan` for the tasks each planned action becomes. Nothing on the target site is deleted.
+
+        Args:
+            stages: (optional) The stages included, from 'users', 'groups', 'projects', 'datasources', 'flows', and
+                'workbooks'. Datasources, flows, and workbooks require 'projects'.
+        """
+        return self.add_plan(plan_migration(self._conn_source, self._conn_target, stages, self.max_workers))
+
+    def add_plan(self, plan: MigrationPlan, delete: bool = False) -> List[CloningTask]:
+        """Adds the tasks carrying out a migration plan, returning them.
+
+        Objects planned to be created are cloned with `add_user`, `add_group`, `add_project`, and `add_content`, and
+        skipped objects are reused through `add_existing`. Updated users and projects get the details they have on the
+        source site, and updated groups the members they are missing. Updated datasources, flows, and workbooks are
+        republished if the engine's overwrite policy is 'overwrite'; otherwise their tasks fail with
+        ContentOverwriteDisabled. New groups wait for their members, projects for their parent project, and content
+        for its project and (for workbooks) the published datasources its connections use.
+
+        Args:
+            plan: The MigrationPlan, from `plan_migration`.
+            delete: (optional) True to also delete the objects planned to be deleted from the target site; content is
+                deleted before the project it belongs to, and child projects before their parent.
+        """
+        first_task = len(self.tasks)
+        user_tasks = self._add_planned_users(plan)
+        self._add_planned_groups(plan, user_tasks)
+        project_tasks = self._add_planned_projects(plan)
+        datasource_tasks = collections.defaultdict(list)
+        for content_type in CONTENT_STAGES:
+            self._add_planned_content(plan, content_type, project_tasks, datasource_tasks)
+        if delete:
+            self._add_deletions(plan)
+        return self.tasks[first_task:]
+
+    def run(self) -> List[CloningTask]:
+        """Runs every pending task, returning all tasks once none are left running.
+
+        Raises:
+            ValueError: A task depends on a task from another engine, or the dependencies form a cycle.
+        """
+        self._resume_from_journal()
+        dependents, waiting_on = self._get_dependency_graph()
+        ready = collections.deque()
+        for task in self.tasks:
+            if task.status == CloningTask.PENDING and not waiting_on[task]:
+                ready.append(task)
+        running = {}
+        running_by_stage = collections.Counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tableau-api-lib-clone") as pool:
+            while ready or running:
+                for _ in range(len(ready)):
+                    task = ready.popleft()
+                    stage_full = running_by_stage[task.stage] >= self.stage_workers.get(task.stage, self.max_workers)
+                    if len(running) >= self.max_workers or stage_full:
+                        ready.append(task)
+                        continue
+                    task.status = CloningTask.RUNNING
+                    running_by_stage[task.stage] += 1
+                    running[pool.submit(self._run_task, task)] = task
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = running.pop(future)
+                    running_by_stage[task.stage] -= 1
+                    future.result()
+                    self._record(task)
+                    if self.progress_callback:
+                        self.progress_callback(task)
+                    self._release_dependents(task, dependents, waiting_on, ready)
+        return self.tasks
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Returns a DataFrame describing the status and timing of each task."""
+        return pd.DataFrame([task.to_dict() for task in self.tasks])
+
+    def get_stage_stats(self) -> pd.DataFrame:
+        """Returns a DataFrame with one row per stage, in the order stages were added.
+
+        Each row counts the stage's tasks by status and reports the time from its first task starting to its last
+        task finishing ('seconds'), along with the time its tasks spent running in total ('task_seconds').
+        """
+        statuses = [CloningTask.SUCCEEDED, CloningTask.FAILED, CloningTask.SKIPPED, CloningTask.PENDING]
+        columns = ["stage", "tasks"] + statuses + ["started_at", "finished_at", "seconds", "task_seconds"]
+        tasks_df = self.to_dataframe()
+        if tasks_df.empty:
+            return pd.DataFrame(columns=columns)
+        tasks_df["status"] = tasks_df["status"].replace(CloningTask.RUNNING, CloningTask.PENDING)
+        stats_df = tasks_df.groupby("stage", sort=False).agg(
+            tasks=("task_id", "size"),
+            started_at=("started_at", "min"),
+            finished_at=("finished_at", "max"),
+            task_seconds=("seconds", "sum"),
+        )
+        stats_df = stats_df.join(pd.crosstab(tasks_df["stage"], tasks_df["status"]).reindex(columns=statuses,
+                                                                                           fill_value=0))
+        stats_df["seconds"] = stats_df["finished_at"] - stats_df["started_at"]
+        return stats_df.reset_index()[columns]
+
+    def _get_dependency_graph(self):
+        """Returns the tasks depending on each task, and the unfinished tasks each pending task is waiting on."""
+        known = set(self.tasks)
+        dependents = collections.defaultdict(list)
+        waiting_on = {}
+        for task in self.tasks:
+            missing = [dependency.task_id for dependency in task.depends_on if dependency not in known]
+            if missing:
+                raise ValueError(f"The cloning task '{task.task_id}' depends on tasks from another engine: {missing}.")
+            for dependency in task.depends_on:
+                dependents[dependency].append(task)
+            waiting_on[task] = {dependency for dependency in task.depends_on
+                                if dependency.status != CloningTask.SUCCEEDED}
+        self._verify_acyclic(dependents, waiting_on)
+        for task in self.tasks:
+            if task.status == CloningTask.PENDING and any(
+                    dependency.status in (CloningTask.FAILED, CloningTask.SKIPPED) for dependency in waiting_on[task]):
+                self._skip(task)
+        return dependents, waiting_on
+
+    @staticmethod
+    def _verify_acyclic(dependents, waiting_on) -> None:
+        remaining = {task: len(dependencies) for task, dependencies in waiting_on.items()}
+        free = [task for task, count in remaining.items() if not count]
+        while free:
+            for dependent in dependents[free.pop()]:
+                if dependent in remaining and remaining[dependent]:
+                    remaining[dependent] -= 1
+                    if not remaining[dependent]:
+                        free.append(dependent)
+        cyclic = [task.task_id for task, count in remaining.items() if count]
+        if cyclic:
+            raise ValueError(f"The cloning tasks {cyclic} depend on themselves through their dependencies.")
+
+    def _release_dependents(self, task: CloningTask, dependents, waiting_on, ready) -> None:
+        finished = collections.deque([task])
+        while finished:
+            task = finished.popleft()
+            for dependent in dependents[task]:
+                if dependent.status != CloningTask.PENDING:
+                    continue
+                if task.status != CloningTask.SUCCEEDED:
+                    self._skip(dependent)
+                    finished.append(dependent)
+                    continue
+                waiting_on[dependent].discard(task)
+                if not waiting_on[dependent]:
+                    ready.append(dependent)
+
+    def _skip(self, task: CloningTask) -> None:
+        failed = [dependency.task_id for dependency in task.depends_on if dependency.status != CloningTask.SUCCEEDED]
+        task.status = CloningTask.SKIPPED
+        task.error = f"Skipped because these tasks did not succeed: {failed}."
+        self._record(task)
+        if self.progress_callback:
+            self.progress_callback(task)
+
+    def _resume_from_journal(self) -> None:
+        if self.journal is None:
+            return
+        for task in self.tasks:
+            if task.status != CloningTask.PENDING or task.source_id is None:
+                continue
+            entry = self.journal.get(task.stage, task.source_id)
+            if entry and entry["status"] == CloningJournal.SUCCEEDED:
+                task.status, task.result, task.resumed = CloningTask.SUCCEEDED, entry["target_id"], True
+
+    def _record(self, task: CloningTask) -> None:
+        if self.journal is not None and task.source_id is not None:
+            self.journal.record(task.stage, task.source_id, task.status, task.target_id, task.name, task.error)
+
+    def _run_task(self, task: CloningTask) -> None:
+        conn_source, conn_target = copy.copy(self._conn_source), copy.copy(self._conn_target)
+        task.started_at = time.time()
+        try:
+            task.result = task.func(conn_source, conn_target)
+            task.status = CloningTask.SUCCEEDED
+        except Exception as error:
+            task.error = error
+            task.status = CloningTask.FAILED
+        finally:
+            task.finished_at = time.time()
+
+    def _copy_connection(self, conn):
+        """Returns a copy of the connection whose requests wait on the engine's request limiter, if it has one."""
+        conn = copy.copy(conn)
+        if self.request_limiter:
+            conn.session = copy.copy(conn.session)
+            conn.session.hooks = dict(conn.session.hooks,
+                                      response=list(conn.session.hooks["response"]) + [self._limit_requests])
+        return conn
+
+    def _limit_requests(self, response, *args, **kwargs) -> None:
+        self.request_limiter.consume(1)
+
+    # migration plans
+
+    def _add_planned_users(self, plan: MigrationPlan) -> Dict[str, CloningTask]:
+        """Adds a task per user of the source site, returning them by the user's name in lowercase."""
+        user_tasks = {}
+        for item in plan.get_items("users"):
+            if item.source is None:
+                continue
+            if item.action == PlanItem.CREATE:
+                task = self.add_user(item.source)
+            elif item.action == PlanItem.UPDATE:
+                task = self.add("users", functools.partial(self._update_user, item.source, item.target_id),
+                                name=item.name, source_id=item.source_id)
+            else:
+                task = self.add_existing("users", item.target_id, item.name, item.source_id)
+            user_tasks[item.key] = task
+        return user_tasks
+
+    def _add_planned_groups(self, plan: MigrationPlan, user_tasks: Dict[str, CloningTask]) -> None:
+        for item in plan.get_items("groups"):
+            if item.source is None or (item.action == PlanItem.SKIP and item.target is None):
+                continue
+            if item.action == PlanItem.CREATE:
+                members = plan.source.group_members.get(item.source_id, [])
+                self.add_group(item.source, [user_tasks[member["name"].lower()] for member in members
+                                             if member["name"].lower() in user_tasks])
+            elif item.action == PlanItem.UPDATE:
+                member_tasks = [user_tasks[name.lower()] for name in item.changes["members"][1]
+                                if name.lower() in user_tasks]
+                func = functools.partial(self._add_group_members, item.target_id, member_tasks)
+                self.add("groups", func, member_tasks, name=item.name, source_id=item.source_id)
+            else:
+                self.add_existing("groups", item.target_id, item.name, item.source_id)
+
+    def _add_planned_projects(self, plan: MigrationPlan) -> Dict[str, CloningTask]:
+        """Adds a task per project of the source site, returning them by the project's source ID."""
+        project_tasks = {}
+        for item in plan.get_items("projects"):
+            if item.source is None:
+                continue
+            if item.action == PlanItem.CREATE:
+                task = self.add_project(item.source, project_tasks.get(item.source.get("parentProjectId")))
+            elif item.action == PlanItem.UPDATE:
+                task = self.add("projects", functools.partial(self._update_project, item.source, item.target_id),
+                                name=item.name, source_id=item.source_id)
+            else:
+                task = self.add_existing("projects", item.target_id, item.name, item.source_id)
+            project_tasks[item.source_id] = task
+        return project_tasks
+
+    def _add_planned_content(self, plan: MigrationPlan, content_type: str, project_tasks: Dict[str, CloningTask],
+                             datasource_tasks: Dict[str, List[CloningTask]]) -> None:
+        """Adds a task per datasource, flow, or workbook of the source site; tasks cloning datasources are added to
+        `datasource_tasks` by name, for the workbooks connecting to them to depend on."""
+        stage = CONTENT_STAGES[content_type]
+        for item in plan.get_items(stage):
+            if item.source is None or item.source["project"]["id"] not in project_tasks:
+                continue
+            project_task = project_tasks[item.source["project"]["id"]]
+            names = plan.source.workbook_datasource_names.get(item.source_id, []) if content_type == "workbook" else []
+            depends_on = [task for name in names for task in datasource_tasks.get(name, [])]
+            republish = item.action == PlanItem.UPDATE and self.overwrite_policy == "overwrite"
+            if item.action == PlanItem.CREATE or republish:
+                task = self.add_content(content_type, item.source, project_task, depends_on)
+            elif item.action == PlanItem.UPDATE:
+                func = functools.partial(_raise_error, ContentOverwriteDisabled(content_type))
+                task = self.add(stage, func, [project_task] + depends_on, name=item.name, source_id=item.source_id)
+            else:
+                task = self.add_existing(stage, item.target_id, item.name, item.source_id)
+            if content_type == "datasource":
+                datasource_tasks[item.name].append(task)
+
+    def _add_deletions(self, plan: MigrationPlan) -> None:
+        deletions_by_project = collections.defaultdict(list)
+        for content_type, stage in CONTENT_STAGES.items():
+            for item in plan.get_items(stage, PlanItem.DELETE):
+                task = self.add(stage, functools.partial(_delete, DELETE_METHODS[content_type], item.target_id),
+                                name=item.name)
+                deletions_by_project[item.target["project"]["id"]].append(task)
+        # children are deleted before their parents, so the deepest projects come first
+        project_items = sorted(plan.get_items("projects", PlanItem.DELETE), key=lambda item: len(item.key),
+                               reverse=True)
+        for item in project_items:
+            task = self.add("projects", functools.partial(_delete, "delete_project", item.target_id),
+                            deletions_by_project[item.target_id], name=item.name)
+            deletions_by_project[item.target.get("parentProjectId")].append(task)
+        for item in plan.get_items("groups", PlanItem.DELETE):
+            self.add("groups", functools.partial(_delete, "delete_group", item.target_id), name=item.name)
+        for item in plan.get_items("users", PlanItem.DELETE):
+            self.add("users", functools.partial(_delete, "remove_user_from_site", item.target_id), name=item.name)
+
+    # task functions
+
+    def _create_user(self, user: Dict[str, Any], conn_source, conn_target) -> str:
+        response = conn_target.add_user_to_site(user["name"], user["siteRole"], user.get("authSetting"))
+        user_id = _get_response_id(response, "user")
+        if user.get("fullName") or user.get("email"):
+            conn_target.update_user(user_id, new_full_name=user.get("fullName") or None,
+                                    new_email=user.get("email") or None).raise_for_status()
+        return user_id
+
+    @staticmethod
+    def _update_user(user: Dict[str, Any], user_id: str, conn_source, conn_target) -> str:
+        conn_target.update_user(user_id, new_full_name=user.get("fullName") or None,
+                                new_email=user.get("email") or None, new_site_role=user.get("siteRole")).raise_for_status()
+        return user_id
+
+    @staticmethod
+    def _create_group(group: Dict[str, Any], member_tasks: List[CloningTask], conn_source, conn_target) -> str:
+        group_id = _get_response_id(conn_target.create_group(group["name"]), "group")
+        for member_task in member_tasks:
+            conn_target.add_user_to_group(group_id, member_task.target_id).raise_for_status()
+        return group_id
+
+    @staticmethod
+    def _add_group_members(group_id: str, member_tasks: List[CloningTask], conn_source, conn_target) -> str:
+        for member_task in member_tasks:
+            conn_target.add_user_to_group(group_id, member_task.target_id).raise_for_status()
+        return group_id
+
+    @staticmethod
+    def _create_project(project: Dict[str, Any], parent_task: Optional[CloningTask], conn_source, conn_target) -> str:
+        response = conn_target.create_project(
+            project_name=project["name"],
+            project_description=project.get("description"),
+            content_permissions=project.get("contentPermissions", "ManagedByOwner"),
+            parent_project_id=parent_task.target_id if parent_task else None,
+        )
+        return _get_response_id(response, "project")
+
+    @staticmethod
+    def _update_project(project: Dict[str, Any], project_id: str, conn_source, conn_target) -> str:
+        conn_target.update_project(
+            project_id,
+            project_description=project.get("description"),
+            content_permissions=project.get("contentPermissions"),
+        ).raise_for_status()
+        return project_id
+
+    def _publish_content(self, content_type: str, item: Dict[str, Any], project_task: CloningTask, conn_source,
+                         conn_target) -> str:
+        download_method, id_arg, _ = DOWNLOAD_METHODS[content_type]
+        publish_method, file_arg, name_arg = PUBLISH_METHODS[content_type]
+        work_dir = tempfile.mkdtemp(prefix=f"{content_type}-", dir=self.temp_dir)
+        try:
+            source_dir, target_dir = os.path.join(work_dir, "source"), os.path.join(work_dir, "target")
+            os.makedirs(source_dir)
+            os.makedirs(target_dir)
+            download = getattr(conn_source, download_method)(**{id_arg: item["id"]}, destination=source_dir,
+                                                             file_stem=item["id"],
+                                                             progress_callback=self._get_progress_callback())
+            if not download.ok:
+                raise IOError(f"Unable to download the {content_type} '{item['name']}': HTTP {download.status_code}.")
+            modified = modify_tableau_file(download.file_path, target_dir, self.remap_rules, self.connection_rules)
+            if modified["error"]:
+                raise IOError(f"Unable to modify the {content_type} '{item['name']}': {modified['error']}")
+            source = UploadSource.from_value(modified["destination_path"])
+            source.bandwidth_limiter = self.bandwidth_limiter
+            publish_kwargs = {file_arg: source, name_arg: item["name"], "project_id": project_task.target_id}
+            if content_type == "workbook":
+                publish_kwargs["show_tabs_flag"] = str(item.get("showTabs")).lower() == "true"
+            return _get_response_id(getattr(conn_target, publish_method)(**publish_kwargs), content_type)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _get_progress_callback(self) -> Optional[Callable[[int, Optional[int]], None]]:
+        if not self.bandwidth_limiter:
+            return None
+        previously_written = [0]
+
+        def progress_callback(written: int, total: Optional[int]) -> None:
+            self.bandwidth_limiter.consume(written - previously_written[0])
+            previously_written[0] = written
+
+        return progress_callback
@@ -0,0 +1,155 @@
+"""Records the outcome of each cloned object, so that an interrupted or partly failed migration can resume.
+
+A `CloningJournal` is a JSON Lines file with one entry per cloning attempt: the stage (such as 'users' or
+'workbooks'), the object's LUID on the source site, its LUID on the target site once cloned, and whether the attempt
+succeeded. Entries are appended and flushed to disk as each object finishes, so recording stays cheap however many
+objects a migration clones, and a crash loses at most the entry being written. When the journal is read, the latest
+entry for each object wins.
+
+`CloningEngine` (through its `journal` argument), `clone_users`, and `clone_workbooks` consult the journal before
+cloning: objects recorded as succeeded are skipped, with their recorded target LUID, and everything else (including
+objects that failed) is cloned again.
+
+Example:
+    engine = CloningEngine(conn_source, conn_target, journal='migration.jsonl')
+    engine.add_site_migration()
+    engine.run()  # after fixing whatever failed, running the same migration again retries only the failed objects
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Union
+
+import pandas as pd
+
+_JOURNAL_LOCK = threading.Lock()
+
+
+class CloningJournal:
+    """A JSON Lines file mapping each cloned object's source LUID to its target LUID and the outcome of cloning it.
+
+    Args:
+        file_path: The path to the journal file, which is created when the first entry is recorded.
+    """
+
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+    def __init__(self, file_path: Union[str, os.PathLike]):
+        self.file_path = os.fspath(file_path)
+        self._entries = None
+
+    @classmethod
+    def from_value(cls, value: Union["CloningJournal", str, os.PathLike, None]) -> Optional["CloningJournal"]:
+        """Returns `value` as a CloningJournal, treating strings and paths as the location of the journal file."""
+        if value is None or isinstance(value, cls):
+            return value
+        return cls(value)
+
+    @staticmethod
+    def make_key(stage: str, source_id: Hashable) -> str:
+        """Returns the key identifying an object within the journal."""
+        return f"{stage}/{source_id}"
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the latest entry recorded for each object, keyed by stage and source LUID."""
+        with _JOURNAL_LOCK:
+            return dict(self._load())
+
+    def get(self, stage: str, source_id: Hashable) -> Optional[Dict[str, Any]]:
+        """Returns the latest entry recorded for the object, or None if it has none."""
+        with _JOURNAL_LOCK:
+            return self._load().get(self.make_key(stage, source_id))
+
+    def get_target_id(self, stage: str, source_id: Hashable) -> Optional[str]:
+        """Returns the object's LUID on the target site if it was cloned successfully, or None otherwise."""
+        entry = self.get(stage, source_id)
+        if entry is None or entry["status"] != self.SUCCEEDED:
+            return None
+        return entry["target_id"]
+
+    def get_completed(self, stage: str) -> Dict[str, Optional[str]]:
+        """Returns the target LUID of each object of the stage cloned successfully, keyed by its source LUID."""
+        with _JOURNAL_LOCK:
+            return {entry["source_id"]: entry["target_id"] for entry in self._load().values()
+                    if entry["stage"] == stage and entry["status"] == self.SUCCEEDED}
+
+    def record(
+        self,
+        stage: str,
+        source_id: Hashable,
+        status: str,
+        target_id: Optional[str] = None,
+        name: Optional[str] = None,
+        error: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """Appends an entry describing an attempt to clone the object, returning the entry.
+
+        Args:
+            stage: The stage the object belongs to, such as 'users' or 'workbooks'.
+            source_id: The object's LUID on the source site.
+            status: One of 'succeeded', 'failed', or 'skipped' (not attempted because a dependency failed).
+            target_id: (optional) The object's LUID on the target site.
+            name: (optional) The object's name.
+            error: (optional) The error the attempt failed with.
+        """
+        if status not in (self.SUCCEEDED, self.FAILED, self.SKIPPED):
+            raise ValueError(f"Invalid journal status '{status}'; expected 'succeeded', 'failed', or 'skipped'.")
+        with _JOURNAL_LOCK:
+            entries = self._load()
+            previous = entries.get(self.make_key(stage, source_id), {})
+            entry = {
+                "stage": stage,
+                "source_id": source_id,
+                "target_id": target_id,
+                "name": name,
+                "status": status,
+                "error": None if error is None else str(error),
+                "attempts": previous.get("attempts", 0) + (status != self.SKIPPED),
+                "recorded_at": time.time(),
+            }
+            with open(self.file_path, "ab+") as file:
+                line = json.dumps(entry).encode("utf-8") + b"\n"
+                if file.tell():
+                    file.seek(-1, os.SEEK_END)
+                    if file.read(1) != b"\n":
+                        line = b"\n" + line  # ends the line an interrupted write left incomplete
+                file.write(line)
+                file.flush()
+                os.fsync(file.fileno())
+            entries[self.make_key(stage, source_id)] = entry
+        return entry
+
+    def compact(self) -> None:
+        """Rewrites the journal with only the latest entry for each object."""
+        with _JOURNAL_LOCK:
+            entries = self._load()
+            temp_path = f"{self.file_path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                for entry in entries.values():
+                    file.write(json.dumps(entry) + "\n")
+            os.replace(temp_path, self.file_path)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Returns a DataFrame with the latest entry for each object."""
+        columns = ["stage", "source_id", "target_id", "name", "status", "error", "attempts", "recorded_at"]
+        return pd.DataFrame(list(self.entries().values()), columns=columns)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Reads the journal file once; a line left incomplete by an interrupted write is ignored."""
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.file_path, encoding="utf-8") as file:
+                    for line in file:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        self._entries[self.make_key(entry["stage"], entry["source_id"])] = entry
+            except FileNotFoundError:
+                pass
+        return self._entries
@@ -0,0 +1,404 @@
+"""Plans a site migration as a diff between snapshots of the source and target sites, without changing either site.
+
+The `clone_*` functions each find the content already on the target site with their own pandas merges, while cloning.
+`plan_migration` instead queries each site once into a `SiteSnapshot`, indexes the target's objects by their natural
+keys (a user or group by its name, a project by its path, and a datasource, flow, or workbook by its name and the path
+of its project), and looks up each source object in those indexes, so a plan takes time linear in the number of
+objects. Every object of either site gets one `PlanItem`, whose action is one of:
+
+- 'create': the object is only on the source site.
+- 'update': the object is on both sites but differs: a user's site role, name, or email; a group missing some of its
+  members; a project's description or content permissions; or content updated on the source site after it was last
+  published to the target site.
+- 'delete': the object is only on the target site.
+- 'skip': the object is on both sites and matches, or is not cloned (such as the 'All Users' group).
+
+Datasources, flows, and workbooks being created or updated carry an estimate of the bytes transferred to clone them,
+from the size (rounded to megabytes) Tableau Server reports for them. `CloningEngine.add_plan` runs a plan.
+
+Example:
+    plan = plan_migration(conn_source, conn_target)
+    print(plan.get_summary())
+    engine = CloningEngine(conn_source, conn_target, overwrite_policy='overwrite')
+    engine.add_plan(plan)
+    engine.run()
+"""
+
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from tableau_api_lib.utils.pagination import extract_pages
+
+SITE_STAGES = ("users", "groups", "projects", "datasources", "flows", "workbooks")
+CONTENT_STAGES = {"datasource": "datasources", "flow": "flows", "workbook": "workbooks"}
+CONTENT_QUERY_METHODS = {
+    "datasource": "query_data_sources",
+    "flow": "query_flows_for_site",
+    "workbook": "query_workbooks_for_site",
+}
+ALL_USERS_GROUP = "All Users"
+USER_FIELDS = ("siteRole", "fullName", "email")
+PROJECT_FIELDS = ("description", "contentPermissions")
+BYTES_PER_MEGABYTE = 1024 * 1024
+
+
+def _get_items(query_func, content_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Returns every item of a paginated listing; `extract_pages` returns [{}] for an empty listing."""
+    return [item for item in extract_pages(query_func, content_id) if item]
+
+
+def _get_published_datasource_names(conn, workbook: Dict[str, Any]) -> List[str]:
+    """Returns the names of the published datasources the workbook connects to."""
+    connections = conn.query_workbook_connections(workbook["id"]).json().get("connections", {}).get("connection", [])
+    return [connection["datasource"]["name"] for connection in connections
+            if connection.get("type") == "sqlproxy" and "datasource" in connection]
+
+
+def get_project_paths(projects: List[Dict[str, Any]]) -> Dict[str, Tuple[str, ...]]:
+    """Returns the path of each project, as the names of its ancestors and itself, keyed by the project's ID.
+
+    Args:
+        projects: The projects of a site, as returned by `query_projects`.
+    """
+    projects_by_id = {project["id"]: project for project in projects}
+    paths = {}
+
+    def get_path(project: Dict[str, Any]) -> Tuple[str, ...]:
+        if project["id"] not in paths:
+            parent = projects_by_id.get(project.get("parentProjectId"))
+            paths[project["id"]] = (get_path(parent) if parent else ()) + (project["name"],)
+        return paths[project["id"]]
+
+    for project in projects:
+        get_path(project)
+    return paths
+
+
+def get_estimated_bytes(item: Dict[str, Any]) -> int:
+    """Returns the approximate size in bytes of a datasource, flow, or workbook, or 0 if its size is not reported."""
+    try:
+        return int(float(item.get("size") or 0) * BYTES_PER_MEGABYTE)
+    except (TypeError, ValueError):
+        return 0
+
+
+class SiteSnapshot:
+    """The users, groups, projects, datasources, flows, and workbooks of a site, queried once.
+
+    Args:
+        stages: The stages the snapshot holds; the content of other stages is left empty.
+        users: The site's users, as returned by `get_users_on_site`.
+        groups: The site's groups, as returned by `query_groups`.
+        group_members: The members of each group (other than 'All Users'), keyed by the group's ID.
+        projects: The site's projects, as returned by `query_projects`.
+        content: The site's datasources, flows, and workbooks, keyed by content type.
+        workbook_datasource_names: (optional) The names of the published datasources each workbook connects to,
+            keyed by the workbook's ID.
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[str],
+        users: List[Dict[str, Any]],
+        groups: List[Dict[str, Any]],
+        group_members: Dict[str, List[Dict[str, Any]]],
+        projects: List[Dict[str, Any]],
+        content: Dict[str, List[Dict[str, Any]]],
+        workbook_datasource_names: Optional[Dict[str, List[str]]] = None,
+    ):
+        self.stages = tuple(stages)
+        self.users = users
+        self.groups = groups
+        self.group_members = group_members
+        self.projects = projects
+        self.content = {content_type: content.get(content_type, []) for content_type in CONTENT_STAGES}
+        self.workbook_datasource_names = workbook_datasource_names or {}
+        self.project_paths = get_project_paths(projects)
+
+    @classmethod
+    def from_connection(
+        cls,
+        conn,
+        stages: Iterable[str] = SITE_STAGES,
+        include_connections: bool = False,
+        max_workers: int = 4,
+    ) -> "SiteSnapshot":
+        """Queries the content of the connection's site.
+
+        Args:
+            conn: A signed-in TableauServerConnection.
+            stages: (optional) The stages queried, from 'users', 'groups', 'projects', 'datasources', 'flows', and
+                'workbooks'.
+            include_connections: (optional) True to also query the published datasources each workbook connects to.
+            max_workers: (optional) The number of group memberships and workbook connections queried at a time.
+        """
+        stages = tuple(stages)
+        users = _get_items(conn.get_users_on_site) if "users" in stages else []
+        groups = _get_items(conn.query_groups) if "groups" in stages else []
+        projects = _get_items(conn.query_projects) if "projects" in stages else []
+        content = {content_type: _get_items(getattr(conn, query_method))
+                   for content_type, query_method in CONTENT_QUERY_METHODS.items()
+                   if CONTENT_STAGES[content_type] in stages}
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tableau-api-lib-snapshot") as pool:
+            member_groups = [group for group in groups if group["name"] != ALL_USERS_GROUP]
+            members = pool.map(lambda group: _get_items(copy.copy(conn).get_users_in_group, group["id"]),
+                               member_groups)
+            group_members = dict(zip([group["id"] for group in member_groups], members))
+            workbook_datasource_names = {}
+            if include_connections and "datasources" in stages:
+                workbooks = content.get("workbook", [])
+                datasource_names = pool.map(lambda workbook: _get_published_datasource_names(copy.copy(conn), workbook),
+                                            workbooks)
+                workbook_datasource_names = dict(zip([workbook["id"] for workbook in workbooks], datasource_names))
+        return cls(stages, users, groups, group_members, projects, content, workbook_datasource_names)
+
+    def get_project_key(self, project_id: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """Returns the natural key of a project: the lowercase names of its ancestors and itself."""
+        path = self.project_paths.get(project_id)
+        return None if path is None else tuple(name.lower() for name in path)
+
+    def get_content_key(self, item: Dict[str, Any]) -> Tuple[Optional[Tuple[str, ...]], str]:
+        """Returns the natural key of a datasource, flow, or workbook: its project's key and its lowercase name."""
+        return self.get_project_key(item["project"]["id"]), item["name"].lower()
+
+
+class PlanItem:
+    """The action planned for one object of the source or target site.
+
+    Args:
+        stage: The stage the object belongs to, such as 'users' or 'workbooks'.
+        action: One of 'create', 'update', 'delete', or 'skip'.
+        key: The object's natural key, such as a username or a project path.
+        source: (optional) The object's details on the source site.
+        target: (optional) The object's details on the target site.
+        changes: (optional) The (target, source) value of each field being updated.
+        estimated_bytes: (optional) The approximate number of bytes transferred to clone the object.
+        reason: (optional) Why the object is skipped.
+    """
+
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+    SKIP = "skip"
+
+    def __init__(
+        self,
+        stage: str,
+        action: str,
+        key: Hashable,
+        source: Optional[Dict[str, Any]] = None,
+        target: Optional[Dict[str, Any]] = None,
+        changes: Optional[Dict[str, Tuple[Any, Any]]] = None,
+        estimated_bytes: int = 0,
+        reason: Optional[str] = None,
+    ):
+        self.stage = stage
+        self.action = action
+        self.key = key
+        self.source = source
+        self.target = target
+        self.changes = changes or {}
+        self.estimated_bytes = estimated_bytes
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return f"PlanItem(stage='{self.stage}', action='{self.action}', name={self.name!r})"
+
+    @property
+    def name(self) -> str:
+        return (self.source or self.target)["name"]
+
+    @property
+    def source_id(self) -> Optional[str]:
+        return self.source["id"] if self.source else None
+
+    @property
+    def target_id(self) -> Optional[str]:
+        return self.target["id"] if self.target else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stage": self.stage,
+            "action": self.action,
+            "name": self.name,
+            "key": self.key,
+            "source_id": self.source_id,
+            "target_id": self.target_id,
+            "changes": self.changes,
+            "estimated_bytes": self.estimated_bytes,
+            "reason": self.reason,
+        }
+
+
+class MigrationPlan:
+    """The actions migrating the source site's content to the target site, with the snapshots they were planned from.
+
+    Args:
+        source: The snapshot of the source site.
+        target: The snapshot of the target site.
+        items: One PlanItem per object of either site.
+    """
+
+    def __init__(self, source: SiteSnapshot, target: SiteSnapshot, items: List[PlanItem]):
+        self.source = source
+        self.target = target
+        self.items = items
+
+    @property
+    def stages(self) -> Tuple[str, ...]:
+        return self.source.stages
+
+    @property
+    def estimated_bytes(self) -> int:
+        """The approximate number of bytes transferred to clone the content being created or updated."""
+        return sum(item.estimated_bytes for item in self.items)
+
+    def get_items(self, stage: Optional[str] = None, action: Optional[str] = None) -> List[PlanItem]:
+        """Returns the items of the stage and action given, or of every stage or action if either is None."""
+        return [item for item in self.items
+                if (stage is None or item.stage == stage) and (action is None or item.action == action)]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        columns = ["stage", "action", "name", "key", "source_id", "target_id", "changes", "estimated_bytes", "reason"]
+        return pd.DataFrame([item.to_dict() for item in self.items], columns=columns)
+
+    def get_summary(self) -> pd.DataFrame:
+        """Returns the number of objects of each stage per action, and the estimated bytes transferred per stage."""
+        actions = [PlanItem.CREATE, PlanItem.UPDATE, PlanItem.DELETE, PlanItem.SKIP]
+        columns = ["stage"] + actions + ["estimated_bytes"]
+        plan_df = self.to_dataframe()
+        if plan_df.empty:
+            return pd.DataFrame(columns=columns)
+        counts = pd.crosstab(plan_df["stage"], plan_df["action"]).reindex(columns=actions, fill_value=0)
+        summary_df = counts.join(plan_df.groupby("stage")["estimated_bytes"].sum())
+        order = [stage for stage in self.stages if stage in summary_df.index]
+        return summary_df.reindex(order).reset_index()[columns]
+
+
+def _diff(
+    stage: str,
+    source_items: Iterable[Dict[str, Any]],
+    target_items: Iterable[Dict[str, Any]],
+    get_source_key,
+    get_target_key,
+    compare,
+) -> List[PlanItem]:
+    """Matches source and target items by their natural keys through a hash index of the target items, returning an
+    item per object. `compare(source, target)` returns the PlanItem for an object on both sites."""
+    target_index = {get_target_key(item): item for item in target_items}
+    items = []
+    for source in source_items:
+        key = get_source_key(source)
+        target = target_index.pop(key, None)
+        items.append(compare(key, source, target) if target else PlanItem(stage, PlanItem.CREATE, key, source))
+    items.extend(PlanItem(stage, PlanItem.DELETE, key, target=target) for key, target in target_index.items())
+    return items
+
+
+def _get_changes(source: Dict[str, Any], target: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Tuple[Any, Any]]:
+    """Returns the (target, source) value of each field the source object has a value for, where the values differ;
+    the REST API cannot clear a field, so empty source values are not compared."""
+    return {field: (target.get(field), source.get(field)) for field in fields
+            if source.get(field) and source.get(field) != target.get(field)}
+
+
+def _plan_users(source: SiteSnapshot, target: SiteSnapshot, signed_in_username: Optional[str]) -> List[PlanItem]:
+    def compare(key, source_user, target_user) -> PlanItem:
+        changes = _get_changes(source_user, target_user, USER_FIELDS)
+        return PlanItem("users", PlanItem.UPDATE if changes else PlanItem.SKIP, key, source_user, target_user, changes)
+
+    items = _diff("users", source.users, target.users, lambda user: user["name"].lower(),
+                  lambda user: user["name"].lower(), compare)
+    for item in items:
+        if item.action == PlanItem.DELETE and signed_in_username and item.key == signed_in_username.lower():
+            item.action, item.reason = PlanItem.SKIP, "The user is signed in to the target site."
+    return items
+
+
+def _plan_groups(source: SiteSnapshot, target: SiteSnapshot) -> List[PlanItem]:
+    def compare(key, source_group, target_group) -> PlanItem:
+        if key == ALL_USERS_GROUP.lower():
+            return PlanItem("groups", PlanItem.SKIP, key, source_group, target_group)
+        target_names = {member["name"].lower() for member in target.group_members.get(target_group["id"], [])}
+        missing = sorted(member["name"] for member in source.group_members.get(source_group["id"], [])
+                         if member["name"].lower() not in target_names)
+        if missing:
+            return PlanItem("groups", PlanItem.UPDATE, key, source_group, target_group, {"members": (None, missing)})
+        return PlanItem("groups", PlanItem.SKIP, key, source_group, target_group)
+
+    items = _diff("groups", source.groups, target.groups, lambda group: group["name"].lower(),
+                  lambda group: group["name"].lower(), compare)
+    for item in items:
+        if item.key == ALL_USERS_GROUP.lower() and item.action != PlanItem.SKIP:
+            item.action, item.reason = PlanItem.SKIP, "Every site has its own 'All Users' group."
+    return items
+
+
+def _plan_projects(source: SiteSnapshot, target: SiteSnapshot) -> List[PlanItem]:
+    def compare(key, source_project, target_project) -> PlanItem:
+        changes = _get_changes(source_project, target_project, PROJECT_FIELDS)
+        return PlanItem("projects", PlanItem.UPDATE if changes else PlanItem.SKIP, key, source_project, target_project,
+                        changes)
+
+    # parents are listed before their children, so the projects they are created in are planned first
+    source_projects = sorted(source.projects, key=lambda project: len(source.project_paths[project["id"]]))
+    return _diff("projects", source_projects, target.projects, lambda project: source.get_project_key(project["id"]),
+                 lambda project: target.get_project_key(project["id"]), compare)
+
+
+def _plan_content(source: SiteSnapshot, target: SiteSnapshot, content_type: str) -> List[PlanItem]:
+    stage = CONTENT_STAGES[content_type]
+
+    def compare(key, source_item, target_item) -> PlanItem:
+        # timestamps are ISO 8601 strings in UTC, so they sort chronologically
+        if (source_item.get("updatedAt") or "") > (target_item.get("updatedAt") or ""):
+            return PlanItem(stage, PlanItem.UPDATE, key, source_item, target_item,
+                            {"updatedAt": (target_item.get("updatedAt"), source_item.get("updatedAt"))},
+                            estimated_bytes=get_estimated_bytes(source_item))
+        return PlanItem(stage, PlanItem.SKIP, key, source_item, target_item)
+
+    items = _diff(stage, source.content[content_type], target.content[content_type], source.get_content_key,
+                  target.get_content_key, compare)
+    for item in items:
+        if item.action == PlanItem.CREATE:
+            item.estimated_bytes = get_estimated_bytes(item.source)
+    return items
+
+
+def plan_migration(conn_source, conn_target, stages: Iterable[str] = SITE_STAGES,
+                   max_workers: int = 4) -> MigrationPlan:
+    """Returns the plan for migrating the source site's content to the target site, leaving both sites unchanged.
+
+    Args:
+        conn_source: A signed-in TableauServerConnection to the source site.
+        conn_target: A signed-in TableauServerConnection to the target site.
+        stages: (optional) The stages planned, from 'users', 'groups', 'projects', 'datasources', 'flows', and
+            'workbooks'. Datasources, flows, and workbooks require 'projects'.
+        max_workers: (optional) The number of group memberships and workbook connections queried at a time.
+
+    Raises:
+        ValueError: An unknown stage is given, or content is planned without the 'projects' stage.
+    """
+    stages = set(stages)
+    unknown_stages = stages - set(SITE_STAGES)
+    if unknown_stages:
+        raise ValueError(f"Unknown stages {sorted(unknown_stages)}; expected stages from {list(SITE_STAGES)}.")
+    if stages & set(CONTENT_STAGES.values()) and "projects" not in stages:
+        raise ValueError("The 'projects' stage is required to clone datasources, flows, and workbooks.")
+    stages = [stage for stage in SITE_STAGES if stage in stages]
+    source = SiteSnapshot.from_connection(conn_source, stages, include_connections=True, max_workers=max_workers)
+    target = SiteSnapshot.from_connection(conn_target, stages, max_workers=max_workers)
+    items = []
+    if "users" in stages:
+        items.extend(_plan_users(source, target, getattr(conn_target, "username", None)))
+    if "groups" in stages:
+        items.extend(_plan_groups(source, target))
+    if "projects" in stages:
+        items.extend(_plan_projects(source, target))
+    for content_type, stage in CONTENT_STAGES.items():
+        if stage in stages:
+            items.extend(_plan_content(source, target, content_type))
+    return MigrationPlan(source, target, items)
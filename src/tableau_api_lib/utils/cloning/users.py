@@ -10,6 +10,9 @@ Logical Flow:
 7) for each user on the source connection, create a new user on the target connection as defined by the mapping file
     7a) if no mapping file is provided, create a new user on the target connection matching the source connection
 
+If a journal is provided, users it records as cloned are left out of steps 4-7, and each user created in step 7 is
+recorded in it, so an interrupted clone can be run again without overwriting the users it already cloned.
+
 *Note the limitation of Tableau Online: cannot update user full names... so they are stuck with a busted full name
 
 """
@@ -18,6 +21,7 @@ Logical Flow:
 import pandas as pd
 
 from tableau_api_lib.exceptions import ContentOverwriteDisabled
+from tableau_api_lib.utils.cloning.journal import CloningJournal
 from tableau_api_lib.utils.querying.users import get_users_dataframe
 
 
@@ -147,13 +151,32 @@ def delete_users(conn, target_user_df) -> list:
     return responses
 
 
-def create_users(conn_target, source_user_df, mapping_file_path, server_type) -> list:
+def record_created_user(journal, source_user_id, username, response) -> None:
+    """
+    Records the outcome of creating a user in the journal, if one is provided.
+    :param CloningJournal journal: the journal recording cloned users, or None
+    :param str source_user_id: the ID of the user on the source server
+    :param str username: the name of the user being created
+    :param response: the HTTP response from creating the user
+    :return: None
+    """
+    if journal is None:
+        return
+    if response.status_code == 201:
+        journal.record('users', source_user_id, journal.SUCCEEDED, target_id=response.json()['user']['id'],
+                       name=username)
+    else:
+        journal.record('users', source_user_id, journal.FAILED, name=username, error=response.text)
+
+
+def create_users(conn_target, source_user_df, mapping_file_path, server_type, journal=None) -> list:
     """
     Create users on the target server, based on user details from the source server.
     :param class conn_target: the target server connection
     :param DataFrame source_user_df: the source user DataFrame containing details for the users being created
     :param mapping_file_path: the file path to the user mapping file CSV
     :param server_type: (optional) the product variety ['tableau_server', 'tableau_online']
+    :param CloningJournal journal: (optional) a journal recording the outcome of creating each user
     :return: list of HTTP responses
     """
     responses = []
@@ -165,6 +188,7 @@ def create_users(conn_target, source_user_df, mapping_file_path, server_type) ->
                 user_name=row[field_prefix + 'username'],
                 site_role=row[field_prefix + 'site_role'],
                 auth_setting=row[field_prefix + 'auth_setting'])
+            record_created_user(journal, row['id'], row[field_prefix + 'username'], response)
             responses.append(response)
     if server_type == 'tableau_online':
         for index, row in source_user_df.iterrows():
@@ -172,6 +196,7 @@ def create_users(conn_target, source_user_df, mapping_file_path, server_type) ->
                 user_name=row[field_prefix + 'email'],
                 site_role=row[field_prefix + 'site_role'],
                 auth_setting=row[field_prefix + 'auth_setting'])
+            record_created_user(journal, row['id'], row[field_prefix + 'email'], response)
             responses.append(response)
     for response in responses:
         print(response.content)
@@ -267,12 +292,29 @@ def process_overlapping_usernames(conn_target,
     pass
 
 
+def remove_journaled_users(source_user_df, journal) -> pd.DataFrame:
+    """
+    Removes the users the journal records as already cloned from the source user DataFrame.
+    :param pd.DataFrame source_user_df: a Pandas DataFrame with source user details
+    :param CloningJournal journal: the journal recording cloned users, or None
+    :return: source_user_df
+    """
+    if journal is None:
+        return source_user_df
+    cloned_user_ids = journal.get_completed('users')
+    if cloned_user_ids:
+        print("skipping {} users already cloned according to the journal".format(
+            source_user_df['id'].isin(cloned_user_ids).sum()))
+    return source_user_df[~source_user_df['id'].isin(cloned_user_ids)]
+
+
 def clone_users(conn_source,
                 conn_target,
                 server_type='tableau_server',
                 usernames=None,
                 mapping_file_path=None,
-                overwrite_policy=None) -> list:
+                overwrite_policy=None,
+                journal=None) -> list:
     """
     Clones users from the source Tableau Server connection to the target Tableau Server connection.
     :param class conn_source: the source Tableau Server connection
@@ -281,15 +323,18 @@ def clone_users(conn_source,
     :param list usernames: (optional) a list of users to clone; if provided, only these users are cloned
     :param str mapping_file_path: (optional) the path to a file mapping users from source to target
     :param  overwrite_policy: (optional) must be set to 'overwrite' to enable overwriting existing content
+    :param journal: (optional) a CloningJournal, or the path to its file; users it records as cloned are skipped
     :return:
     """
+    journal = CloningJournal.from_value(journal)
     source_user_df = get_source_user_df(conn_source, usernames)
+    source_user_df = remove_journaled_users(source_user_df, journal)
     source_user_df = get_mapped_user_df(source_user_df, mapping_file_path)
     source_user_df = fill_expected_columns(source_user_df)
     target_user_df = get_target_user_df(conn_target, usernames)
     overlapping_usernames = get_overlapping_usernames(source_user_df, target_user_df, mapping_file_path)
     process_overlapping_usernames(conn_target, target_user_df, overlapping_usernames, overwrite_policy)
-    cloned_users = create_users(conn_target, source_user_df, mapping_file_path, server_type)
+    cloned_users = create_users(conn_target, source_user_df, mapping_file_path, server_type, journal)
     cloned_users = update_users(conn_target, source_user_df, mapping_file_path)
     # if server_type == 'tableau_server':
     #     cloned_users = update_users(conn_target, source_user_df, mapping_file_path)
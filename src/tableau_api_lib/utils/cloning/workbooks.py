@@ -6,6 +6,7 @@ workflow logic:
 4) if overwrite_policy == 'overwrite', then delete the overlapping workbooks on the target site
 5) if overwrite_policy == None, then throw an exception
 6) if overwrite_policy == 'merge', then proceed with cloning the non-overlapping workbooks and leave the others as is
+    6a) if a journal is provided, workbooks it records as cloned are left out of steps 3-7, and each publish is recorded
 7) for each workbook on the source site, build a clone of that workbook on the target site
     7a) for each workbook, query its connections
     7b) for each connection, check if it is a published data source
@@ -27,9 +28,12 @@ import os
 
 from tableau_api_lib.utils.querying import get_workbooks_dataframe, get_projects_dataframe, \
     get_embedded_datasources_dataframe
-from tableau_api_lib.utils.filemod import modify_tableau_zipfile, set_temp_dirs, delete_temp_files, \
-    replace_unzipped_xml_file
+from tableau_api_lib.utils.filemod import modify_tableau_files, raise_modification_errors, set_temp_dirs, \
+    delete_temp_files
 from tableau_api_lib.utils import flatten_dict_column, get_server_netloc
+from tableau_api_lib.utils.bulk_download import BulkDownloader
+from tableau_api_lib.utils.publish_queue import PublishQueue
+from tableau_api_lib.utils.cloning.journal import CloningJournal
 from tableau_api_lib.exceptions import ContentOverwriteDisabled
 
 
@@ -164,20 +168,32 @@ def get_workbook_file_type(response):
         raise Exception(f"An error occurred while downloading the workbook: status code {response.status_code}")
 
 
-def download_workbooks(conn_source, workbooks_df, download_dir=None, target_project_dir=None):
+def download_workbooks(conn_source, workbooks_df, download_dir=None, target_project_dir=None, max_workers=4,
+                       max_bytes_per_second=None):
+    """
+    Downloads the workbooks concurrently, returning a DataFrame with the path each workbook is modified into.
+    :param class conn_source: the source server connection
+    :param workbooks_df: a DataFrame describing the workbooks being downloaded
+    :param str download_dir: (optional) the directory the workbooks are downloaded to
+    :param str target_project_dir: (optional) the directory the modified workbooks are written to
+    :param int max_workers: (optional) the number of workbooks downloaded at the same time
+    :param float max_bytes_per_second: (optional) the combined download rate allowed across all downloads
+    :return: Pandas DataFrame
+    """
     download_dir = download_dir or os.getcwd() + '/temp/workbooks/source'
     target_project_dir = target_project_dir or os.getcwd() + '/temp/workbooks/target'
+    print("downloading {} workbooks to '{}'...".format(len(workbooks_df), download_dir))
+    downloader = BulkDownloader(conn_source, download_dir, max_workers=max_workers,
+                                max_bytes_per_second=max_bytes_per_second, split_by_content_type=False)
+    items = downloader.add_dataframe('workbook', workbooks_df, id_column='source_id', name_column='source_name')
+    downloader.run()
     workbook_file_names_df = pd.DataFrame()
-    for index, workbook in workbooks_df.iterrows():
-        response = conn_source.download_workbook(workbook_id=workbook['source_id'])
-        file_type = get_workbook_file_type(response)
-        print("downloading workbook '{0}' to '{1}/{0}.{2}'...".format(workbook['source_name'],
-                                                                      download_dir,
-                                                                      file_type))
-        with open(f"{download_dir}/{workbook['source_name']}.{file_type}", 'wb') as file:
-            file.write(response.content)
-        workbook_file_name_df = workbook[['source_name', 'source_project_name']].copy()
-        workbook_file_name_df['file_path'] = f"{target_project_dir}/{workbook['source_name']}.{file_type}"
+    for (index, workbook), item in zip(workbooks_df.iterrows(), items):
+        if item.result is None:
+            raise Exception(f"An error occurred while downloading the workbook: {item.error}")
+        file_type = get_workbook_file_type(item.result.response)
+        workbook_file_name_df = workbook[['source_name', 'source_project_name']].to_frame().T
+        workbook_file_name_df['file_path'] = f"{target_project_dir}/{item.file_stem}.{file_type}"
         workbook_file_names_df = pd.concat([workbook_file_names_df, workbook_file_name_df], ignore_index=True, sort=False)
     return workbook_file_names_df
 
@@ -189,19 +205,27 @@ def add_downloaded_file_names(workbooks_df, downloaded_file_names_df):
     return workbooks_df
 
 
-def modify_workbooks_by_project(conn_source, conn_target, source_project_dir, target_project_dir, extraction_dir):
-    for file in os.listdir(source_project_dir):
-        file_type = os.path.splitext(file)[-1]
-        if file_type == '.twbx':
-            modify_tableau_zipfile(zipfile_path=source_project_dir + '/' + file,
-                                   conn_source=conn_source, conn_target=conn_target,
-                                   extraction_dir_path=extraction_dir,
-                                   destination_dir_path=target_project_dir)
-        elif file_type == '.twb':
-            replace_unzipped_xml_file(file_path=source_project_dir + '/' + file,
-                                      conn_source=conn_source, conn_target=conn_target,
-                                      extraction_dir_path=target_project_dir)
-        delete_temp_files(extraction_dir)
+def modify_workbooks_by_project(conn_source, conn_target, source_project_dir, target_project_dir, extraction_dir=None,
+                                connection_rules=None, max_workers=1):
+    """
+    Modifies the project's downloaded workbooks, optionally in parallel, writing them to the target project directory.
+    :param class conn_source: the source server connection
+    :param class conn_target: the target server connection
+    :param str source_project_dir: the directory holding the downloaded workbooks
+    :param str target_project_dir: the directory the modified workbooks are written to
+    :param str extraction_dir: unused; workbooks are modified without extracting them
+    :param list connection_rules: (optional) ConnectionRules applied to the connection elements of each file
+    :param int max_workers: (optional) the number of processes used; the default of 1 modifies the files one at a
+        time in this process, while more processes require the calling script to guard its entry point with
+        `if __name__ == '__main__':` (see modify_tableau_files)
+    :return: list of dicts describing each modified workbook
+    """
+    file_paths = [os.path.join(source_project_dir, file) for file in sorted(os.listdir(source_project_dir))
+                  if os.path.splitext(file)[-1] in ['.twbx', '.twb']]
+    results = modify_tableau_files(file_paths, conn_source, conn_target, target_project_dir,
+                                   connection_rules=connection_rules, max_workers=max_workers)
+    raise_modification_errors(results)
+    return results
 
 
 def delete_workbooks(conn, workbook_details_df, workbook_names):
@@ -245,21 +269,44 @@ def process_overlapping_workbooks(conn_target,
     pass
 
 
-def publish_workbooks_by_project(conn_target, project_workbooks_df, project_workbook_credentials_df):
+def publish_workbooks_by_project(conn_target,
+                                 project_workbooks_df,
+                                 project_workbook_credentials_df,
+                                 max_workers=4,
+                                 max_bytes_per_second=None,
+                                 journal=None):
+    """
+    Publishes the project's workbooks concurrently, recording the ID of each published workbook as 'target_id'.
+    :param class conn_target: the target server connection
+    :param project_workbooks_df: a DataFrame describing the workbooks being published
+    :param project_workbook_credentials_df: a DataFrame describing the credentials for each workbook's connections
+    :param int max_workers: (optional) the number of workbooks published at the same time
+    :param float max_bytes_per_second: (optional) the combined upload rate allowed across all publishes
+    :param CloningJournal journal: (optional) a journal recording the outcome of publishing each workbook
+    :return: the DataFrame, including the 'target_id' column
+    """
+    publish_queue = PublishQueue(conn_target, max_workers=max_workers, max_bytes_per_second=max_bytes_per_second)
     for index, workbook in project_workbooks_df.iterrows():
         workbook_credentials_df = project_workbook_credentials_df.loc[
             project_workbook_credentials_df['source_workbook_name'] == workbook['source_name']]
-        response = conn_target.publish_workbook(workbook_file_path=workbook['file_path'],
-                                                workbook_name=workbook['source_name'],
-                                                project_id=workbook['target_project_id'],
-                                                server_address=workbook_credentials_df['serverAddress'].to_list(),
-                                                port_number=workbook_credentials_df['serverPort'].to_list(),
-                                                connection_username=workbook_credentials_df['userName'].to_list(),
-                                                connection_password=workbook_credentials_df['password'].to_list(),
-                                                embed_credentials_flag=workbook_credentials_df['embedPassword'].to_list())
-        print("publish response for {}:\n{}".format(workbook['source_name'], response.json()))
-        if response.status_code in [200, 201]:
-            project_workbooks_df.at[index, 'target_id'] = response.json()['workbook']['id']
+        publish_queue.add('workbook',
+                          workbook['file_path'],
+                          workbook['source_name'],
+                          workbook['target_project_id'],
+                          task_id=index,
+                          server_address=workbook_credentials_df['serverAddress'].to_list(),
+                          port_number=workbook_credentials_df['serverPort'].to_list(),
+                          connection_username=workbook_credentials_df['userName'].to_list(),
+                          connection_password=workbook_credentials_df['password'].to_list(),
+                          embed_credentials_flag=workbook_credentials_df['embedPassword'].to_list())
+    for task in publish_queue.run():
+        print("publish response for {}:\n{}".format(
+            task.name, task.response.json() if task.response is not None else task.error))
+        if task.status == task.SUCCEEDED:
+            project_workbooks_df.at[task.task_id, 'target_id'] = task.content_id
+        if journal is not None and task.status in (task.SUCCEEDED, task.FAILED):
+            journal.record('workbooks', project_workbooks_df.at[task.task_id, 'source_id'], task.status,
+                           target_id=task.content_id, name=task.name, error=task.error)
     return project_workbooks_df
 
 
@@ -269,7 +316,9 @@ def clone_workbooks_by_project(conn_source,
                                project_workbook_credentials_df,
                                temp_dir,
                                project,
-                               extraction_dir):
+                               extraction_dir,
+                               journal=None,
+                               modify_workers=1):
     source_project_dir = f"{temp_dir}/workbooks/source/{project}"
     target_project_dir = f"{temp_dir}/workbooks/target/{project}"
     os.makedirs(source_project_dir, exist_ok=False)
@@ -280,12 +329,14 @@ def clone_workbooks_by_project(conn_source,
         project_workbook_credentials_df['target_project_name_lower'] == str(project).lower()].copy()
     workbook_file_names_df = download_workbooks(conn_source, project_workbooks_df, download_dir=source_project_dir, target_project_dir=target_project_dir)
     project_workbooks_df = add_downloaded_file_names(project_workbooks_df, workbook_file_names_df)
-    modify_workbooks_by_project(conn_source, conn_target, source_project_dir, target_project_dir, extraction_dir)
+    modify_workbooks_by_project(conn_source, conn_target, source_project_dir, target_project_dir, extraction_dir,
+                                max_workers=modify_workers)
     project_workbooks_df.to_csv(project + '_project_workbooks_df.csv')
     project_workbook_credentials_df.to_csv(project + '_project_workbook_credentials_df.csv')
     print("project_workbooks_df:\n", project_workbooks_df['file_path'])
     print("project_workbook_credentials_df:\n", project_workbook_credentials_df)
-    published_workbooks = publish_workbooks_by_project(conn_target, project_workbooks_df, project_workbook_credentials_df)
+    published_workbooks = publish_workbooks_by_project(conn_target, project_workbooks_df, project_workbook_credentials_df,
+                                                       journal=journal)
     print("published_workbooks_df:\n", published_workbooks)
     # project_datasources = publish_datasources_by_project(conn_target, project_datasources_df)
     # update_datasources_by_project(conn_target, project_datasources)
@@ -297,7 +348,9 @@ def clone_workbooks(conn_source,
                     workbook_names=None,
                     credentials_file_path=None,
                     temp_dir=None,
-                    overwrite_policy=None):
+                    overwrite_policy=None,
+                    journal=None,
+                    modify_workers=1):
     """
     Clones workbooks from the source server to the target server.
     :param class conn_source: the source server connection
@@ -305,11 +358,21 @@ def clone_workbooks(conn_source,
     :param list workbook_names: (optional) a list of workbook names to clone; specifying no names clones all workbooks
     :param str temp_dir: (optional) designate the location where temp files will be stored
     :param str overwrite_policy: (optional) set to 'overwrite' to overwrite content; defaults to not overwriting
+    :param journal: (optional) a CloningJournal, or the path to its file; workbooks it records as cloned are skipped
+    :param int modify_workers: (optional) the number of processes modifying downloaded files; see
+        modify_workbooks_by_project
     :return: None
     """
-    temp_dir, extraction_dir = set_temp_dirs(temp_dir)
     validate_inputs(overwrite_policy)
+    journal = CloningJournal.from_value(journal)
     source_workbook_df = get_source_workbook_df(conn_source=conn_source, workbook_names=workbook_names)
+    if journal is not None:
+        cloned_workbook_ids = journal.get_completed('workbooks')
+        source_workbook_df = source_workbook_df[~source_workbook_df['source_id'].isin(cloned_workbook_ids)]
+        if source_workbook_df.empty:
+            print("every workbook has already been cloned according to the journal")
+            return
+    temp_dir, extraction_dir = set_temp_dirs(temp_dir)
     target_workbook_df = get_target_workbook_df(conn_target=conn_target, workbook_names=workbook_names)
     # refactor the overlapping checks to a new function: process_overwrite_policy()
     if any(target_workbook_df.columns):
@@ -327,7 +390,9 @@ def clone_workbooks(conn_source,
                                        project_workbook_credentials_df=project_workbook_credentials_df,
                                        temp_dir=temp_dir,
                                        project=project,
-                                       extraction_dir=extraction_dir)
+                                       extraction_dir=extraction_dir,
+                                       journal=journal,
+                                       modify_workers=modify_workers)
     finally:
         delete_temp_files(temp_dir)
     # -> update workbooks to have the correct owner (and other metadata)
@@ -0,0 +1,207 @@
+"""Rewrites attributes of the <connection> and <named-connection> elements of .twb, .tds, and .tfl files as they stream.
+
+`filemod.remap_xml_references` replaces text wherever it appears in a file, so it cannot tell one connection from
+another. A `ConnectionRule` instead changes one attribute of the connection elements whose other attributes match, such
+as `dbname` only for Snowflake connections, or `server` only where `class='sqlserver'`.
+
+`rewrite_connections` reads the document in chunks through expat's event-based parser and writes the output as it
+goes, so no DOM is built and memory use is bounded by the chunk size (plus the longest run of text between two tags).
+Only the values of rewritten attributes change; every other byte of the document is copied as it was, keeping quoting,
+attribute order, whitespace, and comments intact.
+
+Example:
+    rules = [
+        ConnectionRule('dbname', 'ANALYTICS_PROD', where={'class': 'snowflake'}),
+        ConnectionRule('server', 'sql-prod.example.com', old_value='sql-dev.example.com', where={'class': 'sqlserver'}),
+    ]
+    rewritten = rewrite_connections('sales.twb', 'target/sales.twb', rules)
+"""
+
+import collections
+import io
+import os
+import re
+from typing import BinaryIO, Callable, Collection, Deque, Dict, Iterable, List, Optional, Tuple, Union
+from xml.parsers import expat
+
+CONNECTION_ELEMENTS = ("connection", "named-connection")
+REWRITE_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+_START_TAG = re.compile(rb"<[^\s/>]+(?:\s+[^\s=/>]+\s*=\s*(?:\"[^\"]*\"|'[^']*'))*\s*/?>")
+_ATTRIBUTE = re.compile(rb"(\s+)([^\s=/>]+)(\s*=\s*)(\"[^\"]*\"|'[^']*')")
+_ESCAPES = {"&": "&amp;", "<": "&lt;", ">": "&gt;", "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"}
+
+NewValue = Union[str, Callable[[str, Dict[str, str]], Optional[str]]]
+
+
+class ConnectionRule:
+    """Sets one attribute of the connection elements matching the rule.
+
+    Args:
+        attribute: The attribute being rewritten, such as 'server', 'dbname', or 'username'. Elements without the
+            attribute are left unchanged.
+        new_value: The attribute's new value, or a callable receiving its current value and every attribute of the
+            element, and returning the new value (None leaves the attribute unchanged). Rules used with
+            `filemod.modify_tableau_files` are sent to other processes, so their callables must be module-level
+            functions.
+        old_value: (optional) Only rewrite the attribute where this is its current value.
+        where: (optional) Only rewrite elements whose attributes have these values; each value is either a string or
+            a collection of accepted strings, such as {'class': ('sqlserver', 'azure_sql_dw')}.
+        elements: (optional) The names of the elements the rule applies to.
+    """
+
+    def __init__(
+        self,
+        attribute: str,
+        new_value: NewValue,
+        old_value: Optional[str] = None,
+        where: Optional[Dict[str, Union[str, Collection[str]]]] = None,
+        elements: Iterable[str] = CONNECTION_ELEMENTS,
+    ):
+        self.attribute = attribute
+        self.new_value = new_value
+        self.old_value = old_value
+        self.where = {
+            name: (value,) if isinstance(value, str) else tuple(value) for name, value in (where or {}).items()
+        }
+        self.elements = tuple(elements)
+
+    def __repr__(self) -> str:
+        return f"ConnectionRule(attribute='{self.attribute}', old_value={self.old_value!r}, where={self.where})"
+
+    def get_new_value(self, element: str, attributes: Dict[str, str]) -> Optional[str]:
+        """Returns the attribute's new value for the element, or None if the rule does not change it."""
+        if element not in self.elements or self.attribute not in attributes:
+            return None
+        old_value = attributes[self.attribute]
+        if self.old_value is not None and old_value != self.old_value:
+            return None
+        if any(attributes.get(name) not in values for name, values in self.where.items()):
+            return None
+        new_value = self.new_value(old_value, attributes) if callable(self.new_value) else self.new_value
+        return None if new_value is None or new_value == old_value else new_value
+
+
+def _escape_attribute_value(value: str, quote: str) -> str:
+    escaped = "".join(_ESCAPES.get(character, character) for character in value)
+    return escaped.replace(quote, "&apos;" if quote == "'" else "&quot;")
+
+
+def rewrite_start_tag(tag: bytes, new_values: Dict[str, str], encoding: str = "utf-8") -> bytes:
+    """Returns a start tag with the values of the given attributes replaced, keeping their original quote marks.
+
+    Args:
+        tag: The start tag, from '<' through '>'.
+        new_values: The new value of each attribute being rewritten.
+        encoding: (optional) The encoding of the document the tag belongs to.
+    """
+    name_end = re.match(rb"<[^\s/>]+", tag).end()
+
+    def replace(match) -> bytes:
+        name = match.group(2).decode(encoding)
+        if name not in new_values:
+            return match.group(0)
+        quote = match.group(4)[:1].decode(encoding)
+        value = _escape_attribute_value(new_values[name], quote).encode(encoding)
+        return match.group(1) + match.group(2) + match.group(3) + match.group(4)[:1] + value + match.group(4)[:1]
+
+    return tag[:name_end] + _ATTRIBUTE.sub(replace, tag[name_end:])
+
+
+class _StreamingRewriter:
+    """Feeds a document to expat, holding only the bytes not yet known to be free of pending rewrites."""
+
+    def __init__(self, rules: List[ConnectionRule], write: Callable[[bytes], object], encoding: str):
+        self.rules = rules
+        self.elements = {element for rule in rules for element in rule.elements}
+        self.write = write
+        self.encoding = encoding
+        self.buffer = bytearray()
+        self.buffer_offset = 0  # the document offset of the first byte in the buffer
+        self.edits: Deque[Tuple[int, Dict[str, str]]] = collections.deque()
+        self.rewritten: List[Dict[str, str]] = []
+        self.parser = expat.ParserCreate()
+        self.parser.StartElementHandler = self._start_element
+
+    def feed(self, data: bytes, is_final: bool = False) -> None:
+        self.buffer += data
+        self.parser.Parse(data, is_final)
+        # outside a handler, CurrentByteIndex is just past the last event parsed, so every tag starting before it has
+        # been seen; expat may hold back the end of the data until more of it arrives
+        self._flush(None if is_final else max(self.parser.CurrentByteIndex, self.buffer_offset))
+
+    def _start_element(self, name: str, attributes: Dict[str, str]) -> None:
+        if name not in self.elements:
+            return
+        new_values = {}
+        for rule in self.rules:
+            new_value = rule.get_new_value(name, {**attributes, **new_values})
+            if new_value is not None:
+                new_values[rule.attribute] = new_value
+        if new_values:
+            self.edits.append((self.parser.CurrentByteIndex, new_values))
+            changes = {attribute: (attributes[attribute], new_value) for attribute, new_value in new_values.items()}
+            self.rewritten.append({"element": name, "attributes": changes})
+
+    def _flush(self, up_to: Optional[int]) -> None:
+        """Writes the buffered bytes before `up_to` (all of them if None), rewriting the tags starting before it."""
+        written = 0
+        while self.edits and (up_to is None or self.edits[0][0] < up_to):
+            offset, new_values = self.edits.popleft()
+            tag_start = offset - self.buffer_offset
+            match = _START_TAG.match(self.buffer, tag_start)
+            if match is None:
+                raise ValueError(f"Unable to locate the start tag at byte {offset} of the document.")
+            self.write(bytes(self.buffer[written:tag_start]))
+            self.write(rewrite_start_tag(match.group(0), new_values, self.encoding))
+            written = match.end()
+        end = len(self.buffer) if up_to is None else max(up_to - self.buffer_offset, written)
+        if end > written:
+            self.write(bytes(self.buffer[written:end]))
+        del self.buffer[:end]
+        self.buffer_offset += end
+
+
+def rewrite_connections(
+    source: Union[str, os.PathLike, BinaryIO],
+    destination: Union[str, os.PathLike, BinaryIO],
+    rules: Iterable[ConnectionRule],
+    chunk_size: int = REWRITE_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> List[Dict[str, str]]:
+    """Streams a .twb, .tds, or .tfl document from source to destination, applying the rules to its connections.
+
+    Rules are applied in order to each element, so a later rule sees the values set by earlier ones. Returns a list
+    with one dict per rewritten element, holding the element's name and the (old, new) value of each attribute changed
+    under 'attributes'.
+
+    Args:
+        source: The path of the document, or a binary file object it is read from.
+        destination: The path the rewritten document is written to, or a binary file object.
+        rules: The ConnectionRules applied to the document's connection elements.
+        chunk_size: (optional) The number of bytes read and parsed at a time.
+        encoding: (optional) The encoding of the document.
+
+    Raises:
+        xml.parsers.expat.ExpatError: The document is not well-formed XML.
+    """
+    source_file = source if hasattr(source, "read") else open(source, "rb")
+    destination_file = destination if hasattr(destination, "write") else open(destination, "wb")
+    try:
+        rewriter = _StreamingRewriter(list(rules), destination_file.write, encoding)
+        for chunk in iter(lambda: source_file.read(chunk_size), b""):
+            rewriter.feed(chunk)
+        rewriter.feed(b"", is_final=True)
+    finally:
+        if source_file is not source:
+            source_file.close()
+        if destination_file is not destination:
+            destination_file.close()
+    return rewriter.rewritten
+
+
+def rewrite_connections_text(text: str, rules: Iterable[ConnectionRule]) -> str:
+    """Returns the text of a .twb, .tds, or .tfl document with the rules applied to its connections."""
+    destination = io.BytesIO()
+    rewrite_connections(io.BytesIO(text.encode("utf-8")), destination, rules)
+    return destination.getvalue().decode("utf-8")
@@ -0,0 +1,194 @@
+"""Streams downloaded workbooks, datasources, and flows to disk in bounded chunks.
+
+`TableauServerConnection.download_workbook` and its siblings return a response whose whole body is held in memory,
+which for multi-GB extracts means multi-GB of RAM. The `download_*_to_file` methods instead stream the body to a file
+path or file object in chunks of `chunk_size` bytes, so memory use stays flat regardless of the file size.
+
+When writing to a path, the content is written to a temporary file in the same directory and renamed into place once
+complete, so an interrupted download never leaves a truncated file behind. The SHA-256 checksum of the content is
+computed while it is written, and a progress callback receives the number of bytes written after each chunk.
+
+Example:
+    result = conn.download_workbook_to_file(workbook_id, 'backups/', include_extract=False, progress_callback=print)
+    print(result.file_path, result.size, result.sha256)
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import time
+from typing import Any, BinaryIO, Callable, Dict, Optional, Union
+
+import requests
+
+from tableau_api_lib.utils.download_cache import CACHE_HEADER
+from tableau_api_lib.utils.metrics import record_bytes_downloaded
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+FILE_EXTENSIONS = {
+    "workbook": ("twb", "twbx"),
+    "datasource": ("tds", "tdsx"),
+    "flow": ("tfl", "tflx"),
+    "view_image": ("png", "png"),
+    "view_pdf": ("pdf", "pdf"),
+    "view_data": ("csv", "csv"),
+}
+
+ProgressCallback = Callable[[int, Optional[int]], Any]
+
+
+class DownloadResult:
+    """Describes content streamed to a file.
+
+    Args:
+        response: The HTTP response the content was read from.
+        file_path: (optional) The path of the file written, if known.
+        size: (optional) The number of bytes written.
+        sha256: (optional) The SHA-256 checksum of the bytes written, as a hex string.
+        seconds: (optional) The time spent downloading and writing the content.
+    """
+
+    def __init__(
+        self,
+        response: requests.Response,
+        file_path: Optional[str] = None,
+        size: int = 0,
+        sha256: Optional[str] = None,
+        seconds: float = 0.0,
+    ):
+        self.response = response
+        self.file_path = file_path
+        self.size = size
+        self.sha256 = sha256
+        self.seconds = seconds
+
+    def __repr__(self) -> str:
+        return f"DownloadResult(status_code={self.status_code}, file_path='{self.file_path}', size={self.size})"
+
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code
+
+    @property
+    def ok(self) -> bool:
+        """Returns True if the content was downloaded and written."""
+        return self.status_code == 200 and self.sha256 is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status_code": self.status_code,
+            "file_path": self.file_path,
+            "size": self.size,
+            "sha256": self.sha256,
+            "seconds": self.seconds,
+        }
+
+
+def get_file_name(response: requests.Response) -> Optional[str]:
+    """Returns the file name from the response's 'Content-Disposition' header, or None if it has none."""
+    content_disposition = response.headers.get("Content-Disposition", "")
+    match = re.search(r'filename="?([^";]+)"?', content_disposition)
+    return os.path.basename(match.group(1)) if match else None
+
+
+def get_file_extension(response: requests.Response, content_variety: str) -> str:
+    """Returns the extension of the downloaded file, such as 'twb' or 'twbx' for a workbook.
+
+    As in `cloning.workbooks.get_workbook_file_type`, XML content is an unpackaged file and binary content is a
+    packaged (zipped) file; for other content types, the extension of the file name Tableau Server reports is used.
+    """
+    unpackaged, packaged = FILE_EXTENSIONS[content_variety]
+    content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    if content_type == "application/xml":
+        return unpackaged
+    if content_type == "application/octet-stream":
+        return packaged
+    file_name = get_file_name(response)
+    if file_name and "." in file_name:
+        return file_name.rsplit(".", 1)[-1]
+    return packaged
+
+
+def _resolve_file_path(
+    response: requests.Response, destination: str, content_variety: str, file_stem: Optional[str]
+) -> str:
+    if not os.path.isdir(destination):
+        return destination
+    extension = get_file_extension(response, content_variety)
+    if file_stem:
+        file_name = f"{file_stem}.{extension}"
+    else:
+        file_name = get_file_name(response) or f"{content_variety}.{extension}"
+    return os.path.join(destination, file_name)
+
+
+def _write_chunks(
+    response: requests.Response, file: BinaryIO, chunk_size: int, progress_callback: Optional[ProgressCallback]
+):
+    content_length = response.headers.get("Content-Length")
+    total = int(content_length) if content_length and "Content-Encoding" not in response.headers else None
+    hasher = hashlib.sha256()
+    written = 0
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            file.write(chunk)
+            hasher.update(chunk)
+            written += len(chunk)
+            if progress_callback:
+                progress_callback(written, total)
+    finally:
+        # streamed bodies are not counted by the connection's response hook; cached content is not downloaded at all
+        if response.headers.get(CACHE_HEADER) != "hit":
+            record_bytes_downloaded(response.url, written)
+    if total is not None and written != total:
+        raise IOError(f"The download ended after {written} of {total} bytes.")
+    return written, hasher.hexdigest()
+
+
+def save_response(
+    response: requests.Response,
+    destination: Union[str, os.PathLike, BinaryIO],
+    content_variety: str,
+    file_stem: Optional[str] = None,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    progress_callback: Optional[ProgressCallback] = None,
+) -> DownloadResult:
+    """Streams the body of a response sent with `stream=True` to a file.
+
+    Error responses are read into memory as usual and nothing is written; check the result's `ok` property.
+
+    Args:
+        response: The streamed HTTP response.
+        destination: A file path, a directory, or a binary file object. Files in a directory are named after the file
+            name Tableau Server reports, or after `file_stem` with the extension matching the downloaded content.
+        content_variety: One of 'workbook', 'datasource', 'flow', 'view_image', 'view_pdf', or 'view_data'.
+        file_stem: (optional) The name, without extension, of the file written to a directory.
+        chunk_size: (optional) The number of bytes read and written at a time.
+        progress_callback: (optional) A callable receiving the number of bytes written so far and the total number of
+            bytes (None if unknown) after each chunk.
+
+    Raises:
+        IOError: The response ended before all of the content announced by its 'Content-Length' was received.
+    """
+    start = time.perf_counter()
+    if response.status_code != 200:
+        response.content
+        return DownloadResult(response, seconds=time.perf_counter() - start)
+    if hasattr(destination, "write"):
+        size, sha256 = _write_chunks(response, destination, chunk_size, progress_callback)
+        file_path = getattr(destination, "name", None)
+        return DownloadResult(response, file_path, size, sha256, time.perf_counter() - start)
+
+    file_path = _resolve_file_path(response, os.fspath(destination), content_variety, file_stem)
+    directory, file_name = os.path.split(os.path.abspath(file_path))
+    file_descriptor, temp_path = tempfile.mkstemp(prefix=f".{file_name}.", suffix=".part", dir=directory)
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            size, sha256 = _write_chunks(response, file, chunk_size, progress_callback)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return DownloadResult(response, file_path, size, sha256, time.perf_counter() - start)
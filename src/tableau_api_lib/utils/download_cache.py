@@ -0,0 +1,268 @@
+"""Serves repeated downloads of unchanged workbooks and datasources from a local, size-bounded cache.
+
+A `DownloadCache` keeps the content of downloaded workbooks and datasources in a directory, alongside the version of
+the content on Tableau Server when it was downloaded. The version is the number and publish time of the item's latest
+revision (from `get_workbook_revisions` or `get_data_source_revisions`), or its 'updatedAt' time if its revisions
+cannot be queried. Downloading an item whose version has not moved since it was cached costs one or two small
+metadata requests instead of the full download, which turns repeated backups into incremental ones.
+
+The least recently used items are evicted once the cached content exceeds `max_bytes`.
+
+Example:
+    download_cache = DownloadCache('download_cache', max_bytes=50 * 1024 ** 3)
+    response = conn.download_workbook(workbook_id, download_cache=download_cache)
+    print(response.headers[CACHE_HEADER])  # 'hit' or 'miss'
+"""
+
+import copy
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, BinaryIO, Dict, Optional, Union
+
+import requests
+
+from tableau_api_lib.utils.metrics import record_cache_lookup
+
+CACHE_HEADER = "X-Tableau-Api-Lib-Cache"
+CACHED_HEADERS = ("Content-Type", "Content-Disposition")
+DEFAULT_MAX_BYTES = 10 * 1024 ** 3  # 10GB
+INDEX_FILE_NAME = "index.json"
+
+_CACHE_LOCK = threading.Lock()
+
+
+def get_content_version(conn, content_variety: str, content_id: str) -> Optional[str]:
+    """Returns the version of a workbook or datasource on Tableau Server, or None if it could not be determined.
+
+    Args:
+        conn: A signed-in TableauServerConnection; the queries use a copy of it.
+        content_variety: Either 'workbook' or 'datasource'.
+        content_id: The LUID of the content.
+    """
+    conn = copy.copy(conn)
+    if content_variety == "workbook":
+        get_revisions, query_content = conn.get_workbook_revisions, conn.query_workbook
+    elif content_variety == "datasource":
+        get_revisions, query_content = conn.get_data_source_revisions, conn.query_data_source
+    else:
+        raise ValueError(f"Unable to cache '{content_variety}' downloads; expected 'workbook' or 'datasource'.")
+    response = get_revisions(content_id, parameter_dict={"pageSize": "pageSize=1"})
+    if response.status_code == 200:
+        total_available = int(response.json().get("pagination", {}).get("totalAvailable") or 0)
+        if total_available > 1:
+            parameter_dict = {"pageSize": "pageSize=1", "pageNumber": f"pageNumber={total_available}"}
+            response = get_revisions(content_id, parameter_dict=parameter_dict)
+    if response.status_code == 200:
+        revisions = response.json().get("revisions", {}).get("revision", [])
+        if revisions:
+            return f"revision:{revisions[-1].get('revisionNumber')}@{revisions[-1].get('publishedAt')}"
+    response = query_content(content_id)
+    if response.status_code == 200:
+        updated_at = response.json().get(content_variety, {}).get("updatedAt")
+        if updated_at:
+            return f"updatedAt:{updated_at}"
+    return None
+
+
+class DownloadCache:
+    """Stores downloaded content in a directory, keyed by download URL, and evicts the least recently used content.
+
+    Args:
+        directory: The directory holding the cached content and its index, which is created when needed.
+        max_bytes: (optional) The most content, in bytes, kept in the cache.
+        name: (optional) The name the cache's hits and misses are recorded under, as the `cache` label of the
+            `tableau_api_lib_cache_hits` and `tableau_api_lib_cache_misses` metrics.
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike], max_bytes: int = DEFAULT_MAX_BYTES,
+                 name: str = "download_cache"):
+        if max_bytes <= 0:
+            raise ValueError(f"The download cache must hold a positive number of bytes, not {max_bytes}.")
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_value(cls, value: Union["DownloadCache", str, os.PathLike, None],
+                   name: str = "download_cache") -> Optional["DownloadCache"]:
+        """Returns `value` as a DownloadCache, treating strings and paths as the location of the cache directory."""
+        if value is None or isinstance(value, cls):
+            return value
+        return cls(value, name=name)
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_FILE_NAME)
+
+    @property
+    def size(self) -> int:
+        """Returns the number of bytes of content in the cache."""
+        return sum(entry["size"] for entry in self.entries().values())
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the cached entries, keyed by download URL."""
+        try:
+            with open(self.index_path, encoding="utf-8") as file:
+                return json.load(file).get("entries", {})
+        except FileNotFoundError:
+            return {}
+
+    def open(self, key: str, version: Optional[str], max_age: Optional[float] = None):
+        """Returns the cached entry and an open binary file of its content, marking the entry as recently used.
+
+        Returns (None, None) if no content is cached for the key, the cached content is not the current version, or
+        it was cached more than `max_age` seconds ago.
+        """
+        if version is None:
+            return None, None
+        with _CACHE_LOCK:
+            entries = self.entries()
+            entry = entries.get(key)
+            if entry is None or entry["version"] != version:
+                self._record_lookup(hit=False)
+                return None, None
+            if max_age is not None and time.time() - entry.get("stored_at", 0) > max_age:
+                self._record_lookup(hit=False)
+                return None, None
+            try:
+                file = open(os.path.join(self.directory, entry["file_name"]), "rb")
+            except FileNotFoundError:
+                del entries[key]
+                self._write_index(entries)
+                self._record_lookup(hit=False)
+                return None, None
+            entry["last_used_at"] = time.time()
+            self._write_index(entries)
+            self._record_lookup(hit=True)
+            return entry, file
+
+    def _record_lookup(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        record_cache_lookup(self.name, hit)
+
+    def get_response(self, key: str, version: Optional[str]) -> Optional[requests.Response]:
+        """Returns the cached content as an HTTP 200 response built locally, or None if nothing current is cached."""
+        entry, file = self.open(key, version)
+        if entry is None:
+            return None
+        with file:
+            return build_cached_response(key, entry, file.read())
+
+    def store(self, key: str, version: Optional[str], source_path: str, headers: Dict[str, str]) -> bool:
+        """Copies the content of a file into the cache, returning False if it was not cached.
+
+        Content is not cached if its version is unknown or it alone would exceed the cache's `max_bytes`.
+        """
+        def write(file):
+            with open(source_path, "rb") as source:
+                shutil.copyfileobj(source, file)
+
+        return self._store(key, version, os.path.getsize(source_path), headers, write)
+
+    def store_response(self, key: str, version: Optional[str], response: requests.Response) -> bool:
+        """Caches the content of a successful download response, returning False if it was not cached."""
+        if response.status_code != 200:
+            return False
+        content = response.content
+        return self._store(key, version, len(content), response.headers, lambda file: file.write(content))
+
+    def _store(self, key: str, version: Optional[str], size: int, headers, write) -> bool:
+        if version is None or size > self.max_bytes:
+            return False
+        os.makedirs(self.directory, exist_ok=True)
+        file_name = hashlib.sha256(f"{key}\0{version}".encode("utf-8")).hexdigest()
+        file_descriptor, temp_path = tempfile.mkstemp(prefix=f".{file_name}.", suffix=".part", dir=self.directory)
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                write(file)
+            os.replace(temp_path, os.path.join(self.directory, file_name))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        with _CACHE_LOCK:
+            entries = self.entries()
+            previous = entries.pop(key, None)
+            if previous is not None and previous["file_name"] != file_name:
+                self._remove_file(previous["file_name"])
+            entries[key] = {
+                "file_name": file_name,
+                "version": version,
+                "size": size,
+                "headers": {name: headers[name] for name in CACHED_HEADERS if name in headers},
+                "stored_at": time.time(),
+                "last_used_at": time.time(),
+            }
+            self._evict(entries)
+            self._write_index(entries)
+        return True
+
+    def discard(self, key: str) -> None:
+        """Removes the content cached for the download URL."""
+        with _CACHE_LOCK:
+            entries = self.entries()
+            entry = entries.pop(key, None)
+            if entry is not None:
+                self._remove_file(entry["file_name"])
+                self._write_index(entries)
+
+    def clear(self) -> None:
+        """Removes all cached content."""
+        with _CACHE_LOCK:
+            for entry in self.entries().values():
+                self._remove_file(entry["file_name"])
+            self._write_index({})
+
+    def _evict(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        total_size = sum(entry["size"] for entry in entries.values())
+        for key in sorted(entries, key=lambda entry_key: entries[entry_key]["last_used_at"]):
+            if total_size <= self.max_bytes:
+                break
+            entry = entries.pop(key)
+            self._remove_file(entry["file_name"])
+            total_size -= entry["size"]
+
+    def _remove_file(self, file_name: str) -> None:
+        try:
+            os.remove(os.path.join(self.directory, file_name))
+        except FileNotFoundError:
+            pass
+
+    def _write_index(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"entries": entries}, file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.index_path)
+
+
+def build_cached_response(url: str, entry: Dict[str, Any], content: Union[bytes, BinaryIO]) -> requests.Response:
+    """Returns an HTTP 200 response built locally from cached content; its `CACHE_HEADER` header is set to 'hit'.
+
+    Args:
+        url: The download URL the content was cached for.
+        entry: The cached entry describing the content.
+        content: The content, or an open binary file streaming it when read through `iter_content`.
+    """
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response.url = url
+    response.headers.update(entry.get("headers", {}))
+    response.headers["Content-Length"] = str(entry["size"])
+    response.headers[CACHE_HEADER] = "hit"
+    if isinstance(content, bytes):
+        response._content = content
+    else:
+        response.raw = content
+    return response
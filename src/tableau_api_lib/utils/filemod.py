@@ -1,40 +1,129 @@
+import copy
 import os
+import re
 import shutil
+import struct
+import time
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from tableau_api_lib import TableauServerConnection
 from tableau_api_lib.utils.common import get_server_netloc
+from tableau_api_lib.utils.connection_rewriter import rewrite_connections_text
 
+TABLEAU_XML_EXTENSIONS = ['.twb', '.tds', '.tfl']
+ZIP_LOCAL_HEADER_SIZE = 30
+ZIP_DATA_DESCRIPTOR_FLAG = 0x08
+ZIP64_EXTRA_ID = 0x0001
+ZIP_COPY_BLOCK_SIZE = 1024 * 1024
 
-def remap_xml_references(file, conn_source, conn_target) -> str:
+
+def get_attribute_remap_rules(attribute, old_value, new_value) -> dict:
+    """
+    Get the rules replacing one value of an XML attribute with another, in both quoting forms used by Tableau files.
+    :param str attribute: the attribute name, such as 'server' or 'dbname'
+    :param str old_value: the value being replaced
+    :param str new_value: the replacement value
+    :return: dict mapping each text being replaced to its replacement
+    """
+    return {
+        "{}='{}'".format(attribute, old_value): "{}='{}'".format(attribute, new_value),
+        "{}=&apos;{}&apos;".format(attribute, old_value): "{}=&apos;{}&apos;".format(attribute, new_value),
+    }
+
+
+def get_connection_remap_rules(conn_source, conn_target) -> dict:
+    """
+    Get the rules replacing references to the source server and site with references to the target server and site.
+    :param TableauServerConnection conn_source: the source Tableau Server connection
+    :param TableauServerConnection conn_target: the target Tableau Server connection
+    :return: dict mapping each text being replaced to its replacement
+    """
+    source_server, target_server = conn_source.server, conn_target.server
+    source_netloc, target_netloc = get_server_netloc(source_server), get_server_netloc(target_server)
+    return {
+        "xml:base='{}'".format(source_server): "xml:base='{}'".format(target_server),
+        "xml:base=&apos;{}".format(source_server): "xml:base=&apos;{}".format(target_server),
+        "path='/t/{}/".format(conn_source.site_url): "path='/t/{}/".format(conn_target.site_url),
+        "path=&apos;/t/{}/".format(conn_source.site_url): "path=&apos;/t/{}/".format(conn_target.site_url),
+        "site='{}'".format(conn_source.site_url): "site='{}'".format(conn_target.site_url),
+        "site=&apos;{}".format(conn_source.site_url): "site=&apos;{}".format(conn_target.site_url),
+        "server='{}'".format(source_netloc): "server='{}'".format(target_netloc),
+        "server=&apos;{}".format(source_netloc): "server=&apos;{}".format(target_netloc),
+    }
+
+
+@lru_cache(maxsize=32)
+def _compile_remap_rules(rules):
+    """
+    Compile the rules into one regular expression, along with the replacement for each of its groups.
+    Rules containing '=' are matched from their first '=' (with the text before it checked by a lookbehind), so the
+    search skips straight from one '=' to the next; longer rules take precedence over shorter ones.
+    :param tuple rules: (text being replaced, replacement) pairs
+    :return: the compiled pattern, and a list of (text before the match, replacement) indexed by group number
+    """
+    rules = sorted(((old, new) for old, new in rules if old and old != new), key=lambda rule: -len(rule[0]))
+    if not rules:
+        return None, []
+    anchored = all('=' in old for old, new in rules)
+    alternatives, replacements = [], [None]
+    for old, new in rules:
+        if anchored:
+            prefix, rest = old.split('=', 1)
+            alternatives.append('(?<={})({})'.format(re.escape(prefix + '='), re.escape(rest)))
+            replacements.append((prefix, new))
+        else:
+            alternatives.append('({})'.format(re.escape(old)))
+            replacements.append(('', new))
+    pattern = '=(?:{})'.format('|'.join(alternatives)) if anchored else '|'.join(alternatives)
+    return re.compile(pattern), replacements
+
+
+def remap_text(file, rules) -> str:
+    """
+    Replaces each occurrence of the rules' texts with their replacements, in a single scan of the text.
+    Replacements are never rescanned, so one rule's replacement is never modified by another rule.
+    :param str file: the file contents as a string of text
+    :param dict rules: maps each text being replaced to its replacement
+    :return: file contents as a string of text
+    """
+    pattern, replacements = _compile_remap_rules(tuple(rules.items()))
+    if pattern is None:
+        return file
+    if all(new.startswith(prefix) for prefix, new in replacements[1:]):
+        # the text before each match is kept, so only the remainder of each replacement is substituted
+        tails = [None] + [new[len(prefix):] for prefix, new in replacements[1:]]
+        return pattern.sub(lambda match: tails[match.lastindex], file)
+    pieces = []
+    position = 0
+    for match in pattern.finditer(file):
+        prefix, new = replacements[match.lastindex]
+        pieces.append(file[position:match.start() - len(prefix)])
+        pieces.append(new)
+        position = match.end()
+    pieces.append(file[position:])
+    return ''.join(pieces)
+
+
+def remap_xml_references(file, conn_source, conn_target, remap_rules=None) -> str:
     """
     Replaces any reference to the source server with a reference to the target server.
     :param str file: the file contents as a string of text
     :param TableauServerConnection conn_source: the source Tableau Server connection
     :param TableauServerConnection conn_target: the target Tableau Server connection
+    :param dict remap_rules: (optional) additional texts to replace, mapped to their replacements, such as the rules
+    from get_attribute_remap_rules; these are applied in the same scan as the server and site references
     :return: file contents as a string of text
     """
-    file = file.replace("xml:base='{}'".format(conn_source.server),
-                        "xml:base='{}'".format(conn_target.server))
-    file = file.replace("xml:base=&apos;{}".format(conn_source.server),
-                        "xml:base=&apos;{}".format(conn_target.server))
-    file = file.replace("path='/t/{}/".format(conn_source.site_url),
-                        "path='/t/{}/".format(conn_target.site_url))
-    file = file.replace("path=&apos;/t/{}/".format(conn_source.site_url),
-                        "path=&apos;/t/{}/".format(conn_target.site_url))
-    file = file.replace("site='{}'".format(conn_source.site_url),
-                        "site='{}'".format(conn_target.site_url))
-    file = file.replace("site=&apos;{}".format(conn_source.site_url),
-                        "site=&apos;{}".format(conn_target.site_url))
-    file = file.replace("server='{}'".format(get_server_netloc(conn_source.server)),
-                        "server='{}'".format(get_server_netloc(conn_target.server)))
-    file = file.replace("server=&apos;{}".format(get_server_netloc(conn_source.server)),
-                        "server=&apos;{}".format(get_server_netloc(conn_target.server)))
-    return file
+    rules = get_connection_remap_rules(conn_source, conn_target)
+    rules.update(remap_rules or {})
+    return remap_text(file, rules)
 
 
 def copy_dir_to_zip(path, zip_file_obj) -> None:
     """
-    Copies any extracted contents (excluding .tds or .twb) to the new zipfile object.
+    Copies any extracted contents (excluding .tds or .twb) to the new zipfile object, keeping their paths relative to
+    the extraction directory.
     :param str path: the path to the desired extracted files and directories
     :param zipfile.ZipFile zip_file_obj: the destination zipfile object
     :return: None
@@ -46,28 +135,120 @@ def copy_dir_to_zip(path, zip_file_obj) -> None:
             for file in files:
                 filename, file_extension = os.path.splitext(file)
                 if file_extension not in ['.twb', '.tds']:
-                    # zip_file_obj.write(os.path.join(root, file))
-                    dir_to_write = os.path.split(root)[-1]
-                    zip_file_obj.write(os.path.join(root, file), arcname=os.path.join(f'Data/{dir_to_write}', file))
+                    file_path = os.path.join(root, file)
+                    arcname = os.path.relpath(file_path, path).replace(os.sep, '/')
+                    zip_file_obj.write(file_path, arcname=arcname)
 
 
-def replace_unzipped_xml_file(file_path, conn_source, conn_target, extraction_dir_path) -> None:
+def _strip_zip64_extra(extra) -> bytes:
+    """
+    Remove the Zip64 extended information from a member's extra field; it is rewritten when the member is written.
+    :param bytes extra: the member's extra field
+    :return: bytes
+    """
+    stripped = b''
+    position = 0
+    while position + 4 <= len(extra):
+        header_id, size = struct.unpack('<HH', extra[position:position + 4])
+        if header_id != ZIP64_EXTRA_ID:
+            stripped += extra[position:position + 4 + size]
+        position += 4 + size
+    return stripped
+
+
+def copy_raw_zip_member(source_file, member, destination_zip) -> None:
+    """
+    Copy a member's compressed bytes from a zipped file into another zipfile object, without decompressing them.
+    :param source_file: the zipped file holding the member, opened in binary mode
+    :param zipfile.ZipInfo member: the member being copied
+    :param zipfile.ZipFile destination_zip: the destination zipfile object, opened in write mode
+    :return: None
+    """
+    source_file.seek(member.header_offset)
+    header = source_file.read(ZIP_LOCAL_HEADER_SIZE)
+    name_length, extra_length = struct.unpack('<HH', header[26:30])
+    source_file.seek(member.header_offset + ZIP_LOCAL_HEADER_SIZE + name_length + extra_length)
+    copied_member = copy.copy(member)
+    copied_member.flag_bits &= ~ZIP_DATA_DESCRIPTOR_FLAG
+    copied_member.extra = _strip_zip64_extra(member.extra)
+    # zipfile has no public API for writing raw member data; this mirrors what ZipFile.open(mode='w') does, without
+    # passing the data through a compressor
+    with destination_zip._lock:
+        destination_zip.fp.seek(destination_zip.start_dir)
+        copied_member.header_offset = destination_zip.fp.tell()
+        destination_zip.fp.write(copied_member.FileHeader())
+        remaining = member.compress_size
+        while remaining:
+            block = source_file.read(min(ZIP_COPY_BLOCK_SIZE, remaining))
+            if not block:
+                raise zipfile.BadZipFile(f"The member '{member.filename}' ended before its recorded size.")
+            destination_zip.fp.write(block)
+            remaining -= len(block)
+        destination_zip.filelist.append(copied_member)
+        destination_zip.NameToInfo[copied_member.filename] = copied_member
+        destination_zip.start_dir = destination_zip.fp.tell()
+        destination_zip._didModify = True
+
+
+def is_tableau_xml_member(member) -> bool:
+    """
+    Check whether a zipped file's member is the .twb, .tds, or .tfl file at the root of a packaged Tableau file.
+    :param zipfile.ZipInfo member: the member being checked
+    :return: bool
+    """
+    return '/' not in member.filename and os.path.splitext(member.filename)[1].lower() in TABLEAU_XML_EXTENSIONS
+
+
+def rewrite_tableau_zipfile(zipfile_path, destination_path, rewrite_xml) -> list:
+    """
+    Write a copy of a .twbx, .tdsx, or .tflx file whose .twb, .tds, or .tfl file is rewritten.
+    Every other member is copied as its raw compressed bytes, so extracts are neither extracted to disk nor
+    decompressed and recompressed; members keep their paths, and members in 'TwbxExternalCache' are left out.
+    :param str zipfile_path: path to the zipped file being rewritten
+    :param str destination_path: path to the rewritten zipped file
+    :param rewrite_xml: a callable receiving the text of the .twb, .tds, or .tfl file and returning its new text
+    :return: list of the names of the rewritten members
+    """
+    rewritten = []
+    with zipfile.ZipFile(zipfile_path) as source_zip, open(zipfile_path, 'rb') as source_file, \
+            zipfile.ZipFile(destination_path, 'w', zipfile.ZIP_DEFLATED) as destination_zip:
+        for member in source_zip.infolist():
+            if 'TwbxExternalCache' in member.filename:
+                continue
+            if is_tableau_xml_member(member):
+                file_contents = rewrite_xml(str(source_zip.read(member), 'utf-8'))
+                rewritten_member = zipfile.ZipInfo(member.filename, date_time=member.date_time)
+                rewritten_member.compress_type = zipfile.ZIP_DEFLATED
+                rewritten_member.external_attr = member.external_attr
+                destination_zip.writestr(rewritten_member, file_contents.encode('utf-8'))
+                rewritten.append(member.filename)
+            else:
+                copy_raw_zip_member(source_file, member, destination_zip)
+    if not rewritten:
+        os.remove(destination_path)
+        raise Exception(f"No .tds or .twb files were discovered in the zipped file '{zipfile_path}'.")
+    return rewritten
+
+
+def replace_unzipped_xml_file(file_path, conn_source, conn_target, extraction_dir_path, remap_rules=None) -> None:
     """
     Replace a .twb or .tds file, which was added as-is and not zipped.
     :param str file_path:
     :param TableauServerConnection conn_source: the source Tableau Server connection
     :param TableauServerConnection conn_target: the target Tableau Server connection
     :param str extraction_dir_path: path to the directory where the replacement file will be written
+    :param dict remap_rules: (optional) additional texts to replace; see remap_xml_references
     :return: None
     """
     with open(file_path, 'r', encoding='utf-8') as original_file:
         file_contents = original_file.read()
-        file_contents = remap_xml_references(file_contents, conn_source, conn_target)
+        file_contents = remap_xml_references(file_contents, conn_source, conn_target, remap_rules)
     with open(extraction_dir_path + '/' + os.path.basename(file_path), 'w', encoding='utf-8') as new_file:
         new_file.write(file_contents)
 
 
-def replace_zipped_xml_file(conn_source, conn_target, zip_file, tableau_file_base, extraction_dir_path) -> None:
+def replace_zipped_xml_file(conn_source, conn_target, zip_file, tableau_file_base, extraction_dir_path,
+                            remap_rules=None) -> None:
     """
     Replace a .twbx or .tdsx file, which was downloaded as a zipped file.
     :param TableauServerConnection conn_source: the source Tableau Server connection
@@ -75,11 +256,12 @@ def replace_zipped_xml_file(conn_source, conn_target, zip_file, tableau_file_bas
     :param zipfile.ZipFile zip_file: the zipfile object
     :param str tableau_file_base: the Tableau file name
     :param str extraction_dir_path: path to the directory where the replacement file will be written
+    :param dict remap_rules: (optional) additional texts to replace; see remap_xml_references
     :return: None
     """
     with zip_file.open(tableau_file_base, 'r') as file:
         file_contents = str(file.read(), 'utf-8')
-        file_contents = remap_xml_references(file_contents, conn_source, conn_target)
+        file_contents = remap_xml_references(file_contents, conn_source, conn_target, remap_rules)
     with open(extraction_dir_path + '/' + tableau_file_base, 'w', encoding='utf-8') as new_file:
         new_file.write(file_contents)
 
@@ -115,25 +297,101 @@ def get_tableau_filenames(origin_path, extract_dir_path) -> (str, str):
     return origin_base, xml_file_base
 
 
-def modify_tableau_zipfile(zipfile_path, conn_source, conn_target, extraction_dir_path, destination_dir_path) -> None:
+def modify_tableau_zipfile(zipfile_path, conn_source, conn_target, extraction_dir_path, destination_dir_path,
+                           remap_rules=None) -> None:
     """
     Modify a .twbx or .tdsx file and replace source connection references with target connection references.
+    The file is rewritten zip to zip (see rewrite_tableau_zipfile), so nothing is extracted to 'extraction_dir_path'.
     :param str zipfile_path: path to the zipped file that will be modified
     :param TableauServerConnection conn_source: the source Tableau Server connection
     :param TableauServerConnection conn_target: the target Tableau Server connection
-    :param str extraction_dir_path: path to the directory where the zipped file has been extracted
+    :param str extraction_dir_path: unused; formerly the directory the zipped file was extracted to
     :param str destination_dir_path: path to the directory where the modified zipped file will be written
+    :param dict remap_rules: (optional) additional texts to replace; see remap_xml_references
+    :return: None
+    """
+    destination_path = os.path.join(destination_dir_path, os.path.basename(zipfile_path))
+    print(f"rewriting contents of file '{zipfile_path}'...")
+    rewritten = rewrite_tableau_zipfile(
+        zipfile_path, destination_path,
+        lambda file_contents: remap_xml_references(file_contents, conn_source, conn_target, remap_rules))
+    print(f"successfully modified file(s) {rewritten}.")
+    print(f"created the modified zipped file at '{destination_path}'.")
+
+
+def modify_tableau_file(file_path, destination_dir_path, rules, connection_rules=None) -> dict:
+    """
+    Rewrite a .twb, .tds, .tfl, .twbx, .tdsx, or .tflx file into the destination directory using remap rules.
+    Nothing is written outside the destination file, so any number of files can be modified at the same time.
+    :param str file_path: path to the file being modified
+    :param str destination_dir_path: path to the directory where the modified file will be written
+    :param dict rules: maps each text being replaced to its replacement; see get_connection_remap_rules
+    :param list connection_rules: (optional) ConnectionRules applied to the connection elements once the text is
+    remapped; see connection_rewriter.rewrite_connections
+    :return: dict describing the modified file, the time spent, and the error raised, if any
+    """
+    def rewrite_xml(file_contents):
+        file_contents = remap_text(file_contents, rules)
+        return rewrite_connections_text(file_contents, connection_rules) if connection_rules else file_contents
+
+    start = time.perf_counter()
+    destination_path = os.path.join(destination_dir_path, os.path.basename(file_path))
+    result = {'file_path': file_path, 'destination_path': destination_path, 'rewritten': [], 'error': None}
+    try:
+        if os.path.splitext(file_path)[1].lower() in TABLEAU_XML_EXTENSIONS:
+            with open(file_path, 'r', encoding='utf-8') as original_file:
+                file_contents = rewrite_xml(original_file.read())
+            with open(destination_path, 'w', encoding='utf-8') as new_file:
+                new_file.write(file_contents)
+            result['rewritten'] = [os.path.basename(file_path)]
+        else:
+            result['rewritten'] = rewrite_tableau_zipfile(file_path, destination_path, rewrite_xml)
+        result['size'] = os.path.getsize(destination_path)
+    except Exception as error:
+        result['error'] = '{}: {}'.format(type(error).__name__, error)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def modify_tableau_files(file_paths, conn_source, conn_target, destination_dir_path, remap_rules=None,
+                         connection_rules=None, max_workers=None) -> list:
+    """
+    Modify many Tableau files in parallel, replacing source connection references with target connection references.
+    Each file is rewritten in its own process (see modify_tableau_file), so the work is spread across every CPU core.
+    On platforms starting processes with 'spawn' (Windows and macOS), each worker process imports the calling script,
+    so a script using more than one process must guard its entry point with `if __name__ == '__main__':`; otherwise
+    multiprocessing raises a RuntimeError while bootstrapping the workers. Pass max_workers=1 to modify the files in
+    the calling process instead.
+    :param list file_paths: paths to the .twb, .tds, .tfl, .twbx, .tdsx, or .tflx files being modified
+    :param TableauServerConnection conn_source: the source Tableau Server connection
+    :param TableauServerConnection conn_target: the target Tableau Server connection
+    :param str destination_dir_path: path to the directory where the modified files will be written
+    :param dict remap_rules: (optional) additional texts to replace; see remap_xml_references
+    :param list connection_rules: (optional) ConnectionRules applied to the connection elements of each file
+    :param int max_workers: (optional) the number of processes used; defaults to the number of CPUs
+    :return: list of dicts describing each modified file, in the order given; failed files have an 'error'
+    """
+    rules = get_connection_remap_rules(conn_source, conn_target)
+    rules.update(remap_rules or {})
+    file_paths = list(file_paths)
+    max_workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+    if max_workers <= 1:
+        return [modify_tableau_file(file_path, destination_dir_path, rules, connection_rules)
+                for file_path in file_paths]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(modify_tableau_file, file_paths, [destination_dir_path] * len(file_paths),
+                             [rules] * len(file_paths), [connection_rules] * len(file_paths)))
+
+
+def raise_modification_errors(results) -> None:
+    """
+    Raise an exception describing the files that could not be modified, if there are any.
+    :param list results: the results returned by modify_tableau_files
     :return: None
     """
-    with zipfile.ZipFile(file=zipfile_path) as zip_file:
-        print(f"extracting contents of file '{zipfile_path}'...")
-        zip_file.extractall(path=extraction_dir_path)
-        zip_file_base, xml_file_base = get_tableau_filenames(zipfile_path, extraction_dir_path)
-        print(f"discovered a file to be modified: '{xml_file_base}'.")
-        replace_zipped_xml_file(conn_source, conn_target, zip_file, xml_file_base, extraction_dir_path)
-        print(f"successfully modified file '{xml_file_base}'.")
-    generate_tableau_zipfile(extraction_dir_path, destination_dir_path, zip_file_base, xml_file_base)
-    print(f"created the modified zipped file at '{extraction_dir_path}/{zip_file_base}'.")
+    failed = ['{}: {}'.format(result['file_path'], result['error']) for result in results if result['error']]
+    if failed:
+        raise Exception("{} file(s) could not be modified:\n{}".format(len(failed), '\n'.join(failed)))
 
 
 def delete_temp_files(temp_dir_path=None) -> None:
@@ -0,0 +1,185 @@
+"""Tracks asynchronous Tableau Server jobs, such as workbooks and datasources published with `as_job=True`.
+
+Publishing a large file as a job returns as soon as Tableau Server has received it, instead of holding the HTTP
+request open while the file is processed, which avoids gateway timeouts on long publishes. The publish call returns a
+`JobHandle`, whose status is refreshed through `query_job`. `wait_for_jobs` waits on any number of handles at once,
+polling the unfinished jobs with an interval that grows after each round.
+
+Example:
+    handles = [conn.publish_workbook(file_path, name, project_id, as_job=True) for file_path, name in workbooks]
+    for handle in wait_for_jobs(handles, timeout=3600):
+        print(handle.job_id, handle.succeeded)
+"""
+
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import requests
+
+from tableau_api_lib.exceptions import JobWaitTimeout
+
+FINISH_CODE_SUCCEEDED = "0"
+FINISH_CODE_FAILED = "1"
+FINISH_CODE_CANCELLED = "2"
+
+
+class JobHandle:
+    """The status of an asynchronous Tableau Server job, refreshed on demand.
+
+    A handle may also wrap a response for which no job was created: a request completing synchronously, or one
+    rejected by Tableau Server. Such a handle is complete from the start, and has succeeded if the request did.
+
+    Args:
+        conn: The TableauServerConnection used to query the job.
+        job_id: (optional) The ID of the job; None if no job was created.
+        job: (optional) The job details most recently received from Tableau Server.
+        response: (optional) The response to the request that created the job.
+    """
+
+    def __init__(
+        self,
+        conn,
+        job_id: Optional[str] = None,
+        job: Optional[Dict[str, Any]] = None,
+        response: Optional[requests.Response] = None,
+    ):
+        self._conn = conn
+        self.job_id = job_id
+        self.job = job or {}
+        self.response = response
+        self.last_refreshed_at = None
+        self._done_callbacks: List[Callable[["JobHandle"], Any]] = []
+
+    @classmethod
+    def from_response(cls, conn, response: requests.Response) -> "JobHandle":
+        """Returns a handle for the job described by an HTTP 202 response, or for the response itself otherwise."""
+        if response.status_code == 202:
+            job = response.json().get("job", {})
+            return cls(conn, job_id=job.get("id"), job=job, response=response)
+        return cls(conn, response=response)
+
+    def __repr__(self) -> str:
+        return f"JobHandle(job_id='{self.job_id}', is_complete={self.is_complete}, succeeded={self.succeeded})"
+
+    @property
+    def finish_code(self) -> Optional[str]:
+        """Returns the job's finish code ('0' succeeded, '1' failed, '2' cancelled), or None while it is running."""
+        finish_code = self.job.get("finishCode")
+        return None if finish_code is None else str(finish_code)
+
+    @property
+    def progress(self) -> int:
+        """Returns the job's progress as a percentage."""
+        if self.job_id is None:
+            return 100
+        return int(self.job.get("progress") or 0)
+
+    @property
+    def is_complete(self) -> bool:
+        """Returns True once the job has finished, whether or not it succeeded."""
+        return self.job_id is None or self.finish_code is not None or "completedAt" in self.job
+
+    @property
+    def succeeded(self) -> bool:
+        """Returns True if the job finished successfully."""
+        if self.job_id is None:
+            return self.response is not None and self.response.status_code in [200, 201]
+        return self.finish_code == FINISH_CODE_SUCCEEDED
+
+    def add_done_callback(self, callback: Callable[["JobHandle"], Any]) -> None:
+        """Calls `callback` with the handle once the job is seen to complete, or right away if it already has.
+
+        Args:
+            callback: A callable receiving the handle; it runs in the thread refreshing the job's status.
+        """
+        self._done_callbacks.append(callback)
+        self._run_done_callbacks()
+
+    def _run_done_callbacks(self) -> None:
+        if not self.is_complete:
+            return
+        callbacks, self._done_callbacks = self._done_callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+    def refresh(self, conn=None) -> Dict[str, Any]:
+        """Queries the job's current status, returning the job details.
+
+        Args:
+            conn: (optional) The connection used to query the job; defaults to the handle's connection.
+        """
+        if self.job_id is None:
+            return self.job
+        response = (conn or self._conn).query_job(self.job_id)
+        if response.status_code == 200:
+            self.job = response.json().get("job", self.job)
+            self.last_refreshed_at = time.time()
+            self._run_done_callbacks()
+        return self.job
+
+    def wait(
+        self,
+        timeout: Optional[float] = None,
+        poll_interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 2.0,
+    ) -> "JobHandle":
+        """Waits for the job to complete, polling with a growing interval as described for `wait_for_jobs`."""
+        wait_for_jobs([self], timeout=timeout, poll_interval=poll_interval, max_interval=max_interval, backoff=backoff)
+        return self
+
+
+def wait_for_jobs(
+    handles: Iterable[JobHandle],
+    timeout: Optional[float] = None,
+    poll_interval: float = 1.0,
+    max_interval: float = 30.0,
+    backoff: float = 2.0,
+    max_workers: int = 4,
+) -> List[JobHandle]:
+    """Waits until every job has completed, returning the handles in the order given.
+
+    Each round queries the status of the unfinished jobs, using up to `max_workers` requests at a time, then sleeps
+    before the next round. The sleep starts at `poll_interval` seconds and is multiplied by `backoff` after each round,
+    up to `max_interval` seconds. Failed requests to query a job are retried in the next round.
+
+    Args:
+        handles: The handles of the jobs to wait on.
+        timeout: (optional) The number of seconds to wait before giving up; waits indefinitely by default.
+        poll_interval: (optional) The number of seconds between the first two rounds of queries.
+        max_interval: (optional) The longest number of seconds between two rounds of queries.
+        backoff: (optional) The factor the interval grows by after each round.
+        max_workers: (optional) The number of jobs queried at the same time.
+
+    Raises:
+        JobWaitTimeout: Some jobs did not complete within `timeout` seconds.
+    """
+    handles = list(handles)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    interval = poll_interval
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tableau-api-lib-jobs") as pool:
+        while True:
+            pending = [handle for handle in handles if not handle.is_complete]
+            if not pending:
+                return handles
+            list(pool.map(_refresh_quietly, pending))
+            pending = [handle for handle in pending if not handle.is_complete]
+            if not pending:
+                return handles
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise JobWaitTimeout([handle.job_id for handle in pending], timeout)
+                time.sleep(min(interval, remaining))
+            else:
+                time.sleep(interval)
+            interval = min(interval * backoff, max_interval)
+
+
+def _refresh_quietly(handle: JobHandle) -> None:
+    try:
+        handle.refresh(copy.copy(handle._conn))
+    except requests.RequestException:
+        pass
@@ -0,0 +1,322 @@
+"""Defines counters and histograms describing tableau-api-lib activity, exposed in the OpenMetrics text format.
+
+Metrics are collected in-process for every TableauServerConnection. Expose them by calling `start_metrics_server()`
+to serve a local HTTP endpoint that Prometheus can scrape, or by calling `write_metrics()` to dump them to a file.
+"""
+
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib import parse
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+DEFAULT_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DEFAULT_PUBLISH_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+
+_LUID_PATTERN = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+_API_VERSION_PATTERN = re.compile(r"^/api/[^/]+/")
+_NAMED_SEGMENT_PATTERN = re.compile(r"/(fileUploads|revisions|tags)/[^/]+")
+
+
+def _escape_label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    """The shared state for a named metric family whose samples are identified by label values."""
+
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric '{self.name}' expects labels {list(self.labelnames)}, got {list(labels)}.")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """A monotonically increasing count, rendered with the OpenMetrics `_total` suffix."""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Increments the counter identified by the given labels."""
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts.")
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        """Returns the current value of the counter identified by the given labels."""
+        return self._values.get(self._label_values(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in values
+        ]
+
+
+class Histogram(_Metric):
+    """A distribution of observed values, counted into cumulative buckets."""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._values = {}
+
+    def observe(self, value: float, **labels) -> None:
+        """Records an observation for the histogram identified by the given labels."""
+        key = self._label_values(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value)
+
+    def get_count(self, **labels) -> int:
+        """Returns the number of observations for the histogram identified by the given labels."""
+        counts, _ = self._values.get(self._label_values(labels), ([0] * len(self.buckets), 0.0))
+        return counts[-1]
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observes the duration (in seconds) of the wrapped block of code."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        lines = []
+        for key, (counts, total) in values:
+            for upper_bound, count in zip(self.buckets, counts):
+                le_label = f'le="{_format_value(upper_bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le_label)} {count}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {counts[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+        return lines
+
+
+class MetricsRegistry:
+    """A collection of named metrics that can be rendered as a single OpenMetrics exposition."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_class, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = metric_class(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, metric_class) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"A different metric named '{name}' is already registered.")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Returns the counter registered under `name`, creating it if it does not exist yet."""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Returns the histogram registered under `name`, creating it if it does not exist yet."""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """Returns all registered metrics in the OpenMetrics text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.extend(metric.render())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+REQUESTS = REGISTRY.counter(
+    "tableau_api_lib_requests", "HTTP requests sent to Tableau Server.", ["method", "endpoint", "status"]
+)
+REQUEST_DURATION = REGISTRY.histogram(
+    "tableau_api_lib_request_duration_seconds",
+    "Time between sending a request and receiving the response headers.",
+    ["method", "endpoint"],
+)
+RETRIES = REGISTRY.counter("tableau_api_lib_retries", "Operations retried after a failure.", ["operation"])
+CACHE_HITS = REGISTRY.counter("tableau_api_lib_cache_hits", "Lookups served from a local cache.", ["cache"])
+CACHE_MISSES = REGISTRY.counter("tableau_api_lib_cache_misses", "Lookups not found in a local cache.", ["cache"])
+PAGES_FETCHED = REGISTRY.counter(
+    "tableau_api_lib_pages_fetched", "Pages retrieved while extracting paginated results.", ["method"]
+)
+BYTES_UPLOADED = REGISTRY.counter("tableau_api_lib_bytes_uploaded", "Request body bytes sent.", ["endpoint"])
+BYTES_DOWNLOADED = REGISTRY.counter("tableau_api_lib_bytes_downloaded", "Response body bytes received.", ["endpoint"])
+PUBLISH_DURATION = REGISTRY.histogram(
+    "tableau_api_lib_publish_duration_seconds",
+    "Wall-clock time spent publishing content, including any chunked uploads.",
+    ["content_type"],
+    buckets=DEFAULT_PUBLISH_BUCKETS,
+)
+
+
+def normalize_endpoint(url: str) -> str:
+    """Returns the URL path with API versions and content identifiers replaced, keeping label cardinality low."""
+    path = parse.urlsplit(url).path
+    path = _API_VERSION_PATTERN.sub("/api/{version}/", path)
+    path = _LUID_PATTERN.sub("{id}", path)
+    return _NAMED_SEGMENT_PATTERN.sub(lambda match: f"/{match.group(1)}/{{id}}", path)
+
+
+def _get_body_length(request) -> int:
+    content_length = request.headers.get("Content-Length")
+    if content_length:
+        return int(content_length)
+    if isinstance(request.body, (bytes, str)):
+        return len(request.body)
+    return 0
+
+
+def record_response(response, *args, **kwargs):
+    """A `requests` response hook recording request counts, latency, and bytes transferred.
+
+    Bodies of streamed responses are not read here; code consuming a streamed body records its own byte count via
+    `record_bytes_downloaded()`.
+    """
+    request = response.request
+    endpoint = normalize_endpoint(request.url)
+    REQUESTS.inc(method=request.method, endpoint=endpoint, status=str(response.status_code))
+    REQUEST_DURATION.observe(response.elapsed.total_seconds(), method=request.method, endpoint=endpoint)
+    BYTES_UPLOADED.inc(_get_body_length(request), endpoint=endpoint)
+    if not kwargs.get("stream"):
+        BYTES_DOWNLOADED.inc(len(response.content or b""), endpoint=endpoint)
+    return response
+
+
+def record_bytes_downloaded(url: str, num_bytes: int) -> None:
+    """Records bytes consumed from a streamed response body."""
+    BYTES_DOWNLOADED.inc(num_bytes, endpoint=normalize_endpoint(url))
+
+
+def _get_function_name(func: object) -> str:
+    """Returns the name the function was defined with, which decorators replacing `__name__` do not change."""
+    code = getattr(getattr(func, "__func__", func), "__code__", None)
+    return code.co_name if code else getattr(func, "__name__", str(func))
+
+
+def record_page(query_func: object) -> None:
+    """Records a single page fetched while paginating through the given query function."""
+    PAGES_FETCHED.inc(method=_get_function_name(query_func))
+
+
+def record_retry(operation: str) -> None:
+    """Records a retry of the named operation."""
+    RETRIES.inc(operation=operation)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Records a hit or miss for the named local cache."""
+    if hit:
+        CACHE_HITS.inc(cache=cache)
+    else:
+        CACHE_MISSES.inc(cache=cache)
+
+
+def time_publish(content_type: str):
+    """Returns a context manager observing the duration of a publish for the content type [workbook, flow, etc.]."""
+    return PUBLISH_DURATION.time(content_type=content_type)
+
+
+def write_metrics(file_path: str, registry: Optional[MetricsRegistry] = None) -> None:
+    """Writes the current metrics to a file, replacing its previous contents.
+
+    Args:
+        file_path: The path of the file the OpenMetrics exposition will be written to.
+        registry: (optional) The registry to render; defaults to the tableau-api-lib registry.
+    """
+    registry = registry or REGISTRY
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write(registry.render())
+
+
+def start_metrics_server(
+    port: int = 9464, address: str = "127.0.0.1", registry: Optional[MetricsRegistry] = None
+) -> ThreadingHTTPServer:
+    """Serves the current metrics over HTTP from a background thread.
+
+    Args:
+        port: The port the metrics endpoint listens on. Pass 0 to have the operating system choose a free port.
+        address: The address the metrics endpoint binds to. Defaults to the loopback interface.
+        registry: (optional) The registry to render; defaults to the tableau-api-lib registry.
+
+    Returns:
+        The running server. Call its `shutdown()` method to stop serving metrics.
+    """
+    registry = registry or REGISTRY
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((address, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="tableau-api-lib-metrics", daemon=True).start()
+    return server
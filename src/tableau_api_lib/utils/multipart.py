@@ -0,0 +1,107 @@
+"""Defines multipart/mixed request bodies that stream file content from disk instead of holding it in memory.
+
+Tableau Server publish requests combine a JSON 'request_payload' part with the file being published. Building that
+body with `urllib3.encode_multipart_formdata` requires the whole file as bytes, and then copies it again into the
+encoded body. A `StreamingMultipartBody` renders only the part headers up front; file content is read from disk in
+blocks while the request is being sent, so memory use stays constant regardless of the file size.
+
+Example:
+    body = StreamingMultipartBody({
+        "request_payload": (None, json.dumps(payload), "application/json"),
+        "tableau_workbook": ("sales.twbx", FilePart("sales.twbx"), "application/octet-stream"),
+    })
+    requests.post(url, data=body, headers={"Content-Type": body.content_type})
+"""
+
+import os
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+from urllib3.fields import RequestField
+from urllib3.filepost import choose_boundary
+
+STREAM_BLOCK_SIZE = 1024 * 1024  # 1MB
+
+
+class FilePart:
+    """The body of a multipart part, read from a region of a file only as the request is sent.
+
+    Args:
+        file_path: The path to the file.
+        offset: (optional) The position in the file where the part's content starts.
+        length: (optional) The number of bytes in the part; defaults to the rest of the file after `offset`.
+    """
+
+    def __init__(self, file_path: str, offset: int = 0, length: Optional[int] = None):
+        self.file_path = file_path
+        self.offset = offset
+        self.length = os.path.getsize(file_path) - offset if length is None else length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def iter_blocks(self, block_size: int = STREAM_BLOCK_SIZE) -> Iterator[bytes]:
+        """Yields the part's content in blocks of at most `block_size` bytes."""
+        with open(self.file_path, "rb") as file:
+            file.seek(self.offset)
+            remaining = self.length
+            while remaining > 0:
+                block = file.read(min(block_size, remaining))
+                if not block:
+                    raise IOError(f"The file '{self.file_path}' ended before {self.length} bytes could be sent.")
+                remaining -= len(block)
+                yield block
+
+
+PartData = Union[bytes, bytearray, memoryview, str, FilePart]
+
+
+class StreamingMultipartBody:
+    """A multipart/mixed request body whose file-backed parts are streamed from disk.
+
+    The body is produced identically to `urllib3.encode_multipart_formdata` (apart from the multipart/mixed content
+    type required by Tableau Server), and can be iterated any number of times, allowing requests to be retried.
+
+    Args:
+        parts: A dict mapping each part name to a (filename, data, content_type) tuple. The data is either in-memory
+            content (bytes, memoryview, or str) or a streamed part such as a `FilePart`: any sized object whose
+            `iter_blocks(block_size)` method yields its content.
+        boundary: (optional) The multipart boundary; a random boundary is chosen by default.
+        block_size: (optional) The size of the blocks read from file-backed parts.
+    """
+
+    def __init__(
+        self,
+        parts: Dict[str, Tuple[Optional[str], PartData, str]],
+        boundary: Optional[str] = None,
+        block_size: int = STREAM_BLOCK_SIZE,
+    ):
+        self.boundary = boundary or choose_boundary()
+        self.block_size = block_size
+        self._segments = []
+        for name, (filename, data, content_type) in parts.items():
+            part = RequestField(name=name, data=b"", filename=filename)
+            part.make_multipart(content_type=content_type)
+            self._segments.append(f"--{self.boundary}\r\n".encode("latin-1") + part.render_headers().encode("utf-8"))
+            self._segments.append(data.encode("utf-8") if isinstance(data, str) else data)
+            self._segments.append(b"\r\n")
+        self._segments.append(f"--{self.boundary}--\r\n".encode("latin-1"))
+        self._length = sum(len(segment) for segment in self._segments)
+
+    @property
+    def content_type(self) -> str:
+        """Returns the value of the 'Content-Type' header to send with the body."""
+        return f"multipart/mixed; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Union[bytes, memoryview]]:
+        for segment in self._segments:
+            if hasattr(segment, "iter_blocks"):
+                yield from segment.iter_blocks(self.block_size)
+            elif len(segment):
+                yield segment
+
+    def to_bytes(self) -> bytes:
+        """Returns the complete body in memory; intended for debugging and small bodies only."""
+        return b"".join(bytes(block) for block in self)
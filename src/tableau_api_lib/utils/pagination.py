@@ -4,6 +4,7 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 from typeguard import typechecked
 
 from tableau_api_lib.exceptions import ContentNotFound, PaginationError
+from tableau_api_lib.utils import metrics
 
 
 def get_page_attributes(query: dict, query_func: MethodType) -> Tuple:
@@ -59,6 +60,7 @@ def extract_pages(
     while extracting:
         parameter_dict.update({"pageNumber": f"pageNumber={page_number}", "pageSize": f"pageSize={page_size}"})
         query_results = process_query(query_func=query_func, content_id=content_id, parameter_dict=parameter_dict)
+        metrics.record_page(query_func)
         page_number, page_size, total_available = get_page_attributes(query=query_results, query_func=query_func)
         if total_available == 0:
             return [{}]
@@ -0,0 +1,166 @@
+"""Skips publishing workbooks, datasources, and flows whose content has not changed since they were last published.
+
+A `PublishManifest` is a small JSON file recording, for each target site, project, and content name, a hash of the
+content and publish options last published there. Publishing the same content with the same options to the same
+target again returns the recorded item without uploading anything, which saves both upload bandwidth and server-side
+processing on repeated deploys.
+
+The hash covers the content rather than the packaging: for packaged files (.twbx, .tdsx, .tflx), each member is hashed
+by its name and data, so re-zipping unchanged files does not count as a change. The publish options (the request
+payload, including embedded credentials, shown tabs, and hidden views, and the request's query parameters) are folded
+into the hash; only the digest is written to the manifest, never the options themselves.
+
+Example:
+    conn.publish_workbook('workbooks/sales.twbx', 'Sales', project_id, publish_manifest='publish_manifest.json')
+    conn.publish_workbook('workbooks/sales.twbx', 'Sales', project_id, publish_manifest='publish_manifest.json',
+                          force_publish=True)
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+import zipfile
+from typing import Any, Dict, Optional, Union
+
+import requests
+
+from tableau_api_lib.utils.upload import STREAM_BLOCK_SIZE, UploadSource
+
+SKIPPED_PUBLISH_HEADER = "X-Tableau-Api-Lib-Publish"
+
+_MANIFEST_LOCK = threading.Lock()
+
+
+def _hash_blocks(blocks) -> str:
+    hasher = hashlib.sha256()
+    for block in blocks:
+        hasher.update(block)
+    return hasher.hexdigest()
+
+
+def _zip_content_hash(zip_file: zipfile.ZipFile) -> str:
+    hasher = hashlib.sha256()
+    for member in sorted(zip_file.infolist(), key=lambda info: info.filename):
+        if member.is_dir():
+            continue
+        with zip_file.open(member) as file:
+            digest = _hash_blocks(iter(lambda: file.read(STREAM_BLOCK_SIZE), b""))
+        hasher.update(f"{member.filename}\0{digest}\n".encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def content_hash(source: Union[UploadSource, str, os.PathLike]) -> Optional[str]:
+    """Returns a hash identifying the content being published, or None if the content can only be read once.
+
+    Args:
+        source: The content being published, as an UploadSource or a file path.
+    """
+    source = UploadSource.from_value(source)
+    if not source.is_repeatable:
+        return None
+    if source.file_extension.lower() in ("twbx", "tdsx", "tflx"):
+        try:
+            if source.kind == "path":
+                with zipfile.ZipFile(source.file_path) as zip_file:
+                    return _zip_content_hash(zip_file)
+            with source.open(throttle=False) as reader:
+                file = reader if source.kind == "stream" else io.BytesIO(reader.read(source.size))
+                with zipfile.ZipFile(file) as zip_file:
+                    return _zip_content_hash(zip_file)
+        except zipfile.BadZipFile:
+            pass
+    return _hash_blocks(source.iter_blocks(throttle=False))
+
+
+def publish_hash(
+    content_hash_value: Optional[str], request_payload: Dict[str, Any], parameter_dict: Optional[Dict[str, Any]] = None
+) -> Optional[str]:
+    """Returns a hash identifying the content together with the options it is published with, or None without content.
+
+    Args:
+        content_hash_value: The hash of the content, as returned by `content_hash`.
+        request_payload: The JSON request payload describing the publish, which may hold embedded credentials.
+        parameter_dict: (optional) The query parameters of the publish request.
+    """
+    if content_hash_value is None:
+        return None
+    options = json.dumps({"payload": request_payload, "parameters": parameter_dict or {}}, sort_keys=True, default=str)
+    return _hash_blocks([content_hash_value.encode("utf-8"), b"\0", options.encode("utf-8")])
+
+
+class PublishManifest:
+    """Records the hash of the content last published to each target in a JSON file.
+
+    Args:
+        file_path: The path to the manifest file, which is created when the first publish is recorded.
+    """
+
+    def __init__(self, file_path: Union[str, os.PathLike]):
+        self.file_path = os.fspath(file_path)
+
+    @classmethod
+    def from_value(cls, value: Union["PublishManifest", str, os.PathLike, None]) -> Optional["PublishManifest"]:
+        """Returns `value` as a PublishManifest, treating strings and paths as the location of the manifest file."""
+        if value is None or isinstance(value, cls):
+            return value
+        return cls(value)
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Returns the key identifying a publish target from its server, site, content type, project, and name."""
+        return "/".join("" if part is None else str(part) for part in parts)
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the recorded entries, keyed by publish target."""
+        try:
+            with open(self.file_path, encoding="utf-8") as file:
+                return json.load(file).get("published", {})
+        except FileNotFoundError:
+            return {}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the entry recorded for the publish target, or None if nothing has been published there."""
+        return self.entries().get(key)
+
+    def is_unchanged(self, key: str, hash_value: Optional[str]) -> bool:
+        """Returns True if content with the given hash is what was last published to the target."""
+        entry = self.get(key)
+        return hash_value is not None and entry is not None and entry.get("content_hash") == hash_value
+
+    def record(self, key: str, hash_value: str, content: Dict[str, Any]) -> None:
+        """Records the hash of the content published to the target, along with the published item's details."""
+        with _MANIFEST_LOCK:
+            entries = self.entries()
+            entries[key] = {"content_hash": hash_value, "content": content, "published_at": time.time()}
+            self._write(entries)
+
+    def discard(self, key: str) -> None:
+        """Forgets what was published to the target, so that its next publish is never skipped."""
+        with _MANIFEST_LOCK:
+            entries = self.entries()
+            if entries.pop(key, None) is not None:
+                self._write(entries)
+
+    def _write(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        temp_path = f"{self.file_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"published": entries}, file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.file_path)
+
+
+def build_unchanged_response(content_variety: str, entry: Dict[str, Any]) -> requests.Response:
+    """Returns the response given for a skipped publish: HTTP 200 with the item recorded when it was last published.
+
+    The response is built locally; its `SKIPPED_PUBLISH_HEADER` header is set to 'skipped'.
+    """
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "application/json"
+    response.headers[SKIPPED_PUBLISH_HEADER] = "skipped"
+    response._content = json.dumps({content_variety: entry.get("content", {})}).encode("utf-8")
+    return response
@@ -0,0 +1,302 @@
+"""Publishes many workbooks, datasources, and flows to Tableau Server concurrently.
+
+A `PublishQueue` runs up to `max_workers` publishes at a time. Each publish uses its own copy of the connection, so
+every file goes through its own upload session, and an optional `BandwidthLimiter` caps the combined upload rate so
+a migration does not saturate the network link to Tableau Server.
+
+Tasks may depend on other tasks; a task starts only once everything it depends on has been published, and is skipped
+if any of them fails. By default, workbooks and flows also wait for every datasource in the queue to finish, so
+published datasources exist before the workbooks connecting to them are published; this only orders the publishes,
+and a datasource failing to publish does not skip the workbooks and flows that did not explicitly depend on it.
+
+Example:
+    publish_queue = PublishQueue(conn, max_workers=8, max_bytes_per_second=50 * 1024 * 1024)
+    sales = publish_queue.add('datasource', 'extracts/sales.tdsx', 'Sales', project_id)
+    publish_queue.add('workbook', 'workbooks/sales.twbx', 'Sales Overview', project_id, depends_on=[sales])
+    publish_queue.run()
+    print(publish_queue.to_dataframe()[['name', 'status', 'seconds', 'bytes_uploaded']])
+"""
+
+import copy
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Union
+
+import pandas as pd
+
+from tableau_api_lib.utils.jobs import JobHandle
+from tableau_api_lib.utils.upload import BandwidthLimiter, UploadSource
+
+PUBLISH_METHODS = {
+    "workbook": ("publish_workbook", "workbook_file_path", "workbook_name"),
+    "datasource": ("publish_data_source", "datasource_file_path", "datasource_name"),
+    "flow": ("publish_flow", "flow_file_path", "flow_name"),
+}
+
+
+class PublishTask:
+    """A workbook, datasource, or flow waiting to be published, and the outcome of publishing it.
+
+    Args:
+        task_id: The ID identifying the task within its queue.
+        content_type: One of 'workbook', 'datasource', or 'flow'.
+        file_source: The file being published, as a file path or an UploadSource.
+        name: The name the content is published under.
+        project_id: The ID of the project the content is published to.
+        depends_on: (optional) The tasks that must be published before this one starts.
+        publish_kwargs: (optional) Additional keyword arguments for the connection's publish method.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+    def __init__(
+        self,
+        task_id: Hashable,
+        content_type: str,
+        file_source: Union[str, UploadSource],
+        name: str,
+        project_id: str,
+        depends_on: Optional[Iterable["PublishTask"]] = None,
+        publish_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        if content_type not in PUBLISH_METHODS:
+            raise ValueError(f"Unable to publish '{content_type}' content; expected one of {list(PUBLISH_METHODS)}.")
+        self.task_id = task_id
+        self.content_type = content_type
+        self.file_source = file_source
+        self.name = name
+        self.project_id = project_id
+        self.depends_on = list(depends_on or [])
+        self.publish_kwargs = publish_kwargs or {}
+        self.status = self.PENDING
+        self.response = None
+        self.job = None
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self.upload_stats = []
+
+    def __repr__(self) -> str:
+        return f"PublishTask(task_id='{self.task_id}', content_type='{self.content_type}', status='{self.status}')"
+
+    @property
+    def seconds(self) -> Optional[float]:
+        """Returns the time spent publishing, or None if the task has not finished."""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    @property
+    def bytes_uploaded(self) -> int:
+        """Returns the number of bytes sent through a file upload session; single-request publishes report 0."""
+        return sum(stats.size for stats in self.upload_stats)
+
+    @property
+    def content_id(self) -> Optional[str]:
+        """Returns the ID of the published content, once Tableau Server has created it."""
+        if self.status != self.SUCCEEDED:
+            return None
+        if self.job is not None and self.job.job_id is not None:
+            return self.job.job.get(self.content_type, {}).get("id")
+        return self.response.json().get(self.content_type, {}).get("id")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "task_id": self.task_id,
+            "content_type": self.content_type,
+            "name": self.name,
+            "project_id": self.project_id,
+            "status": self.status,
+            "status_code": getattr(self.response, "status_code", None),
+            "content_id": self.content_id,
+            "error": None if self.error is None else str(self.error),
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "seconds": self.seconds,
+            "bytes_uploaded": self.bytes_uploaded,
+        }
+
+
+class PublishQueue:
+    """Publishes queued workbooks, datasources, and flows concurrently, honoring the dependencies between them.
+
+    Args:
+        conn: A signed-in TableauServerConnection; each publish uses a copy of it.
+        max_workers: (optional) The maximum number of publishes running at the same time.
+        max_bytes_per_second: (optional) The combined upload rate allowed across all publishes.
+        datasources_first: (optional) True if workbooks and flows wait for every datasource in the queue to finish,
+            whether or not it was published.
+        progress_callback: (optional) A callable receiving each PublishTask once it has finished.
+        job_timeout: (optional) The number of seconds a publish job is waited on before its task fails; waits
+            indefinitely by default.
+        job_poll_interval: (optional) The number of seconds between the first two queries of a publish job's status;
+            see `wait_for_jobs`.
+    """
+
+    def __init__(
+        self,
+        conn,
+        max_workers: int = 4,
+        max_bytes_per_second: Optional[float] = None,
+        datasources_first: bool = True,
+        progress_callback: Optional[Callable[[PublishTask], Any]] = None,
+        job_timeout: Optional[float] = None,
+        job_poll_interval: float = 1.0,
+    ):
+        if max_workers < 1:
+            raise ValueError(f"At least one worker is required to publish content, not {max_workers}.")
+        self._conn = conn
+        self.max_workers = max_workers
+        self.bandwidth_limiter = BandwidthLimiter(max_bytes_per_second) if max_bytes_per_second else None
+        self.datasources_first = datasources_first
+        self.progress_callback = progress_callback
+        self.job_timeout = job_timeout
+        self.job_poll_interval = job_poll_interval
+        self.tasks: List[PublishTask] = []
+
+    def add(
+        self,
+        content_type: str,
+        file_source: Union[str, UploadSource],
+        name: str,
+        project_id: str,
+        depends_on: Optional[Iterable[PublishTask]] = None,
+        task_id: Optional[Hashable] = None,
+        **publish_kwargs: Any,
+    ) -> PublishTask:
+        """Queues content to be published, returning its PublishTask.
+
+        Args:
+            content_type: One of 'workbook', 'datasource', or 'flow'.
+            file_source: The file being published, as a file path or an UploadSource.
+            name: The name the content is published under.
+            project_id: The ID of the project the content is published to.
+            depends_on: (optional) Tasks from this queue that must be published before this one starts.
+            task_id: (optional) The ID identifying the task, such as a DataFrame index label; defaults to the task's
+                position in the queue.
+            publish_kwargs: Additional keyword arguments for the connection's publish method, such as
+                `connection_username` or `parameter_dict`. With `as_job=True`, the publish job's JobHandle is stored
+                as the task's `job`, and the task keeps running until the job finishes; it succeeds if the job
+                does.
+        """
+        task_id = len(self.tasks) if task_id is None else task_id
+        task = PublishTask(task_id, content_type, file_source, name, project_id, depends_on, publish_kwargs)
+        self.tasks.append(task)
+        return task
+
+    def run(self) -> List[PublishTask]:
+        """Publishes every pending task, returning all tasks once none are left running.
+
+        Raises:
+            ValueError: A task depends on a task from another queue, or the dependencies between tasks form a cycle.
+        """
+        known = set(self.tasks)
+        for task in self.tasks:
+            missing = [dependency.task_id for dependency in task.depends_on if dependency not in known]
+            if missing:
+                raise ValueError(f"The publish task '{task.task_id}' depends on tasks from another queue: {missing}.")
+        dependencies = {task: list(task.depends_on) for task in self.tasks}
+        barriers = {task: self._get_barriers(task) for task in self.tasks}
+        ordering = {task: dependencies[task] + barriers[task] for task in self.tasks}
+        pending = [task for task in self._sort_by_dependencies(ordering) if task.status == PublishTask.PENDING]
+        finished_states = {PublishTask.SUCCEEDED, PublishTask.FAILED, PublishTask.SKIPPED}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tableau-api-lib-publish") as pool:
+            running = {}
+            while pending or running:
+                for task in list(pending):
+                    states = {dependency.status for dependency in dependencies[task]}
+                    if states & {PublishTask.FAILED, PublishTask.SKIPPED}:
+                        pending.remove(task)
+                        self._skip(task, dependencies[task])
+                    elif (
+                        states <= {PublishTask.SUCCEEDED}
+                        and all(barrier.status in finished_states for barrier in barriers[task])
+                        and len(running) < self.max_workers
+                    ):
+                        pending.remove(task)
+                        task.status = PublishTask.RUNNING
+                        running[pool.submit(self._publish, task)] = task
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = running.pop(future)
+                    future.result()
+                    if self.progress_callback:
+                        self.progress_callback(task)
+        return self.tasks
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Returns a DataFrame describing the status and timing of each task."""
+        return pd.DataFrame([task.to_dict() for task in self.tasks])
+
+    def _get_barriers(self, task: PublishTask) -> List[PublishTask]:
+        """Returns the tasks that must finish, whether or not they succeed, before the task starts."""
+        if not self.datasources_first or task.content_type == "datasource":
+            return []
+        return [other for other in self.tasks if other.content_type == "datasource" and other not in task.depends_on]
+
+    @staticmethod
+    def _sort_by_dependencies(dependencies: Dict[PublishTask, List[PublishTask]]) -> List[PublishTask]:
+        ordered, visiting, visited = [], set(), set()
+
+        def visit(task: PublishTask) -> None:
+            if task in visited:
+                return
+            if task in visiting:
+                raise ValueError(f"The publish task '{task.task_id}' depends on itself through its dependencies.")
+            visiting.add(task)
+            for dependency in dependencies.get(task, []):
+                visit(dependency)
+            visiting.discard(task)
+            visited.add(task)
+            ordered.append(task)
+
+        for task in dependencies:
+            visit(task)
+        return ordered
+
+    @staticmethod
+    def _skip(task: PublishTask, dependencies: List[PublishTask]) -> None:
+        failed = [dependency.task_id for dependency in dependencies if dependency.status != PublishTask.SUCCEEDED]
+        task.status = PublishTask.SKIPPED
+        task.error = f"Skipped because these tasks were not published: {failed}."
+
+    def _publish(self, task: PublishTask) -> None:
+        conn = copy.copy(self._conn)
+        method_name, file_arg, name_arg = PUBLISH_METHODS[task.content_type]
+        publish_kwargs = dict(task.publish_kwargs)
+        upload_progress_callback = publish_kwargs.pop("upload_progress_callback", None)
+
+        def record_chunk(stats) -> None:
+            task.upload_stats.append(stats)
+            if upload_progress_callback:
+                upload_progress_callback(stats)
+
+        source = UploadSource.from_value(task.file_source)
+        if self.bandwidth_limiter:
+            source = copy.copy(source)
+            source.bandwidth_limiter = self.bandwidth_limiter
+        publish_kwargs.update({file_arg: source, name_arg: task.name, "project_id": task.project_id})
+        task.started_at = time.time()
+        try:
+            result = getattr(conn, method_name)(upload_progress_callback=record_chunk, **publish_kwargs)
+            if isinstance(result, JobHandle):
+                task.job, result = result, result.response
+            task.response = result
+            if task.job is not None and task.job.job_id is not None:
+                task.job.wait(timeout=self.job_timeout, poll_interval=self.job_poll_interval)
+                task.status = PublishTask.SUCCEEDED if task.job.succeeded else PublishTask.FAILED
+                if not task.job.succeeded:
+                    task.error = f"The publish job '{task.job.job_id}' finished with code {task.job.finish_code}."
+            else:
+                task.status = PublishTask.SUCCEEDED if task.response.status_code in [200, 201] else PublishTask.FAILED
+        except Exception as error:
+            task.error = error
+            task.status = PublishTask.FAILED
+        finally:
+            task.finished_at = time.time()
@@ -1,14 +1,28 @@
 """Defines helper functions for querying details about REST API workbooks and views."""
 
 
+import copy
+import hashlib
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
 from io import StringIO
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 
 import pandas as pd
+import requests
 
 from tableau_api_lib import TableauServerConnection
 from tableau_api_lib.exceptions.tableau_server_exceptions import ContentNotFound
 from tableau_api_lib.utils import extract_pages, flatten_dict_column
+from tableau_api_lib.utils.bulk_download import _sanitize_file_stem
+from tableau_api_lib.utils.view_export import encode_view_filter_value, get_view_filter_values, \
+    get_view_parameter_dict
+
+VIEW_DATA_CHUNK_ROWS = 100_000
+VIEW_DATA_BLOCK_SIZE = 1024 * 1024  # 1MB
+VIEW_FILTER_MAX_VALUES = 100
+VIEW_FILTER_MAX_LENGTH = 2000  # URL-encoded characters of filter values per request
 
 
 def get_all_workbook_fields(conn: TableauServerConnection, all_fields: Optional[bool] = True) -> List[Dict[str, Any]]:
@@ -65,6 +79,195 @@ def get_view_data_dataframe(
     return view_df
 
 
+def _open_view_data_stream(
+    conn: TableauServerConnection, view_id: str, parameter_dict: Optional[Dict[str, Any]]
+) -> requests.Response:
+    """Returns the streamed response of a view data query, whose raw body is decoded as it is read."""
+    response = conn.query_view_data(view_id=view_id, parameter_dict=parameter_dict, stream=True)
+    if response.status_code == 404:
+        response.close()
+        raise ContentNotFound(content_type="view", content_id=view_id)
+    if response.status_code != 200:
+        response.content
+        response.close()
+        response.raise_for_status()
+    response.raw.decode_content = True
+    return response
+
+
+def iter_view_data_dataframes(
+    conn: TableauServerConnection,
+    view_id: str,
+    parameter_dict: Optional[Dict[str, Any]] = None,
+    chunk_rows: int = VIEW_DATA_CHUNK_ROWS,
+    sep: str = ",",
+    **read_csv_kwargs,
+) -> Iterator[pd.DataFrame]:
+    """Yields the data downloaded from a Tableau view as DataFrames of at most `chunk_rows` rows.
+
+    The CSV is parsed as it streams from Tableau Server, so memory use is bounded by the chunk size rather than the
+    size of the view's data. Each chunk infers its own column types; pass `dtype` to fix them across chunks. Other
+    keyword arguments are passed on to `pandas.read_csv`.
+    """
+    with _open_view_data_stream(conn, view_id, parameter_dict) as response:
+        read_csv_kwargs.setdefault("encoding", "utf-8-sig")
+        with pd.read_csv(response.raw, sep=sep, chunksize=chunk_rows, **read_csv_kwargs) as reader:
+            yield from reader
+
+
+def iter_view_data_record_batches(
+    conn: TableauServerConnection,
+    view_id: str,
+    parameter_dict: Optional[Dict[str, Any]] = None,
+    batch_rows: int = VIEW_DATA_CHUNK_ROWS,
+    block_size: int = VIEW_DATA_BLOCK_SIZE,
+) -> Iterator["pyarrow.RecordBatch"]:
+    """Yields the data downloaded from a Tableau view as Arrow record batches of at most `batch_rows` rows.
+
+    The CSV is parsed by pyarrow's streaming CSV reader in blocks of `block_size` bytes as it streams from Tableau
+    Server; column types are inferred from the first block and kept for every batch. Requires the pyarrow package.
+    """
+    try:
+        from pyarrow import csv
+    except ImportError:
+        raise ImportError("Reading view data as Arrow record batches requires pyarrow; run 'pip install pyarrow'.")
+    with _open_view_data_stream(conn, view_id, parameter_dict) as response:
+        reader = csv.open_csv(response.raw, read_options=csv.ReadOptions(block_size=block_size))
+        for batch in reader:
+            for offset in range(0, batch.num_rows, batch_rows):
+                yield batch.slice(offset, batch_rows)
+
+
+def split_view_filters(
+    filters: Optional[Dict[str, Union[str, Iterable[Any]]]],
+    max_values: int = VIEW_FILTER_MAX_VALUES,
+    max_length: int = VIEW_FILTER_MAX_LENGTH,
+) -> List[Dict[str, List[str]]]:
+    """Splits filters whose value lists are too long for one request into several sets of filters.
+
+    Each list of values is split into chunks of at most `max_values` values and `max_length` URL-encoded characters;
+    the returned sets of filters combine every chunk of each field with every chunk of the others, so together they
+    select exactly the rows the original filters select.
+    """
+    field_chunks = []
+    for name, values in (filters or {}).items():
+        values = get_view_filter_values(values)
+        chunks, chunk, length = [], [], 0
+        for value in values:
+            encoded_length = len(encode_view_filter_value(value)) + 1
+            if chunk and (len(chunk) >= max_values or length + encoded_length > max_length):
+                chunks.append(chunk)
+                chunk, length = [], 0
+            chunk.append(value)
+            length += encoded_length
+        field_chunks.append([(name, chunk) for chunk in chunks + [chunk]])
+    return [dict(combination) for combination in itertools.product(*field_chunks)]
+
+
+def _get_view_data_partitions(
+    filter_sets: Iterable[Optional[Dict[str, Any]]],
+    parameter_sets: Iterable[Optional[Dict[str, Any]]],
+    max_values: int,
+    max_length: int,
+) -> List[Dict[str, Any]]:
+    """Returns one partition per request: its filter set, parameter set, part number, and the filters it sends."""
+    partitions = []
+    for filters, parameters in itertools.product(list(filter_sets), list(parameter_sets)):
+        for part, request_filters in enumerate(split_view_filters(filters, max_values, max_length)):
+            partitions.append({
+                "filters": filters or {},
+                "parameters": parameters or {},
+                "part": part,
+                "request_filters": request_filters,
+            })
+    return partitions
+
+
+def _read_view_data_partition(
+    conn: TableauServerConnection, view_id: str, partition: Dict[str, Any], read_csv_kwargs: Dict[str, Any]
+) -> pd.DataFrame:
+    parameter_dict = get_view_parameter_dict(partition["request_filters"], partition["parameters"])
+    with _open_view_data_stream(copy.copy(conn), view_id, parameter_dict) as response:
+        view_df = pd.read_csv(response.raw, **{"encoding": "utf-8-sig", **read_csv_kwargs})
+    for name, values in partition["request_filters"].items():
+        view_df[f"filter_{name}"] = ",".join(values)
+    for name, value in partition["parameters"].items():
+        view_df[f"parameter_{name}"] = value
+    return view_df
+
+
+def get_view_data_for_filters_dataframe(
+    conn: TableauServerConnection,
+    view_id: str,
+    filter_sets: Iterable[Optional[Dict[str, Union[str, Iterable[Any]]]]],
+    parameter_sets: Iterable[Optional[Dict[str, Any]]] = (None,),
+    max_workers: int = 4,
+    max_values_per_request: int = VIEW_FILTER_MAX_VALUES,
+    max_filter_length: int = VIEW_FILTER_MAX_LENGTH,
+    **read_csv_kwargs,
+) -> pd.DataFrame:
+    """Returns one DataFrame holding a view's data for every combination of filter set and parameter set.
+
+    Each filter set maps field names to a value or list of values, such as {'Region': 'West'}; each parameter set maps
+    parameter names to values. The requests run concurrently, at most `max_workers` at a time, and value lists too long
+    for one request are split across several (see `split_view_filters`). Rows are labelled with the filter values
+    ('filter_<field>', comma-separated for lists) and parameter values ('parameter_<name>') that produced them.
+    """
+    partitions = _get_view_data_partitions(filter_sets, parameter_sets, max_values_per_request, max_filter_length)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tableau-api-lib-view-data") as pool:
+        view_dfs = list(pool.map(
+            lambda partition: _read_view_data_partition(conn, view_id, partition, read_csv_kwargs), partitions
+        ))
+    return pd.concat(view_dfs, ignore_index=True) if view_dfs else pd.DataFrame()
+
+
+def _get_partition_dir(partition: Dict[str, Any]) -> str:
+    labels = [f"{name}={','.join(get_view_filter_values(values))}"
+              for name, values in {**partition["filters"], **partition["parameters"]}.items()]
+    partition_dir = _sanitize_file_stem("_".join(labels)) if labels else "unfiltered"
+    if len(partition_dir) > 100:
+        digest = hashlib.sha256(partition_dir.encode("utf-8")).hexdigest()[:12]
+        partition_dir = f"{partition_dir[:87]}_{digest}"
+    return partition_dir
+
+
+def write_view_data_partitions(
+    conn: TableauServerConnection,
+    view_id: str,
+    destination_dir: str,
+    filter_sets: Iterable[Optional[Dict[str, Union[str, Iterable[Any]]]]],
+    parameter_sets: Iterable[Optional[Dict[str, Any]]] = (None,),
+    max_workers: int = 4,
+    max_values_per_request: int = VIEW_FILTER_MAX_VALUES,
+    max_filter_length: int = VIEW_FILTER_MAX_LENGTH,
+) -> pd.DataFrame:
+    """Streams a view's data for every combination of filter set and parameter set to partitioned CSV files.
+
+    Each combination is written to its own directory (such as 'Region=West') in `destination_dir`, holding one
+    'part-00000.csv' file per request; see `get_view_data_for_filters_dataframe` for the filter and parameter sets.
+    Returns a DataFrame describing each request: its filters, parameters, file path, size, status code, and duration.
+    """
+    partitions = _get_view_data_partitions(filter_sets, parameter_sets, max_values_per_request, max_filter_length)
+
+    def write_partition(partition: Dict[str, Any]) -> Dict[str, Any]:
+        directory = os.path.join(destination_dir, _get_partition_dir(partition))
+        os.makedirs(directory, exist_ok=True)
+        parameter_dict = get_view_parameter_dict(partition["request_filters"], partition["parameters"])
+        result = copy.copy(conn).query_view_data_to_file(
+            view_id, os.path.join(directory, f"part-{partition['part']:05d}.csv"), parameter_dict=parameter_dict
+        )
+        return {
+            "filters": partition["filters"],
+            "parameters": partition["parameters"],
+            "part": partition["part"],
+            "request_filters": partition["request_filters"],
+            **result.to_dict(),
+        }
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tableau-api-lib-view-data") as pool:
+        return pd.DataFrame(list(pool.map(write_partition, partitions)))
+
+
 def get_views_for_workbook_dataframe(conn: TableauServerConnection, workbook_id: str) -> pd.DataFrame:
     """Returns a DataFrame containing details for the views contained within the specified workbook."""
     views_for_workbook = conn.query_views_for_workbook(workbook_id=workbook_id)
@@ -0,0 +1,1411 @@
+"""Defines an in-process stand-in for Tableau Server's REST API, populated with synthetic content for load testing.
+
+The server implements the REST API routes used by the api_endpoints modules for signing in, paginated listings,
+publishing (including chunked file-upload sessions), downloads, view exports, jobs, permissions, schedules and their
+tasks, subscriptions, data-driven alerts, and favorites. Sites are
+generated from a seed with as many users, groups, projects, workbooks, views, datasources, and flows as needed, and
+latency, server errors, and throttling (HTTP 429) can be injected to exercise retry and concurrency settings.
+
+Example:
+    with SyntheticTableauServer([SyntheticSite(num_workbooks=100_000)], latency=0.01) as server:
+        conn = TableauServerConnection(server.get_config(), ssl_verify=False)
+        conn.sign_in()
+        workbooks = extract_pages(conn.query_workbooks_for_site)
+"""
+
+import csv
+import io
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import zipfile
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib import parse
+
+DEFAULT_API_VERSION = "3.15"
+MULTIPART_HEAD_LIMIT = 1024 * 1024
+STREAM_BLOCK_SIZE = 1024 * 256
+VIEW_DATA_COLUMNS = ["Region", "Category", "Order Date", "Sales", "Profit"]
+VIEW_DATA_REGIONS = ["Central", "East", "South", "West"]
+VIEW_DATA_CATEGORIES = ["Furniture", "Office Supplies", "Technology"]
+PNG_BYTES = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89"
+    b"\x00\x00\x00\rIDATx\x9cc\xf8\x0f\x00\x00\x01\x01\x00\x05\x18\xd8N\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+PDF_BYTES = b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n2 0 obj<</Type/Pages/Count 0/Kids[]>>endobj\n%%EOF\n"
+
+
+def _timestamp(epoch_seconds: Optional[float] = None) -> str:
+    moment = datetime.fromtimestamp(epoch_seconds or time.time(), tz=timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class SyntheticSite:
+    """Describes a generated Tableau site; content is created deterministically from the seed.
+
+    Args:
+        name: The site name.
+        content_url: The site content URL; an empty string describes the Default site.
+        num_users: The number of users on the site.
+        num_groups: The number of groups on the site; users are distributed across groups round-robin.
+        num_projects: The number of projects content is distributed across.
+        num_workbooks: The number of workbooks on the site.
+        views_per_workbook: The number of views contained in each workbook.
+        num_datasources: The number of published datasources on the site.
+        num_flows: The number of flows on the site.
+        num_data_alerts: The number of data-driven alerts on the site; alerts cannot be created through the REST API.
+        revisions_per_item: The number of revisions recorded for each workbook and datasource.
+        extract_size: The size in bytes of the extract packaged into downloaded workbooks and datasources.
+        rows_per_view: The number of rows returned when querying view data.
+        seed: The seed used to generate identifiers and content.
+    """
+
+    def __init__(
+        self,
+        name: str = "Default",
+        content_url: str = "",
+        num_users: int = 10,
+        num_groups: int = 3,
+        num_projects: int = 3,
+        num_workbooks: int = 10,
+        views_per_workbook: int = 2,
+        num_datasources: int = 5,
+        num_flows: int = 2,
+        num_data_alerts: int = 0,
+        revisions_per_item: int = 1,
+        extract_size: int = 1024,
+        rows_per_view: int = 100,
+        seed: int = 0,
+    ):
+        self.name = name
+        self.content_url = content_url
+        self.views_per_workbook = views_per_workbook
+        self.revisions_per_item = revisions_per_item
+        self.extract_size = extract_size
+        self.rows_per_view = rows_per_view
+        self._rng = random.Random(f"{seed}:{content_url}")
+        self.id = self.new_id()
+        self.users = [self._build_user(i) for i in range(num_users)]
+        self.groups = [self._build_group(i) for i in range(num_groups)]
+        self.group_members = {group["id"]: [] for group in self.groups}
+        for i, user in enumerate(self.users):
+            if self.groups:
+                self.group_members[self.groups[i % len(self.groups)]["id"]].append(user["id"])
+        self.projects = [self._build_project(i) for i in range(max(num_projects, 1))]
+        self.datasources = [self._build_content("datasource", i) for i in range(num_datasources)]
+        self.workbooks = [self._build_content("workbook", i) for i in range(num_workbooks)]
+        self.flows = [self._build_content("flow", i) for i in range(num_flows)]
+        self.views = [view for workbook in self.workbooks for view in self._build_views(workbook)]
+        self.data_alerts = [self._build_data_alert(i) for i in range(num_data_alerts) if self.views]
+        self.settings = {"adminMode": "ContentAndUsers", "state": "Active"}
+        self.permissions = {}
+        self.default_permissions = {}
+        self.deleted_revisions = {}
+        self.favorites = {}
+        self.subscriptions = []
+        self.tasks = []
+
+    def new_id(self) -> str:
+        """Returns a new identifier (luid) drawn from the site's seeded generator."""
+        return str(uuid.UUID(int=self._rng.getrandbits(128), version=4))
+
+    def _owner(self, i: int) -> Dict[str, str]:
+        if not self.users:
+            return {"id": self.id, "name": "admin", "email": "admin@example.com"}
+        user = self.users[i % len(self.users)]
+        return {"id": user["id"], "name": user["name"], "email": user["email"]}
+
+    def _build_user(self, i: int) -> Dict[str, Any]:
+        return {
+            "id": self.new_id(),
+            "name": f"user_{i}",
+            "fullName": f"Synthetic User {i}",
+            "email": f"user_{i}@example.com",
+            "siteRole": "Creator" if i % 10 == 0 else "Viewer",
+            "authSetting": "ServerDefault",
+            "lastLogin": _timestamp(),
+            "externalAuthUserId": "",
+        }
+
+    def _build_group(self, i: int) -> Dict[str, Any]:
+        return {"id": self.new_id(), "name": f"group_{i}", "domain": {"name": "local"}}
+
+    def _build_project(self, i: int) -> Dict[str, Any]:
+        return {
+            "id": self.new_id(),
+            "name": "Default" if i == 0 else f"project_{i}",
+            "description": "",
+            "contentPermissions": "ManagedByOwner",
+            "createdAt": _timestamp(),
+            "updatedAt": _timestamp(),
+            "owner": {"id": self._owner(i)["id"]},
+        }
+
+    def _build_content(self, content_type: str, i: int, name: Optional[str] = None, project=None) -> Dict[str, Any]:
+        project = project or self.projects[i % len(self.projects)]
+        name = name or f"{content_type}_{i}"
+        item = {
+            "id": self.new_id(),
+            "name": name,
+            "contentUrl": re.sub(r"\W", "", name),
+            "webpageUrl": f"https://synthetic.invalid/#/{content_type}s/{i}",
+            "description": "",
+            "createdAt": _timestamp(),
+            "updatedAt": _timestamp(),
+            "size": str(max(self.extract_size // (1024 * 1024), 1)),
+            "encryptExtracts": "false",
+            "project": {"id": project["id"], "name": project["name"]},
+            "owner": self._owner(i),
+            "tags": {},
+            "revision": str(self.revisions_per_item),
+        }
+        if content_type == "workbook":
+            item.update({"showTabs": "true"})
+        if content_type == "datasource":
+            item.update({
+                "type": "hyper",
+                "hasExtracts": "true",
+                "isCertified": "false",
+                "isPublished": "true",
+                "useRemoteQueryAgent": "false",
+                "serverName": "",
+            })
+        return item
+
+    def _build_views(self, workbook: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": self.new_id(),
+                "name": f"{workbook['name']}_view_{i}",
+                "contentUrl": f"{workbook['contentUrl']}/sheets/view_{i}",
+                "viewUrlName": f"view_{i}",
+                "createdAt": workbook["createdAt"],
+                "updatedAt": workbook["updatedAt"],
+                "workbook": {"id": workbook["id"]},
+                "owner": {"id": workbook["owner"]["id"]},
+                "project": {"id": workbook["project"]["id"]},
+                "tags": {},
+                "usage": {"totalViewCount": str(i)},
+            }
+            for i in range(self.views_per_workbook)
+        ]
+
+    def _build_data_alert(self, i: int) -> Dict[str, Any]:
+        view = self.views[i % len(self.views)]
+        owner = self._owner(i)
+        return {
+            "id": self.new_id(),
+            "subject": f"data_alert_{i}",
+            "creatorId": owner["id"],
+            "createdAt": _timestamp(),
+            "updatedAt": _timestamp(),
+            "frequency": "once",
+            "public": "true",
+            "owner": owner,
+            "view": {"id": view["id"], "name": view["name"]},
+            "recipients": {"recipient": [{"id": owner["id"]}]},
+        }
+
+
+class _Job:
+    def __init__(self, job_id: str, job_type: str, duration: float, content: Optional[Dict[str, Any]] = None):
+        self.id = job_id
+        self.type = job_type
+        self.created_at = time.time()
+        self.duration = duration
+        self.content = content
+
+    def to_json(self) -> Dict[str, Any]:
+        completed = time.time() - self.created_at >= self.duration
+        job = {
+            "id": self.id,
+            "mode": "Asynchronous",
+            "type": self.type,
+            "progress": "100" if completed else "50",
+            "createdAt": _timestamp(self.created_at),
+            "startedAt": _timestamp(self.created_at),
+        }
+        if completed:
+            job.update({"completedAt": _timestamp(self.created_at + self.duration), "finishCode": "0"})
+        if self.content:
+            job.update(self.content)
+        return job
+
+
+class _Response:
+    def __init__(
+        self,
+        status: int,
+        body: Any = None,
+        content_type: str = "application/json",
+        headers: Optional[Dict[str, str]] = None,
+        length: Optional[int] = None,
+    ):
+        self.status = status
+        self.body = body
+        self.content_type = content_type
+        self.headers = headers or {}
+        self.length = length
+
+
+class _MultipartUpload:
+    """Describes a multipart request body read from the socket without holding its file part in memory."""
+
+    def __init__(self, payload: Optional[Dict[str, Any]], file_name: Optional[str], file_size: int):
+        self.payload = payload
+        self.file_name = file_name
+        self.file_size = file_size
+
+
+class SyntheticTableauServer:
+    """Serves synthetic sites over HTTP from a background thread.
+
+    Args:
+        sites: The sites hosted by the server; a single small Default site is generated if none are provided.
+        api_version: The REST API version reported by the server info endpoint.
+        latency: Seconds added before every response.
+        error_rate: The fraction of requests (after sign-in) answered with an HTTP 500 error.
+        throttle_rate: The fraction of requests (after sign-in) answered with HTTP 429 Too Many Requests.
+        retry_after: The value of the 'Retry-After' header sent with throttled responses.
+        job_duration: Seconds before asynchronous jobs (asJob publishes, extract refreshes) report completion.
+        host: The address the server binds to.
+        port: The port the server listens on; 0 chooses a free port.
+        seed: The seed used for error injection and new identifiers.
+    """
+
+    def __init__(
+        self,
+        sites: Optional[List[SyntheticSite]] = None,
+        api_version: str = DEFAULT_API_VERSION,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: int = 1,
+        job_duration: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 0,
+    ):
+        self.sites = sites or [SyntheticSite()]
+        self.api_version = api_version
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.job_duration = job_duration
+        self.request_count = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self._host = host
+        self._port = port
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        self._tokens = {}
+        self._upload_sessions = {}
+        self._jobs = {}
+        self.schedules = []
+        self._package_cache = {}
+        self._httpd = None
+        self._routes = self._build_routes()
+
+    def __enter__(self) -> "SyntheticTableauServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """Returns the base URL of the running server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def get_config(self, site_url: str = "", env: str = "tableau_prod") -> Dict[str, Dict[str, str]]:
+        """Returns a TableauServerConnection config that signs in to the given site of this server."""
+        site = self._get_site_by_content_url(site_url)
+        return {
+            env: {
+                "server": self.url,
+                "api_version": self.api_version,
+                "username": "synthetic_admin",
+                "password": "synthetic_password",
+                "site_name": site.name,
+                "site_url": site.content_url,
+            }
+        }
+
+    def start(self) -> "SyntheticTableauServer":
+        """Starts serving requests from a daemon thread."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server._handle(self)
+
+            do_POST = do_PUT = do_DELETE = do_GET
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((self._host, self._port), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, name="synthetic-tableau-server", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stops the server and releases its socket."""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def _build_routes(self) -> List[Tuple[str, "re.Pattern", Callable]]:
+        site = r"/api/[^/]+/sites/(?P<site_id>[^/]+)"
+        grantee = r"/(?P<grantee_type>users|groups)/(?P<grantee_id>[^/]+)/(?P<capability>[^/]+)/(?P<mode>[^/]+)"
+        routes = [
+            ("GET", r"/api/[^/]+/serverinfo", self._server_info),
+            ("POST", r"/api/[^/]+/auth/signin", self._sign_in),
+            ("POST", r"/api/[^/]+/auth/signout", self._sign_out),
+            ("POST", r"/api/[^/]+/auth/switchSite", self._switch_site),
+            ("GET", r"/api/[^/]+/sites", self._query_sites),
+            ("POST", r"/api/[^/]+/sites", self._create_site),
+            ("GET", site, self._query_site),
+            ("PUT", site, self._update_site),
+            ("DELETE", site, self._delete_site),
+            ("GET", r"/api/[^/]+/schedules", self._query_schedules),
+            ("POST", r"/api/[^/]+/schedules", self._create_schedule),
+            ("GET", r"/api/[^/]+/schedules/(?P<schedule_id>[^/]+)", self._query_schedule),
+            ("PUT", r"/api/[^/]+/schedules/(?P<schedule_id>[^/]+)", self._update_schedule),
+            ("DELETE", r"/api/[^/]+/schedules/(?P<schedule_id>[^/]+)", self._delete_schedule),
+            ("GET", site + r"/users", self._list("users")),
+            ("POST", site + r"/users", self._create_user),
+            ("GET", site + r"/users/(?P<item_id>[^/]+)", self._get_item("users", "user")),
+            ("PUT", site + r"/users/(?P<item_id>[^/]+)", self._update_item("users", "user")),
+            ("DELETE", site + r"/users/(?P<item_id>[^/]+)", self._delete_item("users")),
+            ("GET", site + r"/users/(?P<item_id>[^/]+)/workbooks", self._query_user_content("workbooks")),
+            ("GET", site + r"/users/(?P<item_id>[^/]+)/flows", self._query_user_content("flows")),
+            ("GET", site + r"/groups", self._list("groups")),
+            ("POST", site + r"/groups", self._create_group),
+            ("PUT", site + r"/groups/(?P<item_id>[^/]+)", self._update_item("groups", "group")),
+            ("DELETE", site + r"/groups/(?P<item_id>[^/]+)", self._delete_item("groups")),
+            ("GET", site + r"/groups/(?P<item_id>[^/]+)/users", self._query_group_users),
+            ("POST", site + r"/groups/(?P<item_id>[^/]+)/users", self._add_user_to_group),
+            ("DELETE", site + r"/groups/(?P<item_id>[^/]+)/users/(?P<user_id>[^/]+)", self._remove_user_from_group),
+            ("GET", site + r"/projects", self._list("projects")),
+            ("POST", site + r"/projects", self._create_project),
+            ("PUT", site + r"/projects/(?P<item_id>[^/]+)", self._update_item("projects", "project")),
+            ("DELETE", site + r"/projects/(?P<item_id>[^/]+)", self._delete_item("projects")),
+            (
+                "GET",
+                site + r"/projects/(?P<item_id>[^/]+)/default-permissions/(?P<content_type>[^/]+)",
+                self._query_default_permissions,
+            ),
+            (
+                "PUT",
+                site + r"/projects/(?P<item_id>[^/]+)/default-permissions/(?P<content_type>[^/]+)",
+                self._add_default_permissions,
+            ),
+            (
+                "DELETE",
+                site + r"/projects/(?P<item_id>[^/]+)/default-permissions/(?P<content_type>[^/]+)" + grantee,
+                self._delete_default_permission,
+            ),
+            ("GET", site + r"/views", self._list("views")),
+            ("GET", site + r"/views/(?P<item_id>[^/]+)", self._get_item("views", "view")),
+            ("GET", site + r"/views/(?P<item_id>[^/]+)/data", self._query_view_data),
+            ("GET", site + r"/views/(?P<item_id>[^/]+)/image", self._query_view_file(PNG_BYTES, "image/png")),
+            ("GET", site + r"/views/(?P<item_id>[^/]+)/pdf", self._query_view_file(PDF_BYTES, "application/pdf")),
+            ("POST", site + r"/fileUploads", self._initiate_file_upload),
+            ("PUT", site + r"/fileUploads/(?P<upload_id>[^/]+)", self._append_to_file_upload),
+            ("GET", site + r"/jobs", self._query_jobs),
+            ("GET", site + r"/jobs/(?P<job_id>[^/]+)", self._query_job),
+            ("PUT", site + r"/jobs/(?P<job_id>[^/]+)", self._cancel_job),
+            ("GET", site + r"/workbooks/(?P<item_id>[^/]+)/views", self._query_workbook_views),
+            ("GET", site + r"/workbooks/(?P<item_id>[^/]+)/pdf", self._query_workbook_file(PDF_BYTES, "application/pdf")),
+            (
+                "GET",
+                site + r"/workbooks/(?P<item_id>[^/]+)/previewImage",
+                self._query_workbook_file(PNG_BYTES, "image/png"),
+            ),
+            (
+                "PUT",
+                site + r"/schedules/(?P<schedule_id>[^/]+)/(?P<collection>workbooks|datasources|flows)",
+                self._add_to_schedule,
+            ),
+            ("GET", site + r"/schedules/(?P<schedule_id>[^/]+)/extracts", self._query_schedule_extracts),
+            ("GET", site + r"/tasks/extractRefreshes", self._query_tasks("extractRefresh")),
+            ("GET", site + r"/tasks/extractRefreshes/(?P<task_id>[^/]+)", self._get_task("extractRefresh")),
+            ("DELETE", site + r"/tasks/extractRefreshes/(?P<task_id>[^/]+)", self._delete_task("extractRefresh")),
+            (
+                "POST",
+                site + r"/tasks/extractRefreshes/(?P<task_id>[^/]+)/runNow",
+                self._run_task("extractRefresh", "RefreshExtract", "extractRefreshJob"),
+            ),
+            ("GET", site + r"/tasks/runFlow", self._query_tasks("flowRun")),
+            ("GET", site + r"/tasks/runFlow/(?P<task_id>[^/]+)", self._get_task("flowRun")),
+            (
+                "POST",
+                site + r"/tasks/runFlow/(?P<task_id>[^/]+)/runNow",
+                self._run_task("flowRun", "RunFlow", "runFlowJobType"),
+            ),
+            ("GET", site + r"/subscriptions", self._list("subscriptions")),
+            ("POST", site + r"/subscriptions", self._create_subscription),
+            ("GET", site + r"/subscriptions/(?P<item_id>[^/]+)", self._get_item("subscriptions", "subscription")),
+            ("PUT", site + r"/subscriptions/(?P<item_id>[^/]+)", self._update_subscription),
+            ("DELETE", site + r"/subscriptions/(?P<item_id>[^/]+)", self._delete_item("subscriptions")),
+            ("GET", site + r"/dataAlerts", self._query_data_alerts),
+            ("GET", site + r"/dataAlerts/(?P<item_id>[^/]+)", self._get_item("data_alerts", "dataAlert")),
+            ("PUT", site + r"/dataAlerts/(?P<item_id>[^/]+)", self._update_data_alert),
+            ("DELETE", site + r"/dataAlerts/(?P<item_id>[^/]+)", self._delete_item("data_alerts")),
+            ("POST", site + r"/dataAlerts/(?P<item_id>[^/]+)/users", self._add_user_to_data_alert),
+            (
+                "DELETE",
+                site + r"/dataAlerts/(?P<item_id>[^/]+)/users/(?P<user_id>[^/]+)",
+                self._delete_user_from_data_alert,
+            ),
+            ("GET", site + r"/favorites/(?P<user_id>[^/]+)", self._query_favorites),
+            ("PUT", site + r"/favorites/(?P<user_id>[^/]+)", self._add_favorite),
+            (
+                "DELETE",
+                site + r"/favorites/(?P<user_id>[^/]+)/(?P<collection>datasources|flows|projects|views|workbooks)"
+                r"/(?P<item_id>[^/]+)",
+                self._delete_favorite,
+            ),
+        ]
+        for collection, singular in [("workbooks", "workbook"), ("datasources", "datasource"), ("flows", "flow")]:
+            routes.extend([
+                ("GET", site + f"/{collection}", self._list(collection)),
+                ("POST", site + f"/{collection}", self._publish(collection, singular)),
+                ("GET", site + f"/{collection}/(?P<item_id>[^/]+)", self._get_item(collection, singular)),
+                ("PUT", site + f"/{collection}/(?P<item_id>[^/]+)", self._update_item(collection, singular)),
+                ("DELETE", site + f"/{collection}/(?P<item_id>[^/]+)", self._delete_item(collection)),
+                ("GET", site + f"/{collection}/(?P<item_id>[^/]+)/content", self._download(collection, singular)),
+                ("GET", site + f"/{collection}/(?P<item_id>[^/]+)/connections", self._query_connections(collection)),
+                (
+                    "PUT",
+                    site + f"/{collection}/(?P<item_id>[^/]+)/connections/(?P<connection_id>[^/]+)",
+                    self._update_connection(collection),
+                ),
+                ("GET", site + f"/{collection}/(?P<item_id>[^/]+)/revisions", self._query_revisions(collection)),
+                (
+                    "DELETE",
+                    site + f"/{collection}/(?P<item_id>[^/]+)/revisions/(?P<revision>[^/]+)",
+                    self._remove_revision(collection),
+                ),
+                (
+                    "GET",
+                    site + f"/{collection}/(?P<item_id>[^/]+)/revisions/(?P<revision>[^/]+)/content",
+                    self._download(collection, singular),
+                ),
+                ("POST", site + f"/{collection}/(?P<item_id>[^/]+)/refresh", self._refresh(collection, singular)),
+            ])
+        for collection, singular in [("workbooks", "workbook"), ("datasources", "datasource"), ("views", "view")]:
+            routes.extend([
+                ("PUT", site + f"/{collection}/(?P<item_id>[^/]+)/tags", self._add_tags(collection, singular)),
+                (
+                    "DELETE",
+                    site + f"/{collection}/(?P<item_id>[^/]+)/tags/(?P<tag>[^/]+)",
+                    self._delete_tag(collection, singular),
+                ),
+            ])
+        for collection in ["workbooks", "datasources", "flows", "projects", "views"]:
+            routes.extend([
+                ("GET", site + f"/{collection}/(?P<item_id>[^/]+)/permissions", self._query_permissions(collection)),
+                ("PUT", site + f"/{collection}/(?P<item_id>[^/]+)/permissions", self._add_permissions(collection)),
+                (
+                    "DELETE",
+                    site + f"/{collection}/(?P<item_id>[^/]+)/permissions" + grantee,
+                    self._delete_permission(collection),
+                ),
+            ])
+        return [(method, re.compile(pattern + "$"), handler) for method, pattern, handler in routes]
+
+    # request handling
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        handler._bytes_read = 0  # the handler serves every request sent over its keep-alive connection
+        with self._lock:
+            self.request_count += 1
+        split_url = parse.urlsplit(handler.path)
+        query = dict(parse.parse_qsl(split_url.query, keep_blank_values=True))
+        try:
+            response = self._dispatch(handler, split_url.path, query)
+        except _HttpError as error:
+            response = _Response(
+                error.status, {"error": {"code": str(error.code), "summary": error.summary}}, headers=error.headers
+            )
+        except Exception as error:
+            response = _Response(500, {"error": {"code": "500000", "summary": f"{type(error).__name__}: {error}"}})
+        finally:
+            self._drain(handler)
+        if self.latency:
+            time.sleep(self.latency)
+        self._send(handler, response)
+
+    def _dispatch(self, handler: BaseHTTPRequestHandler, path: str, query: Dict[str, str]) -> _Response:
+        for method, pattern, route_handler in self._routes:
+            match = pattern.match(path)
+            if match and method == handler.command:
+                if route_handler not in (self._server_info, self._sign_in):
+                    site = self._authenticate(handler, match.groupdict().get("site_id"))
+                    self._inject_faults()
+                else:
+                    site = None
+                return route_handler(handler=handler, site=site, query=query, **match.groupdict())
+        raise _HttpError(404, 404000, f"No route exists for {handler.command} {path}.")
+
+    def _authenticate(self, handler: BaseHTTPRequestHandler, site_id: Optional[str]) -> Optional[SyntheticSite]:
+        token = handler.headers.get("X-Tableau-Auth")
+        site = self._tokens.get(token)
+        if site is None:
+            raise _HttpError(401, 401002, "The authentication token is missing or invalid.")
+        if site_id and site_id != site.id:
+            raise _HttpError(403, 403069, "The token does not grant access to the requested site.")
+        return site
+
+    def _inject_faults(self) -> None:
+        with self._lock:
+            draw = self._rng.random()
+        if draw < self.throttle_rate:
+            raise _HttpError(429, 429000, "Too many requests.", headers={"Retry-After": str(self.retry_after)})
+        if draw < self.throttle_rate + self.error_rate:
+            raise _HttpError(500, 500000, "An injected internal server error occurred.")
+
+    @staticmethod
+    def _get_content_length(handler: BaseHTTPRequestHandler) -> int:
+        return int(handler.headers.get("Content-Length") or 0)
+
+    def _read_body(self, handler: BaseHTTPRequestHandler) -> bytes:
+        remaining = self._get_content_length(handler) - getattr(handler, "_bytes_read", 0)
+        body = handler.rfile.read(remaining) if remaining > 0 else b""
+        handler._bytes_read = getattr(handler, "_bytes_read", 0) + len(body)
+        with self._lock:
+            self.bytes_received += len(body)
+        return body
+
+    def _read_json(self, handler: BaseHTTPRequestHandler) -> Dict[str, Any]:
+        body = self._read_body(handler)
+        return json.loads(body) if body else {}
+
+    def _read_multipart(self, handler: BaseHTTPRequestHandler) -> _MultipartUpload:
+        """Reads the JSON payload part and measures the file part, discarding file bytes as they arrive."""
+        boundary = parse.unquote(handler.headers.get("Content-Type", "").partition("boundary=")[2].strip('"'))
+        delimiter = b"--" + boundary.encode("latin-1")
+        content_length = self._get_content_length(handler)
+        head = b""
+        while len(head) < content_length and head.count(delimiter) < 3 and len(head) < MULTIPART_HEAD_LIMIT:
+            head += handler.rfile.read(min(STREAM_BLOCK_SIZE, content_length - len(head)))
+        handler._bytes_read = len(head)
+        with self._lock:
+            self.bytes_received += len(head)
+        self._drain(handler)
+        parts = head.split(delimiter)
+        payload, file_name, file_size = None, None, 0
+        offset = len(parts[0])
+        for part in parts[1:]:
+            offset += len(delimiter)
+            header_block, _, data = part.partition(b"\r\n\r\n")
+            headers = header_block.decode("latin-1")
+            data_start = offset + len(header_block) + 4
+            offset += len(part)
+            if 'name="request_payload"' in headers:
+                text = data[:-2].decode("utf-8") if data.endswith(b"\r\n") else data.decode("utf-8")
+                payload = json.loads(text) if text.strip() else None
+            elif "filename=" in headers:
+                file_name = re.search(r'filename="([^"]*)"', headers).group(1)
+                trailer_length = len(b"\r\n" + delimiter + b"--\r\n")
+                file_size = max(content_length - data_start - trailer_length, 0)
+                break
+        return _MultipartUpload(payload, file_name, file_size)
+
+    def _drain(self, handler: BaseHTTPRequestHandler) -> None:
+        remaining = self._get_content_length(handler) - getattr(handler, "_bytes_read", 0)
+        while remaining > 0:
+            block = handler.rfile.read(min(STREAM_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            with self._lock:
+                self.bytes_received += len(block)
+        handler._bytes_read = self._get_content_length(handler)
+
+    def _send(self, handler: BaseHTTPRequestHandler, response: _Response) -> None:
+        body = response.body
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode("utf-8")
+        elif isinstance(body, str):
+            body = body.encode("utf-8")
+        elif body is None:
+            body = b""
+        length = response.length if response.length is not None else len(body)
+        handler.send_response(response.status)
+        handler.send_header("Content-Type", response.content_type)
+        handler.send_header("Content-Length", str(length))
+        for key, value in response.headers.items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        chunks = [body] if isinstance(body, (bytes, bytearray)) else body
+        for chunk in chunks:
+            handler.wfile.write(chunk)
+            with self._lock:
+                self.bytes_sent += len(chunk)
+
+    # helpers
+
+    def _get_site_by_content_url(self, content_url: str) -> SyntheticSite:
+        for site in self.sites:
+            if site.content_url.lower() == (content_url or "").lower():
+                return site
+        raise _HttpError(404, 404000, f"No site with the content URL '{content_url}' exists.")
+
+    @staticmethod
+    def _paginate(items: List[Dict[str, Any]], query: Dict[str, str], outer_key: str, inner_key: str) -> _Response:
+        items = _apply_filter(items, query.get("filter"))
+        page_size = int(query.get("pageSize", 100))
+        page_number = int(query.get("pageNumber", 1))
+        page = items[(page_number - 1) * page_size: page_number * page_size]
+        return _Response(200, {
+            "pagination": {
+                "pageNumber": str(page_number),
+                "pageSize": str(page_size),
+                "totalAvailable": str(len(items)),
+            },
+            outer_key: {inner_key: page},
+        })
+
+    @staticmethod
+    def _find(items: List[Dict[str, Any]], item_id: str, content_type: str) -> Dict[str, Any]:
+        for item in items:
+            if item["id"] == item_id:
+                return item
+        raise _HttpError(404, 404000, f"The {content_type} (id='{item_id}') could not be found.")
+
+    def _new_job(self, site: SyntheticSite, job_type: str, content: Optional[Dict[str, Any]] = None) -> _Job:
+        job = _Job(site.new_id(), job_type, self.job_duration, content)
+        with self._lock:
+            self._jobs[job.id] = job
+        return job
+
+    def _build_package(self, site: SyntheticSite, collection: str, item: Dict[str, Any], include_extract: bool):
+        """Returns a packaged workbook, datasource, or flow whose XML references this server and site."""
+        extension = {"workbooks": "twb", "datasources": "tds", "flows": "tfl"}[collection]
+        cache_key = (site.id, collection, item["name"], include_extract)
+        with self._lock:
+            if cache_key in self._package_cache:
+                return self._package_cache[cache_key]
+        netloc = parse.urlsplit(self.url).netloc
+        xml = (
+            f"<?xml version='1.0' encoding='utf-8' ?>\n"
+            f"<{collection[:-1]} source-build='synthetic' version='18.1'>\n"
+            f"  <repository-location id='{item['contentUrl']}' path='/t/{site.content_url}/{collection}' "
+            f"site='{site.content_url}' xml:base='{self.url}' />\n"
+            f"  <datasources>\n"
+            f"    <datasource caption='{item['name']}' name='federated.synthetic'>\n"
+            f"      <connection class='sqlproxy' server='{netloc}' dbname='{item['contentUrl']}' "
+            f"port='80' username='' channel='http' />\n"
+            f"    </datasource>\n"
+            f"  </datasources>\n"
+            f"</{collection[:-1]}>\n"
+        )
+        package = io.BytesIO()
+        with zipfile.ZipFile(package, "w", zipfile.ZIP_DEFLATED) as package_file:
+            package_file.writestr(f"{item['name']}.{extension}", xml)
+            if include_extract and site.extract_size:
+                extract_rng = random.Random(item["id"])
+                extract = bytes(extract_rng.getrandbits(8) for _ in range(min(site.extract_size, 4096)))
+                extract = (extract * (site.extract_size // len(extract) + 1))[: site.extract_size]
+                package_file.writestr(
+                    zipfile.ZipInfo(f"Data/Extracts/{item['contentUrl']}.hyper"), extract, zipfile.ZIP_STORED
+                )
+        package_bytes = package.getvalue()
+        with self._lock:
+            self._package_cache[cache_key] = package_bytes
+        return package_bytes
+
+    # route handlers
+
+    def _server_info(self, handler, site, query, **kwargs) -> _Response:
+        return _Response(200, {"serverInfo": {
+            "productVersion": {"value": "2022.1.0", "build": "20221.22.0000.0000"},
+            "restApiVersion": self.api_version,
+        }})
+
+    def _credentials(self, site: SyntheticSite, token: str) -> Dict[str, Any]:
+        user = site.users[0] if site.users else {"id": site.id}
+        return {"credentials": {
+            "token": token,
+            "site": {"id": site.id, "contentUrl": site.content_url},
+            "user": {"id": user["id"]},
+        }}
+
+    def _sign_in(self, handler, site, query, **kwargs) -> _Response:
+        credentials = self._read_json(handler).get("credentials", {})
+        site = self._get_site_by_content_url(credentials.get("site", {}).get("contentUrl", ""))
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._tokens[token] = site
+        return _Response(200, self._credentials(site, token))
+
+    def _sign_out(self, handler, site, query, **kwargs) -> _Response:
+        with self._lock:
+            self._tokens.pop(handler.headers.get("X-Tableau-Auth"), None)
+        return _Response(204)
+
+    def _switch_site(self, handler, site, query, **kwargs) -> _Response:
+        content_url = self._read_json(handler).get("site", {}).get("contentUrl", "")
+        new_site = self._get_site_by_content_url(content_url)
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._tokens.pop(handler.headers.get("X-Tableau-Auth"), None)
+            self._tokens[token] = new_site
+        return _Response(200, self._credentials(new_site, token))
+
+    def _site_json(self, site: SyntheticSite) -> Dict[str, Any]:
+        return {"id": site.id, "name": site.name, "contentUrl": site.content_url, **site.settings}
+
+    def _query_sites(self, handler, site, query, **kwargs) -> _Response:
+        return self._paginate([self._site_json(s) for s in self.sites], query, "sites", "site")
+
+    def _query_site(self, handler, site, query, **kwargs) -> _Response:
+        return _Response(200, {"site": self._site_json(site)})
+
+    @staticmethod
+    def _site_settings(details: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            key: value for key, value in details.items()
+            if key not in ("name", "contentUrl") and not isinstance(value, dict)
+        }
+
+    def _create_site(self, handler, site, query, **kwargs) -> _Response:
+        details = self._read_json(handler).get("site", {})
+        content_url = details.get("contentUrl", "")
+        if any(each_site.content_url.lower() == content_url.lower() for each_site in self.sites):
+            raise _HttpError(409, 409001, f"A site with the content URL '{content_url}' already exists.")
+        new_site = SyntheticSite(name=details.get("name"), content_url=content_url, num_users=0, num_groups=0,
+                                 num_projects=1, num_workbooks=0, num_datasources=0, num_flows=0)
+        new_site.settings.update(self._site_settings(details))
+        with self._lock:
+            self.sites.append(new_site)
+        return _Response(201, {"site": self._site_json(new_site)})
+
+    def _update_site(self, handler, site, query, **kwargs) -> _Response:
+        details = self._read_json(handler).get("site", {})
+        with self._lock:
+            site.name = details.get("name", site.name)
+            site.content_url = details.get("contentUrl", site.content_url)
+            site.settings.update(self._site_settings(details))
+        return _Response(200, {"site": self._site_json(site)})
+
+    def _delete_site(self, handler, site, query, **kwargs) -> _Response:
+        with self._lock:
+            self.sites.remove(site)
+        return _Response(204)
+
+    def _list(self, collection: str) -> Callable:
+        def handler_func(handler, site, query, **kwargs) -> _Response:
+            return self._paginate(getattr(site, collection), query, collection, collection[:-1])
+
+        return handler_func
+
+    def _get_item(self, collection: str, singular: str) -> Callable:
+        def handler_func(handler, site, query, item_id, **kwargs) -> _Response:
+            return _Response(200, {singular: self._find(getattr(site, collection), item_id, singular)})
+
+        return handler_func
+
+    def _update_item(self, collection: str, singular: str) -> Callable:
+        def handler_func(handler, site, query, item_id, **kwargs) -> _Response:
+            item = self._find(getattr(site, collection), item_id, singular)
+            updates = self._read_json(handler).get(singular, {})
+            with self._lock:
+                item.update({key: value for key, value in updates.items() if not isinstance(value, dict)})
+                item["updatedAt"] = _timestamp()
+            return _Response(200, {singular: item})
+
+        return handler_func
+
+    def _delete_item(self, collection: str) -> Callable:
+        def handler_func(handler, site, query, item_id, **kwargs) -> _Response:
+            items = getattr(site, collection)
+            item = self._find(items, item_id, collection[:-1])
+            with self._lock:
+                items.remove(item)
+                if collection == "workbooks":
+                    site.views = [view for view in site.views if view["workbook"]["id"] != item_id]
+            return _Response(204)
+
+        return handler_func
+
+    def _create_user(self, handler, site, query, **kwargs) -> _Response:
+        details = self._read_json(handler).get("user", {})
+        if any(user["name"] == details.get("name") for user in site.users):
+            raise _HttpError(409, 409017, f"A user named '{details.get('name')}' already exists on the site.")
+        user = {"id": site.new_id(), "name": details.get("name"), "siteRole": details.get("siteRole", "Viewer"),
+                "authSetting": details.get("authSetting", "ServerDefault"), "email": "", "fullName": "",
+                "lastLogin": "", "externalAuthUserId": ""}
+        with self._lock:
+            site.users.append(user)
+        return _Response(201, {"user": user})
+
+    def _create_group(self, handler, site, query, **kwargs) -> _Response:
+        details = self._read_json(handler).get("group", {})
+        if any(group["name"] == details.get("name") for group in site.groups):
+            raise _HttpError(409, 409009, f"A group named '{details.get('name')}' already exists on the site.")
+        group = {"id": site.new_id(), "name": details.get("name"), "domain": {"name": "local"}}
+        with self._lock:
+            site.groups.append(group)
+            site.group_members[group["id"]] = []
+        return _Response(201, {"group": group})
+
+    def _query_group_users(self, handler, site, query, item_id, **kwargs) -> _Response:
+        self._find(site.groups, item_id, "group")
+        member_ids = set(site.group_members.get(item_id, []))
+        return self._paginate([user for user in site.users if user["id"] in member_ids], query, "users", "user")
+
+    def _add_user_to_group(self, handler, site, query, item_id, **kwargs) -> _Response:
+        user_id = self._read_json(handler).get("user", {}).get("id")
+        user = self._find(site.users, user_id, "user")
+        with self._lock:
+            site.group_members.setdefault(item_id, []).append(user_id)
+        return _Response(200, {"user": user})
+
+    def _remove_user_from_group(self, handler, site, query, item_id, user_id, **kwargs) -> _Response:
+        self._find(site.groups, item_id, "group")
+        with self._lock:
+            members = site.group_members.get(item_id, [])
+            if user_id not in members:
+                raise _HttpError(404, 404002, f"The user (id='{user_id}') is not a member of the group.")
+            members.remove(user_id)
+        return _Response(204)
+
+    def _create_project(self, handler, site, query, **kwargs) -> _Response:
+        details = self._read_json(handler).get("project", {})
+        if any(project["name"] == details.get("name") for project in site.projects):
+            raise _HttpError(409, 409006, f"A project named '{details.get('name')}' already exists.")
+        project = dict(site._build_project(len(site.projects)), **{
+            key: value for key, value in details.items() if not isinstance(value, dict)
+        })
+        with self._lock:
+            site.projects.append(project)
+        return _Response(201, {"project": project})
+
+    def _query_workbook_views(self, handler, site, query, item_id, **kwargs) -> _Response:
+        self._find(site.workbooks, item_id, "workbook")
+        views = [view for view in site.views if view["workbook"]["id"] == item_id]
+        return _Response(200, {"views": {"view": views}})
+
+    def _query_user_content(self, collection: str) -> Callable:
+        def handler_func(handler, site, query, item_id, **kwargs) -> _Response:
+            self._find(site.users, item_id, "user")
+            items = [item for item in getattr(site, collection) if item["owner"]["id"] == item_id]
+            return self._paginate(items, query, collection, collection[:-1])
+
+        return handler_func
+
+    def _add_tags(self, collection: str, singular: str) -> Callable:
+        def handler_func(handler, site, query, item_id, **kwargs) -> _Response:
+            item = self._find(getattr(site, collection), item_id, singular)
+            labels = [tag.get("label") for tag in self._read_json(handler).get("tags", {}).get("tag", [])]
+            with self._lock:
+                tags = item.setdefault("tags", {}).setdefault("tag", [])
+                tags.extend({"label": label} for label in labels if {"label": label} not in tags)
+            return _Response(200, {"tags": {"tag": [{"label": label} for label in labels]}})
+
+        return handler_func
+
+    def _delete_tag(self, collection: str, singular: str) -> Callable:
+        def handler_func(handler, site, query, item_id, tag, **kwargs) -> _Response:
+            item = self._find(getattr(site, collection), item_id, singular)
+            label = parse.unquote(tag)
+            with self._lock:
+                tags = item.get("tags", {}).get("tag", [])
+                if {"label": label} not in tags:
+                    raise _HttpError(404, 404008, f"The tag '{label}' could not be found on the {singular}.")
+                tags.remove({"label": label})
+            return _Response(204)
+
+        return handler_func
+
+    def _connection_json(self, item: Dict[str, Any], connection_id: str) -> Dict[str, Any]:
+        return {
+            "id": connection_id,
+            "type": "sqlproxy",
+            "embedPassword": False,
+            "serverAddress": parse.urlsplit(self.url).hostname,
+            "serverPort": str(parse.urlsplit(self.url).port),
+            "userName": "",
+            "datasource": {"id": item["id"], "name": item["name"]},
+        }
+
+    def _query_connections(self, collection: str) -> Callable:
+        def handler_func(handler, site, query, item_id, **kwargs) -> _Response:
+            item = self._find(getattr(site, collection), item_id, collection[:-1])
+            return _Response(200, {"connections": {"connection": [self._connection_json(item, site.new_id())]}})
+
+        return handler_func
+
+    def _update_connection(self, collection: str) -> Callable:
+        def handler_func(handler, site, query, item_id, connection_id, **kwargs) -> _Response:
+            item = self._find(getattr(site, collection), item_id, collection[:-1])
+            updates = self._read_json(handler).get("connection", {})
+            connection = self._connection_json(item, connection_id)
+            connection.update({key: value for key, value in updates.items() if key != "password"})
+            return _Response(200, {"connection": connection})
+
+        return handler_func
+
+    def _query_view_data(self, handler, site, query, item_id, **kwargs) -> _Response:
+        self._find(site.views, item_id, "view")
+        filters = {
+            parse.unquote(key[3:]): set(value.split(","))
+            for key, value in query.items() if key.startswith("vf_")
+        }
+        rows_rng = random.Random(item_id)
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(VIEW_DATA_COLUMNS)
+        for i in range(site.rows_per_view):
+            row = {
+                "Region": VIEW_DATA_REGIONS[i % len(VIEW_DATA_REGIONS)],
+                "Category": VIEW_DATA_CATEGORIES[i % len(VIEW_DATA_CATEGORIES)],
+                "Order Date": f"2021-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                "Sales": f"{rows_rng.uniform(1, 1000):.2f}",
+                "Profit": f"{rows_rng.uniform(-100, 300):.2f}",
+            }
+            if all(row.get(column) in values for column, values in filters.items()):
+                writer.writerow([row[column] for column in VIEW_DATA_COLUMNS])
+        return _Response(200, output.getvalue(), content_type="text/csv; charset=utf-8")
+
+    def _query_view_file(self, body: bytes, content_type: str) -> Callable:
+        def handler_func(handler, site, query, item_id, **kwargs) -> _Response:
+            self._find(site.views, item_id, "view")
+            return _Response(200, body, content_type=content_type)
+
+        return handler_func
+
+    def _query_workbook_file(self, body: bytes, content_type: str) -> Callable:
+        def handler_func(handler, site, query, item_id, **kwargs) -> _Response:
+            self._find(site.workbooks, item_id, "workbook")
+            return _Response(200, body, content_type=content_type)
+
+        return handler_func
+
+    def _initiate_file_upload(self, handler, site, query, **kwargs) -> _Response:
+        upload_id = f"{self._rng.randint(10000, 99999)}:{uuid.uuid4().hex.upper()}-0:0"
+        with self._lock:
+            self._upload_sessions[upload_id] = 0
+        return _Response(201, {"fileUpload": {"uploadSessionId": upload_id, "fileSize": "0"}})
+
+    def _append_to_file_upload(self, handler, site, query, upload_id, **kwargs) -> _Response:
+        upload_id = parse.unquote(upload_id)
+        if upload_id not in self._upload_sessions:
+            raise _HttpError(404, 404003, f"The upload session '{upload_id}' could not be found.")
+        upload = self._read_multipart(handler)
+        with self._lock:
+            self._upload_sessions[upload_id] += upload.file_size
+            total_size = self._upload_sessions[upload_id]
+        return _Response(200, {"fileUpload": {
+            "uploadSessionId": upload_id,
+            "fileSize": str(total_size // (1024 * 1024)),
+        }})
+
+    def _publish(self, collection: str, singular: str) -> Callable:
+        def handler_func(handler, site, query, **kwargs) -> _Response:
+            upload = self._read_multipart(handler)
+            upload_id = query.get("uploadSessionId")
+            if upload_id:
+                if upload_id not in self._upload_sessions:
+                    raise _HttpError(404, 404003, f"The upload session '{upload_id}' could not be found.")
+                with self._lock:
+                    upload.file_size = self._upload_sessions.pop(upload_id)
+            details = (upload.payload or {}).get(singular, {})
+            project = self._find(site.projects, details.get("project", {}).get("id"), "project")
+            item = self._save_published_item(site, collection, singular, details, project, query)
+            item["size"] = str(max(upload.file_size // (1024 * 1024), 1))
+            if query.get("asJob", "").lower() == "true":
+                job = self._new_job(site, f"Publish{singular.capitalize()}", {singular: {"id": item["id"]}})
+                return _Response(202, {"job": job.to_json()})
+            return _Response(201, {singular: item})
+
+        return handler_func
+
+    def _save_published_item(self, site, collection, singular, details, project, query) -> Dict[str, Any]:
+        items = getattr(site, collection)
+        with self._lock:
+            existing = [item for item in items if item["name"] == details.get("name")
+                        and item["project"]["id"] == project["id"]]
+            if existing and query.get("overwrite", "").lower() != "true":
+                raise _HttpError(409, 409004, f"A {singular} named '{details.get('name')}' already exists.")
+            if existing:
+                item = existing[0]
+                item["updatedAt"] = _timestamp()
+                item["revision"] = str(int(item.get("revision", "1")) + 1)
+                return item
+            item = site._build_content(singular, len(items), name=details.get("name"), project=project)
+            item["revision"] = "1"
+            items.append(item)
+            if collection == "workbooks":
+                site.views.extend(site._build_views(item))
+            return item
+
+    def _download(self, collection: str, singular: str) -> Callable:
+        def handler_func(handler, site, query, item_id, **kwargs) -> _Response:
+            item = self._find(getattr(site, collection), item_id, singular)
+            include_extract = query.get("includeExtract", "true").lower() != "false"
+            package = self._build_package(site, collection, item, include_extract)
+            extension = {"workbooks": "twbx", "datasources": "tdsx", "flows": "tflx"}[collection]
+            chunks = (package[i: i + STREAM_BLOCK_SIZE] for i in range(0, len(package), STREAM_BLOCK_SIZE))
+            headers = {"Content-Disposition": f'name="tableau_{singular}"; filename="{item["name"]}.{extension}"'}
+            return _Response(200, chunks, "application/octet-stream", headers=headers, length=len(package))
+
+        return handler_func
+
+    def _query_revisions(self, collection: str) -> Callable:
+        def handler_func(handler, site, query, item_id, **kwargs) -> _Response:
+            item = self._find(getattr(site, collection), item_id, collection[:-1])
+            latest = int(item.get("revision", "1"))
+            revisions = [
+                {
+                    "revisionNumber": str(number),
+                    "publishedAt": item["updatedAt"],
+                    "deleted": str(number in site.deleted_revisions.get(item_id, set())).lower(),
+                    "current": str(number == latest).lower(),
+                    "sizeInBytes": str(site.extract_size),
+                    "publisher": {"id": item["owner"]["id"], "name": item["owner"]["name"]},
+                }
+                for number in range(1, latest + 1)
+            ]
+            return self._paginate(revisions, query, "revisions", "revision")
+
+        return handler_func
+
+    def _remove_revision(self, collection: str) -> Callable:
+        def handler_func(handler, site, query, item_id, revision, **kwargs) -> _Response:
+            item = self._find(getattr(site, collection), item_id, collection[:-1])
+            if not revision.isdigit() or not 1 <= int(revision) <= int(item.get("revision", "1")):
+                raise _HttpError(404, 404011, f"The revision '{revision}' could not be found.")
+            with self._lock:
+                site.deleted_revisions.setdefault(item_id, set()).add(int(revision))
+            return _Response(204)
+
+        return handler_func
+
+    def _query_permissions(self, collection: str) -> Callable:
+        def handler_func(handler, site, query, item_id, **kwargs) -> _Response:
+            item = self._find(getattr(site, collection), item_id, collection[:-1])
+            grantees = site.permissions.get(item_id, [])
+            return _Response(200, {"permissions": {collection[:-1]: {"id": item["id"], "name": item["name"]},
+                                                   "granteeCapabilities": grantees}})
+
+        return handler_func
+
+    def _add_permissions(self, collection: str) -> Callable:
+        def handler_func(handler, site, query, item_id, **kwargs) -> _Response:
+            self._find(getattr(site, collection), item_id, collection[:-1])
+            grantees = self._read_json(handler).get("permissions", {}).get("granteeCapabilities", [])
+            with self._lock:
+                site.permissions.setdefault(item_id, []).extend(grantees)
+            return _Response(200, {"permissions": {"granteeCapabilities": grantees}})
+
+        return handler_func
+
+    def _delete_permission(self, collection: str) -> Callable:
+        def handler_func(handler, site, query, item_id, grantee_type, grantee_id, capability, mode, **kwargs):
+            self._find(getattr(site, collection), item_id, collection[:-1])
+            self._remove_capability(site.permissions.get(item_id, []), grantee_type, grantee_id, capability, mode)
+            return _Response(204)
+
+        return handler_func
+
+    def _query_default_permissions(self, handler, site, query, item_id, content_type, **kwargs) -> _Response:
+        project = self._find(site.projects, item_id, "project")
+        grantees = site.default_permissions.get((item_id, content_type), [])
+        return _Response(200, {"permissions": {"project": {"id": project["id"], "name": project["name"]},
+                                               "granteeCapabilities": grantees}})
+
+    def _add_default_permissions(self, handler, site, query, item_id, content_type, **kwargs) -> _Response:
+        self._find(site.projects, item_id, "project")
+        grantees = self._read_json(handler).get("permissions", {}).get("granteeCapabilities", [])
+        with self._lock:
+            site.default_permissions.setdefault((item_id, content_type), []).extend(grantees)
+        return _Response(200, {"permissions": {"granteeCapabilities": grantees}})
+
+    def _delete_default_permission(
+        self, handler, site, query, item_id, content_type, grantee_type, grantee_id, capability, mode, **kwargs
+    ) -> _Response:
+        self._find(site.projects, item_id, "project")
+        grantees = site.default_permissions.get((item_id, content_type), [])
+        self._remove_capability(grantees, grantee_type, grantee_id, capability, mode)
+        return _Response(204)
+
+    def _remove_capability(self, grantees, grantee_type, grantee_id, capability, mode) -> None:
+        """Removes one capability granted to a user or group, as the REST API's delete permission methods do."""
+        grantee_kind = grantee_type[:-1]
+        target = {"name": capability, "mode": mode}
+        with self._lock:
+            for grantee in grantees:
+                capabilities = grantee.get("capabilities", {}).get("capability", [])
+                if grantee.get(grantee_kind, {}).get("id") == grantee_id and target in capabilities:
+                    capabilities.remove(target)
+                    return
+        raise _HttpError(
+            404, 404009, f"The {grantee_kind} (id='{grantee_id}') has no '{capability}' capability set to '{mode}'."
+        )
+
+    def _refresh(self, collection: str, singular: str) -> Callable:
+        def handler_func(handler, site, query, item_id, **kwargs) -> _Response:
+            item = self._find(getattr(site, collection), item_id, singular)
+            job = self._new_job(site, "RefreshExtract", {"extractRefreshJob": {singular: {"id": item["id"]}}})
+            return _Response(202, {"job": job.to_json()})
+
+        return handler_func
+
+    def _query_jobs(self, handler, site, query, **kwargs) -> _Response:
+        jobs = [{"id": job.id, "type": job.type, "createdAt": _timestamp(job.created_at)} for job in self._jobs.values()]
+        return self._paginate(jobs, query, "backgroundJobs", "backgroundJob")
+
+    def _query_job(self, handler, site, query, job_id, **kwargs) -> _Response:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise _HttpError(404, 404000, f"The job (id='{job_id}') could not be found.")
+        return _Response(200, {"job": job.to_json()})
+
+    def _cancel_job(self, handler, site, query, job_id, **kwargs) -> _Response:
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is None:
+            raise _HttpError(404, 404000, f"The job (id='{job_id}') could not be found.")
+        return _Response(200, {"job": {"id": job.id, "finishCode": "2"}})
+
+    def _query_schedules(self, handler, site, query, **kwargs) -> _Response:
+        return self._paginate(self.schedules, query, "schedules", "schedule")
+
+    def _create_schedule(self, handler, site, query, **kwargs) -> _Response:
+        details = self._read_json(handler).get("schedule", {})
+        if any(schedule["name"] == details.get("name") for schedule in self.schedules):
+            raise _HttpError(409, 409021, f"A schedule named '{details.get('name')}' already exists.")
+        schedule = {
+            "id": site.new_id(),
+            "name": details.get("name"),
+            "state": "Active",
+            "priority": str(details.get("priority", 50)),
+            "type": str(details.get("type", "Extract")).capitalize(),
+            "frequency": details.get("frequency"),
+            "executionOrder": details.get("executionOrder", "Parallel"),
+            "frequencyDetails": details.get("frequencyDetails", {}),
+            "createdAt": _timestamp(),
+            "updatedAt": _timestamp(),
+        }
+        with self._lock:
+            self.schedules.append(schedule)
+        return _Response(201, {"schedule": schedule})
+
+    def _query_schedule(self, handler, site, query, schedule_id, **kwargs) -> _Response:
+        return _Response(200, {"schedule": self._find(self.schedules, schedule_id, "schedule")})
+
+    def _update_schedule(self, handler, site, query, schedule_id, **kwargs) -> _Response:
+        schedule = self._find(self.schedules, schedule_id, "schedule")
+        updates = self._read_json(handler).get("schedule", {})
+        with self._lock:
+            schedule.update({key: value for key, value in updates.items() if value is not None})
+            schedule["updatedAt"] = _timestamp()
+        return _Response(200, {"schedule": schedule})
+
+    def _delete_schedule(self, handler, site, query, schedule_id, **kwargs) -> _Response:
+        schedule = self._find(self.schedules, schedule_id, "schedule")
+        with self._lock:
+            self.schedules.remove(schedule)
+            for each_site in self.sites:
+                each_site.tasks = [
+                    task for task in each_site.tasks if list(task.values())[0]["schedule"]["id"] != schedule_id
+                ]
+        return _Response(204)
+
+    def _add_to_schedule(self, handler, site, query, schedule_id, collection, **kwargs) -> _Response:
+        schedule = self._find(self.schedules, schedule_id, "schedule")
+        singular = collection[:-1]
+        kind = "flowRun" if collection == "flows" else "extractRefresh"
+        item_id = self._read_json(handler).get("task", {}).get(kind, {}).get(singular, {}).get("id")
+        item = self._find(getattr(site, collection), item_id, singular)
+        task = {
+            "id": site.new_id(),
+            "priority": schedule["priority"],
+            "consecutiveFailedCount": "0",
+            "type": "RunFlowTask" if kind == "flowRun" else "RefreshExtractTask",
+            "schedule": {"id": schedule["id"], "name": schedule["name"]},
+            singular: {"id": item["id"]},
+        }
+        with self._lock:
+            site.tasks.append({kind: task})
+        return _Response(200, {"task": {kind: task}})
+
+    def _query_schedule_extracts(self, handler, site, query, schedule_id, **kwargs) -> _Response:
+        self._find(self.schedules, schedule_id, "schedule")
+        extracts = [
+            {key: value for key, value in task["extractRefresh"].items() if key != "schedule"}
+            for task in site.tasks
+            if task.get("extractRefresh", {}).get("schedule", {}).get("id") == schedule_id
+        ]
+        return self._paginate(extracts, query, "extracts", "extract")
+
+    @staticmethod
+    def _find_task(site: SyntheticSite, kind: str, task_id: str) -> Dict[str, Any]:
+        for task in site.tasks:
+            if task.get(kind, {}).get("id") == task_id:
+                return task
+        raise _HttpError(404, 404005, f"The task (id='{task_id}') could not be found.")
+
+    def _query_tasks(self, kind: str) -> Callable:
+        def handler_func(handler, site, query, **kwargs) -> _Response:
+            return _Response(200, {"tasks": {"task": [task for task in site.tasks if kind in task]}})
+
+        return handler_func
+
+    def _get_task(self, kind: str) -> Callable:
+        def handler_func(handler, site, query, task_id, **kwargs) -> _Response:
+            return _Response(200, {"task": self._find_task(site, kind, task_id)})
+
+        return handler_func
+
+    def _delete_task(self, kind: str) -> Callable:
+        def handler_func(handler, site, query, task_id, **kwargs) -> _Response:
+            task = self._find_task(site, kind, task_id)
+            with self._lock:
+                site.tasks.remove(task)
+            return _Response(204)
+
+        return handler_func
+
+    def _run_task(self, kind: str, job_type: str, job_key: str) -> Callable:
+        def handler_func(handler, site, query, task_id, **kwargs) -> _Response:
+            task = self._find_task(site, kind, task_id)[kind]
+            content = {key: value for key, value in task.items() if key in ("datasource", "flow", "workbook")}
+            job = self._new_job(site, job_type, {job_key: content})
+            return _Response(200, {"job": job.to_json()})
+
+        return handler_func
+
+    def _create_subscription(self, handler, site, query, **kwargs) -> _Response:
+        details = self._read_json(handler).get("subscription", {})
+        content = details.get("content", {})
+        collection = {"workbook": "workbooks", "view": "views"}.get(str(content.get("type")).lower())
+        if collection is None:
+            raise _HttpError(400, 400000, f"Subscriptions cannot be created for '{content.get('type')}' content.")
+        self._find(getattr(site, collection), content.get("id"), collection[:-1])
+        schedule = self._find(self.schedules, details.get("schedule", {}).get("id"), "schedule")
+        user = self._find(site.users, details.get("user", {}).get("id"), "user")
+        subscription = {
+            "id": site.new_id(),
+            "subject": details.get("subject"),
+            "content": dict(content),
+            "schedule": {"id": schedule["id"], "name": schedule["name"]},
+            "user": {"id": user["id"], "name": user["name"]},
+        }
+        with self._lock:
+            site.subscriptions.append(subscription)
+        return _Response(201, {"subscription": subscription})
+
+    def _update_subscription(self, handler, site, query, item_id, **kwargs) -> _Response:
+        subscription = self._find(site.subscriptions, item_id, "subscription")
+        updates = self._read_json(handler).get("subscription", {})
+        schedule_id = updates.get("schedule", {}).get("id")
+        schedule = self._find(self.schedules, schedule_id, "schedule") if schedule_id else None
+        with self._lock:
+            subscription["subject"] = updates.get("subject", subscription["subject"])
+            if schedule:
+                subscription["schedule"] = {"id": schedule["id"], "name": schedule["name"]}
+        return _Response(200, {"subscription": subscription})
+
+    def _query_data_alerts(self, handler, site, query, **kwargs) -> _Response:
+        return self._paginate(site.data_alerts, query, "dataAlerts", "dataAlert")
+
+    def _update_data_alert(self, handler, site, query, item_id, **kwargs) -> _Response:
+        alert = self._find(site.data_alerts, item_id, "dataAlert")
+        updates = self._read_json(handler).get("dataAlert", {})
+        owner_id = updates.get("owner", {}).get("id")
+        owner = self._find(site.users, owner_id, "user") if owner_id else None
+        with self._lock:
+            alert.update({key: value for key, value in updates.items() if not isinstance(value, dict)})
+            if owner:
+                alert["owner"] = {"id": owner["id"], "name": owner["name"], "email": owner["email"]}
+            alert["updatedAt"] = _timestamp()
+        return _Response(200, {"dataAlert": alert})
+
+    def _add_user_to_data_alert(self, handler, site, query, item_id, **kwargs) -> _Response:
+        alert = self._find(site.data_alerts, item_id, "dataAlert")
+        user = self._find(site.users, self._read_json(handler).get("user", {}).get("id"), "user")
+        with self._lock:
+            recipients = alert["recipients"]["recipient"]
+            if {"id": user["id"]} not in recipients:
+                recipients.append({"id": user["id"]})
+        return _Response(200, {"user": {"id": user["id"], "name": user["name"]}})
+
+    def _delete_user_from_data_alert(self, handler, site, query, item_id, user_id, **kwargs) -> _Response:
+        alert = self._find(site.data_alerts, item_id, "dataAlert")
+        with self._lock:
+            recipients = alert["recipients"]["recipient"]
+            if {"id": user_id} not in recipients:
+                raise _HttpError(404, 404002, f"The user (id='{user_id}') is not a recipient of the data alert.")
+            recipients.remove({"id": user_id})
+        return _Response(204)
+
+    def _query_favorites(self, handler, site, query, user_id, **kwargs) -> _Response:
+        self._find(site.users, user_id, "user")
+        return self._paginate(site.favorites.get(user_id, []), query, "favorites", "favorite")
+
+    def _add_favorite(self, handler, site, query, user_id, **kwargs) -> _Response:
+        self._find(site.users, user_id, "user")
+        details = self._read_json(handler).get("favorite", {})
+        singular = next((key for key in ("datasource", "flow", "project", "view", "workbook") if key in details), None)
+        if singular is None:
+            raise _HttpError(400, 400000, "The favorite does not reference a datasource, flow, project, view, or "
+                                          "workbook.")
+        item = self._find(getattr(site, singular + "s"), details[singular].get("id"), singular)
+        with self._lock:
+            favorites = site.favorites.setdefault(user_id, [])
+            favorites[:] = [favorite for favorite in favorites if favorite.get(singular, {}).get("id") != item["id"]]
+            favorites.append({"label": details.get("label"), singular: {"id": item["id"], "name": item["name"]}})
+        return _Response(200, {"favorites": {"favorite": list(favorites)}})
+
+    def _delete_favorite(self, handler, site, query, user_id, collection, item_id, **kwargs) -> _Response:
+        singular = collection[:-1]
+        with self._lock:
+            favorites = site.favorites.get(user_id, [])
+            matches = [favorite for favorite in favorites if favorite.get(singular, {}).get("id") == item_id]
+            if not matches:
+                raise _HttpError(404, 404016, f"The {singular} (id='{item_id}') is not a favorite of the user.")
+            favorites.remove(matches[0])
+        return _Response(204)
+
+
+class _HttpError(Exception):
+    def __init__(self, status: int, code: int, summary: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(summary)
+        self.status = status
+        self.code = code
+        self.summary = summary
+        self.headers = headers or {}
+
+
+def _apply_filter(items: Iterable[Dict[str, Any]], filter_text: Optional[str]) -> List[Dict[str, Any]]:
+    """Applies REST API filter expressions such as 'name:eq:Sales' or 'name:in:[a,b]' to top-level fields."""
+    items = list(items)
+    if not filter_text:
+        return items
+    # commas separate expressions, except within the brackets of an 'in' expression's list of values
+    for expression in re.split(r",(?![^\[]*\])", filter_text):
+        field, operator, value = (expression.split(":", 2) + ["", ""])[:3]
+        if operator == "eq":
+            items = [item for item in items if str(item.get(field)) == value]
+        elif operator == "in":
+            values = set(value.strip("[]").split(","))
+            items = [item for item in items if str(item.get(field)) in values]
+    return items
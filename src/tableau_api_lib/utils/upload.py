@@ -0,0 +1,595 @@
+"""Defines the chunked upload engine used to publish large files through Tableau Server file upload sessions.
+
+An `UploadSource` describes the content being published: a file path, bytes, a binary file-like object, or an
+iterable of bytes, which lets content built in memory (a workbook rewritten on the fly, for example) be published
+without writing temp files. Sources of a known size up to the single-request limit are streamed within the publish
+request itself; larger sources, and iterables whose size is unknown, are sent to Tableau Server in chunks, each
+appended to a file upload session with its own PUT request.
+
+The `ChunkedUploader` reads the next chunks from the source on a background thread while the current chunk is being
+sent, so reads overlap network transfers. Chunks are read into a small pool of reusable buffers and framed as
+multipart bodies without copying their bytes.
+
+An `UploadJournal` makes chunked uploads resumable. After each acknowledged chunk, the upload session ID, the
+identity of the file (its size, modification time, and a SHA-256 hash of the bytes sent so far) and the confirmed
+offset are written to a small JSON file. When the same content is published again after a failure, appending resumes
+from the last acknowledged chunk instead of starting a new upload session from byte zero.
+
+Example:
+    uploader = ChunkedUploader(conn, chunk_size=64 * 1024 * 1024, progress_callback=print)
+    upload_session_id = uploader.upload('extracts/sales.hyper')
+
+    conn.publish_data_source('extracts/sales.hyper', 'sales', project_id, upload_journal='uploads.json')
+
+    conn.publish_workbook(UploadSource(rewritten_twb_bytes, file_name='sales.twb'), 'sales', project_id)
+"""
+
+import hashlib
+import io
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from tableau_api_lib.exceptions import FileUploadFailed
+from tableau_api_lib.utils.multipart import STREAM_BLOCK_SIZE, StreamingMultipartBody
+
+CHUNK_SIZE = 1024 * 1024 * 5  # 5MB
+FILE_SIZE_LIMIT = 1024 * 1024 * 60  # 60MB
+PREFETCH_CHUNKS = 1
+
+
+class _IterableReader:
+    """Reads the bytes produced by an iterable as a stream."""
+
+    def __init__(self, iterable: Iterable[bytes]):
+        self._iterator = iter(iterable)
+        self._pending = memoryview(b"")
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer)
+        filled = 0
+        while filled < len(view):
+            if not self._pending:
+                try:
+                    self._pending = memoryview(next(self._iterator)).cast("B")
+                except StopIteration:
+                    break
+            size = min(len(self._pending), len(view) - filled)
+            view[filled: filled + size] = self._pending[:size]
+            self._pending = self._pending[size:]
+            filled += size
+        return filled
+
+    def read(self, size: int) -> bytes:
+        buffer = bytearray(size)
+        return bytes(buffer[: self.readinto(buffer)])
+
+
+class BandwidthLimiter:
+    """Caps the combined rate at which uploads read, or downloads write, their content, shared by any number of threads.
+
+    The limiter is a token bucket: transfers that exceed the available tokens wait until the bucket has refilled, so
+    the average rate across every upload or download using the limiter stays at or below `bytes_per_second`.
+
+    Args:
+        bytes_per_second: The maximum average rate, in bytes per second.
+        burst: (optional) The number of bytes that may be read without waiting after a pause; defaults to one
+            second's worth of bytes.
+    """
+
+    def __init__(self, bytes_per_second: float, burst: Optional[float] = None):
+        if bytes_per_second <= 0:
+            raise ValueError(f"The bandwidth limit must be a positive number of bytes, not {bytes_per_second}.")
+        self.bytes_per_second = bytes_per_second
+        self.burst = burst or bytes_per_second
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, size: int) -> float:
+        """Waits until `size` more bytes may be sent, returning the number of seconds spent waiting."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.bytes_per_second)
+            self._updated = now
+            self._tokens -= size
+            delay = -self._tokens / self.bytes_per_second if self._tokens < 0 else 0.0
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class _ThrottledReader:
+    """Reads from a stream in blocks, waiting on a BandwidthLimiter for each block."""
+
+    def __init__(self, reader, limiter: BandwidthLimiter):
+        self._reader = reader
+        self._limiter = limiter
+
+    def readinto(self, buffer) -> int:
+        size = self._reader.readinto(memoryview(buffer)[:STREAM_BLOCK_SIZE])
+        if size:
+            self._limiter.consume(size)
+        return size
+
+    def read(self, size: int) -> bytes:
+        block = self._reader.read(min(size, STREAM_BLOCK_SIZE))
+        if block:
+            self._limiter.consume(len(block))
+        return block
+
+
+def _read_full(reader, buffer: bytearray) -> int:
+    """Fills the buffer from the reader, returning fewer bytes than the buffer holds only at the end of the stream."""
+    view = memoryview(buffer)
+    filled = 0
+    while filled < len(view):
+        size = reader.readinto(view[filled:])
+        if not size:
+            break
+        filled += size
+    return filled
+
+
+class UploadSource:
+    """Content to be published: a file path, bytes, a binary file-like object, or an iterable of bytes.
+
+    Args:
+        source: The content. File-like objects are read from their current position and are never closed.
+        file_name: (optional) The file name, including its extension, reported to Tableau Server. It is required
+            unless the source is a path or a file object with a `name`.
+        bandwidth_limiter: (optional) A BandwidthLimiter capping the rate at which the content is read for upload.
+
+    Raises:
+        ValueError: No file name was provided, and none could be derived from the source.
+        TypeError: The source is not one of the supported types.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, os.PathLike, bytes, BinaryIO, Iterable[bytes]],
+        file_name: Optional[str] = None,
+        bandwidth_limiter: Optional[BandwidthLimiter] = None,
+    ):
+        self._source = source
+        self.bandwidth_limiter = bandwidth_limiter
+        self._start = 0
+        if isinstance(source, (str, os.PathLike)):
+            self.kind = "path"
+            file_name = file_name or os.path.basename(os.fspath(source))
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            self.kind = "bytes"
+            self._source = memoryview(source).cast("B")
+        elif hasattr(source, "read"):
+            self.kind = "stream"
+            file_name = file_name or os.path.basename(str(getattr(source, "name", "")))
+            self._start = source.tell() if source.seekable() else None
+        elif hasattr(source, "__iter__"):
+            self.kind = "iterable"
+        else:
+            raise TypeError(f"Unable to upload an object of type '{type(source).__name__}'.")
+        if not file_name:
+            raise ValueError(f"A file name (including its extension) is required to upload {self.kind} content.")
+        self.file_name = file_name
+
+    def __repr__(self) -> str:
+        return f"UploadSource(kind='{self.kind}', file_name='{self.file_name}', size={self.size})"
+
+    @classmethod
+    def from_value(cls, value: Union["UploadSource", str, os.PathLike, BinaryIO]) -> "UploadSource":
+        """Returns the value as an UploadSource; paths and named file objects are wrapped as-is."""
+        return value if isinstance(value, UploadSource) else cls(value)
+
+    @property
+    def file_path(self) -> Optional[str]:
+        """Returns the path of a file-backed source, or None for other sources."""
+        return os.fspath(self._source) if self.kind == "path" else None
+
+    @property
+    def file_extension(self) -> str:
+        return self.file_name.split(".")[-1]
+
+    @property
+    def size(self) -> Optional[int]:
+        """Returns the size of the content in bytes, or None if it cannot be known before the content is read."""
+        if self.kind == "path":
+            return os.path.getsize(self._source)
+        if self.kind == "bytes":
+            return len(self._source)
+        if self.kind == "stream" and self._start is not None:
+            end = self._source.seek(0, io.SEEK_END)
+            self._source.seek(self._start)
+            return end - self._start
+        return None
+
+    @property
+    def is_repeatable(self) -> bool:
+        """Returns True if the content can be read more than once, for example to retry or resume an upload."""
+        return self.kind != "iterable" and self._start is not None
+
+    @contextmanager
+    def open(self, offset: int = 0, throttle: bool = True) -> Iterator[Any]:
+        """Opens the content for reading from `offset`, yielding an object with `read()` and `readinto()` methods.
+
+        Reads wait on the source's `bandwidth_limiter` unless `throttle` is False, as when hashing the content locally.
+
+        Raises:
+            ValueError: The content cannot be read again from `offset`.
+        """
+        if offset and not self.is_repeatable:
+            raise ValueError(f"Unable to read {self.kind} content from offset {offset}.")
+        with self._open(offset) as reader:
+            throttled = throttle and self.bandwidth_limiter
+            yield _ThrottledReader(reader, self.bandwidth_limiter) if throttled else reader
+
+    @contextmanager
+    def _open(self, offset: int = 0) -> Iterator[Any]:
+        if self.kind == "path":
+            with open(self._source, "rb") as file:
+                file.seek(offset)
+                yield file
+        elif self.kind == "bytes":
+            yield _IterableReader([self._source[offset:]])
+        elif self.kind == "stream":
+            if self._start is not None:
+                self._source.seek(self._start + offset)
+            yield self._source
+        else:
+            yield _IterableReader(self._source)
+
+    def __len__(self) -> int:
+        size = self.size
+        if size is None:
+            raise TypeError(f"The size of {self.kind} content is unknown until it has been read.")
+        return size
+
+    def iter_blocks(
+        self, block_size: int = STREAM_BLOCK_SIZE, throttle: bool = True
+    ) -> Iterator[Union[bytes, memoryview]]:
+        """Yields the content in blocks of at most `block_size` bytes, allowing sized sources to be multipart parts."""
+        if self.kind == "bytes":
+            for offset in range(0, len(self._source), block_size):
+                block = self._source[offset: offset + block_size]
+                if throttle and self.bandwidth_limiter:
+                    self.bandwidth_limiter.consume(len(block))
+                yield block
+            return
+        with self.open(throttle=throttle) as reader:
+            while True:
+                block = reader.read(block_size)
+                if not block:
+                    break
+                yield block
+
+    def requires_chunking(self, file_size_limit: int) -> bool:
+        """Returns True if the content must be sent through a file upload session before publishing."""
+        size = self.size
+        return size is None or size > file_size_limit
+
+
+class ChunkStats:
+    """Describes one chunk appended to a file upload session.
+
+    Args:
+        index: The position of the chunk within the upload, starting at 0.
+        offset: The position in the file where the chunk starts.
+        size: The number of bytes in the chunk.
+        read_seconds: The time spent reading the chunk from its source.
+        upload_seconds: The time spent sending the chunk and receiving Tableau Server's acknowledgement.
+    """
+
+    def __init__(self, index: int, offset: int, size: int, read_seconds: float, upload_seconds: float):
+        self.index = index
+        self.offset = offset
+        self.size = size
+        self.read_seconds = read_seconds
+        self.upload_seconds = upload_seconds
+
+    def __repr__(self) -> str:
+        return (
+            f"ChunkStats(index={self.index}, offset={self.offset}, size={self.size}, "
+            f"bytes_per_second={self.bytes_per_second:.0f})"
+        )
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Returns the upload throughput observed for the chunk."""
+        return self.size / self.upload_seconds if self.upload_seconds else float("inf")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "offset": self.offset,
+            "size": self.size,
+            "read_seconds": self.read_seconds,
+            "upload_seconds": self.upload_seconds,
+            "bytes_per_second": self.bytes_per_second,
+        }
+
+
+_JOURNAL_LOCK = threading.Lock()
+
+
+class UploadJournal:
+    """Records the progress of chunked uploads in a JSON file, so that uploads interrupted by a failure can resume.
+
+    Each entry is keyed by the publish target and stores the upload session ID, the identity of the content, and the
+    offset confirmed by Tableau Server. An entry only lets an upload resume while the content keeps its recorded size
+    and modification time, and its first `offset` bytes still match the recorded SHA-256 digest.
+
+    Args:
+        file_path: The path to the journal file, which is created when the first entry is recorded.
+    """
+
+    def __init__(self, file_path: Union[str, os.PathLike]):
+        self.file_path = os.fspath(file_path)
+
+    @classmethod
+    def from_value(cls, value: Union["UploadJournal", str, os.PathLike, None]) -> Optional["UploadJournal"]:
+        """Returns `value` as an UploadJournal, treating strings and paths as the location of the journal file."""
+        if value is None or isinstance(value, cls):
+            return value
+        return cls(value)
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Returns the key identifying an upload, built from the parts describing its publish target."""
+        return "/".join("" if part is None else str(part) for part in parts)
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the recorded entries, keyed by upload."""
+        try:
+            with open(self.file_path, encoding="utf-8") as file:
+                return json.load(file).get("uploads", {})
+        except FileNotFoundError:
+            return {}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the entry recorded for `key`, or None if the upload has no recorded progress."""
+        return self.entries().get(key)
+
+    def record(self, key: str, entry: Dict[str, Any]) -> None:
+        """Records the progress of the upload identified by `key`, replacing any earlier entry."""
+        with _JOURNAL_LOCK:
+            entries = self.entries()
+            entries[key] = dict(entry, updated_at=time.time())
+            self._write(entries)
+
+    def discard(self, key: str) -> None:
+        """Removes the entry recorded for `key`, if there is one."""
+        with _JOURNAL_LOCK:
+            entries = self.entries()
+            if entries.pop(key, None) is not None:
+                self._write(entries)
+
+    def _write(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        temp_path = f"{self.file_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"uploads": entries}, file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.file_path)
+
+
+def _source_identity(source: UploadSource) -> Dict[str, Any]:
+    file_path = source.file_path
+    return {
+        "file_name": source.file_name,
+        "file_path": os.path.abspath(file_path) if file_path else None,
+        "file_size": source.size,
+        "file_mtime": os.path.getmtime(file_path) if file_path else None,
+    }
+
+
+class ChunkedUploader:
+    """Uploads files to Tableau Server file upload sessions, reading chunks ahead while earlier chunks are sent.
+
+    Memory use is bounded by `chunk_size * (prefetch + 2)` bytes, regardless of the file size.
+
+    When a `journal` is given, the progress of each upload is recorded after every acknowledged chunk. Uploading the
+    same content again after a failure then resumes the recorded upload session from its confirmed offset. If the
+    failed chunk reached Tableau Server but its acknowledgement was lost, that chunk is sent twice and Tableau Server
+    rejects the publish request; the journal entry is discarded at that point, so the next attempt starts over.
+
+    Args:
+        conn: A signed-in TableauServerConnection.
+        chunk_size: (optional) The number of bytes sent in each append request.
+        prefetch: (optional) The number of chunks read ahead of the chunk being sent.
+        progress_callback: (optional) A callable receiving the `ChunkStats` of each chunk once it is acknowledged.
+        journal: (optional) The UploadJournal, or the path to the journal file, recording the progress of uploads.
+        journal_key: (optional) The key of this upload's journal entry; defaults to the path or name of the content.
+    """
+
+    def __init__(
+        self,
+        conn,
+        chunk_size: int = CHUNK_SIZE,
+        prefetch: int = PREFETCH_CHUNKS,
+        progress_callback: Optional[Callable[[ChunkStats], Any]] = None,
+        journal: Union[UploadJournal, str, os.PathLike, None] = None,
+        journal_key: Optional[str] = None,
+    ):
+        if chunk_size <= 0:
+            raise ValueError(f"The chunk size must be a positive number of bytes, not {chunk_size}.")
+        self._conn = conn
+        self.chunk_size = chunk_size
+        self.prefetch = max(prefetch, 0)
+        self.progress_callback = progress_callback
+        self.journal = UploadJournal.from_value(journal)
+        self.journal_key = journal_key
+        self.chunk_stats: List[ChunkStats] = []
+        self.resumed_offset = 0
+        self._resumed_hash = None
+
+    @property
+    def bytes_uploaded(self) -> int:
+        """Returns the number of bytes acknowledged by Tableau Server."""
+        return sum(stats.size for stats in self.chunk_stats)
+
+    def upload(self, source: Union[UploadSource, str, os.PathLike, BinaryIO]) -> str:
+        """Uploads the content to a file upload session.
+
+        A new upload session is initiated unless the journal records an unfinished upload of the same content, in
+        which case the remaining chunks are appended to that session and `resumed_offset` is set to the offset the
+        upload resumed from.
+
+        Args:
+            source: The content being uploaded, as an UploadSource or a file path.
+
+        Returns:
+            The upload session ID, to be passed as the 'uploadSessionId' URL parameter of the publish request.
+
+        Raises:
+            FileUploadFailed: Tableau Server rejected the upload session or one of its chunks.
+        """
+        source = UploadSource.from_value(source)
+        resume_point = self._find_resume_point(source)
+        if resume_point:
+            upload_session_id, offset = resume_point
+            try:
+                self.append(upload_session_id, source, offset)
+                return upload_session_id
+            except FileUploadFailed as error:
+                if error.offset != offset or getattr(error.response, "status_code", None) != 404:
+                    raise
+                # Tableau Server no longer knows the upload session (it expired), so the content is sent again.
+                self.resumed_offset = 0
+        upload_session_id = self.initiate()
+        self.append(upload_session_id, source)
+        return upload_session_id
+
+    def initiate(self) -> str:
+        """Initiates a file upload session and returns its ID."""
+        response = self._conn.initiate_file_upload()
+        if response.status_code != 201:
+            raise FileUploadFailed(None, 0, response)
+        return response.json()["fileUpload"]["uploadSessionId"]
+
+    def append(
+        self, upload_session_id: str, source: Union[UploadSource, str, os.PathLike, BinaryIO], offset: int = 0
+    ) -> None:
+        """Appends the content, starting at `offset`, to an existing file upload session.
+
+        Raises:
+            FileUploadFailed: Tableau Server rejected one of the chunks.
+        """
+        source = UploadSource.from_value(source)
+        journaled = self.journal is not None and source.is_repeatable
+        hasher = self._start_hash(source, offset) if journaled else None
+        identity = _source_identity(source) if journaled else None
+        free_buffers = queue.Queue()
+        for _ in range(self.prefetch + 2):
+            free_buffers.put(bytearray(self.chunk_size))
+        ready_chunks = queue.Queue()
+        reader = threading.Thread(
+            target=self._read_chunks,
+            args=(source, offset, free_buffers, ready_chunks, hasher),
+            name="tableau-api-lib-chunk-reader",
+            daemon=True,
+        )
+        reader.start()
+        try:
+            while True:
+                chunk = ready_chunks.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                buffer, chunk_offset, size, read_seconds, digest = chunk
+                upload_seconds = self._append_chunk(upload_session_id, memoryview(buffer)[:size], chunk_offset)
+                free_buffers.put(buffer)
+                if journaled:
+                    self.journal.record(self._journal_key(source), dict(
+                        identity, upload_session_id=upload_session_id, offset=chunk_offset + size, sha256=digest
+                    ))
+                stats = ChunkStats(len(self.chunk_stats), chunk_offset, size, read_seconds, upload_seconds)
+                self.chunk_stats.append(stats)
+                if self.progress_callback:
+                    self.progress_callback(stats)
+        finally:
+            free_buffers.put(None)
+            reader.join()
+
+    def _journal_key(self, source: UploadSource) -> str:
+        return self.journal_key or source.file_path or source.file_name
+
+    def _find_resume_point(self, source: UploadSource) -> Optional[Tuple[str, int]]:
+        if self.journal is None or not source.is_repeatable:
+            return None
+        key = self._journal_key(source)
+        entry = self.journal.get(key)
+        if entry is None:
+            return None
+        identity = _source_identity(source)
+        offset = entry.get("offset", 0)
+        if any(entry.get(name) != value for name, value in identity.items()) or offset > identity["file_size"]:
+            self.journal.discard(key)
+            return None
+        hasher = self._hash_prefix(source, offset)
+        if hasher.hexdigest() != entry.get("sha256"):
+            self.journal.discard(key)
+            return None
+        self.resumed_offset = offset
+        self._resumed_hash = (offset, hasher)
+        return entry["upload_session_id"], offset
+
+    def _start_hash(self, source: UploadSource, offset: int) -> "hashlib._Hash":
+        if self._resumed_hash and self._resumed_hash[0] == offset:
+            return self._resumed_hash[1].copy()
+        return self._hash_prefix(source, offset)
+
+    @staticmethod
+    def _hash_prefix(source: UploadSource, offset: int) -> "hashlib._Hash":
+        hasher = hashlib.sha256()
+        with source.open(throttle=False) as reader:
+            remaining = offset
+            while remaining > 0:
+                block = reader.read(min(STREAM_BLOCK_SIZE, remaining))
+                if not block:
+                    break
+                hasher.update(block)
+                remaining -= len(block)
+        return hasher
+
+    @staticmethod
+    def _read_chunks(
+        source: UploadSource,
+        offset: int,
+        free_buffers: queue.Queue,
+        ready_chunks: queue.Queue,
+        hasher: Optional["hashlib._Hash"] = None,
+    ) -> None:
+        try:
+            with source.open(offset) as reader:
+                while True:
+                    buffer = free_buffers.get()
+                    if buffer is None:
+                        return
+                    start = time.perf_counter()
+                    size = _read_full(reader, buffer)
+                    if not size:
+                        break
+                    digest = None
+                    if hasher is not None:
+                        hasher.update(memoryview(buffer)[:size])
+                        digest = hasher.hexdigest()
+                    ready_chunks.put((buffer, offset, size, time.perf_counter() - start, digest))
+                    offset += size
+            ready_chunks.put(None)
+        except Exception as error:
+            ready_chunks.put(error)
+
+    def _append_chunk(self, upload_session_id: str, chunk: memoryview, offset: int) -> float:
+        request_body = StreamingMultipartBody({
+            "request_payload": (None, "", "application/json"),
+            "tableau_file": ("file", chunk, "application/octet-stream"),
+        })
+        start = time.perf_counter()
+        response = self._conn.append_to_file_upload(
+            upload_session_id=upload_session_id, payload=request_body, content_type=request_body.content_type
+        )
+        if response.status_code != 200:
+            raise FileUploadFailed(upload_session_id, offset, response)
+        return time.perf_counter() - start
@@ -0,0 +1,371 @@
+"""Exports many view images, PDFs, and CSVs concurrently, such as the renders sent in scheduled email digests.
+
+A `ViewExporter` queues views with any number of filter (`vf_`) and parameter (`vp_`) combinations and streams up to
+`max_workers` exports at a time, each on its own copy of the connection, into a directory. Identical requests (the same
+view, format, filters, and parameters, in any order) are queued once. Exports failing with a network error or a
+retryable status (429 or 5xx) are retried with a growing delay, and each export records the time until the server
+responded (its render latency) and the total time spent.
+
+With a `render_cache`, renders are kept in a `DownloadCache` keyed by their canonical request URL, which includes the
+view, filters, parameters, and `maxAge`. A request rendered within its `maxAge` minutes (or the exporter's
+`max_age` for requests without one) is copied from the cache instead of being rendered again.
+
+Example:
+    exporter = ViewExporter(conn, 'digests/2024-01-01', max_workers=8, render_cache='render_cache')
+    exporter.add_combinations(view_ids, ['image', 'pdf'], filter_sets=[{'Region': 'West'}, {'Region': 'East'}])
+    exporter.run()
+    print(exporter.get_latency_stats())
+"""
+
+import collections.abc
+import copy
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+from urllib import parse
+
+import pandas as pd
+import requests
+
+from tableau_api_lib.utils import download
+from tableau_api_lib.utils.bulk_download import RETRYABLE_STATUS_CODES, _sanitize_file_stem
+from tableau_api_lib.utils.download import DOWNLOAD_CHUNK_SIZE
+from tableau_api_lib.utils.download_cache import DownloadCache, build_cached_response
+from tableau_api_lib.utils.metrics import record_retry
+
+EXPORT_METHODS = {
+    "image": ("query_view_image_to_file", "view_image"),
+    "pdf": ("query_view_pdf_to_file", "view_pdf"),
+    "csv": ("query_view_data_to_file", "view_data"),
+}
+RENDER_CACHE_VERSION = "render"
+MANIFEST_FILE_NAME = "manifest.json"
+
+
+def encode_view_filter_value(value: Any) -> str:
+    """Returns a filter value URL-encoded for a `vf_` parameter; commas within the value are escaped with a backslash,
+    since commas separate the values of a filter."""
+    return parse.quote(str(value).replace(",", "\\,"), safe="")
+
+
+def get_view_filter_values(values: Any) -> List[str]:
+    """Returns a filter's values as strings: a string or other scalar is one value, and any other iterable (a list, a
+    NumPy array, a pandas Series, or a range) is a list of values."""
+    if isinstance(values, (str, bytes)) or not isinstance(values, collections.abc.Iterable):
+        return [str(values)]
+    return [str(value) for value in values]
+
+
+def get_view_parameter_dict(
+    filters: Optional[Dict[str, Union[str, Iterable[Any]]]] = None,
+    parameters: Optional[Dict[str, str]] = None,
+    max_age: Optional[int] = None,
+    parameter_dict: Optional[Dict[str, Any]] = None,
+) -> Dict[str, str]:
+    """Returns the `parameter_dict` filtering a view export and setting its parameters.
+
+    Args:
+        filters: (optional) Maps each field name to the value, or list of values, the view is filtered to.
+        parameters: (optional) Maps each parameter name to its value.
+        max_age: (optional) The maximum number of minutes a render cached by Tableau Server may be used for.
+        parameter_dict: (optional) Other URL parameters, such as {'resolution': 'resolution=high'}.
+    """
+    view_parameters = dict(parameter_dict or {})
+    for name, values in (filters or {}).items():
+        encoded = ",".join(encode_view_filter_value(value) for value in get_view_filter_values(values))
+        view_parameters[f"vf_{name}"] = f"vf_{parse.quote(name, safe='')}={encoded}"
+    for name, value in (parameters or {}).items():
+        view_parameters[f"vp_{name}"] = f"vp_{parse.quote(name, safe='')}={parse.quote(str(value), safe='')}"
+    if max_age is not None:
+        view_parameters["maxAge"] = f"maxAge={max_age}"
+    return view_parameters
+
+
+def _get_max_age_minutes(parameter_dict: Dict[str, str]) -> Optional[float]:
+    for text in parameter_dict.values():
+        name, _, value = str(text).partition("=")
+        if name == "maxAge":
+            return float(value)
+    return None
+
+
+class ViewExportItem:
+    """A view export, and the outcome of running it.
+
+    Args:
+        view_id: The LUID of the view.
+        export_format: One of 'image', 'pdf', or 'csv'.
+        parameter_dict: The URL parameters of the export, such as those built by `get_view_parameter_dict`.
+        file_stem: The name, without extension, of the file the export is saved to.
+        name: (optional) A name describing the export.
+    """
+
+    PENDING = "pending"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    def __init__(
+        self,
+        view_id: str,
+        export_format: str,
+        parameter_dict: Dict[str, str],
+        file_stem: str,
+        name: Optional[str] = None,
+    ):
+        if export_format not in EXPORT_METHODS:
+            raise ValueError(f"Unable to export views as '{export_format}'; expected one of {list(EXPORT_METHODS)}.")
+        self.view_id = view_id
+        self.export_format = export_format
+        self.parameter_dict = parameter_dict
+        self.file_stem = file_stem
+        self.name = name
+        self.status = self.PENDING
+        self.attempts = 0
+        self.result = None
+        self.error = None
+        self.cached = False
+        self.latency = None
+        self.seconds = None
+
+    def __repr__(self) -> str:
+        return f"ViewExportItem(view_id='{self.view_id}', export_format='{self.export_format}', status='{self.status}')"
+
+    @property
+    def request_key(self) -> tuple:
+        """Identifies the export; identical exports share the same key regardless of their parameters' order."""
+        return self.view_id, self.export_format, tuple(sorted(self.parameter_dict.values()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = self.result
+        return {
+            "view_id": self.view_id,
+            "export_format": self.export_format,
+            "name": self.name,
+            "parameters": "&".join(self.request_key[2]),
+            "status": self.status,
+            "status_code": result.status_code if result is not None else None,
+            "file_path": result.file_path if result is not None else None,
+            "size": result.size if result is not None else None,
+            "sha256": result.sha256 if result is not None else None,
+            "cached": self.cached,
+            "latency": self.latency,
+            "seconds": self.seconds,
+            "attempts": self.attempts,
+            "error": None if self.error is None else str(self.error),
+        }
+
+
+class ViewExporter:
+    """Exports queued view images, PDFs, and CSVs concurrently into a directory.
+
+    Args:
+        conn: A signed-in TableauServerConnection; each export uses a copy of it.
+        destination_dir: The directory receiving the exported files and the manifest.
+        max_workers: (optional) The maximum number of exports running at the same time.
+        retries: (optional) The number of times a failed export is retried.
+        retry_delay: (optional) The seconds waited before the first retry; the delay doubles with each retry.
+        chunk_size: (optional) The number of bytes read and written at a time by each export.
+        render_cache: (optional) A DownloadCache, or the path to its directory, keeping renders for reuse.
+        max_age: (optional) The minutes renders of requests without a `maxAge` parameter are reused from the render
+            cache; 0 only reuses renders of requests with a `maxAge`.
+        progress_callback: (optional) A callable receiving each ViewExportItem once its export has finished.
+    """
+
+    def __init__(
+        self,
+        conn,
+        destination_dir: str,
+        max_workers: int = 4,
+        retries: int = 2,
+        retry_delay: float = 1.0,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        render_cache: Union[DownloadCache, str, None] = None,
+        max_age: float = 60,
+        progress_callback: Optional[Callable[[ViewExportItem], Any]] = None,
+    ):
+        if max_workers < 1:
+            raise ValueError(f"At least one worker is required to export views, not {max_workers}.")
+        self._conn = conn
+        self.destination_dir = destination_dir
+        self.max_workers = max_workers
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.chunk_size = chunk_size
+        self.render_cache = DownloadCache.from_value(render_cache, name="render_cache")
+        self.max_age = max_age
+        self.progress_callback = progress_callback
+        self.items: List[ViewExportItem] = []
+        self._items_by_key: Dict[tuple, ViewExportItem] = {}
+        self.duplicates = 0
+
+    def add(
+        self,
+        view_id: str,
+        export_format: str = "image",
+        filters: Optional[Dict[str, Union[str, Iterable[str]]]] = None,
+        parameters: Optional[Dict[str, str]] = None,
+        parameter_dict: Optional[Dict[str, Any]] = None,
+        max_age: Optional[int] = None,
+        name: Optional[str] = None,
+    ) -> ViewExportItem:
+        """Queues a view export, returning its ViewExportItem; an identical export already queued is returned instead.
+
+        Args:
+            view_id: The LUID of the view.
+            export_format: (optional) One of 'image', 'pdf', or 'csv'.
+            filters: (optional) Maps each field name to the value, or list of values, the view is filtered to.
+            parameters: (optional) Maps each parameter name to its value.
+            parameter_dict: (optional) Other URL parameters, including `vf_` and `vp_` parameters built by hand, and
+                'resolution'.
+            max_age: (optional) The maximum number of minutes a render cached by Tableau Server, or by the render
+                cache, may be used for.
+            name: (optional) A name for the export; the file is named after it, or the view's LUID otherwise.
+        """
+        parameter_dict = get_view_parameter_dict(filters, parameters, max_age, parameter_dict)
+        item = ViewExportItem(view_id, export_format, parameter_dict, "", name)
+        existing = self._items_by_key.get(item.request_key)
+        if existing is not None:
+            self.duplicates += 1
+            return existing
+        file_stem = _sanitize_file_stem(name) if name else view_id
+        if parameter_dict:
+            file_stem += "_" + hashlib.sha256("&".join(item.request_key[2]).encode("utf-8")).hexdigest()[:12]
+        item.file_stem = file_stem
+        self._items_by_key[item.request_key] = item
+        self.items.append(item)
+        return item
+
+    def add_combinations(
+        self,
+        view_ids: Iterable[str],
+        export_formats: Iterable[str] = ("image",),
+        filter_sets: Iterable[Optional[Dict[str, Union[str, Iterable[str]]]]] = (None,),
+        parameter_sets: Iterable[Optional[Dict[str, str]]] = (None,),
+        parameter_dict: Optional[Dict[str, Any]] = None,
+        max_age: Optional[int] = None,
+    ) -> List[ViewExportItem]:
+        """Queues every combination of view, export format, filters, and parameters."""
+        export_formats, filter_sets, parameter_sets = list(export_formats), list(filter_sets), list(parameter_sets)
+        return [
+            self.add(view_id, export_format, filters, parameters, parameter_dict, max_age)
+            for view_id in view_ids
+            for export_format in export_formats
+            for filters in filter_sets
+            for parameters in parameter_sets
+        ]
+
+    def run(self) -> List[ViewExportItem]:
+        """Runs every pending export, returning all items once the exports have finished."""
+        pending = [item for item in self.items if item.status == ViewExportItem.PENDING]
+        os.makedirs(self.destination_dir, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tableau-api-lib-export") as pool:
+            list(pool.map(self._export, pending))
+        return self.items
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Returns a DataFrame describing the outcome of each export."""
+        return pd.DataFrame([item.to_dict() for item in self.items])
+
+    def get_latency_stats(self) -> Dict[str, Any]:
+        """Returns the number of exports rendered and served from the render cache, and percentiles of render latency.
+
+        Latency is the number of seconds until Tableau Server responded to the successful attempt of each export
+        rendered by the server.
+        """
+        latencies = pd.Series([item.latency for item in self.items
+                               if item.status == ViewExportItem.SUCCEEDED and not item.cached], dtype=float)
+        stats = {
+            "exports": len(self.items),
+            "succeeded": sum(item.status == ViewExportItem.SUCCEEDED for item in self.items),
+            "failed": sum(item.status == ViewExportItem.FAILED for item in self.items),
+            "cached": sum(item.cached for item in self.items),
+            "duplicates": self.duplicates,
+        }
+        for label, quantile in [("p50", 0.5), ("p90", 0.9), ("p99", 0.99)]:
+            stats[f"latency_{label}"] = float(latencies.quantile(quantile)) if len(latencies) else None
+        stats["latency_max"] = float(latencies.max()) if len(latencies) else None
+        return stats
+
+    def write_manifest(self, file_path: Optional[str] = None) -> str:
+        """Writes the JSON manifest describing each export, returning its path.
+
+        Args:
+            file_path: (optional) The path of the manifest; defaults to 'manifest.json' in the destination directory.
+        """
+        file_path = file_path or os.path.join(self.destination_dir, MANIFEST_FILE_NAME)
+        manifest = {"created_at": time.time(), "items": [item.to_dict() for item in self.items]}
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2)
+        return file_path
+
+    def _get_file_path(self, item: ViewExportItem) -> str:
+        extension = download.FILE_EXTENSIONS[EXPORT_METHODS[item.export_format][1]][0]
+        return os.path.join(self.destination_dir, f"{item.file_stem}.{extension}")
+
+    def _get_cache_max_age(self, item: ViewExportItem) -> Optional[float]:
+        """Returns the seconds a render of the item may be reused for."""
+        max_age = _get_max_age_minutes(item.parameter_dict)
+        return (self.max_age if max_age is None else max_age) * 60
+
+    def _export(self, item: ViewExportItem) -> None:
+        conn = copy.copy(self._conn)
+        method_name, content_variety = EXPORT_METHODS[item.export_format]
+        parameter_dict = dict(sorted(item.parameter_dict.items(), key=lambda parameter: parameter[1]))
+        file_path = self._get_file_path(item)
+        start = time.perf_counter()
+        cache_key = None
+        if self.render_cache is not None:
+            cache_key = self._get_cache_key(conn, item, parameter_dict)
+            if self._export_from_cache(item, cache_key, file_path, content_variety):
+                item.seconds = time.perf_counter() - start
+                self._finish(item)
+                return
+        delay = self.retry_delay
+        while True:
+            item.attempts += 1
+            item.error = None
+            try:
+                item.result = getattr(conn, method_name)(
+                    item.view_id, file_path, parameter_dict=parameter_dict or None, chunk_size=self.chunk_size
+                )
+                item.latency = item.result.response.elapsed.total_seconds()
+                retryable = item.result.status_code in RETRYABLE_STATUS_CODES
+            except (requests.RequestException, IOError) as error:
+                item.result, item.error, retryable = None, error, True
+            if item.result is not None and item.result.ok:
+                item.status = ViewExportItem.SUCCEEDED
+                if cache_key is not None:
+                    self.render_cache.store(cache_key, RENDER_CACHE_VERSION, file_path, item.result.response.headers)
+                break
+            if not retryable or item.attempts > self.retries:
+                item.status = ViewExportItem.FAILED
+                break
+            record_retry("export_view")
+            time.sleep(delay)
+            delay *= 2
+        item.seconds = time.perf_counter() - start
+        self._finish(item)
+
+    @staticmethod
+    def _get_cache_key(conn, item: ViewExportItem, parameter_dict: Dict[str, str]) -> str:
+        """Returns the canonical URL of the export, the key its render is cached under."""
+        query = "&".join(parameter_dict.values())
+        return f"{conn.server}/sites/{conn.site_id}/views/{item.view_id}/{item.export_format}?{query}"
+
+    def _export_from_cache(self, item: ViewExportItem, cache_key: str, file_path: str, content_variety: str) -> bool:
+        entry, file = self.render_cache.open(cache_key, RENDER_CACHE_VERSION, self._get_cache_max_age(item))
+        if entry is None:
+            return False
+        with file:
+            response = build_cached_response(cache_key, entry, file)
+            item.result = download.save_response(response, file_path, content_variety, chunk_size=self.chunk_size)
+        item.cached = True
+        item.status = ViewExportItem.SUCCEEDED if item.result.ok else ViewExportItem.FAILED
+        return True
+
+    def _finish(self, item: ViewExportItem) -> None:
+        if self.progress_callback:
+            self.progress_callback(item)
@@ -0,0 +1,166 @@
+"""
+Configures test runs that record or replay Tableau Server exchanges through cassettes.
+
+Set the TABLEAU_API_LIB_CASSETTE_MODE environment variable to:
+    'record': send requests to the server described in tests/config.py and save each module's exchanges
+    'replay': answer requests from the saved cassettes, without any network access or tests/config.py
+
+Setting TABLEAU_API_LIB_CASSETTE_SERVER=synthetic while recording sends the requests to a SyntheticTableauServer
+started for the test run instead, which is how the committed cassettes are recorded. The test modules change the
+server's content, so record one module per run:
+    TABLEAU_API_LIB_CASSETTE_MODE=record TABLEAU_API_LIB_CASSETTE_SERVER=synthetic pytest tests/test_flows.py
+
+Cassettes are stored per test module in tests/cassettes (override with TABLEAU_API_LIB_CASSETTE_DIR).
+Replayed responses can be delayed with TABLEAU_API_LIB_CASSETTE_LATENCY (seconds per response).
+Without the environment variable, tests run against the live server exactly as before.
+"""
+
+import os
+import sys
+import tempfile
+import types
+import zipfile
+
+import pytest
+
+from tableau_api_lib import TableauServerConnection
+from tableau_api_lib.utils.cassette import Cassette, CassetteAdapter
+from tableau_api_lib.utils.synthetic_server import SyntheticSite, SyntheticTableauServer
+
+
+CASSETTE_MODE = os.environ.get('TABLEAU_API_LIB_CASSETTE_MODE')
+CASSETTE_DIR = os.environ.get('TABLEAU_API_LIB_CASSETTE_DIR', os.path.join(os.path.dirname(__file__), 'cassettes'))
+CASSETTE_LATENCY = float(os.environ.get('TABLEAU_API_LIB_CASSETTE_LATENCY', 0))
+CASSETTE_SERVER = os.environ.get('TABLEAU_API_LIB_CASSETTE_SERVER')
+CASSETTE_ADAPTER = CassetteAdapter(cassette=None)
+CASSETTES = {}
+
+REPLAY_CONFIG = {
+    'tableau_prod': {
+        'server': 'https://tableau.replay.invalid',
+        'api_version': os.environ.get('TABLEAU_API_LIB_REPLAY_API_VERSION', '3.15'),
+        'username': 'replay_user',
+        'password': 'replay_password',
+        'site_name': '',
+        'site_url': '',
+    }
+}
+
+
+def get_cassette_servers():
+    """Returns the addresses of the servers in tests.config, whose requests are recorded to or replayed from cassettes."""
+    from tests.config import tableau_server_config
+    return {env_config['server'].rstrip('/') + '/' for env_config in tableau_server_config.values()}
+
+
+def build_cassette_session(session=None):
+    # only the live-server test modules use cassettes; other connections, such as those to synthetic servers, are
+    # sent as usual
+    session = BUILD_SESSION(session)
+    for server in get_cassette_servers():
+        session.mount(server, CASSETTE_ADAPTER)
+    return session
+
+
+def install_config(tableau_server_config):
+    """Provides a tests.config module holding the given config in place of tests/config.py."""
+    config_module = types.ModuleType('tests.config')
+    config_module.tableau_server_config = tableau_server_config
+    sys.modules['tests.config'] = config_module
+
+
+def start_synthetic_server():
+    """Starts the synthetic server recorded cassettes are made against, with the content the tests look for."""
+    site = SyntheticSite(num_users=3, num_projects=2, num_workbooks=2, num_datasources=1, num_flows=0,
+                         num_data_alerts=1)
+    site.projects[0]['name'] = 'Test'
+    site.projects[1]['name'] = 'Test Alt'
+    site.data_alerts[0]['subject'] = 'Test alert'
+    alt_site = SyntheticSite(name='Test Alt', content_url='test_alt', num_users=1, num_workbooks=0, num_datasources=0,
+                             num_flows=0)
+    server = SyntheticTableauServer([site, alt_site], api_version=REPLAY_CONFIG['tableau_prod']['api_version']).start()
+    # flow schedules are never created by the tests, which expect the server to have one
+    conn = TableauServerConnection(server.get_config())
+    conn.sign_in()
+    conn.create_schedule('Test Flow Schedule', schedule_type='Flow')
+    conn.sign_out()
+    return server
+
+
+def install_placeholder_files():
+    """Provides placeholder publishing files; their contents are never read by a replayed server."""
+    placeholder_dir = tempfile.mkdtemp(prefix='tableau_api_lib_replay_')
+    placeholders = {
+        'TABLEAU_API_LIB_TEST_WORKBOOK': 'test_workbook_with_extract.twbx',
+        'TABLEAU_API_LIB_TEST_DATASOURCE': 'test_datasource_with_extract.tdsx',
+        'TABLEAU_API_LIB_TEST_FLOW': 'sample_snowflake_flow.tfl',
+    }
+    for variable, file_name in placeholders.items():
+        file_path = os.path.join(placeholder_dir, file_name)
+        with zipfile.ZipFile(file_path, 'w') as placeholder:
+            placeholder.writestr('placeholder.txt', '')
+        os.environ.setdefault(variable, file_path)
+
+
+if CASSETTE_MODE:
+    if CASSETTE_MODE == 'replay':
+        if not os.path.exists(os.path.join(os.path.dirname(__file__), 'config.py')):
+            install_config(REPLAY_CONFIG)
+        install_placeholder_files()
+    elif CASSETTE_SERVER == 'synthetic':
+        install_config(start_synthetic_server().get_config())
+        install_placeholder_files()
+    BUILD_SESSION = TableauServerConnection._build_session
+    TableauServerConnection._build_session = staticmethod(build_cassette_session)
+
+
+def get_module_cassette(module_name):
+    if module_name not in CASSETTES:
+        CASSETTES[module_name] = Cassette(os.path.join(CASSETTE_DIR, module_name + '.json'),
+                                          mode=CASSETTE_MODE,
+                                          latency=CASSETTE_LATENCY)
+    return CASSETTES[module_name]
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector):
+    # several test modules sign in while being imported, so their cassette must be active during collection
+    if CASSETTE_MODE and isinstance(collector, pytest.Module):
+        CASSETTE_ADAPTER.cassette = get_module_cassette(collector.path.stem)
+    yield
+
+
+@pytest.fixture(autouse=True, scope='module')
+def cassette(request):
+    if not CASSETTE_MODE:
+        yield None
+        return
+    CASSETTE_ADAPTER.cassette = get_module_cassette(request.module.__name__.split('.')[-1])
+    yield CASSETTE_ADAPTER.cassette
+    if CASSETTE_MODE == 'record' and CASSETTE_ADAPTER.cassette.interactions:
+        CASSETTE_ADAPTER.cassette.save()
+
+
+def signed_in(server):
+    """Returns a connection signed in to the synthetic server's default site."""
+    conn = TableauServerConnection(server.get_config(), ssl_verify=False)
+    conn.sign_in()
+    return conn
+
+
+@pytest.fixture
+def synthetic_server():
+    """Starts synthetic servers for a test and stops them once it finishes.
+
+    The fixture is a factory taking the SyntheticTableauServer arguments, e.g. synthetic_server([site], latency=0.01).
+    """
+    servers = []
+
+    def start_server(*args, **kwargs):
+        server = SyntheticTableauServer(*args, **kwargs).start()
+        servers.append(server)
+        return server
+
+    yield start_server
+    for server in servers:
+        server.stop()
@@ -0,0 +1,98 @@
+import io
+import os
+import zipfile
+
+import pandas as pd
+import pytest
+
+from tableau_api_lib.utils import ArtifactStore, BulkDownloader
+from tableau_api_lib.utils.synthetic_server import SyntheticSite
+from .conftest import signed_in
+
+EXTRACT = os.urandom(512 * 1024)
+
+
+def write_package(file_path, workbook_xml, compression=zipfile.ZIP_DEFLATED):
+    with zipfile.ZipFile(file_path, 'w', compression=compression) as zip_file:
+        zip_file.writestr('workbook.twb', workbook_xml)
+        zip_file.writestr('Data/Extracts/extract.hyper', EXTRACT, compress_type=zipfile.ZIP_STORED)
+        zip_file.writestr('Image/logo.png', b'\x89PNG' * 16)
+    return str(file_path)
+
+
+def test_packages_share_members_and_restore_byte_for_byte(tmp_path):
+    artifact_store = ArtifactStore(tmp_path / 'store')
+    file_paths = [write_package(tmp_path / f'revision_{i}.twbx', f'<workbook revision="{i}"/>' * 1000)
+                  for i in range(4)]
+    unpackaged_path = tmp_path / 'plain.twb'
+    unpackaged_path.write_text('<workbook/>')
+    package_ids = [artifact_store.add(file_path, metadata={'revision': i}) for i, file_path in enumerate(file_paths)]
+    package_ids.append(artifact_store.add(unpackaged_path))
+
+    stats = artifact_store.get_stats()
+    assert stats['packages'] == 5
+    assert stats['stored_bytes'] < stats['package_bytes'] / 3
+    assert [package['metadata'] for package in artifact_store.packages()][:4] == [{'revision': i} for i in range(4)]
+
+    for package_id, file_path in zip(package_ids, file_paths + [str(unpackaged_path)]):
+        restored = io.BytesIO()
+        artifact_store.restore(package_id, restored)
+        with open(file_path, 'rb') as file:
+            assert restored.getvalue() == file.read()
+    restored_path = artifact_store.restore(package_ids[0], str(tmp_path / 'store'))
+    assert os.path.basename(restored_path) == 'revision_0.twbx'
+    with pytest.raises(KeyError):
+        artifact_store.restore('no-such-package', io.BytesIO())
+
+
+def test_collect_garbage_and_detect_corruption(tmp_path):
+    artifact_store = ArtifactStore(tmp_path / 'store')
+    first = artifact_store.add(write_package(tmp_path / 'first.tdsx', '<datasource/>'))
+    second = artifact_store.add(write_package(tmp_path / 'second.tdsx', '<datasource/>' * 2,
+                                              compression=zipfile.ZIP_STORED))
+    artifact_store.remove(first)
+    assert artifact_store.collect_garbage() == 0
+    artifact_store.remove(second)
+    assert artifact_store.collect_garbage() >= len(EXTRACT)
+
+    third = artifact_store.add(write_package(tmp_path / 'third.tdsx', '<datasource/>'))
+    object_id = next(segment['object'] for segment in artifact_store.get_manifest(third)['segments']
+                     if 'object' in segment)
+    with open(artifact_store._get_object_path(object_id), 'r+b') as object_file:
+        object_file.write(b'corrupt')
+    with pytest.raises(IOError):
+        artifact_store.restore(third, io.BytesIO())
+
+
+def test_bulk_download_into_artifact_store(synthetic_server, tmp_path):
+    site = SyntheticSite(num_workbooks=4, extract_size=256 * 1024)
+    conn = signed_in(synthetic_server([site]))
+    downloader = BulkDownloader(conn, str(tmp_path / 'downloads'), artifact_store=str(tmp_path / 'store'))
+    downloader.add_ids('workbook', [workbook['id'] for workbook in site.workbooks])
+    downloader.run()
+    response = conn.download_workbook(site.workbooks[0]['id'])
+
+    assert all(item.package_id == item.result.sha256 for item in downloader.items)
+    assert os.listdir(tmp_path / 'downloads' / 'workbooks') == []
+    restored = io.BytesIO()
+    ArtifactStore(tmp_path / 'store').restore(downloader.items[0].package_id, restored)
+    assert zipfile.ZipFile(restored).namelist() == zipfile.ZipFile(io.BytesIO(response.content)).namelist()
+
+
+def test_bulk_download_fails_items_the_artifact_store_rejects(synthetic_server, tmp_path):
+    class RejectingArtifactStore(ArtifactStore):
+        def add(self, file_path, metadata=None):
+            if metadata['name'] == 'workbook_1':
+                raise OSError('No space left on device')
+            return super().add(file_path, metadata=metadata)
+
+    site = SyntheticSite(num_workbooks=3, num_datasources=0, num_flows=0)
+    conn = signed_in(synthetic_server([site]))
+    downloader = BulkDownloader(conn, str(tmp_path / 'downloads'),
+                                artifact_store=RejectingArtifactStore(tmp_path / 'store'))
+    downloader.add_dataframe('workbook', pd.DataFrame(site.workbooks))
+    items = downloader.run()
+
+    assert [item.status for item in items] == ['succeeded', 'failed', 'succeeded']
+    assert str(items[1].error) == 'No space left on device' and items[1].package_id is None
+    assert os.listdir(tmp_path / 'downloads' / 'workbooks') == [os.path.basename(items[1].result.file_path)]
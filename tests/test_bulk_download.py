@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from tableau_api_lib.utils import BulkDownloader
+from tableau_api_lib.utils.synthetic_server import SyntheticSite
+from .conftest import signed_in
+
+
+@pytest.fixture
+def server(synthetic_server):
+    site = SyntheticSite(num_workbooks=6, num_datasources=3, num_flows=1, extract_size=256 * 1024)
+    return synthetic_server([site], latency=0.01)
+
+
+def test_bulk_download_writes_files_and_manifest(server, tmp_path):
+    site = server.sites[0]
+    conn = signed_in(server)
+    progress = []
+    downloader = BulkDownloader(conn, str(tmp_path), max_workers=4,
+                                progress_callback=lambda item, written, total: progress.append(item.content_id))
+    workbooks_df = pd.DataFrame(site.workbooks)
+    workbooks_df.loc[1, 'name'] = workbooks_df.loc[0, 'name']
+    downloader.add_dataframe('workbook', workbooks_df)
+    downloader.add_ids('datasource', [datasource['id'] for datasource in site.datasources])
+    downloader.add('flow', site.flows[0]['id'], name='flow/with:slashes')
+    items = downloader.run()
+
+    assert [item.status for item in items] == ['succeeded'] * 10
+    assert len(set(item.result.file_path for item in items)) == 10
+    assert items[1].file_stem.endswith(items[1].content_id)
+    assert sorted(os.listdir(tmp_path / 'datasources')) == sorted(f"{ds['id']}.tdsx" for ds in site.datasources)
+    assert os.listdir(tmp_path / 'flows') == ['flow_with_slashes.tflx']
+    assert set(progress) == {item.content_id for item in items}
+
+    manifest_path = downloader.write_manifest()
+    with open(manifest_path) as file:
+        manifest = json.load(file)
+    for entry in manifest['items']:
+        with open(entry['file_path'], 'rb') as file:
+            content = file.read()
+        assert entry['size'] == len(content)
+        assert entry['sha256'] == hashlib.sha256(content).hexdigest()
+        assert entry['seconds'] > 0 and entry['attempts'] == 1
+    assert list(downloader.to_dataframe()['status_code']) == [200] * 10
+
+
+def test_bulk_download_retries_and_records_failures(server, tmp_path):
+    conn = signed_in(server)
+    server.error_rate = 0.5
+    downloader = BulkDownloader(conn, str(tmp_path), max_workers=4, retries=10, retry_delay=0.01)
+    downloader.add_ids('workbook', [workbook['id'] for workbook in server.sites[0].workbooks])
+    missing = downloader.add('workbook', 'no-such-workbook')
+    downloader.run()
+    server.error_rate = 0.0
+
+    succeeded = [item for item in downloader.items if item is not missing]
+    assert all(item.status == 'succeeded' for item in succeeded)
+    assert sum(item.attempts for item in succeeded) > len(succeeded)
+    assert missing.status == 'failed' and missing.result.status_code == 404
+    assert not any(name.startswith('.') for name in os.listdir(tmp_path / 'workbooks'))
+
+
+def test_bulk_download_bandwidth_limit(server, tmp_path):
+    conn = signed_in(server)
+    downloader = BulkDownloader(conn, str(tmp_path), max_workers=4, max_bytes_per_second=512 * 1024,
+                                chunk_size=64 * 1024)
+    downloader.add_ids('workbook', [workbook['id'] for workbook in server.sites[0].workbooks])
+    start = time.monotonic()
+    downloader.run()
+    total = sum(item.result.size for item in downloader.items)
+    assert total > 1024 * 1024
+    assert time.monotonic() - start >= (total - 512 * 1024) / (512 * 1024) * 0.9
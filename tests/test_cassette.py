@@ -0,0 +1,122 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from tableau_api_lib import TableauServerConnection
+from tableau_api_lib.exceptions import CassetteInteractionNotFound
+from tableau_api_lib.utils import extract_pages
+from tableau_api_lib.utils.cassette import REDACTED_TOKEN, use_cassette
+from tableau_api_lib.utils.synthetic_server import SyntheticTableauServer
+
+
+TEST_SITE_ID = '9a8b7c6d-1234-5678-9abc-def012345678'
+
+
+def build_config(server):
+    return {'tableau_prod': {'server': server, 'api_version': '3.15', 'username': 'estam', 'password': 'secret',
+                             'site_name': 'Test', 'site_url': 'test'}}
+
+
+def json_interaction(method, path, body, query=''):
+    return {'request': {'method': method, 'path': path, 'query': query},
+            'response': {'status_code': 200, 'reason': 'OK', 'headers': {'Content-Type': 'application/json'},
+                         'body': {'string': json.dumps(body)}, 'elapsed': 0.01}}
+
+
+def write_sign_in_cassette(file_path):
+    interactions = [
+        json_interaction('GET', '/api/{version}/serverinfo', {'serverInfo': {'restApiVersion': '3.15'}}),
+        json_interaction('POST', '/api/{version}/auth/signin',
+                         {'credentials': {'token': 'token', 'site': {'id': TEST_SITE_ID, 'contentUrl': 'test'},
+                                          'user': {'id': 'user-luid'}}}),
+        json_interaction('GET', '/api/{version}/sites',
+                         {'pagination': {'pageNumber': '1', 'pageSize': '1', 'totalAvailable': '2'},
+                          'sites': {'site': [{'id': 'site-a'}]}},
+                         query='pageNumber=1&pageSize=1'),
+        json_interaction('GET', '/api/{version}/sites',
+                         {'pagination': {'pageNumber': '2', 'pageSize': '1', 'totalAvailable': '2'},
+                          'sites': {'site': [{'id': 'site-b'}]}},
+                         query='pageNumber=2&pageSize=1'),
+    ]
+    with open(file_path, 'w') as file:
+        json.dump({'version': 1, 'interactions': interactions}, file)
+
+
+def test_replay_cassette(tmp_path):
+    cassette_path = str(tmp_path / 'sites.json')
+    write_sign_in_cassette(cassette_path)
+    conn = TableauServerConnection(build_config('https://replayed.invalid'))
+    with use_cassette(conn, cassette_path, mode='replay', latency=0.01):
+        start = time.perf_counter()
+        conn.sign_in()
+        sites = extract_pages(conn.query_sites, page_size=1)
+        elapsed = time.perf_counter() - start
+    assert conn.site_id == TEST_SITE_ID
+    assert [site['id'] for site in sites] == ['site-a', 'site-b']
+    assert elapsed >= 0.04
+
+
+def test_replay_missing_interaction(tmp_path):
+    cassette_path = str(tmp_path / 'sites.json')
+    write_sign_in_cassette(cassette_path)
+    conn = TableauServerConnection(build_config('https://replayed.invalid'))
+    with use_cassette(conn, cassette_path, mode='replay'):
+        with pytest.raises(CassetteInteractionNotFound):
+            conn.query_projects()
+
+
+def test_record_cassette(tmp_path):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json.dumps({'serverInfo': {'restApiVersion': '3.15'}}).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cassette_path = str(tmp_path / 'server_info.json')
+    try:
+        conn = TableauServerConnection(build_config(f'http://127.0.0.1:{server.server_address[1]}'))
+        with use_cassette(conn, cassette_path, mode='record'):
+            conn.server_info()
+    finally:
+        server.shutdown()
+    offline_conn = TableauServerConnection(build_config('https://replayed.invalid'))
+    with use_cassette(offline_conn, cassette_path, mode='replay'):
+        response = offline_conn.server_info()
+    assert response.json()['serverInfo']['restApiVersion'] == '3.15'
+
+
+def test_recorded_session_tokens_are_redacted(tmp_path):
+    cassette_path = str(tmp_path / 'sign_in.json')
+    with SyntheticTableauServer() as server:
+        config = server.get_config()
+        conn = TableauServerConnection(config, ssl_verify=False)
+        with use_cassette(conn, cassette_path, mode='record'):
+            conn.sign_in()
+            conn.query_projects()
+    with open(cassette_path) as file:
+        cassette_text = file.read()
+    assert conn.auth_token not in cassette_text and REDACTED_TOKEN in cassette_text
+
+    offline_conn = TableauServerConnection(config, ssl_verify=False)
+    with use_cassette(offline_conn, cassette_path, mode='replay'):
+        offline_conn.sign_in()
+        assert offline_conn.query_projects().status_code == 200
+    assert offline_conn.auth_token == REDACTED_TOKEN
+
+    legacy_path = str(tmp_path / 'legacy.json')
+    write_sign_in_cassette(legacy_path)
+    legacy_conn = TableauServerConnection(build_config('https://replayed.invalid'))
+    with use_cassette(legacy_conn, legacy_path, mode='replay'):
+        legacy_conn.sign_in()
+    assert legacy_conn.auth_token == REDACTED_TOKEN
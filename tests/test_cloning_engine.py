@@ -0,0 +1,121 @@
+import time
+
+import pytest
+
+from tableau_api_lib.utils.cloning import CloningEngine
+from tableau_api_lib.utils.synthetic_server import SyntheticSite
+from .conftest import signed_in
+
+
+@pytest.fixture
+def servers(synthetic_server):
+    source_site = SyntheticSite(num_users=6, num_groups=2, num_projects=3, num_workbooks=6, num_datasources=2,
+                                num_flows=1, extract_size=64 * 1024)
+    target_site = SyntheticSite(num_users=0, num_groups=0, num_projects=1, num_workbooks=0, num_datasources=0,
+                                num_flows=0, seed=1)
+    return synthetic_server([source_site], latency=0.01), synthetic_server([target_site], latency=0.01)
+
+
+def test_site_migration_clones_each_object_after_its_dependencies(servers):
+    source_server, target_server = servers
+    source_site, target_site = source_server.sites[0], target_server.sites[0]
+    finished = []
+    engine = CloningEngine(signed_in(source_server), signed_in(target_server), max_workers=4,
+                           progress_callback=finished.append)
+    tasks = engine.add_site_migration()
+    engine.run()
+
+    assert [task.status for task in tasks] == ['succeeded'] * len(tasks)
+    assert len(finished) == len(tasks)
+    assert sorted(user['name'] for user in target_site.users) == sorted(user['name'] for user in source_site.users)
+    assert sorted(user['email'] for user in target_site.users) == sorted(user['email'] for user in source_site.users)
+    assert sorted(project['name'] for project in target_site.projects) == \
+        sorted(project['name'] for project in source_site.projects)
+    for content_type in ['workbooks', 'datasources', 'flows']:
+        assert len(getattr(target_site, content_type)) == len(getattr(source_site, content_type))
+    target_users = {user['id']: user['name'] for user in target_site.users}
+    for group in target_site.groups:
+        source_group, = [source_group for source_group in source_site.groups if source_group['name'] == group['name']]
+        source_users = {user['id']: user['name'] for user in source_site.users}
+        assert sorted(target_users[user_id] for user_id in target_site.group_members[group['id']]) == \
+            sorted(source_users[user_id] for user_id in source_site.group_members[source_group['id']])
+    for task in tasks:
+        assert all(dependency.finished_at <= task.started_at for dependency in task.depends_on)
+    workbook, = [item for item in target_site.workbooks if item['name'] == source_site.workbooks[0]['name']]
+    assert workbook['project']['name'] == source_site.workbooks[0]['project']['name']
+
+    stats_df = engine.get_stage_stats()
+    assert list(stats_df['stage']) == ['users', 'groups', 'projects', 'datasources', 'flows', 'workbooks']
+    assert list(stats_df['tasks']) == [6, 2, 3, 2, 1, 6]
+    assert stats_df['failed'].sum() == 0 and stats_df['seconds'].gt(0).all()
+
+
+def test_rerun_reuses_cloned_content_and_requires_overwrite_policy_for_updates(servers):
+    source_server, target_server = servers
+    conn_source, conn_target = signed_in(source_server), signed_in(target_server)
+    engine = CloningEngine(conn_source, conn_target)
+    engine.add_site_migration(stages=['users', 'projects', 'workbooks'])
+    engine.run()
+
+    rerun = CloningEngine(conn_source, conn_target)
+    tasks = rerun.add_site_migration(stages=['users', 'projects', 'workbooks'])
+    rerun.run()
+    stats_df = rerun.get_stage_stats().set_index('stage')
+    assert list(stats_df['succeeded']) == [6, 3, 6]
+    existing_ids = {task.name: task.target_id for task in engine.tasks}
+    assert {task.name: task.target_id for task in tasks} == existing_ids
+
+    for workbook in source_server.sites[0].workbooks:
+        workbook['updatedAt'] = '2999-01-01T00:00:00Z'
+    update = CloningEngine(conn_source, conn_target)
+    tasks = update.add_site_migration(stages=['projects', 'workbooks'])
+    update.run()
+    assert all('overwrite_policy' in str(task.error) for task in tasks if task.stage == 'workbooks')
+
+    overwrite = CloningEngine(conn_source, conn_target, overwrite_policy='overwrite')
+    overwrite.add_site_migration(stages=['projects', 'workbooks'])
+    assert {task.status for task in overwrite.run()} == {'succeeded'}
+    assert len(target_server.sites[0].workbooks) == 6
+    assert all(workbook['revision'] == '2' for workbook in target_server.sites[0].workbooks)
+
+
+def test_failed_tasks_skip_dependents_and_stage_workers_bound_concurrency(servers):
+    source_server, target_server = servers
+    conn_source = signed_in(source_server)
+    engine = CloningEngine(conn_source, signed_in(target_server), max_workers=4, stage_workers={'slow': 1},
+                           max_requests_per_second=1000)
+    running, overlaps = [], []
+
+    def slow(conn_source, conn_target):
+        running.append(1)
+        overlaps.append(len(running))
+        time.sleep(0.02)
+        running.pop()
+
+    def fail(conn_source, conn_target):
+        raise RuntimeError('unable to create the project')
+
+    slow_tasks = [engine.add('slow', slow) for _ in range(4)]
+    failed = engine.add('projects', fail)
+    skipped = engine.add('workbooks', slow, depends_on=[failed])
+    skipped_later = engine.add('permissions', slow, depends_on=[skipped, slow_tasks[0]])
+    engine.run()
+
+    assert max(overlaps) == 1
+    assert [task.status for task in slow_tasks] == ['succeeded'] * 4
+    assert failed.status == 'failed' and 'unable to create' in str(failed.error)
+    assert skipped.status == 'skipped' and skipped_later.status == 'skipped'
+    assert engine.get_stage_stats().set_index('stage').loc['permissions', 'skipped'] == 1
+    assert engine.request_limiter is not None
+    assert engine._limit_requests not in conn_source.session.hooks['response']
+
+
+def test_cyclic_dependencies_are_rejected(servers):
+    source_server, target_server = servers
+    engine = CloningEngine(signed_in(source_server), signed_in(target_server))
+    first = engine.add('projects', lambda conn_source, conn_target: None)
+    second = engine.add('projects', lambda conn_source, conn_target: None, depends_on=[first])
+    first.depends_on.append(second)
+    with pytest.raises(ValueError):
+        engine.run()
+    assert first.status == second.status == 'pending'
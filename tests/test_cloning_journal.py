@@ -0,0 +1,73 @@
+import pytest
+
+from tableau_api_lib.utils.cloning import CloningEngine, CloningJournal, clone_users
+from tableau_api_lib.utils.synthetic_server import SyntheticSite
+from .conftest import signed_in
+
+
+def test_journal_keeps_the_latest_entry_and_survives_torn_lines(tmp_path):
+    journal_path = tmp_path / 'journal.jsonl'
+    journal = CloningJournal(journal_path)
+    journal.record('workbooks', 'wb-1', 'failed', name='Sales', error='HTTP 500')
+    journal.record('workbooks', 'wb-1', 'succeeded', target_id='target-1', name='Sales')
+    journal.record('users', 'user-1', 'succeeded', target_id='target-2')
+    with open(journal_path, 'a') as file:
+        file.write('{"stage": "users", "source_id": "us')
+
+    reloaded = CloningJournal(journal_path)
+    assert reloaded.get('workbooks', 'wb-1')['attempts'] == 2
+    assert reloaded.get_completed('workbooks') == {'wb-1': 'target-1'}
+    assert reloaded.get_target_id('users', 'user-1') == 'target-2'
+    reloaded.record('users', 'user-2', 'skipped')
+    assert len(CloningJournal(journal_path).entries()) == 3
+
+    reloaded.compact()
+    assert len(journal_path.read_text().splitlines()) == 3
+    assert list(CloningJournal(journal_path).to_dataframe()['status']) == ['succeeded', 'succeeded', 'skipped']
+    with pytest.raises(ValueError):
+        journal.record('users', 'user-3', 'done')
+
+
+def test_engine_rerun_resumes_from_the_journal(synthetic_server, tmp_path):
+    source_site = SyntheticSite(num_users=6, num_groups=2, num_projects=3, num_workbooks=8, num_datasources=2,
+                                num_flows=1, extract_size=16 * 1024)
+    target_site = SyntheticSite(num_users=0, num_groups=0, num_projects=1, num_workbooks=0, num_datasources=0,
+                                num_flows=0, seed=1)
+    journal_path = tmp_path / 'migration.jsonl'
+    source_server, target_server = synthetic_server([source_site]), synthetic_server([target_site])
+    conn_source, conn_target = signed_in(source_server), signed_in(target_server)
+    engine = CloningEngine(conn_source, conn_target, journal=str(journal_path))
+    engine.add_site_migration()
+    target_server.error_rate = 0.3
+    engine.run()
+    target_server.error_rate = 0.0
+    assert any(task.status != 'succeeded' for task in engine.tasks)
+    cloned = {task.source_id: task.target_id for task in engine.tasks if task.status == 'succeeded'}
+
+    rerun = CloningEngine(conn_source, conn_target, journal=CloningJournal(journal_path))
+    tasks = rerun.add_site_migration()
+    rerun.run()
+
+    assert [task.status for task in tasks] == ['succeeded'] * len(tasks)
+    assert all(task.resumed and task.target_id == cloned[task.source_id] for task in tasks
+               if task.stage in ('datasources', 'flows', 'workbooks') and task.source_id in cloned)
+    for content_type in ['users', 'groups', 'projects', 'workbooks', 'datasources', 'flows']:
+        assert sorted(item['name'] for item in getattr(target_site, content_type)) == \
+            sorted(item['name'] for item in getattr(source_site, content_type))
+    completed = CloningJournal(journal_path).get_completed('workbooks')
+    assert sorted(completed) == sorted(workbook['id'] for workbook in source_site.workbooks)
+
+
+def test_clone_users_rerun_skips_journaled_users(synthetic_server, tmp_path):
+    source_site = SyntheticSite(num_users=5, num_workbooks=0, num_datasources=0, num_flows=0)
+    target_site = SyntheticSite(num_users=1, num_groups=0, num_workbooks=0, num_datasources=0, num_flows=0, seed=1)
+    usernames = ['user_1', 'user_2', 'user_3', 'user_4']
+    journal = CloningJournal(tmp_path / 'users.jsonl')
+    conn_source, conn_target = signed_in(synthetic_server([source_site])), signed_in(synthetic_server([target_site]))
+    clone_users(conn_source, conn_target, usernames=usernames[:2], journal=journal)
+    clone_users(conn_source, conn_target, usernames=usernames, journal=journal)
+
+    assert sorted(user['name'] for user in target_site.users)[1:] == usernames
+    target_ids = {user['name']: user['id'] for user in target_site.users}
+    assert {entry['name']: entry['target_id'] for entry in journal.entries().values()} == \
+        {username: target_ids[username] for username in usernames}
@@ -0,0 +1,66 @@
+import copy
+
+import pytest
+
+from tableau_api_lib.utils.cloning import CloningEngine, plan_migration
+from tableau_api_lib.utils.synthetic_server import SyntheticSite
+from .conftest import signed_in
+
+
+@pytest.fixture
+def servers(synthetic_server):
+    source_site = SyntheticSite(num_users=6, num_groups=2, num_projects=3, num_workbooks=6, num_datasources=2,
+                                num_flows=1, extract_size=2 * 1024 * 1024)
+    source_site.projects[1]['description'] = 'Quarterly reporting'
+    target_site = SyntheticSite(num_users=2, num_groups=1, num_projects=2, num_workbooks=2, num_datasources=0,
+                                num_flows=0, seed=1)
+    target_site.users[1]['siteRole'] = 'Explorer'
+    target_site.workbooks[1]['name'] = 'retired_workbook'
+    return synthetic_server([source_site]), synthetic_server([target_site])
+
+
+def test_plan_diffs_each_object_by_its_natural_key(servers):
+    source_server, target_server = servers
+    target_before = copy.deepcopy(target_server.sites[0].workbooks)
+    plan = plan_migration(signed_in(source_server), signed_in(target_server))
+
+    summary_df = plan.get_summary().set_index('stage')
+    assert list(summary_df.index) == ['users', 'groups', 'projects', 'datasources', 'flows', 'workbooks']
+    assert summary_df[['create', 'update', 'delete', 'skip']].values.tolist() == [
+        [4, 1, 0, 1],
+        [1, 1, 0, 0],
+        [1, 1, 0, 1],
+        [2, 0, 0, 0],
+        [1, 0, 0, 0],
+        [5, 0, 1, 1],
+    ]
+    assert summary_df.loc['workbooks', 'estimated_bytes'] == 5 * 2 * 1024 * 1024
+    assert plan.estimated_bytes == 8 * 2 * 1024 * 1024
+    user_update, = plan.get_items('users', 'update')
+    assert user_update.name == 'user_1' and user_update.changes == {'siteRole': ('Explorer', 'Viewer')}
+    group_update, = plan.get_items('groups', 'update')
+    assert group_update.changes == {'members': (None, ['user_2', 'user_4'])}
+    deleted, = plan.get_items('workbooks', 'delete')
+    assert deleted.name == 'retired_workbook' and deleted.source_id is None
+    assert target_server.sites[0].workbooks == target_before
+
+
+def test_engine_runs_the_plan_until_nothing_differs(servers):
+    source_server, target_server = servers
+    source_site, target_site = source_server.sites[0], target_server.sites[0]
+    conn_source, conn_target = signed_in(source_server), signed_in(target_server)
+    engine = CloningEngine(conn_source, conn_target, max_workers=4)
+    tasks = engine.add_plan(plan_migration(conn_source, conn_target), delete=True)
+    engine.run()
+
+    assert [task.status for task in tasks] == ['succeeded'] * len(tasks)
+    assert {user['name']: user['siteRole'] for user in target_site.users} == \
+        {user['name']: user['siteRole'] for user in source_site.users}
+    assert sorted(workbook['name'] for workbook in target_site.workbooks) == \
+        sorted(workbook['name'] for workbook in source_site.workbooks)
+    project, = [project for project in target_site.projects if project['name'] == source_site.projects[1]['name']]
+    assert project['description'] == 'Quarterly reporting'
+
+    replan = plan_migration(conn_source, conn_target)
+    assert {item.action for item in replan.items} == {'skip'}
+    assert replan.estimated_bytes == 0
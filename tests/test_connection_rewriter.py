@@ -0,0 +1,86 @@
+import io
+import os
+import zipfile
+
+import pytest
+from xml.parsers.expat import ExpatError
+
+from tableau_api_lib import TableauServerConnection
+from tableau_api_lib.utils.connection_rewriter import ConnectionRule, rewrite_connections, rewrite_connections_text
+from tableau_api_lib.utils.filemod import modify_tableau_files
+
+SOURCE_CONFIG = {'tableau_prod': {'server': 'https://source.example.com', 'api_version': '3.15', 'username': 'estam',
+                                  'password': 'secret', 'site_name': 'Source', 'site_url': 'source'}}
+TARGET_CONFIG = {'tableau_prod': {'server': 'https://target.example.com', 'api_version': '3.15', 'username': 'estam',
+                                  'password': 'secret', 'site_name': 'Target', 'site_url': 'target'}}
+
+WORKBOOK_XML = (
+    "<?xml version='1.0' encoding='utf-8' ?>\n"
+    "<!-- <connection class='snowflake' dbname='ANALYTICS_DEV' /> -->\n"
+    "<workbook>\n"
+    "  <datasource name='federated.1'>\n"
+    "    <connection class='federated'>\n"
+    "      <named-connections>\n"
+    "        <named-connection caption='acct.snowflakecomputing.com' name='snowflake.1'>\n"
+    "          <connection class='snowflake' dbname='ANALYTICS_DEV' server='acct.snowflakecomputing.com' />\n"
+    "        </named-connection>\n"
+    "        <named-connection caption='sql-dev.example.com' name='sqlserver.1'>\n"
+    "          <connection\n"
+    "             class=\"sqlserver\" dbname='ANALYTICS_DEV' server=\"sql-dev.example.com\"/>\n"
+    "        </named-connection>\n"
+    "      </named-connections>\n"
+    "    </connection>\n"
+    "    <relation type='text'>SELECT 'dbname=&apos;ANALYTICS_DEV&apos;' WHERE a &lt; 5 -- é</relation>\n"
+    "  </datasource>\n"
+    "</workbook>\n"
+)
+RULES = [
+    ConnectionRule('dbname', 'ANALYTICS_PROD', where={'class': 'snowflake'}),
+    ConnectionRule('server', 'sql-prod.example.com', old_value='sql-dev.example.com', where={'class': 'sqlserver'}),
+    ConnectionRule('caption', 'sql-prod.example.com', old_value='sql-dev.example.com', elements=['named-connection']),
+]
+EXPECTED_XML = WORKBOOK_XML.replace(
+    "dbname='ANALYTICS_DEV' server='acct", "dbname='ANALYTICS_PROD' server='acct").replace(
+    "sql-dev.example.com", "sql-prod.example.com")
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1024 * 1024])
+def test_rewrite_connections_changes_only_matching_attributes(chunk_size):
+    destination = io.BytesIO()
+    rewritten = rewrite_connections(io.BytesIO(WORKBOOK_XML.encode('utf-8')), destination, RULES, chunk_size=chunk_size)
+    assert destination.getvalue().decode('utf-8') == EXPECTED_XML
+    assert rewritten == [
+        {'element': 'connection', 'attributes': {'dbname': ('ANALYTICS_DEV', 'ANALYTICS_PROD')}},
+        {'element': 'named-connection', 'attributes': {'caption': ('sql-dev.example.com', 'sql-prod.example.com')}},
+        {'element': 'connection', 'attributes': {'server': ('sql-dev.example.com', 'sql-prod.example.com')}},
+    ]
+
+
+def test_new_values_are_escaped_and_computed(tmp_path):
+    rules = [ConnectionRule('dbname', lambda value, attributes: f"{value}_{attributes['class']}<'&'>")]
+    source_path = tmp_path / 'sales.twb'
+    source_path.write_text(WORKBOOK_XML, encoding='utf-8')
+    rewrite_connections(str(source_path), str(tmp_path / 'rewritten.twb'), rules)
+    rewritten = (tmp_path / 'rewritten.twb').read_text(encoding='utf-8')
+    assert "dbname='ANALYTICS_DEV_snowflake&lt;&apos;&amp;&apos;&gt;'" in rewritten
+    assert "dbname='ANALYTICS_DEV_sqlserver&lt;&apos;&amp;&apos;&gt;'" in rewritten
+    assert rewrite_connections_text(WORKBOOK_XML, []) == WORKBOOK_XML
+    with pytest.raises(ExpatError):
+        rewrite_connections_text('<workbook><connection></workbook>', RULES)
+
+
+def test_modify_tableau_files_applies_connection_rules(tmp_path):
+    conn_source = TableauServerConnection(SOURCE_CONFIG)
+    conn_target = TableauServerConnection(TARGET_CONFIG)
+    with zipfile.ZipFile(tmp_path / 'sales.twbx', 'w') as package:
+        package.writestr('sales.twb', WORKBOOK_XML)
+    (tmp_path / 'sales.twb').write_text(WORKBOOK_XML, encoding='utf-8')
+    os.makedirs(tmp_path / 'target')
+    file_paths = [str(tmp_path / 'sales.twbx'), str(tmp_path / 'sales.twb')]
+
+    results = modify_tableau_files(file_paths, conn_source, conn_target, str(tmp_path / 'target'),
+                                   connection_rules=RULES, max_workers=2)
+    assert [result['error'] for result in results] == [None, None]
+    with zipfile.ZipFile(tmp_path / 'target' / 'sales.twbx') as package:
+        assert package.read('sales.twb').decode('utf-8') == EXPECTED_XML
+    assert (tmp_path / 'target' / 'sales.twb').read_text(encoding='utf-8') == EXPECTED_XML
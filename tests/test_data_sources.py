@@ -1,10 +1,13 @@
+import os
+
 from tableau_api_lib import TableauServerConnection
 from .config import tableau_server_config
 
 
 TABLEAU_SERVER_CONFIG_ENV = 'tableau_prod'
 TEST_USERNAME = tableau_server_config[TABLEAU_SERVER_CONFIG_ENV]['username']
-TEST_DATASOURCE_FILE_PATH = r'C:\Users\estam\Documents\Development\python-tableau-api\test_datasource_with_extract.tdsx'
+TEST_DATASOURCE_FILE_PATH = os.environ.get('TABLEAU_API_LIB_TEST_DATASOURCE',
+                                            r'C:\Users\estam\Documents\Development\python-tableau-api\test_datasource_with_extract.tdsx')
 TEST_DATASOURCE_PREFIX = 'test_ds_'
 TEST_PROJECT_NAME = 'Test'
 TEST_ALT_PROJECT_NAME = 'Test Alt'
@@ -0,0 +1,67 @@
+import hashlib
+import io
+import os
+import zipfile
+
+import pytest
+
+from tableau_api_lib.utils.synthetic_server import SyntheticSite
+from .conftest import signed_in
+
+CHUNK_SIZE = 64 * 1024
+
+
+@pytest.fixture
+def server(synthetic_server):
+    site = SyntheticSite(num_workbooks=2, num_datasources=2, num_flows=1, extract_size=1024 * 1024)
+    return synthetic_server([site])
+
+
+@pytest.fixture
+def conn(server):
+    return signed_in(server)
+
+
+def test_download_workbook_to_directory(server, conn, tmp_path):
+    workbook = server.sites[0].workbooks[0]
+    progress = []
+    result = conn.download_workbook_to_file(workbook['id'], str(tmp_path), file_stem='backup',
+                                            chunk_size=CHUNK_SIZE, progress_callback=lambda *args: progress.append(args))
+    assert result.ok
+    assert result.file_path == str(tmp_path / 'backup.twbx')
+    with open(result.file_path, 'rb') as file:
+        content = file.read()
+    assert result.size == len(content)
+    assert result.sha256 == hashlib.sha256(content).hexdigest()
+    assert progress[-1] == (len(content), len(content))
+    assert len(progress) >= len(content) // CHUNK_SIZE
+    assert sorted(os.listdir(tmp_path)) == ['backup.twbx']
+
+    without_extract = conn.download_workbook_to_file(workbook['id'], str(tmp_path / 'thin.twbx'),
+                                                     include_extract=False)
+    with zipfile.ZipFile(without_extract.file_path) as zip_file:
+        assert not any(name.endswith('.hyper') for name in zip_file.namelist())
+    assert without_extract.size < result.size
+
+
+def test_download_other_content_to_files(server, conn, tmp_path):
+    site = server.sites[0]
+    datasource = conn.download_data_source_to_file(site.datasources[0]['id'], str(tmp_path))
+    assert datasource.ok and datasource.file_path.endswith('.tdsx')
+    flow = io.BytesIO()
+    assert conn.download_flow_to_file(site.flows[0]['id'], flow).size == len(flow.getvalue()) > 0
+    revision = conn.download_workbook_revision_to_file(site.workbooks[0]['id'], '1', str(tmp_path / 'revision.twbx'))
+    assert revision.ok and zipfile.is_zipfile(revision.file_path)
+
+
+def test_failed_downloads_leave_no_files(conn, tmp_path):
+    missing = conn.download_workbook_to_file('no-such-workbook', str(tmp_path / 'missing.twbx'))
+    assert not missing.ok and missing.status_code == 404
+
+    def interrupt(written, total):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        conn.download_data_source_to_file(conn.query_data_sources().json()['datasources']['datasource'][0]['id'],
+                                          str(tmp_path / 'interrupted.tdsx'), progress_callback=interrupt)
+    assert os.listdir(tmp_path) == []
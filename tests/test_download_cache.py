@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from tableau_api_lib.utils import BulkDownloader, DownloadCache
+from tableau_api_lib.utils.download_cache import CACHE_HEADER
+from tableau_api_lib.utils.synthetic_server import SyntheticSite
+from .conftest import signed_in
+
+EXTRACT_SIZE = 256 * 1024
+
+
+@pytest.fixture
+def server(synthetic_server):
+    site = SyntheticSite(num_workbooks=3, num_datasources=1, extract_size=EXTRACT_SIZE, revisions_per_item=3)
+    return synthetic_server([site])
+
+
+@pytest.fixture
+def conn(server):
+    return signed_in(server)
+
+
+def test_unchanged_downloads_are_served_from_cache(server, conn, tmp_path):
+    workbook = server.sites[0].workbooks[0]
+    download_cache = DownloadCache(tmp_path / 'cache')
+    first = conn.download_workbook(workbook['id'], download_cache=download_cache)
+    second = conn.download_workbook(workbook['id'], download_cache=download_cache)
+    assert (first.headers[CACHE_HEADER], second.headers[CACHE_HEADER]) == ('miss', 'hit')
+    assert second.content == first.content
+    assert second.headers['Content-Type'] == first.headers['Content-Type']
+    assert conn.active_endpoint.endswith('/content')
+
+    workbook['revision'] = '4'
+    third = conn.download_workbook(workbook['id'], download_cache=download_cache)
+    assert third.headers[CACHE_HEADER] == 'miss'
+    assert len(download_cache.entries()) == 1
+    assert len(os.listdir(tmp_path / 'cache')) == 2
+
+    datasource_id = server.sites[0].datasources[0]['id']
+    assert conn.download_data_source(datasource_id, download_cache=download_cache).headers[CACHE_HEADER] == 'miss'
+    result = conn.download_data_source_to_file(datasource_id, str(tmp_path), download_cache=download_cache)
+    assert result.ok and result.response.headers[CACHE_HEADER] == 'hit'
+    assert result.file_path.endswith('.tdsx') and result.size == os.path.getsize(result.file_path)
+
+
+def test_cache_evicts_least_recently_used_content(server, conn, tmp_path):
+    workbooks = server.sites[0].workbooks
+    package_size = len(conn.download_workbook(workbooks[0]['id']).content)
+    download_cache = DownloadCache(tmp_path / 'cache', max_bytes=int(package_size * 2.5))
+    for workbook in workbooks[:2]:
+        conn.download_workbook_to_file(workbook['id'], str(tmp_path), download_cache=download_cache)
+    conn.download_workbook(workbooks[0]['id'], download_cache=download_cache)
+    conn.download_workbook(workbooks[2]['id'], download_cache=download_cache)
+
+    cached_urls = list(download_cache.entries())
+    assert len(cached_urls) == 2 and download_cache.size <= download_cache.max_bytes
+    assert not any(workbooks[1]['id'] in url for url in cached_urls)
+    assert (download_cache.hits, download_cache.misses) == (1, 3)
+
+
+def test_bulk_download_with_cache(server, conn, tmp_path):
+    workbook_ids = [workbook['id'] for workbook in server.sites[0].workbooks]
+    for run in range(2):
+        downloader = BulkDownloader(conn, str(tmp_path / str(run)), download_cache=str(tmp_path / 'cache'))
+        downloader.add_ids('workbook', workbook_ids)
+        downloader.run()
+        assert all(item.status == 'succeeded' for item in downloader.items)
+        expected = 'miss' if run == 0 else 'hit'
+        assert all(item.result.response.headers[CACHE_HEADER] == expected for item in downloader.items)
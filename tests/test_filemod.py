@@ -0,0 +1,127 @@
+import os
+import zipfile
+
+from tableau_api_lib import TableauServerConnection
+from tableau_api_lib.utils.common import get_server_netloc
+from tableau_api_lib.utils.filemod import copy_dir_to_zip, get_attribute_remap_rules, modify_tableau_files, \
+    modify_tableau_zipfile, remap_text, remap_xml_references
+
+SOURCE_CONFIG = {'tableau_prod': {'server': 'https://source.example.com', 'api_version': '3.15', 'username': 'estam',
+                                  'password': 'secret', 'site_name': 'Source', 'site_url': 'source'}}
+TARGET_CONFIG = {'tableau_prod': {'server': 'https://target.example.com', 'api_version': '3.15', 'username': 'estam',
+                                  'password': 'secret', 'site_name': 'Target', 'site_url': 'target'}}
+
+WORKBOOK_XML = (
+    "<workbook>\n"
+    "  <repository-location id='sales' path='/t/source/workbooks' site='source' />\n"
+    "  <datasource caption='source data' name='sqlproxy'>\n"
+    "    <repository-location id='ds' path='/t/source/datasources' site='source' xml:base='https://source.example.com' />\n"
+    "    <connection class='sqlproxy' server='source.example.com' dbname='sales' channel='https' />\n"
+    "    <connection class='postgres' server='db.source.internal' dbname='sales' />\n"
+    "    <relation name='Custom SQL' type='text'>SELECT * FROM sales WHERE site = 'source'</relation>\n"
+    "  </datasource>\n"
+    "  <thumbnail xml:base=&apos;https://source.example.com&apos; site=&apos;source&apos; "
+    "server=&apos;source.example.com&apos; path=&apos;/t/source/views&apos; />\n"
+    "</workbook>\n"
+)
+
+
+def remap_sequentially(file, conn_source, conn_target):
+    for template, source, target in [
+        ("xml:base='{}'", conn_source.server, conn_target.server),
+        ("xml:base=&apos;{}", conn_source.server, conn_target.server),
+        ("path='/t/{}/", conn_source.site_url, conn_target.site_url),
+        ("path=&apos;/t/{}/", conn_source.site_url, conn_target.site_url),
+        ("site='{}'", conn_source.site_url, conn_target.site_url),
+        ("site=&apos;{}", conn_source.site_url, conn_target.site_url),
+        ("server='{}'", get_server_netloc(conn_source.server), get_server_netloc(conn_target.server)),
+        ("server=&apos;{}", get_server_netloc(conn_source.server), get_server_netloc(conn_target.server)),
+    ]:
+        file = file.replace(template.format(source), template.format(target))
+    return file
+
+
+def test_remap_xml_references_matches_sequential_replacement():
+    conn_source = TableauServerConnection(SOURCE_CONFIG)
+    conn_target = TableauServerConnection(TARGET_CONFIG)
+    remapped = remap_xml_references(WORKBOOK_XML, conn_source, conn_target)
+    assert remapped == remap_sequentially(WORKBOOK_XML, conn_source, conn_target)
+    assert 'source.example.com' not in remapped and "site = 'source'" in remapped
+    assert remap_xml_references(WORKBOOK_XML, conn_source, conn_source) == WORKBOOK_XML
+
+
+def test_user_defined_rules_run_in_the_same_scan():
+    conn_source = TableauServerConnection(SOURCE_CONFIG)
+    conn_target = TableauServerConnection(TARGET_CONFIG)
+    rules = get_attribute_remap_rules('server', 'db.source.internal', 'db.target.internal')
+    rules.update(get_attribute_remap_rules('dbname', 'sales', 'sales_prod'))
+    remapped = remap_xml_references(WORKBOOK_XML, conn_source, conn_target, remap_rules=rules)
+    assert "server='db.target.internal' dbname='sales_prod'" in remapped
+    assert "server='target.example.com' dbname='sales_prod'" in remapped
+
+    assert remap_text('a b ab ba', {'a': 'b', 'b': 'a', 'ab': 'x'}) == 'b a x ab'
+    assert remap_text("<a name='x' caption='x' />", {"name='x'": "label='y'"}) == "<a label='y' caption='x' />"
+    assert remap_text('unchanged', {}) == 'unchanged'
+
+
+def write_packaged_workbook(file_path):
+    with zipfile.ZipFile(file_path, 'w', zipfile.ZIP_DEFLATED) as package:
+        package.writestr('sales.twb', WORKBOOK_XML)
+        package.writestr('Data/Extracts/sales.hyper', os.urandom(256 * 1024), compress_type=zipfile.ZIP_STORED)
+        package.writestr('Data/Sales Data/regions.csv', 'region,sales\nwest,1\n' * 1000)
+        package.writestr('Image/logo.png', os.urandom(1024))
+        package.writestr('TwbxExternalCache/cache.bin', b'cache')
+        with package.open(zipfile.ZipInfo('Data/Extracts/large.hyper'), 'w', force_zip64=True) as member:
+            member.write(b'extract' * 1000)
+    return str(file_path)
+
+
+def test_rewrite_tableau_zipfile_copies_members_raw(tmp_path):
+    conn_source = TableauServerConnection(SOURCE_CONFIG)
+    conn_target = TableauServerConnection(TARGET_CONFIG)
+    source_path = write_packaged_workbook(tmp_path / 'sales.twbx')
+    os.makedirs(tmp_path / 'target')
+    modify_tableau_zipfile(source_path, conn_source, conn_target, str(tmp_path / 'unused'), str(tmp_path / 'target'))
+
+    with zipfile.ZipFile(source_path) as source_zip, zipfile.ZipFile(tmp_path / 'target' / 'sales.twbx') as target_zip:
+        assert target_zip.testzip() is None
+        assert target_zip.namelist() == [name for name in source_zip.namelist() if 'TwbxExternalCache' not in name]
+        assert target_zip.read('sales.twb').decode('utf-8') == remap_xml_references(WORKBOOK_XML, conn_source,
+                                                                                    conn_target)
+        for name in target_zip.namelist()[1:]:
+            source_info, target_info = source_zip.getinfo(name), target_zip.getinfo(name)
+            assert target_zip.read(name) == source_zip.read(name)
+            assert (target_info.compress_type, target_info.compress_size, target_info.CRC) == \
+                   (source_info.compress_type, source_info.compress_size, source_info.CRC)
+    assert not os.path.exists(tmp_path / 'unused')
+
+
+def test_copy_dir_to_zip_keeps_relative_paths(tmp_path):
+    extraction_dir = tmp_path / 'extracted'
+    with zipfile.ZipFile(write_packaged_workbook(tmp_path / 'sales.twbx')) as package:
+        package.extractall(extraction_dir)
+    with zipfile.ZipFile(tmp_path / 'copy.zip', 'w') as zip_file:
+        copy_dir_to_zip(str(extraction_dir), zip_file)
+        assert sorted(zip_file.namelist()) == ['Data/Extracts/large.hyper', 'Data/Extracts/sales.hyper',
+                                               'Data/Sales Data/regions.csv', 'Image/logo.png']
+
+
+def test_modify_tableau_files_in_parallel(tmp_path):
+    conn_source = TableauServerConnection(SOURCE_CONFIG)
+    conn_target = TableauServerConnection(TARGET_CONFIG)
+    file_paths = [write_packaged_workbook(tmp_path / 'sales_{}.twbx'.format(index)) for index in range(3)]
+    (tmp_path / 'sales.twb').write_text(WORKBOOK_XML, encoding='utf-8')
+    (tmp_path / 'broken.twbx').write_bytes(b'not a zip file')
+    file_paths += [str(tmp_path / 'sales.twb'), str(tmp_path / 'broken.twbx')]
+    os.makedirs(tmp_path / 'target')
+
+    results = modify_tableau_files(file_paths, conn_source, conn_target, str(tmp_path / 'target'), max_workers=2)
+    expected_xml = remap_xml_references(WORKBOOK_XML, conn_source, conn_target)
+    assert [result['file_path'] for result in results] == file_paths
+    assert all(result['error'] is None and result['seconds'] >= 0 for result in results[:4])
+    assert results[4]['error'].startswith('BadZipFile')
+    for result in results[:3]:
+        assert result['rewritten'] == ['sales.twb']
+        with zipfile.ZipFile(result['destination_path']) as target_zip:
+            assert target_zip.read('sales.twb').decode('utf-8') == expected_xml
+    assert (tmp_path / 'target' / 'sales.twb').read_text(encoding='utf-8') == expected_xml
@@ -1,3 +1,5 @@
+import os
+
 from tableau_api_lib import TableauServerConnection
 from .config import tableau_server_config
 
@@ -6,7 +8,8 @@ TABLEAU_SERVER_CONFIG_ENV = 'tableau_prod'
 TEST_USERNAME = tableau_server_config[TABLEAU_SERVER_CONFIG_ENV]['username']
 TEST_PROJECT_NAME = 'Test'
 TEST_ALT_PROJECT_NAME = 'Test Alt'
-TEST_FLOW_FILE_PATH = r'C:\Users\estam\Documents\InterWorks\Demo\Tableau Prep\sample_snowflake_flow.tfl'
+TEST_FLOW_FILE_PATH = os.environ.get('TABLEAU_API_LIB_TEST_FLOW',
+                                      r'C:\Users\estam\Documents\InterWorks\Demo\Tableau Prep\sample_snowflake_flow.tfl')
 
 
 def sign_in():
@@ -167,6 +170,7 @@ def test_add_and_delete_flow_permissions():
                                              'Read': 'Allow',
                                              'Write': 'Deny'
                                          },
+                                         group_capability_dict=None,
                                          user_id=user_id)
     assert response.status_code == 200
     conn.sign_out()
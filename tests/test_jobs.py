@@ -0,0 +1,72 @@
+import os
+import time
+
+import pytest
+
+from tableau_api_lib.exceptions import JobWaitTimeout
+from tableau_api_lib.utils import JobHandle, PublishQueue, wait_for_jobs
+from .conftest import signed_in
+
+
+def test_wait_for_published_jobs(synthetic_server, tmp_path):
+    file_path = tmp_path / 'sales.twbx'
+    file_path.write_bytes(os.urandom(64 * 1024))
+    datasource_path = tmp_path / 'sales.tdsx'
+    datasource_path.write_bytes(os.urandom(64 * 1024))
+    server = synthetic_server(job_duration=0.3)
+    conn = signed_in(server)
+    project_id = server.sites[0].projects[0]['id']
+    handles = [conn.publish_workbook(str(file_path), f'sales {i}', project_id, as_job=True) for i in range(5)]
+    handles.append(conn.publish_data_source(str(datasource_path), 'sales', project_id, as_job=True))
+    assert all(isinstance(handle, JobHandle) and not handle.is_complete for handle in handles)
+    request_count = server.request_count
+    start = time.monotonic()
+    wait_for_jobs(handles, timeout=10, poll_interval=0.05, backoff=2.0)
+    assert time.monotonic() - start >= 0.25
+    assert all(handle.succeeded and handle.progress == 100 for handle in handles)
+    assert server.request_count - request_count <= 6 * len(handles)
+
+    republished = conn.publish_workbook(str(file_path), 'sales 0', project_id, as_job=True)
+    assert republished.job_id is not None
+
+
+def test_wait_for_jobs_times_out(synthetic_server, tmp_path):
+    file_path = tmp_path / 'sales.twbx'
+    file_path.write_bytes(b'workbook')
+    server = synthetic_server(job_duration=60)
+    conn = signed_in(server)
+    project_id = server.sites[0].projects[0]['id']
+    handle = conn.publish_workbook(str(file_path), 'sales', project_id, as_job=True)
+    with pytest.raises(JobWaitTimeout) as error:
+        handle.wait(timeout=0.2, poll_interval=0.05)
+    assert error.value.job_ids == [handle.job_id]
+
+    rejected = conn.publish_workbook(str(file_path), 'sales', 'no-such-project', as_job=True)
+    assert rejected.is_complete and not rejected.succeeded
+    assert rejected.response.status_code == 404
+
+    publish_queue = PublishQueue(conn, job_timeout=0.2, job_poll_interval=0.05)
+    task = publish_queue.add('workbook', str(file_path), 'queued', project_id, as_job=True)
+    publish_queue.run()
+    assert task.status == task.FAILED and isinstance(task.error, JobWaitTimeout)
+    assert task.job.job_id is not None and not task.job.is_complete and task.content_id is None
+
+
+def test_publish_jobs_gate_dependent_tasks(synthetic_server, tmp_path):
+    workbook_path = tmp_path / 'sales.twbx'
+    workbook_path.write_bytes(b'workbook')
+    datasource_path = tmp_path / 'sales.tdsx'
+    datasource_path.write_bytes(b'datasource')
+    server = synthetic_server(job_duration=0.3)
+    conn = signed_in(server)
+    project_id = server.sites[0].projects[0]['id']
+    publish_queue = PublishQueue(conn, job_poll_interval=0.05)
+    workbook = publish_queue.add('workbook', str(workbook_path), 'sales', project_id)
+    datasource = publish_queue.add('datasource', str(datasource_path), 'sales', project_id, as_job=True)
+    publish_queue.run()
+
+    assert datasource.status == workbook.status == 'succeeded'
+    assert datasource.job.succeeded and datasource.seconds >= 0.25
+    assert workbook.started_at >= datasource.finished_at
+    published, = [item for item in server.sites[0].datasources if item['name'] == 'sales']
+    assert datasource.content_id == published['id']
@@ -0,0 +1,68 @@
+from urllib.request import urlopen
+
+from tableau_api_lib.utils import BulkDownloader, metrics
+from tableau_api_lib.utils.synthetic_server import SyntheticSite
+from .conftest import signed_in
+
+
+def test_normalize_endpoint():
+    url = ('https://tableau.example.com/api/3.15/sites/9a8b7c6d-1234-5678-9abc-def012345678/workbooks/'
+           '0f1e2d3c-4b5a-6978-8a9b-0c1d2e3f4a5b/revisions/3/content?includeExtract=False')
+    assert metrics.normalize_endpoint(url) == '/api/{version}/sites/{id}/workbooks/{id}/revisions/{id}/content'
+
+
+def test_render_openmetrics():
+    registry = metrics.MetricsRegistry()
+    counter = registry.counter('test_requests', 'Requests issued.', ['method'])
+    histogram = registry.histogram('test_latency_seconds', 'Request latency.', ['method'], buckets=[0.5, 1.0])
+    counter.inc(method='GET')
+    counter.inc(2, method='GET')
+    histogram.observe(0.25, method='GET')
+    histogram.observe(0.75, method='GET')
+    rendered = registry.render()
+    assert '# TYPE test_requests counter' in rendered
+    assert 'test_requests_total{method="GET"} 3' in rendered
+    assert 'test_latency_seconds_bucket{method="GET",le="0.5"} 1' in rendered
+    assert 'test_latency_seconds_bucket{method="GET",le="+Inf"} 2' in rendered
+    assert 'test_latency_seconds_count{method="GET"} 2' in rendered
+    assert rendered.endswith('# EOF\n')
+
+
+def test_metrics_server():
+    registry = metrics.MetricsRegistry()
+    registry.counter('test_pages', 'Pages fetched.').inc()
+    server = metrics.start_metrics_server(port=0, registry=registry)
+    try:
+        with urlopen(f'http://127.0.0.1:{server.server_address[1]}/metrics') as response:
+            assert response.headers['Content-Type'] == metrics.OPENMETRICS_CONTENT_TYPE
+            assert 'test_pages_total 1' in response.read().decode('utf-8')
+    finally:
+        server.shutdown()
+
+
+def test_streamed_bytes_retries_and_cache_lookups_are_recorded(synthetic_server, tmp_path):
+    site = SyntheticSite(num_workbooks=4, num_datasources=0, num_flows=0, extract_size=64 * 1024)
+    workbook_ids = [workbook['id'] for workbook in site.workbooks]
+    endpoint = '/api/{version}/sites/{id}/workbooks/{id}/content'
+    bytes_before = metrics.BYTES_DOWNLOADED.get(endpoint=endpoint)
+    retries_before = metrics.RETRIES.get(operation='download_workbook')
+    hits_before = metrics.CACHE_HITS.get(cache='download_cache')
+    misses_before = metrics.CACHE_MISSES.get(cache='download_cache')
+    server = synthetic_server([site])
+    conn = signed_in(server)
+    server.error_rate = 0.5
+    flaky = BulkDownloader(conn, str(tmp_path / 'flaky'), retries=10, retry_delay=0.01)
+    flaky.add_ids('workbook', workbook_ids)
+    flaky_items = flaky.run()
+    server.error_rate = 0.0
+    for name in ['first', 'second']:
+        downloader = BulkDownloader(conn, str(tmp_path / name), download_cache=str(tmp_path / 'cache'))
+        downloader.add_ids('workbook', workbook_ids)
+        downloader.run()
+
+    assert metrics.BYTES_DOWNLOADED.get(endpoint=endpoint) - bytes_before == 2 * sum(
+        item.result.size for item in flaky_items)
+    assert metrics.RETRIES.get(operation='download_workbook') - retries_before == \
+        sum(item.attempts - 1 for item in flaky_items)
+    assert metrics.CACHE_MISSES.get(cache='download_cache') - misses_before == len(workbook_ids)
+    assert metrics.CACHE_HITS.get(cache='download_cache') - hits_before == len(workbook_ids)
@@ -0,0 +1,46 @@
+import json
+import os
+import tracemalloc
+
+from urllib3.fields import RequestField
+from urllib3.filepost import encode_multipart_formdata
+
+from tableau_api_lib.utils.multipart import FilePart, StreamingMultipartBody
+from .conftest import signed_in
+
+
+def test_matches_encoded_multipart(tmp_path):
+    file_path = tmp_path / 'sales.twbx'
+    file_path.write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+    payload = json.dumps({'workbook': {'name': 'sales'}})
+    body = StreamingMultipartBody({'request_payload': (None, payload, 'application/json'),
+                                   'tableau_workbook': ('sales.twbx', FilePart(str(file_path)),
+                                                        'application/octet-stream')}, block_size=1024 * 1024)
+    fields = []
+    for name, (filename, data, content_type) in [('request_payload', (None, payload, 'application/json')),
+                                                 ('tableau_workbook', ('sales.twbx', file_path.read_bytes(),
+                                                                       'application/octet-stream'))]:
+        field = RequestField(name=name, data=data, filename=filename)
+        field.make_multipart(content_type=content_type)
+        fields.append(field)
+    expected, content_type = encode_multipart_formdata(fields, boundary=body.boundary)
+    assert body.to_bytes() == expected
+    assert len(body) == len(expected)
+    assert body.content_type == content_type.replace('multipart/form-data', 'multipart/mixed')
+
+
+def test_publish_streams_from_disk(synthetic_server, tmp_path):
+    file_path = tmp_path / 'large.twbx'
+    file_size = 50 * 1024 * 1024
+    with open(file_path, 'wb') as file:
+        file.truncate(file_size)
+    server = synthetic_server()
+    conn = signed_in(server)
+    project_id = server.sites[0].projects[0]['id']
+    tracemalloc.start()
+    response = conn.publish_workbook(str(file_path), 'large', project_id)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert response.status_code == 201
+    assert response.json()['workbook']['size'] == '50'
+    assert peak_memory < file_size / 4
@@ -1,3 +1,5 @@
+import os
+
 import time
 
 from tableau_api_lib import TableauServerConnection
@@ -6,9 +8,11 @@ from .config import tableau_server_config
 
 TABLEAU_SERVER_CONFIG_ENV = 'tableau_prod'
 TEST_USERNAME = tableau_server_config[TABLEAU_SERVER_CONFIG_ENV]['username']
-TEST_DATASOURCE_FILE_PATH = r'C:\Users\estam\Documents\Development\python-tableau-api\test_datasource_with_extract.tdsx'
+TEST_DATASOURCE_FILE_PATH = os.environ.get('TABLEAU_API_LIB_TEST_DATASOURCE',
+                                            r'C:\Users\estam\Documents\Development\python-tableau-api\test_datasource_with_extract.tdsx')
 TEST_DATASOURCE_PREFIX = 'test_ds_'
-TEST_WORKBOOK_FILE_PATH = r'C:\Users\estam\Documents\Development\python-tableau-api\test_workbook_with_extract.twbx'
+TEST_WORKBOOK_FILE_PATH = os.environ.get('TABLEAU_API_LIB_TEST_WORKBOOK',
+                                          r'C:\Users\estam\Documents\Development\python-tableau-api\test_workbook_with_extract.twbx')
 TEST_WORKBOOK_PREFIX = 'test_wb_'
 TEST_PROJECT_NAME = 'Test'
 TEST_ALT_PROJECT_NAME = 'Test Alt'
@@ -165,6 +169,7 @@ def test_add_data_source_permissions_user():
                                                     'Connect': 'Allow',
                                                     'Read': 'Allow'
                                                 },
+                                                group_capability_dict=None,
                                                 user_id=test_user_id)
     print(response.content)
     assert response.status_code == 200
@@ -255,6 +260,7 @@ def test_add_datasource_permissions():
                                                     'Read': 'Allow',
                                                     'ExportXml': 'Deny'
                                                 },
+                                                group_capability_dict=None,
                                                 user_id=test_user_id)
     assert response.status_code == 200
 
@@ -0,0 +1,84 @@
+import zipfile
+
+from tableau_api_lib.utils import PublishManifest
+from tableau_api_lib.utils.publish_manifest import SKIPPED_PUBLISH_HEADER, content_hash
+from tableau_api_lib.utils.upload import UploadSource
+from .conftest import signed_in
+
+WORKBOOK_XML = b"<?xml version='1.0' encoding='utf-8' ?><workbook><datasources /></workbook>"
+
+
+def write_twbx(file_path, workbook_xml=WORKBOOK_XML, date_time=(2020, 1, 1, 0, 0, 0)):
+    with zipfile.ZipFile(file_path, 'w', compression=zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr(zipfile.ZipInfo('sales.twb', date_time), workbook_xml)
+        zip_file.writestr(zipfile.ZipInfo('Data/Extracts/sales.hyper', date_time), b'\x00' * 4096)
+    return str(file_path)
+
+
+def test_unchanged_content_is_not_republished(synthetic_server, tmp_path):
+    server = synthetic_server()
+    conn = signed_in(server)
+    project_id = server.sites[0].projects[0]['id']
+    manifest = PublishManifest(tmp_path / 'manifest.json')
+    file_path = write_twbx(tmp_path / 'sales.twbx')
+
+    published = conn.publish_workbook(file_path, 'sales', project_id, publish_manifest=manifest)
+    assert published.status_code == 201
+    request_count = server.request_count
+    write_twbx(file_path, date_time=(2021, 6, 1, 12, 0, 0))
+    skipped = conn.publish_workbook(file_path, 'sales', project_id, publish_manifest=manifest)
+    assert server.request_count == request_count
+    assert skipped.status_code == 200
+    assert skipped.headers[SKIPPED_PUBLISH_HEADER] == 'skipped'
+    assert skipped.json()['workbook']['id'] == published.json()['workbook']['id']
+
+    forced = conn.publish_workbook(file_path, 'sales', project_id, publish_manifest=manifest, force_publish=True)
+    renamed = conn.publish_workbook(file_path, 'sales copy', project_id, publish_manifest=manifest)
+    write_twbx(file_path, workbook_xml=WORKBOOK_XML.replace(b'<datasources />', b'<datasources></datasources>'))
+    changed = conn.publish_workbook(file_path, 'sales', project_id, publish_manifest=manifest)
+    assert [forced.status_code, renamed.status_code, changed.status_code] == [201, 201, 201]
+    assert len(manifest.entries()) == 2
+
+
+def test_publish_options_are_hashed_and_jobs_recorded_once_they_succeed(synthetic_server, tmp_path):
+    server = synthetic_server(job_duration=0.2)
+    conn = signed_in(server)
+    project_id = server.sites[0].projects[0]['id']
+    manifest = PublishManifest(tmp_path / 'manifest.json')
+    file_path = write_twbx(tmp_path / 'sales.twbx')
+    credentials = dict(server_address='db.example.com', connection_username='analyst',
+                       connection_password='s3cret-password', embed_credentials_flag=True)
+
+    job = conn.publish_workbook(file_path, 'sales', project_id, publish_manifest=manifest, as_job=True,
+                                **credentials)
+    assert job.job_id is not None and manifest.entries() == {}
+    job.wait(timeout=5, poll_interval=0.05)
+    entry, = manifest.entries().values()
+    assert entry['content']['id'] == job.job['workbook']['id']
+
+    request_count = server.request_count
+    skipped = conn.publish_workbook(file_path, 'sales', project_id, publish_manifest=manifest, **credentials)
+    assert skipped.headers[SKIPPED_PUBLISH_HEADER] == 'skipped' and server.request_count == request_count
+    credentials['connection_password'] = 'rotated-password'
+    republished = conn.publish_workbook(file_path, 'sales', project_id, publish_manifest=manifest, **credentials)
+    shown_tabs = conn.publish_workbook(file_path, 'sales', project_id, publish_manifest=manifest,
+                                       show_tabs_flag=True, **credentials)
+    assert [republished.status_code, shown_tabs.status_code] == [201, 201]
+
+    manifest_text = (tmp_path / 'manifest.json').read_text()
+    assert 'password' not in manifest_text and 'analyst' not in manifest_text
+
+
+def test_content_hash_of_sources(tmp_path):
+    file_path = write_twbx(tmp_path / 'sales.twbx')
+    with open(file_path, 'rb') as file:
+        twbx_bytes = file.read()
+    assert content_hash(file_path) == content_hash(UploadSource(twbx_bytes, file_name='sales.twbx'))
+    assert content_hash(UploadSource(WORKBOOK_XML, file_name='sales.twb')) is not None
+    assert content_hash(UploadSource(iter([WORKBOOK_XML]), file_name='sales.twb')) is None
+
+    changed_path = tmp_path / 'changed.twbx'
+    with zipfile.ZipFile(changed_path, 'w') as zip_file:
+        zip_file.writestr(zipfile.ZipInfo('sales.twb', (2020, 1, 1, 0, 0, 0)), WORKBOOK_XML)
+        zip_file.writestr(zipfile.ZipInfo('Data/Extracts/sales.hyper', (2020, 1, 1, 0, 0, 0)), b'\x01' * 4096)
+    assert content_hash(str(changed_path)) != content_hash(file_path)
@@ -0,0 +1,95 @@
+import os
+import time
+
+import pytest
+
+from tableau_api_lib.utils import BandwidthLimiter, PublishQueue
+from tableau_api_lib.utils.upload import UploadSource
+from .conftest import signed_in
+
+CHUNK_SIZE = 256 * 1024
+
+
+def write_files(tmp_path, extension, count, size):
+    file_paths = []
+    for i in range(count):
+        file_path = tmp_path / f'content_{i}.{extension}'
+        file_path.write_bytes(os.urandom(size))
+        file_paths.append(str(file_path))
+    return file_paths
+
+
+def test_datasources_publish_before_workbooks(synthetic_server, tmp_path):
+    server = synthetic_server(latency=0.01)
+    conn = signed_in(server)
+    project_id = server.sites[0].projects[0]['id']
+    publish_queue = PublishQueue(conn, max_workers=4)
+    for i, file_path in enumerate(write_files(tmp_path, 'twbx', 4, 3 * CHUNK_SIZE)):
+        publish_queue.add('workbook', file_path, f'workbook {i}', project_id, chunk_size=CHUNK_SIZE,
+                          file_size_limit=CHUNK_SIZE)
+    for i, file_path in enumerate(write_files(tmp_path, 'tdsx', 4, CHUNK_SIZE)):
+        publish_queue.add('datasource', file_path, f'datasource {i}', project_id)
+    tasks = publish_queue.run()
+
+    assert [task.status for task in tasks] == ['succeeded'] * 8
+    datasources = [task for task in tasks if task.content_type == 'datasource']
+    workbooks = [task for task in tasks if task.content_type == 'workbook']
+    assert max(task.finished_at for task in datasources) <= min(task.started_at for task in workbooks)
+    assert all(task.bytes_uploaded == 3 * CHUNK_SIZE for task in workbooks)
+    assert all(task.content_id for task in tasks)
+    results_df = publish_queue.to_dataframe()
+    assert list(results_df['status_code']) == [201] * 8
+    assert results_df['seconds'].gt(0).all()
+
+
+def test_failed_dependencies_skip_dependent_tasks(synthetic_server, tmp_path):
+    server = synthetic_server(latency=0.01)
+    conn = signed_in(server)
+    project_id = server.sites[0].projects[0]['id']
+    datasource_path, = write_files(tmp_path, 'tdsx', 1, 1024)
+    workbook_path, = write_files(tmp_path, 'twbx', 1, 1024)
+    publish_queue = PublishQueue(conn, datasources_first=False)
+    datasource = publish_queue.add('datasource', datasource_path, 'missing project', 'no-such-project')
+    workbook = publish_queue.add('workbook', workbook_path, 'dependent', project_id, depends_on=[datasource])
+    independent = publish_queue.add('workbook', workbook_path, 'independent', project_id)
+    publish_queue.run()
+    assert (datasource.status, workbook.status, independent.status) == ('failed', 'skipped', 'succeeded')
+    assert workbook.started_at is None
+
+    cyclic_queue = PublishQueue(conn)
+    first = cyclic_queue.add('workbook', workbook_path, 'first', project_id)
+    second = cyclic_queue.add('workbook', workbook_path, 'second', project_id, depends_on=[first])
+    first.depends_on.append(second)
+    with pytest.raises(ValueError):
+        cyclic_queue.run()
+
+    other_queue = PublishQueue(conn)
+    other_queue.add('workbook', workbook_path, 'cross-queue', project_id, depends_on=[first], task_id='cross-queue')
+    with pytest.raises(ValueError, match=r"depends on tasks from another queue: \[0\]"):
+        other_queue.run()
+
+
+def test_datasources_first_only_orders_publishes(synthetic_server, tmp_path):
+    server = synthetic_server(latency=0.01)
+    conn = signed_in(server)
+    project_id = server.sites[0].projects[0]['id']
+    datasource_path, = write_files(tmp_path, 'tdsx', 1, 1024)
+    workbook_path, = write_files(tmp_path, 'twbx', 1, 1024)
+    workbook_source = UploadSource(workbook_path)
+    publish_queue = PublishQueue(conn, max_bytes_per_second=50 * 1024 * 1024)
+    independent = publish_queue.add('workbook', workbook_source, 'independent', project_id)
+    datasource = publish_queue.add('datasource', datasource_path, 'missing project', 'no-such-project')
+    dependent = publish_queue.add('workbook', workbook_path, 'dependent', project_id, depends_on=[datasource])
+    publish_queue.run()
+
+    assert (datasource.status, dependent.status, independent.status) == ('failed', 'skipped', 'succeeded')
+    assert independent.started_at >= datasource.finished_at
+    assert workbook_source.bandwidth_limiter is None
+
+
+def test_bandwidth_limiter_caps_combined_rate():
+    limiter = BandwidthLimiter(bytes_per_second=4 * 1024 * 1024, burst=1024 * 1024)
+    start = time.monotonic()
+    for _ in range(12):
+        limiter.consume(256 * 1024)
+    assert time.monotonic() - start >= 0.45
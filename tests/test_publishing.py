@@ -1,12 +1,116 @@
+import os
+
 from tableau_api_lib import TableauServerConnection
 from .config import tableau_server_config
 
 
 TABLEAU_SERVER_CONFIG_ENV = 'tableau_prod'
 TEST_USERNAME = tableau_server_config[TABLEAU_SERVER_CONFIG_ENV]['username']
+TEST_WORKBOOK_FILE_PATH = os.environ.get('TABLEAU_API_LIB_TEST_WORKBOOK',
+                                          r'C:\Users\estam\Documents\Development\python-tableau-api\test_workbook_with_extract.twbx')
+TEST_DATASOURCE_FILE_PATH = os.environ.get('TABLEAU_API_LIB_TEST_DATASOURCE',
+                                            r'C:\Users\estam\Documents\Development\python-tableau-api\test_datasource_with_extract.tdsx')
+TEST_FLOW_FILE_PATH = os.environ.get('TABLEAU_API_LIB_TEST_FLOW',
+                                      r'C:\Users\estam\Documents\InterWorks\Demo\Tableau Prep\sample_snowflake_flow.tfl')
+TEST_PUBLISH_PREFIX = 'test_publish_'
+TEST_PROJECT_NAME = 'Test'
+TEST_CHUNK_SIZE = 64
 
 
 def sign_in():
     conn = TableauServerConnection(tableau_server_config)
     conn.sign_in()
     return conn
+
+
+def get_test_project_id(connection):
+    projects = connection.query_projects().json()['projects']['project']
+    for project in projects:
+        if project['name'] == TEST_PROJECT_NAME:
+            return project['id']
+    return projects.pop()['id']
+
+
+def get_published_ids(items):
+    return [item['id'] for item in items if item['name'].startswith(TEST_PUBLISH_PREFIX)]
+
+
+conn = sign_in()
+
+
+def test_publish_workbook():
+    response = conn.publish_workbook(workbook_file_path=TEST_WORKBOOK_FILE_PATH,
+                                     workbook_name=TEST_PUBLISH_PREFIX + 'workbook',
+                                     project_id=get_test_project_id(conn),
+                                     parameter_dict={'overwrite': 'overwrite=true'})
+    assert response.status_code == 201
+
+
+def test_publish_workbook_as_job():
+    response = conn.publish_workbook(workbook_file_path=TEST_WORKBOOK_FILE_PATH,
+                                     workbook_name=TEST_PUBLISH_PREFIX + 'workbook',
+                                     project_id=get_test_project_id(conn),
+                                     parameter_dict={
+                                         'overwrite': 'overwrite=true',
+                                         'asJob': 'asJob=true'
+                                     })
+    assert response.status_code == 202
+
+
+def test_publish_workbook_in_chunks():
+    # a file size limit of 0 bytes publishes even small files through a chunked file upload session
+    response = conn.publish_workbook(workbook_file_path=TEST_WORKBOOK_FILE_PATH,
+                                     workbook_name=TEST_PUBLISH_PREFIX + 'chunked_workbook',
+                                     project_id=get_test_project_id(conn),
+                                     parameter_dict={'overwrite': 'overwrite=true'},
+                                     chunk_size=TEST_CHUNK_SIZE,
+                                     file_size_limit=0)
+    assert response.status_code == 201
+
+
+def test_publish_data_source():
+    response = conn.publish_data_source(datasource_file_path=TEST_DATASOURCE_FILE_PATH,
+                                        datasource_name=TEST_PUBLISH_PREFIX + 'datasource',
+                                        project_id=get_test_project_id(conn),
+                                        parameter_dict={'overwrite': 'overwrite=true'})
+    assert response.status_code == 201
+
+
+def test_publish_data_source_in_chunks():
+    response = conn.publish_data_source(datasource_file_path=TEST_DATASOURCE_FILE_PATH,
+                                        datasource_name=TEST_PUBLISH_PREFIX + 'chunked_datasource',
+                                        project_id=get_test_project_id(conn),
+                                        parameter_dict={'overwrite': 'overwrite=true'},
+                                        chunk_size=TEST_CHUNK_SIZE,
+                                        file_size_limit=0)
+    assert response.status_code == 201
+
+
+def test_publish_flow():
+    response = conn.publish_flow(TEST_FLOW_FILE_PATH,
+                                 TEST_PUBLISH_PREFIX + 'flow',
+                                 project_id=get_test_project_id(conn),
+                                 parameter_dict={'overwrite': 'overwrite=true'})
+    assert response.status_code == 201
+
+
+def test_delete_published_workbooks():
+    workbook_ids = get_published_ids(conn.query_workbooks_for_site().json()['workbooks']['workbook'])
+    responses = [conn.delete_workbook(workbook_id) for workbook_id in workbook_ids]
+    assert len(responses) == 2
+    assert all(response.status_code == 204 for response in responses)
+
+
+def test_delete_published_data_sources():
+    datasource_ids = get_published_ids(conn.query_data_sources().json()['datasources']['datasource'])
+    responses = [conn.delete_data_source(datasource_id) for datasource_id in datasource_ids]
+    assert len(responses) == 2
+    assert all(response.status_code == 204 for response in responses)
+
+
+def test_delete_published_flows():
+    flow_ids = get_published_ids(conn.query_flows_for_site().json()['flows']['flow'])
+    responses = [conn.delete_flow(flow_id) for flow_id in flow_ids]
+    assert len(responses) == 1
+    assert all(response.status_code == 204 for response in responses)
+    conn.sign_out()
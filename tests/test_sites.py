@@ -40,7 +40,8 @@ def query_sites(conn):
 
 
 def query_views_for_site(conn):
-    response = conn.query_views_for_site()
+    site_id = conn.query_site().json()['site']['id']
+    response = conn.query_views_for_site(site_id)
     return conn, response
 
 
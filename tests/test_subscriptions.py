@@ -1,3 +1,5 @@
+import os
+
 import time
 
 from tableau_api_lib import TableauServerConnection
@@ -6,7 +8,8 @@ from .config import tableau_server_config
 
 TABLEAU_SERVER_CONFIG_ENV = 'tableau_prod'
 TEST_USERNAME = tableau_server_config[TABLEAU_SERVER_CONFIG_ENV]['username']
-TEST_WORKBOOK_FILE_PATH = r'C:\Users\estam\Documents\Development\python-tableau-api\test_workbook_with_extract.twbx'
+TEST_WORKBOOK_FILE_PATH = os.environ.get('TABLEAU_API_LIB_TEST_WORKBOOK',
+                                          r'C:\Users\estam\Documents\Development\python-tableau-api\test_workbook_with_extract.twbx')
 TEST_WORKBOOK_PREFIX = 'test_wb_'
 TEST_SCHEDULE_NAME = 'temp_test_schedule'
 TEST_SUBSCRIPTION_SUBJECT = 'temp_test_subscription_subject'
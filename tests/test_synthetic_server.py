@@ -0,0 +1,103 @@
+import io
+import zipfile
+
+import pytest
+
+from tableau_api_lib import TableauServerConnection
+from tableau_api_lib.utils import extract_pages
+from tableau_api_lib.utils.synthetic_server import SyntheticSite, SyntheticTableauServer
+
+
+@pytest.fixture(scope='module')
+def server():
+    sites = [SyntheticSite(num_users=250, num_workbooks=30, views_per_workbook=3, extract_size=4096),
+             SyntheticSite(name='Other', content_url='other', num_workbooks=1)]
+    with SyntheticTableauServer(sites) as synthetic_server:
+        yield synthetic_server
+
+
+@pytest.fixture
+def conn(server):
+    connection = TableauServerConnection(server.get_config(), ssl_verify=False)
+    connection.sign_in()
+    yield connection
+    connection.sign_out()
+
+
+def test_paginated_listings(server, conn):
+    users = extract_pages(conn.get_users_on_site, page_size=100)
+    views = extract_pages(conn.query_views_for_site, conn.site_id, page_size=40)
+    assert len(users) == 250
+    assert len({view['id'] for view in views}) == 90
+    filtered = extract_pages(conn.query_workbooks_for_site, parameter_dict={'filter': 'filter=name:eq:workbook_7'})
+    assert [workbook['name'] for workbook in filtered] == ['workbook_7']
+    filtered = extract_pages(conn.query_workbooks_for_site,
+                             parameter_dict={'filter': 'filter=name:in:[workbook_3,workbook_7],showTabs:eq:true'})
+    assert sorted(workbook['name'] for workbook in filtered) == ['workbook_3', 'workbook_7']
+
+
+def test_download_and_publish(server, conn, tmp_path):
+    workbook = extract_pages(conn.query_workbooks_for_site)[0]
+    with_extract = conn.download_workbook(workbook['id'])
+    without_extract = conn.download_workbook(workbook['id'], parameter_dict={'extract': 'includeExtract=False'})
+    assert len(zipfile.ZipFile(io.BytesIO(with_extract.content)).namelist()) == 2
+    assert len(zipfile.ZipFile(io.BytesIO(without_extract.content)).namelist()) == 1
+
+    file_path = tmp_path / 'published.twbx'
+    file_path.write_bytes(with_extract.content)
+    project_id = workbook['project']['id']
+    response = conn.publish_workbook(str(file_path), 'published', project_id)
+    assert response.status_code == 201
+    response = conn.publish_workbook(
+        str(file_path), 'published', project_id, parameter_dict={'overwrite': 'overwrite=false'}
+    )
+    assert response.status_code == 409
+    response = conn.publish_workbook(str(file_path), 'published', project_id)
+    assert response.json()['workbook']['revision'] == '2'
+
+
+def test_injected_throttling(server):
+    throttled = SyntheticTableauServer(throttle_rate=1.0, retry_after=7).start()
+    try:
+        connection = TableauServerConnection(throttled.get_config(), ssl_verify=False)
+        connection.sign_in()
+        response = connection.query_projects()
+    finally:
+        throttled.stop()
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '7'
+
+
+def test_unexpected_errors_are_answered_with_500(server, conn):
+    response = conn.session.post(f'{server.url}/api/{conn.api_version}/sites/{conn.site_id}/groups',
+                                 data='{not json', headers=conn.default_headers, verify=False)
+    assert response.status_code == 500
+    assert response.json()['error']['summary'].startswith('JSONDecodeError')
+    assert conn.query_projects().status_code == 200
+
+
+def test_requires_sign_in(server):
+    connection = TableauServerConnection(server.get_config(site_url='other'), ssl_verify=False)
+    connection.auth_token = 'invalid'
+    connection.site_id = server.sites[1].id
+    assert connection.query_projects().status_code == 401
+
+
+def test_schedule_tasks_and_permissions(server, conn):
+    schedule = conn.create_schedule('synthetic extracts').json()['schedule']
+    datasource = extract_pages(conn.query_data_sources)[0]
+    assert conn.add_data_source_to_schedule(datasource['id'], schedule['id']).status_code == 200
+    tasks = conn.get_extract_refresh_tasks_for_site().json()['tasks']['task']
+    assert [task['extractRefresh']['datasource']['id'] for task in tasks] == [datasource['id']]
+    job = conn.run_extract_refresh_task(tasks[0]['extractRefresh']['id']).json()['job']
+    assert job['extractRefreshJob']['datasource']['id'] == datasource['id']
+    assert conn.delete_schedule(schedule['id']).status_code == 204
+    assert conn.get_extract_refresh_tasks_for_site().json()['tasks']['task'] == []
+
+    user_id = server.sites[0].users[1]['id']
+    conn.add_data_source_permissions(datasource['id'], user_capability_dict={'Read': 'Allow'},
+                                     group_capability_dict=None, user_id=user_id)
+    response = conn.delete_data_source_permission(datasource['id'], 'user', user_id, 'Read', 'Allow')
+    assert response.status_code == 204
+    response = conn.delete_data_source_permission(datasource['id'], 'user', user_id, 'Read', 'Allow')
+    assert response.status_code == 404
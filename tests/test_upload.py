@@ -0,0 +1,114 @@
+import io
+import os
+
+import pytest
+import requests
+
+from tableau_api_lib.exceptions import FileUploadFailed
+from tableau_api_lib.utils.upload import ChunkedUploader, UploadJournal, UploadSource
+from .conftest import signed_in
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def test_chunked_publish(synthetic_server, tmp_path):
+    server = synthetic_server()
+    file_path = tmp_path / 'extract.tdsx'
+    file_path.write_bytes(os.urandom(5 * CHUNK_SIZE + 123))
+    conn = signed_in(server)
+    progress = []
+    response = conn.publish_data_source(str(file_path), 'extract', server.sites[0].projects[0]['id'],
+                                        chunk_size=CHUNK_SIZE, file_size_limit=CHUNK_SIZE,
+                                        upload_progress_callback=progress.append)
+    assert response.status_code == 201
+    assert [stats.offset for stats in progress] == [i * CHUNK_SIZE for i in range(6)]
+    assert sum(stats.size for stats in progress) == os.path.getsize(file_path)
+    assert all(stats.bytes_per_second > 0 for stats in progress)
+
+
+def test_uploader_reports_rejected_chunks(synthetic_server, tmp_path):
+    file_path = tmp_path / 'extract.hyper'
+    file_path.write_bytes(os.urandom(3 * CHUNK_SIZE))
+    server = synthetic_server()
+    conn = signed_in(server)
+    uploader = ChunkedUploader(conn, chunk_size=CHUNK_SIZE)
+    upload_session_id = uploader.initiate()
+    server.error_rate = 1.0
+    with pytest.raises(FileUploadFailed) as error:
+        uploader.append(upload_session_id, str(file_path))
+    assert error.value.upload_session_id == upload_session_id
+    assert error.value.offset == 0
+    assert uploader.bytes_uploaded == 0
+
+
+def test_publish_resumes_from_journal(synthetic_server, tmp_path, monkeypatch):
+    server = synthetic_server()
+    file_path = tmp_path / 'extract.tdsx'
+    file_path.write_bytes(os.urandom(6 * CHUNK_SIZE))
+    journal = UploadJournal(tmp_path / 'uploads.json')
+    conn = signed_in(server)
+    project_id = server.sites[0].projects[0]['id']
+    append_to_file_upload = conn.append_to_file_upload
+    appended = []
+
+    def fail_fourth_chunk(**kwargs):
+        if len(appended) == 3:
+            raise requests.ConnectionError('connection reset')
+        appended.append(kwargs['upload_session_id'])
+        return append_to_file_upload(**kwargs)
+
+    monkeypatch.setattr(conn, 'append_to_file_upload', fail_fourth_chunk)
+    publish_kwargs = dict(chunk_size=CHUNK_SIZE, file_size_limit=CHUNK_SIZE, upload_journal=journal)
+    with pytest.raises(requests.ConnectionError):
+        conn.publish_data_source(str(file_path), 'extract', project_id, **publish_kwargs)
+    [entry] = journal.entries().values()
+    assert entry['offset'] == 3 * CHUNK_SIZE
+    assert entry['file_size'] == os.path.getsize(file_path)
+
+    monkeypatch.setattr(conn, 'append_to_file_upload', append_to_file_upload)
+    progress = []
+    response = conn.publish_data_source(str(file_path), 'extract', project_id,
+                                        upload_progress_callback=progress.append, **publish_kwargs)
+    assert response.status_code == 201
+    assert response.json()['datasource']['size'] == '6'
+    assert [stats.offset for stats in progress] == [3 * CHUNK_SIZE, 4 * CHUNK_SIZE, 5 * CHUNK_SIZE]
+    assert journal.entries() == {}
+
+
+def test_journal_ignores_modified_files(synthetic_server, tmp_path):
+    file_path = tmp_path / 'extract.hyper'
+    file_path.write_bytes(os.urandom(2 * CHUNK_SIZE))
+    journal = UploadJournal(tmp_path / 'uploads.json')
+    conn = signed_in(synthetic_server())
+    uploader = ChunkedUploader(conn, chunk_size=CHUNK_SIZE, journal=journal)
+    upload_session_id = uploader.upload(str(file_path))
+    with open(file_path, 'r+b') as file:
+        file.write(b'changed')
+    uploader = ChunkedUploader(conn, chunk_size=CHUNK_SIZE, journal=journal)
+    assert uploader.upload(str(file_path)) != upload_session_id
+    assert uploader.resumed_offset == 0
+    assert uploader.bytes_uploaded == 2 * CHUNK_SIZE
+
+
+def test_publish_sources_without_temp_files(synthetic_server, tmp_path):
+    server = synthetic_server()
+    conn = signed_in(server)
+    project_id = server.sites[0].projects[0]['id']
+    twb = b"<?xml version='1.0' encoding='utf-8' ?><workbook />" * 1000
+    responses = [
+        conn.publish_workbook(UploadSource(twb, file_name='bytes.twb'), 'bytes', project_id),
+        conn.publish_workbook(UploadSource(io.BytesIO(twb), file_name='stream.twb'), 'stream', project_id),
+        conn.publish_workbook(UploadSource((twb[i:i + 4096] for i in range(0, len(twb), 4096)),
+                                           file_name='generated.twb'), 'generated', project_id,
+                              chunk_size=16 * 1024),
+    ]
+    assert [response.status_code for response in responses] == [201, 201, 201]
+    assert server.bytes_received > 3 * len(twb)
+
+
+def test_upload_source_requires_file_name():
+    with pytest.raises(ValueError):
+        UploadSource(b'<workbook />')
+    source = UploadSource(iter([b'abc', b'def']), file_name='generated.tds')
+    assert source.size is None
+    assert source.requires_chunking(file_size_limit=1024)
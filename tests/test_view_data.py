@@ -0,0 +1,82 @@
+import os
+
+import pandas as pd
+import pytest
+
+from tableau_api_lib.exceptions.tableau_server_exceptions import ContentNotFound
+from tableau_api_lib.utils.querying import get_view_data_dataframe, get_view_data_for_filters_dataframe, \
+    iter_view_data_dataframes, iter_view_data_record_batches, write_view_data_partitions
+from tableau_api_lib.utils.querying.workbooks import split_view_filters
+from tableau_api_lib.utils.synthetic_server import SyntheticSite
+from tableau_api_lib.utils.view_export import get_view_parameter_dict
+from .conftest import signed_in
+
+
+@pytest.fixture
+def conn(synthetic_server):
+    site = SyntheticSite(num_workbooks=1, views_per_workbook=1, rows_per_view=2500)
+    return signed_in(synthetic_server([site]))
+
+
+def test_iter_view_data_dataframes_streams_chunks(conn):
+    view_id = conn.query_views_for_site(conn.site_id).json()['views']['view'][0]['id']
+    chunks = list(iter_view_data_dataframes(conn, view_id, chunk_rows=1000))
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+    view_df = get_view_data_dataframe(conn, view_id)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), view_df)
+
+    filtered = pd.concat(iter_view_data_dataframes(conn, view_id, {'region': 'vf_Region=West'}, chunk_rows=100))
+    assert set(filtered['Region']) == {'West'} and 0 < len(filtered) < 2500
+
+    with pytest.raises(ContentNotFound):
+        next(iter_view_data_dataframes(conn, 'missing-view'))
+
+
+def test_iter_view_data_record_batches_limits_rows(conn):
+    pytest.importorskip('pyarrow')
+    view_id = conn.query_views_for_site(conn.site_id).json()['views']['view'][0]['id']
+    batches = list(iter_view_data_record_batches(conn, view_id, batch_rows=300, block_size=16 * 1024))
+    assert all(batch.num_rows <= 300 for batch in batches)
+    assert sum(batch.num_rows for batch in batches) == 2500
+    assert len({batch.schema for batch in batches}) == 1
+
+
+def test_split_view_filters_covers_every_value():
+    customers = [f'customer, {i}' for i in range(25)]
+    filter_sets = split_view_filters({'Region': ['West', 'East'], 'Customer': customers, 'Year': 2021},
+                                     max_values=10, max_length=10000)
+    assert len(filter_sets) == 3
+    assert [value for filters in filter_sets for value in filters['Customer']] == customers
+    assert all(filters['Region'] == ['West', 'East'] and filters['Year'] == ['2021'] for filters in filter_sets)
+    assert len(split_view_filters({'Customer': customers}, max_values=100, max_length=60)) == 9
+    assert split_view_filters(None) == [{}]
+
+
+def test_split_view_filters_accepts_arrays_series_and_ranges():
+    regions_df = pd.DataFrame({'region': ['West', 'East', 'West', 'South']})
+    assert split_view_filters({'Region': regions_df['region'].unique()}) == [{'Region': ['West', 'East', 'South']}]
+    assert split_view_filters({'Region': regions_df['region'].drop_duplicates()}) == \
+        [{'Region': ['West', 'East', 'South']}]
+    assert split_view_filters({'Year': range(2020, 2023)}) == [{'Year': ['2020', '2021', '2022']}]
+    assert get_view_parameter_dict({'Region': regions_df['region'].unique()}) == \
+        get_view_parameter_dict({'Region': ['West', 'East', 'South']})
+
+
+def test_view_data_fan_out_to_dataframe_and_partitions(conn, tmp_path):
+    view_id = conn.query_views_for_site(conn.site_id).json()['views']['view'][0]['id']
+    filter_sets = [{'Region': region} for region in ['West', 'East', 'Central']]
+    filter_sets.append({'Category': ['Furniture', 'Technology', 'Office Supplies'], 'Region': 'South'})
+    view_df = get_view_data_for_filters_dataframe(conn, view_id, filter_sets, max_workers=3, max_values_per_request=2)
+    expected = get_view_data_dataframe(conn, view_id)
+    for region in ['West', 'East', 'Central', 'South']:
+        assert len(view_df[view_df['Region'] == region]) == len(expected[expected['Region'] == region])
+    assert set(view_df['filter_Region']) == {'West', 'East', 'Central', 'South'}
+    assert set(view_df['filter_Category'].dropna()) == {'Furniture,Technology', 'Office Supplies'}
+
+    manifest_df = write_view_data_partitions(conn, view_id, str(tmp_path), filter_sets, max_values_per_request=2)
+    assert list(manifest_df['status_code']) == [200] * 5
+    assert sorted(os.listdir(tmp_path / 'Region=West')) == ['part-00000.csv']
+    south_dir = tmp_path / 'Category=Furniture,Technology,Office Supplies_Region=South'
+    assert sorted(os.listdir(south_dir)) == ['part-00000.csv', 'part-00001.csv']
+    south_df = pd.concat(pd.read_csv(south_dir / file) for file in sorted(os.listdir(south_dir)))
+    assert len(south_df) == len(expected[expected['Region'] == 'South'])
@@ -0,0 +1,65 @@
+import os
+
+import pandas as pd
+import pytest
+
+from tableau_api_lib.utils import ViewExporter
+from tableau_api_lib.utils.synthetic_server import SyntheticSite
+from tableau_api_lib.utils.view_export import get_view_parameter_dict
+from .conftest import signed_in
+
+
+@pytest.fixture
+def server(synthetic_server):
+    site = SyntheticSite(num_workbooks=3, views_per_workbook=2, rows_per_view=40)
+    return synthetic_server([site], latency=0.01)
+
+
+def test_get_view_parameter_dict_encodes_filters_and_parameters():
+    parameter_dict = get_view_parameter_dict({'Region': ['West', 'East'], 'Sub Category': 'A&B'}, {'Top N': 10},
+                                             max_age=5, parameter_dict={'resolution': 'resolution=high'})
+    assert sorted(parameter_dict.values()) == ['maxAge=5', 'resolution=high', 'vf_Region=West,East',
+                                               'vf_Sub%20Category=A%26B', 'vp_Top%20N=10']
+
+
+def test_view_exporter_exports_deduplicates_and_filters(server, tmp_path):
+    view_ids = [view['id'] for view in server.sites[0].views]
+    exporter = ViewExporter(signed_in(server), str(tmp_path), max_workers=4)
+    exporter.add_combinations(view_ids, ['image', 'pdf'])
+    exporter.add_combinations(view_ids[:2], ['csv'], filter_sets=[None, {'Region': 'West'}, {'Region': ['West']}])
+    exporter.add(view_ids[0], 'image')
+    items = exporter.run()
+
+    assert len(items) == 16 and exporter.duplicates == 3
+    assert all(item.status == 'succeeded' and item.attempts == 1 for item in items)
+    assert len(os.listdir(tmp_path)) == 16
+    with open(os.path.join(tmp_path, f'{view_ids[0]}.png'), 'rb') as file:
+        assert file.read().startswith(b'\x89PNG')
+    unfiltered = pd.read_csv(items[12].result.file_path)
+    filtered = pd.read_csv(items[13].result.file_path)
+    assert len(unfiltered) == 40 and set(filtered['Region']) == {'West'} and len(filtered) < 40
+
+    stats = exporter.get_latency_stats()
+    assert stats['succeeded'] == 16 and stats['duplicates'] == 3 and stats['cached'] == 0
+    assert stats['latency_p50'] >= 0.01 and stats['latency_max'] >= stats['latency_p90']
+    assert exporter.to_dataframe()['latency'].notna().all()
+
+
+def test_view_exporter_reuses_renders_within_max_age(server, tmp_path):
+    view_id = server.sites[0].views[0]['id']
+    conn = signed_in(server)
+    for destination, expected_cached in [('first', False), ('second', True)]:
+        exporter = ViewExporter(conn, str(tmp_path / destination), render_cache=str(tmp_path / 'cache'))
+        fresh = exporter.add(view_id, 'pdf', filters={'Region': 'West'}, max_age=0)
+        cached = exporter.add(view_id, 'pdf', filters={'Region': 'West'}, max_age=30)
+        exporter.run()
+        assert (fresh.cached, cached.cached) == (False, expected_cached)
+        assert fresh.result.ok and cached.result.ok
+    with open(cached.result.file_path, 'rb') as file:
+        assert file.read().startswith(b'%PDF')
+
+    server.error_rate = 1.0
+    exporter = ViewExporter(conn, str(tmp_path / 'failed'), retries=1, retry_delay=0.01)
+    item = exporter.add(view_id, 'image')
+    exporter.run()
+    assert item.status == 'failed' and item.attempts == 2 and item.result.status_code == 500
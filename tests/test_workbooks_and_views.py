@@ -1,10 +1,13 @@
+import os
+
 from tableau_api_lib import TableauServerConnection
 from .config import tableau_server_config
 
 
 TABLEAU_SERVER_CONFIG_ENV = 'tableau_prod'
 TEST_USERNAME = tableau_server_config[TABLEAU_SERVER_CONFIG_ENV]['username']
-TEST_WORKBOOK_FILE_PATH = r'C:\Users\estam\Documents\Development\python-tableau-api\test_workbook_with_extract.twbx'
+TEST_WORKBOOK_FILE_PATH = os.environ.get('TABLEAU_API_LIB_TEST_WORKBOOK',
+                                          r'C:\Users\estam\Documents\Development\python-tableau-api\test_workbook_with_extract.twbx')
 TEST_WORKBOOK_PREFIX = 'test_wb_'
 TEST_PROJECT_NAME = 'Test'
 TEST_ALT_PROJECT_NAME = 'Test Alt'
@@ -123,7 +126,7 @@ def test_add_tags_to_workbook():
 
 
 def test_query_views_for_site():
-    response = conn.query_views_for_site()
+    response = conn.query_views_for_site(conn.site_id)
     assert response.status_code == 200
 
 
@@ -238,9 +241,9 @@ def test_update_workbook_project_id():
     test_workbook_id = get_test_workbook_id(conn)
     original_project_id = get_test_project_id(conn)
     alt_project_id = get_alt_project_id(conn)
-    response = conn.update_workbook(test_workbook_id, project_id=alt_project_id)
+    response = conn.update_workbook(test_workbook_id, new_project_id=alt_project_id)
     assert response.status_code == 200
-    response = conn.update_workbook(test_workbook_id, project_id=original_project_id)
+    response = conn.update_workbook(test_workbook_id, new_project_id=original_project_id)
     assert response.status_code == 200
 
 
@@ -248,9 +251,9 @@ def test_update_workbook_owner_id():
     test_workbook_id = get_test_workbook_id(conn)
     original_owner_id = get_active_user_id(conn)
     alt_owner_id = get_alt_user_id(conn)
-    response = conn.update_workbook(test_workbook_id, owner_id=alt_owner_id)
+    response = conn.update_workbook(test_workbook_id, new_owner_id=alt_owner_id)
     assert response.status_code == 200
-    response = conn.update_workbook(test_workbook_id, owner_id=original_owner_id)
+    response = conn.update_workbook(test_workbook_id, new_owner_id=original_owner_id)
     assert response.status_code == 200
 
 